@@ -0,0 +1,143 @@
+"""인증 principal 캐시 — get_current_user의 users / user_sessions 조회 생략.
+
+get_current_user는 거의 모든 요청에서 JWT 디코드 후 users SELECT, 비관리자는
+user_sessions SELECT를 한 번 더 실행합니다. 이 모듈은 (user_id, sid) 키로
+사용자 행 스냅샷 + 세션 기기 지문을 짧은 TTL 동안 보관합니다.
+
+- 캐시 적중 시 스냅샷으로 User를 만들어 요청 세션에 merge(load=False) → DB 왕복 없음.
+  라우터가 user를 수정하고 commit하면 기존처럼 UPDATE가 나감
+- 플랜 만료 / 기기 지문 검사는 적중 시에도 매 요청 수행
+- 로그아웃, 세션 폐기, 로그인(기존 세션 폐기), 비밀번호/프로필 변경, 플랜/결제/권한
+  변경 경로에서 invalidate_user / invalidate_session 호출
+- 무효화 세대(generation): 조회 도중 무효화가 있었으면 그 결과는 캐시하지 않음
+- AUTH_CACHE_TTL_SEC (기본 30초, 0이면 비활성). 무효화는 프로세스 로컬이므로
+  다른 API 워커의 변경은 TTL 안에 반영
+
+사용법:
+  from api.auth_cache import principal_cache
+
+  principal_cache.invalidate_user(user.id)
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from database.models import User
+
+logger = logging.getLogger("adscope.auth_cache")
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass
+class CachedPrincipal:
+    """users 행 컬럼 값 + 활성 세션의 기기 지문 (sid 없는 토큰/관리자는 None)."""
+
+    user_id: int
+    sid: str | None
+    values: dict
+    device_fingerprint: str | None
+    expires_at: float
+
+
+def user_snapshot(user: User) -> dict:
+    """User 인스턴스의 컬럼 값 (요청 세션과 분리된 dict)."""
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+
+
+class PrincipalCache:
+    """(user_id, sid) → CachedPrincipal. TTL + LRU."""
+
+    def __init__(self, ttl_seconds: float | None = None, max_entries: int | None = None):
+        self.ttl_seconds = (
+            _env_float("AUTH_CACHE_TTL_SEC", DEFAULT_TTL_SECONDS) if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = (
+            int(_env_float("AUTH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)) if max_entries is None else max_entries
+        )
+        self._entries: OrderedDict[tuple[int, str | None], CachedPrincipal] = OrderedDict()
+        self.generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: int, sid: str | None) -> CachedPrincipal | None:
+        if not self.enabled:
+            return None
+        key = (user_id, sid)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry
+
+    def put(
+        self, user: User, sid: str | None, device_fingerprint: str | None, generation: int,
+    ) -> None:
+        """DB에서 확인한 principal 저장. 조회 시작 후 무효화가 있었으면 버림."""
+        if not self.enabled or generation != self.generation:
+            return
+        key = (user.id, sid)
+        self._entries[key] = CachedPrincipal(
+            user_id=user.id,
+            sid=sid,
+            values=user_snapshot(user),
+            device_fingerprint=device_fingerprint,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def attach(self, db: AsyncSession, entry: CachedPrincipal) -> User:
+        """스냅샷 → 요청 세션의 persistent User (SELECT 없이)."""
+        user = User(**entry.values)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    def invalidate_user(self, user_id: int | None) -> None:
+        """사용자의 모든 세션 엔트리 제거 (플랜/권한/프로필/비밀번호 변경, 재로그인)."""
+        self.generation += 1
+        if user_id is None:
+            return
+        stale = [key for key in self._entries if key[0] == user_id]
+        for key in stale:
+            del self._entries[key]
+        self._stats["invalidations"] += len(stale)
+
+    def invalidate_session(self, user_id: int, sid: str | None) -> None:
+        """단일 세션 엔트리 제거 (로그아웃, 기기 불일치)."""
+        self.generation += 1
+        if self._entries.pop((user_id, sid), None) is not None:
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._stats, "entries": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+principal_cache = PrincipalCache()
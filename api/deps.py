@@ -9,9 +9,10 @@ from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth_cache import principal_cache
 from database import get_db
 from database.models import User, UserSession
 
@@ -92,6 +93,9 @@ async def get_current_user(
 
     Non-admin users: session (sid) must be active, device fingerprint must match.
     Admin users: bypass all session checks.
+
+    The user row and session fingerprint are cached per (user_id, sid) for
+    AUTH_CACHE_TTL_SEC (see api.auth_cache), so warm requests skip both SELECTs.
     """
     # Support _token query param for file downloads (browser can't send headers)
     token: str | None = None
@@ -121,8 +125,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    session_id = payload.get("sid")
+    cached = principal_cache.get(int(user_id), session_id)
+    if cached is not None:
+        user = await principal_cache.attach(db, cached)
+        device_fingerprint = cached.device_fingerprint
+    else:
+        generation = principal_cache.generation
+        result = await db.execute(select(User).where(User.id == int(user_id)))
+        user = result.scalar_one_or_none()
+        device_fingerprint = None
 
     if user is None or not user.is_active:
         raise HTTPException(
@@ -132,6 +144,8 @@ async def get_current_user(
 
     # Admin bypasses session validation
     if user.role == "admin":
+        if cached is None:
+            principal_cache.put(user, session_id, None, generation)
         return user
 
     # Plan expiry check (non-admin only)
@@ -146,9 +160,8 @@ async def get_current_user(
                 headers={"X-Plan-Expired": "true"},
             )
 
-    # Non-admin: validate active session
-    session_id = payload.get("sid")
-    if session_id:
+    # Non-admin: validate active session (cache hit = session was active within TTL)
+    if session_id and cached is None:
         sess_result = await db.execute(
             select(UserSession).where(
                 UserSession.session_token == session_id,
@@ -163,23 +176,29 @@ async def get_current_user(
                 detail="Session expired - logged in from another device",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-
-        # Check device fingerprint match
-        client_fp = request.headers.get("X-Device-Fingerprint", "")
-        if (
-            session.device_fingerprint
-            and client_fp
-            and session.device_fingerprint != client_fp
-        ):
-            session.is_active = False
-            session.revoked_at = datetime.now(timezone.utc)
-            session.revoke_reason = "fingerprint_mismatch"
-            await db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Device mismatch - please log in again",
+        device_fingerprint = session.device_fingerprint
+
+    # Check device fingerprint match
+    client_fp = request.headers.get("X-Device-Fingerprint", "")
+    if session_id and device_fingerprint and client_fp and device_fingerprint != client_fp:
+        await db.execute(
+            update(UserSession)
+            .where(UserSession.session_token == session_id, UserSession.user_id == user.id)
+            .values(
+                is_active=False,
+                revoked_at=datetime.now(timezone.utc),
+                revoke_reason="fingerprint_mismatch",
             )
+        )
+        await db.commit()
+        principal_cache.invalidate_session(user.id, session_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Device mismatch - please log in again",
+        )
 
+    if cached is None:
+        principal_cache.put(user, session_id, device_fingerprint, generation)
     return user
 
 
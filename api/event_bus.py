@@ -1,5 +1,23 @@
 """SSE Event Bus — 크롤링/프로세서 이벤트를 프론트엔드로 실시간 푸시.
 
+링 버퍼 브로드캐스트:
+- 발행 시 이벤트를 1회 직렬화해 고정 크기 링(EVENT_BUS_RING_SIZE, 기본 1024)에 기록
+  → 구독자 수와 무관하게 O(1), 구독자별 큐/복사 없음
+- 구독자는 링 안의 커서(seq)만 보유하고 새 이벤트 알림을 기다림
+- 느린 구독자가 링 한 바퀴 이상 뒤처지면 끊지 않고 "gap" 이벤트(놓친 개수)를 보낸 뒤
+  가장 오래된 보관 이벤트부터 계속 전달
+- since_ts 재생은 링 구간 이진 탐색
+- heartbeat는 링에 넣지 않고 구독자별로 대기 시간 초과 시 생성
+
+프로세스 간 전달 (스케줄러 → API 워커, 워커 ↔ 워커):
+- EVENT_BUS_LOG_PATH를 지정하면 발행 이벤트를 그 SQLite 로그 파일에 추가
+  (프로세스당 연결 1개, 디렉토리는 없으면 생성)
+- API 프로세스는 lifespan에서 relay를 시작해 로그를 폴링(EVENT_BUS_POLL_SEC, 기본 0.5초)하고
+  다른 프로세스가 쓴 이벤트를 자기 링에 넣음 (자기 프로세스 이벤트는 origin으로 제외)
+- Windows 서비스 배포도 지원해야 하므로 Unix 소켓 대신 SQLite 파일 사용
+- 미지정(기본)이면 프로세스 내 전달만 — 스케줄러를 별도 프로세스로 돌리는 배포는
+  .env.example처럼 경로를 지정
+
 사용법:
   from api.event_bus import event_bus
   await event_bus.publish("crawl_complete", {"channel": "youtube_ads", "new_ads": 42})
@@ -8,8 +26,13 @@
 import asyncio
 import json
 import logging
+import os
+import sqlite3
+import threading
 import time
+import uuid
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import AsyncGenerator
 
 logger = logging.getLogger("adscope.event_bus")
@@ -21,6 +44,10 @@ EVT_DATA_UPDATED = "data_updated"
 EVT_AI_ENRICH_DONE = "ai_enrich_done"
 EVT_CAMPAIGN_REBUILT = "campaign_rebuilt"
 EVT_HEARTBEAT = "heartbeat"
+EVT_GAP = "gap"
+
+DEFAULT_RING_SIZE = 1024
+DEFAULT_LOG_KEEP = 10_000
 
 
 @dataclass
@@ -28,80 +55,272 @@ class SSEEvent:
     event: str
     data: dict
     timestamp: float = field(default_factory=time.time)
+    seq: int = -1
+    _encoded: str | None = field(default=None, repr=False, compare=False)
 
     def format_sse(self) -> str:
-        """SSE 프로토콜 형식으로 직렬화."""
-        payload = json.dumps({**self.data, "_ts": self.timestamp}, ensure_ascii=False)
-        return f"event: {self.event}\ndata: {payload}\n\n"
+        """SSE 프로토콜 형식으로 직렬화 (이벤트당 1회, 이후 캐시)."""
+        if self._encoded is None:
+            payload = json.dumps({**self.data, "_ts": self.timestamp}, ensure_ascii=False)
+            self._encoded = f"event: {self.event}\ndata: {payload}\n\n"
+        return self._encoded
+
+
+class SQLiteEventLog:
+    """프로세스 간 이벤트 로그. 프로세스당 연결 1개를 잠금으로 공유, 호출은 스레드에서 실행."""
+
+    def __init__(self, path: str, keep: int = DEFAULT_LOG_KEEP):
+        self.path = path
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """호출자가 self._lock 보유. fork된 자식은 부모 연결을 쓰지 않고 새로 연결."""
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, "
+                "origin TEXT NOT NULL, event TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _run(self, fn):
+        with self._lock:
+            try:
+                return fn(self._connection())
+            except sqlite3.Error:
+                self._close_locked()  # 파일 교체/손상 등 — 다음 호출에서 다시 연결
+                raise
+
+    def _close_locked(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def append(self, origin: str, evt: SSEEvent) -> None:
+        payload = json.dumps(evt.data, ensure_ascii=False, default=str)
+
+        def _append(conn: sqlite3.Connection) -> None:
+            cur = conn.execute(
+                "INSERT INTO events (ts, origin, event, payload) VALUES (?, ?, ?, ?)",
+                (evt.timestamp, origin, evt.event, payload),
+            )
+            if cur.lastrowid % 500 == 0:
+                conn.execute("DELETE FROM events WHERE seq <= ?", (cur.lastrowid - self.keep,))
+
+        self._run(_append)
+
+    def last_seq(self) -> int:
+        return self._run(lambda conn: conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0])
+
+    def read_after(self, seq: int, exclude_origin: str, limit: int = 500) -> tuple[int, list[SSEEvent]]:
+        """seq 이후 행 → (마지막 seq, 다른 origin의 이벤트 목록)."""
+        rows = self._run(lambda conn: conn.execute(
+            "SELECT seq, ts, origin, event, payload FROM events WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit),
+        ).fetchall())
+        events = [
+            SSEEvent(event=event, data=json.loads(payload), timestamp=ts)
+            for _, ts, origin, event, payload in rows
+            if origin != exclude_origin
+        ]
+        return (rows[-1][0] if rows else seq), events
+
+
+def create_event_log() -> SQLiteEventLog | None:
+    """EVENT_BUS_LOG_PATH가 설정된 경우에만 프로세스 간 로그 사용 (테스트/벤치는 기본 비활성)."""
+    path = os.getenv("EVENT_BUS_LOG_PATH", "").strip()
+    return SQLiteEventLog(path) if path else None
 
 
 class EventBus:
-    """비동기 pub/sub 이벤트 버스 (인메모리).
+    """비동기 pub/sub 이벤트 버스 (링 버퍼 + 구독자 커서).
 
-    여러 SSE 클라이언트가 subscribe하면 각자의 큐에 이벤트가 복제됩니다.
+    max_history: 링 크기 (재생/지연 구독자가 따라잡을 수 있는 최대 이벤트 수).
     """
 
-    def __init__(self, max_history: int = 50):
-        self._subscribers: list[asyncio.Queue] = []
-        self._history: list[SSEEvent] = []
-        self._max_history = max_history
-        self._lock = asyncio.Lock()
+    def __init__(self, max_history: int = DEFAULT_RING_SIZE, log: SQLiteEventLog | None = None):
+        self._capacity = max(1, max_history)
+        self._ring: list[SSEEvent | None] = [None] * self._capacity
+        self._next_seq = 0
+        self._last_ts = 0.0
+        self._wakeup = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscriber_count = 0
+        self.log = log
+        self.origin = uuid.uuid4().hex
+        self._relay: asyncio.Task | None = None
+        self._log_tasks: set[asyncio.Task] = set()
+        self._stats = {"published": 0, "relayed": 0, "gaps": 0, "log_errors": 0}
+
+    # ── 발행 ──
+
+    def _append(self, evt: SSEEvent) -> SSEEvent:
+        # 재생 이진 탐색을 위해 링 안의 타임스탬프는 단조 증가로 보정
+        if evt.timestamp < self._last_ts:
+            evt.timestamp = self._last_ts
+        self._last_ts = evt.timestamp
+        evt.seq = self._next_seq
+        self._ring[evt.seq % self._capacity] = evt
+        self._next_seq += 1
+        # 대기 중인 구독자 전체를 깨우고 다음 대기용 Event로 교체
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+        return evt
+
+    def publish_nowait(self, event_type: str, data: dict | None = None) -> SSEEvent:
+        """이벤트 발행 — 링에 기록 후 구독자 알림, 로그 전송은 백그라운드."""
+        evt = self._append(SSEEvent(event=event_type, data=data or {}))
+        self._stats["published"] += 1
+        if self.log is not None and event_type != EVT_HEARTBEAT:
+            task = asyncio.get_running_loop().create_task(self._write_log(evt))
+            self._log_tasks.add(task)
+            task.add_done_callback(self._log_tasks.discard)
+        logger.debug("Event published: %s (%d subscribers)", event_type, self._subscriber_count)
+        return evt
 
     async def publish(self, event_type: str, data: dict | None = None):
-        """이벤트 발행 — 모든 구독자 큐에 전달."""
-        evt = SSEEvent(event=event_type, data=data or {})
-
-        async with self._lock:
-            # 히스토리 유지
-            self._history.append(evt)
-            if len(self._history) > self._max_history:
-                self._history = self._history[-self._max_history:]
-
-            # 각 구독자 큐에 넣기
-            dead: list[asyncio.Queue] = []
-            for q in self._subscribers:
-                try:
-                    q.put_nowait(evt)
-                except asyncio.QueueFull:
-                    dead.append(q)
-            # 꽉 찬 큐 제거
-            for q in dead:
-                self._subscribers.remove(q)
+        """이벤트 발행 — 다른 프로세스용 로그 기록까지 대기."""
+        self.publish_nowait(event_type, data)
+        if self._log_tasks:
+            await asyncio.gather(*list(self._log_tasks), return_exceptions=True)
 
-        logger.debug("Event published: %s (%d subscribers)", event_type, len(self._subscribers))
+    async def _write_log(self, evt: SSEEvent) -> None:
+        try:
+            await asyncio.to_thread(self.log.append, self.origin, evt)
+        except Exception as exc:
+            self._stats["log_errors"] += 1
+            logger.warning("Event log write failed (%s): %s", evt.event, exc)
 
-    async def subscribe(self, since_ts: float = 0) -> AsyncGenerator[SSEEvent, None]:
-        """SSE 스트림 구독.
+    # ── 구독 ──
 
-        since_ts > 0 이면 해당 시각 이후 히스토리를 먼저 재생합니다.
-        """
-        q: asyncio.Queue[SSEEvent] = asyncio.Queue(maxsize=100)
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self._capacity)
+
+    def _first_after(self, since_ts: float) -> int:
+        """링에서 timestamp > since_ts 인 첫 seq (이진 탐색)."""
+        lo, hi = self._oldest_seq, self._next_seq
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ring[mid % self._capacity].timestamp > since_ts:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _wakeup_event(self) -> asyncio.Event:
+        """현재 루프용 알림 Event (테스트/스크립트가 루프를 바꿔도 안전)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        return self._wakeup
 
-        async with self._lock:
-            self._subscribers.append(q)
+    def _gap(self, missed: int | None) -> SSEEvent:
+        self._stats["gaps"] += 1
+        return SSEEvent(event=EVT_GAP, data={"missed": missed})
 
-            # 히스토리 재생 (재연결 시 놓친 이벤트 복구)
-            if since_ts > 0:
-                for evt in self._history:
-                    if evt.timestamp > since_ts:
-                        try:
-                            q.put_nowait(evt)
-                        except asyncio.QueueFull:
-                            break
+    async def subscribe(
+        self, since_ts: float = 0, heartbeat_sec: float | None = None,
+    ) -> AsyncGenerator[SSEEvent, None]:
+        """SSE 스트림 구독.
+
+        since_ts > 0 이면 해당 시각 이후 히스토리를 먼저 재생합니다 (링에서 밀려난
+        이벤트가 있었으면 gap 이벤트 선행). heartbeat_sec를 주면 그 시간 동안 이벤트가
+        없을 때 heartbeat 이벤트를 생성합니다.
+        """
+        cursor = self._next_seq
+        if since_ts > 0:
+            cursor = self._first_after(since_ts)
+            oldest = self._ring[self._oldest_seq % self._capacity]
+            if self._oldest_seq > 0 and oldest is not None and oldest.timestamp > since_ts:
+                yield self._gap(None)  # 밀려난 개수는 알 수 없음
 
+        self._subscriber_count += 1
         try:
             while True:
-                evt = await q.get()
-                yield evt
+                if cursor < self._oldest_seq:
+                    yield self._gap(self._oldest_seq - cursor)
+                    cursor = self._oldest_seq
+                if cursor < self._next_seq:
+                    evt = self._ring[cursor % self._capacity]
+                    cursor += 1
+                    yield evt
+                    continue
+                wakeup = self._wakeup_event()
+                if heartbeat_sec is None:
+                    await wakeup.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), heartbeat_sec)
+                except asyncio.TimeoutError:
+                    yield SSEEvent(event=EVT_HEARTBEAT, data={"type": "ping"})
         finally:
-            async with self._lock:
-                if q in self._subscribers:
-                    self._subscribers.remove(q)
+            self._subscriber_count -= 1
 
     @property
     def subscriber_count(self) -> int:
-        return len(self._subscribers)
+        return self._subscriber_count
+
+    # ── 프로세스 간 relay ──
+
+    async def _relay_loop(self, poll_sec: float) -> None:
+        seq: int | None = None  # 시작 시점 이후 이벤트만 전달 (첫 조회도 실패 시 재시도)
+        while True:
+            try:
+                if seq is None:
+                    seq = await asyncio.to_thread(self.log.last_seq)
+                else:
+                    seq, events = await asyncio.to_thread(self.log.read_after, seq, self.origin)
+                    for evt in events:
+                        self._append(evt)
+                    self._stats["relayed"] += len(events)
+            except Exception as exc:
+                self._stats["log_errors"] += 1
+                logger.warning("Event log relay failed: %s", exc)
+            await asyncio.sleep(poll_sec)
+
+    def start_relay(self, poll_sec: float | None = None) -> None:
+        """다른 프로세스가 로그에 쓴 이벤트를 이 버스로 전달 (API lifespan에서 호출)."""
+        if self.log is None or (self._relay is not None and not self._relay.done()):
+            return
+        if poll_sec is None:
+            poll_sec = float(os.getenv("EVENT_BUS_POLL_SEC", "0.5"))
+        self._relay = asyncio.create_task(self._relay_loop(poll_sec))
+
+    async def stop_relay(self) -> None:
+        if self._relay is not None:
+            self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+            self._relay = None
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "subscribers": self._subscriber_count,
+            "ring_size": self._capacity,
+            "buffered": self._next_seq - self._oldest_seq,
+            "last_seq": self._next_seq - 1,
+            "transport": self.log.path if self.log is not None else "memory",
+        }
 
 
 # 싱글톤 인스턴스
-event_bus = EventBus()
+event_bus = EventBus(
+    max_history=int(os.getenv("EVENT_BUS_RING_SIZE", str(DEFAULT_RING_SIZE))),
+    log=create_event_log(),
+)
@@ -0,0 +1,103 @@
+"""라우트별 응답 지연 히스토그램 — RequestLoggingMiddleware가 기록.
+
+로그 한 줄(경로 + 소요시간)만으로는 라우트별 분포를 볼 수 없어서, 라우트
+템플릿(/api/ads/{ad_id}) x 메서드 단위로 고정 버킷 히스토그램을 유지합니다.
+
+- 지연 = 요청 수신 → 응답 헤더 전송까지 (SSE/대용량 export는 스트림 길이 제외)
+- 버킷 상한(ms): 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, +Inf
+  기록은 bisect 1회 + 카운터 증가 (요청당 O(log 버킷))
+- p50/p95/p99는 버킷 내 선형 보간 추정치
+- 매칭되는 라우트가 없으면 "<unmatched>" 한 항목으로 합산 (경로별 무한 증가 방지)
+
+조회: GET /api/admin/latency (관리자)
+"""
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+BUCKET_BOUNDS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RouteHistogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+    max_ms: float = 0.0
+    status: dict[str, int] = field(default_factory=dict)
+
+    def observe(self, ms: float, status_code: int) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        status_class = f"{status_code // 100}xx"
+        self.status[status_class] = self.status.get(status_class, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 경계 사이 선형 보간 (관측 최대값을 넘지 않음)."""
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = BUCKET_BOUNDS_MS[i - 1] if i else 0.0
+                upper = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else max(self.max_ms, lower)
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max_ms)
+            seen += count
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 2) if self.total else 0.0,
+            "p50_ms": round(self.quantile(0.50), 2),
+            "p95_ms": round(self.quantile(0.95), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "status": dict(self.status),
+            "buckets": {
+                **{f"le_{bound}": c for bound, c in zip(BUCKET_BOUNDS_MS, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class LatencyStats:
+    """(메서드, 라우트 템플릿) → RouteHistogram."""
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteHistogram] = {}
+        self.started_at = time.time()
+
+    def observe(self, method: str, route: str, ms: float, status_code: int) -> None:
+        key = (method, route)
+        hist = self._routes.get(key)
+        if hist is None:
+            hist = self._routes[key] = RouteHistogram()
+        hist.observe(ms, status_code)
+
+    def snapshot(self) -> dict:
+        routes = sorted(self._routes.items(), key=lambda item: -item[1].total)
+        return {
+            "since": self.started_at,
+            "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+            "routes": [{"method": m, "route": r, **hist.snapshot()} for (m, r), hist in routes],
+        }
+
+    def reset(self) -> None:
+        self._routes.clear()
+        self.started_at = time.time()
+
+
+def route_template(scope: dict) -> str:
+    """라우팅 후 scope의 매칭 라우트 경로 템플릿."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+latency_stats = LatencyStats()
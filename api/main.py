@@ -1,11 +1,9 @@
 """FastAPI app entrypoint."""
 
-import asyncio
 import logging
 import os
 import time
 import traceback
-from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
@@ -16,9 +14,15 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 import bcrypt
 from sqlalchemy import select, text
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from api.event_bus import event_bus
+from api.latency import LatencyStats, latency_stats, route_template
 from api.logging_config import setup_logging
+from api.mobile_ingest import exposure_writer
+from api.rate_limit import RateLimiter
+from api.response_cache import response_cache
 from api.routers import (
     admin, ads, advertisers, advertiser_trends, analytics, auth, brand_channels,
     buzz, campaign_effect, campaigns, competitors, consumer_insights, download,
@@ -69,10 +73,16 @@ async def lifespan(app: FastAPI):
     logger.info("AdScope API starting up")
     await init_db()
     await _ensure_master_account()
+    response_cache.start_invalidator()
+    event_bus.start_relay()
     try:
         yield
     finally:
         logger.info("AdScope API shutting down")
+        await response_cache.stop_invalidator()
+        await event_bus.stop_relay()
+        await rate_limiter.close()
+        await exposure_writer.stop()
         from database import engine
         await engine.dispose()
         logger.info("Database engine disposed")
@@ -86,6 +96,8 @@ app = FastAPI(
     redirect_slashes=False,
 )
 
+rate_limiter = RateLimiter()
+
 _cors_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:3001,https://adscope.kr,https://www.adscope.kr,https://api.adscope.kr")
 CORS_ORIGINS = [o.strip() for o in _cors_origins.split(",") if o.strip()]
 
@@ -93,99 +105,116 @@ CORS_ORIGINS = [o.strip() for o in _cors_origins.split(",") if o.strip()]
 # ---------------------------------------------------------------------------
 # Rate limiting middleware
 # ---------------------------------------------------------------------------
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """In-memory rate limiter per client IP + route group."""
-
-    _CLEANUP_INTERVAL = 3600  # 1 hour
-
-    def __init__(self, app):
-        super().__init__(app)
-        self.requests: dict[str, list[float]] = defaultdict(list)
-        self._last_cleanup = time.time()
-        self._lock = asyncio.Lock()
-
-    def _cleanup_stale_keys(self):
-        """Remove keys whose timestamp lists are entirely expired (>120s old)."""
-        now = time.time()
-        if now - self._last_cleanup < self._CLEANUP_INTERVAL:
-            return
-        self._last_cleanup = now
-        stale_keys = [
-            k for k, ts_list in self.requests.items()
-            if not ts_list or (now - ts_list[-1]) > 120
-        ]
-        for k in stale_keys:
-            del self.requests[k]
-        if stale_keys:
-            logger.debug("Rate limiter cleanup: removed %d stale keys", len(stale_keys))
-
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        client_ip = request.client.host if request.client else "unknown"
-
-        # Rate limit config: (max_requests, window_seconds, bucket_key)
-        if path.startswith("/api/auth/login"):
-            limit, window, bucket = 10, 60, "login"
-        elif path.startswith("/api/admin"):
-            limit, window, bucket = 30, 60, "admin"
-        elif path.startswith("/api/"):
-            limit, window, bucket = 120, 60, "api"
-        else:
-            return await call_next(request)
-
-        async with self._lock:
-            # Periodic cleanup of stale entries
-            self._cleanup_stale_keys()
-
-            key = f"{client_ip}:{bucket}"
-            now = time.time()
-            self.requests[key] = [t for t in self.requests[key] if now - t < window]
-
-            if len(self.requests[key]) >= limit:
-                oldest = self.requests[key][0]
-                retry_after = int(window - (now - oldest)) + 1
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Too many requests. Please try again later."},
-                    headers={"Retry-After": str(retry_after)},
-                )
+class RateLimitMiddleware:
+    """Rate limiter per client IP + route group (GCRA, backend from RATE_LIMIT_BACKEND)."""
+
+    # (path prefix, max_requests, window_seconds, bucket_key) - first match wins
+    RULES = (
+        ("/api/auth/login", 10, 60, "login"),
+        ("/api/admin", 30, 60, "admin"),
+        ("/api/", 120, 60, "api"),
+    )
 
-            self.requests[key].append(now)
+    def __init__(self, app: ASGIApp, limiter: RateLimiter | None = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        path = scope["path"]
+        for prefix, limit, window, bucket in self.RULES:
+            if path.startswith(prefix):
+                break
+        else:
+            return await self.app(scope, receive, send)
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        decision = await self.limiter.hit(f"{client_ip}:{bucket}", limit, window)
+        if not decision.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests. Please try again later."},
+                headers={"Retry-After": decision.retry_after_header},
+            )
+            return await response(scope, receive, send)
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 # ---------------------------------------------------------------------------
 # Security headers middleware
 # ---------------------------------------------------------------------------
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Inject standard security headers into every response."""
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        return response
+    HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 # ---------------------------------------------------------------------------
 # Request logging middleware
 # ---------------------------------------------------------------------------
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
-        response = await call_next(request)
-        duration = time.time() - start
+class RequestLoggingMiddleware:
+    """Log each request when its response starts and record per-route latency.
+
+    Latency is measured up to the response headers, so SSE / export streams
+    are timed to their first byte, not their full length.
+    """
+
+    def __init__(self, app: ASGIApp, stats: LatencyStats | None = None):
+        self.app = app
+        self.stats = stats or latency_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        started = False
+
+        async def send_with_timing(message: Message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                self._record(scope, message["status"], time.perf_counter() - start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if not started:
+                self.stats.observe(scope["method"], route_template(scope), (time.perf_counter() - start) * 1000, 500)
+
+    def _record(self, scope: Scope, status_code: int, duration: float):
+        self.stats.observe(scope["method"], route_template(scope), duration * 1000, status_code)
         logger.info(
             "%s %s -> %d (%.2fs)",
-            request.method,
-            request.url.path,
-            response.status_code,
+            scope["method"],
+            scope["path"],
+            status_code,
             duration,
         )
-        return response
 
 
 app.add_middleware(RequestLoggingMiddleware)
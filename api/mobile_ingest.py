@@ -0,0 +1,411 @@
+"""모바일 패널 노출 대량 적재 — 배치/NDJSON 수집 + 비동기 ack 백그라운드 writer.
+
+기존 /exposures/batch는 노출마다 광고주 이름 SELECT 1회 + ORM 객체 2개(add)였고,
+디바이스 1,000대가 동시에 보고하면 요청 하나가 노출 수 × 왕복만큼 SQLite 쓰기 잠금을
+쥐고 있었습니다. 이 모듈은 요청(또는 writer 배치) 단위로 한 번에 처리합니다.
+
+- 디바이스: 요청에 나온 device_id를 IN 조회 1회 (필요 컬럼만)
+- 광고주: 요청에 나온 이름을 같은 세션에서 IN 조회 1회 (같은 이름이 여럿이면 최소 id).
+  생성하지 않음 — 기존과 같이 없는 광고주는 advertiser_id NULL + advertiser_name_raw.
+  processor.dimension_cache는 별도 세션(두 번째 커넥션)을 열기 때문에 동시 요청이
+  커넥션을 하나씩 쥔 채 두 번째를 기다리다 풀이 고갈되어 쓰지 않음
+- mobile_panel_exposures / panel_observations: 테이블 Core insert() + 행 목록 executemany
+  (문장 1개를 컴파일 캐시에서 재사용, 행 루프는 드라이버 C 코드). insert().values([...])
+  다중 VALUES는 요청마다 행×컬럼 개수만큼 바인드를 새로 컴파일해 그 비용이 쓰기보다 컸음.
+  last_seen은 UPDATE ... IN 1회
+- 요청 본문: JSON({device_id, exposures} 또는 노출 배열) / NDJSON(한 줄 = 노출 1건),
+  Content-Encoding: gzip 지원. 압축 해제 후 크기가 MOBILE_INGEST_MAX_BODY_BYTES를 넘으면 413.
+  수신 단계에서도 Content-Length가 상한을 넘거나, 스트림 누적 바이트가 상한을 넘는 즉시
+  413 (read_body — 본문 전체를 메모리에 올리지 않음)
+- ack=async: 검증 + 디바이스 확인 후 큐에 넣고 202 즉시 응답, ExposureWriter 태스크가
+  큐를 MOBILE_INGEST_WRITER_BATCH 행 단위로 모아 트랜잭션 1회로 기록.
+  큐에 쌓인 노출이 MOBILE_INGEST_QUEUE_MAX를 넘으면 503(Retry-After) — 단말이 재전송.
+  큐는 프로세스 메모리이므로 프로세스가 비정상 종료되면 미기록분은 유실됨
+  (정상 종료 시 lifespan에서 stop()이 남은 큐를 모두 기록)
+
+사용법:
+  body = await read_body(request)
+  items = decode_exposures(body, content_encoding, content_type)
+  devices = await load_devices(db, {i.device_id for i in items})
+  saved = await write_exposures(db, items, devices, source="mobile_panel_ingest")
+  # 또는
+  exposure_writer.submit(items, devices, source="mobile_panel_ingest")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Advertiser, MobilePanelDevice, MobilePanelExposure, PanelObservation
+from database.schemas import MobileExposureBatchIn, MobileExposureIn
+
+logger = logging.getLogger("adscope.mobile_ingest")
+
+MAX_BODY_BYTES = int(os.getenv("MOBILE_INGEST_MAX_BODY_BYTES", str(16 * 1024 * 1024)))
+QUEUE_MAX = int(os.getenv("MOBILE_INGEST_QUEUE_MAX", "50000"))
+WRITER_BATCH = int(os.getenv("MOBILE_INGEST_WRITER_BATCH", "2000"))
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+_IN_CHUNK = 500
+
+# 앱→채널 매핑
+_APP_TO_CHANNEL = {
+    "youtube": "youtube_surf",
+    "instagram": "meta",
+    "facebook": "meta",
+    "tiktok": "tiktok_ads",
+    "naver": "naver_da",
+    "kakao": "kakao_da",
+    "chrome": "google_gdn",
+    "samsung internet": "google_gdn",
+}
+
+
+@lru_cache(maxsize=1024)
+def resolve_channel(app_name: str | None) -> str | None:
+    """앱 이름을 채널명으로 매핑."""
+    lower = (app_name or "").lower().strip()
+    for key, channel in _APP_TO_CHANNEL.items():
+        if key in lower:
+            return channel
+    return None
+
+
+class IngestBodyError(ValueError):
+    """요청 본문을 해석할 수 없음 (status_code: 400/413/422)."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class DeviceInfo:
+    """PanelObservation 행 생성에 필요한 디바이스 컬럼 (세션과 분리 — writer 큐로 전달)."""
+
+    device_type: str | None
+    os_type: str
+    device_model: str | None
+    region: str | None
+
+    @property
+    def label(self) -> str:
+        return f"{self.os_type}_{self.device_model or 'unknown'}"
+
+
+# ── 본문 해석 ──
+
+async def read_body(request) -> bytes:
+    """요청 본문을 MAX_BODY_BYTES까지만 수신.
+
+    Content-Length가 상한을 넘으면 읽기 전에, 청크 전송 등 길이를 모르면
+    누적 바이트가 상한을 넘는 시점에 IngestBodyError(413).
+    request: headers / stream()을 가진 starlette Request.
+    """
+    declared = request.headers.get("content-length")
+    if declared is not None:
+        try:
+            length = int(declared)
+        except ValueError as exc:
+            raise IngestBodyError(400, "Invalid Content-Length") from exc
+        if length > MAX_BODY_BYTES:
+            raise IngestBodyError(413, "Body too large")
+    chunks: list[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_BODY_BYTES:
+            raise IngestBodyError(413, "Body too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _gunzip(raw: bytes) -> bytes:
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        body = inflater.decompress(raw, MAX_BODY_BYTES + 1)
+    except zlib.error as exc:
+        raise IngestBodyError(400, f"Invalid gzip body: {exc}") from exc
+    if len(body) > MAX_BODY_BYTES or inflater.unconsumed_tail:
+        raise IngestBodyError(413, "Decompressed body too large")
+    return body
+
+
+def decode_exposures(raw: bytes, content_encoding: str | None = None, content_type: str | None = None) -> list[MobileExposureIn]:
+    """요청 본문 → 노출 목록.
+
+    JSON 객체({device_id, exposures})면 각 노출의 device_id를 배치 device_id로 맞춤.
+    """
+    if len(raw) > MAX_BODY_BYTES:
+        raise IngestBodyError(413, "Body too large")
+    if "gzip" in (content_encoding or "").lower():
+        raw = _gunzip(raw)
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+
+    if media_type in NDJSON_TYPES:
+        items = []
+        for lineno, line in enumerate(raw.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(MobileExposureIn.model_validate_json(line))
+            except ValidationError as exc:
+                raise IngestBodyError(422, f"Line {lineno}: {exc.errors(include_url=False)[0]['msg']}") from exc
+        return items
+
+    try:
+        payload = json.loads(raw)
+    except ValueError as exc:
+        raise IngestBodyError(400, f"Invalid JSON body: {exc}") from exc
+    try:
+        if isinstance(payload, list):
+            return [MobileExposureIn.model_validate(item) for item in payload]
+        batch = MobileExposureBatchIn.model_validate(payload)
+    except ValidationError as exc:
+        raise IngestBodyError(422, str(exc.errors(include_url=False)[0]["msg"])) from exc
+    for item in batch.exposures:
+        item.device_id = batch.device_id
+    return batch.exposures
+
+
+# ── 적재 ──
+
+async def load_devices(db: AsyncSession, device_ids: Iterable[str]) -> dict[str, DeviceInfo]:
+    """device_id → DeviceInfo (등록되지 않은 id는 결과에 없음)."""
+    ids = sorted(set(device_ids))
+    devices: dict[str, DeviceInfo] = {}
+    for i in range(0, len(ids), _IN_CHUNK):
+        rows = await db.execute(
+            select(
+                MobilePanelDevice.device_id,
+                MobilePanelDevice.device_type,
+                MobilePanelDevice.os_type,
+                MobilePanelDevice.device_model,
+                MobilePanelDevice.region,
+            ).where(MobilePanelDevice.device_id.in_(ids[i:i + _IN_CHUNK]))
+        )
+        for device_id, *columns in rows.all():
+            devices[device_id] = DeviceInfo(*columns)
+    return devices
+
+
+async def load_advertiser_ids(db: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+    """광고주 이름 → id (없는 이름은 결과에 없음)."""
+    wanted = sorted({n for n in names if n})
+    ids: dict[str, int] = {}
+    for i in range(0, len(wanted), _IN_CHUNK):
+        rows = await db.execute(
+            select(Advertiser.name, func.min(Advertiser.id))
+            .where(Advertiser.name.in_(wanted[i:i + _IN_CHUNK]))
+            .group_by(Advertiser.name)
+        )
+        ids.update(rows.all())
+    return ids
+
+
+def build_rows(
+    items: list[MobileExposureIn],
+    devices: dict[str, DeviceInfo],
+    advertiser_ids: dict[str, int],
+    source: str,
+    now: datetime,
+) -> tuple[list[dict], list[dict]]:
+    """(mobile_panel_exposures 행, panel_observations 행). 미등록 디바이스 노출은 제외.
+
+    executemany는 첫 행의 키로 문장을 만들므로 모든 행에 같은 키(observed_at 포함)를 채움.
+    """
+    exposures: list[dict] = []
+    observations: list[dict] = []
+    for exp in items:
+        device = devices.get(exp.device_id)
+        if device is None:
+            continue
+        channel = resolve_channel(exp.app_name)
+        advertiser_id = advertiser_ids.get(exp.advertiser_name) if exp.advertiser_name else None
+        exposures.append({
+            "device_id": exp.device_id,
+            "app_name": exp.app_name,
+            "channel": channel,
+            "advertiser_id": advertiser_id,
+            "advertiser_name_raw": exp.advertiser_name,
+            "ad_text": exp.ad_text,
+            "ad_type": exp.ad_type,
+            "creative_url": exp.creative_url,
+            "click_url": exp.click_url,
+            "duration_ms": exp.duration_ms,
+            "was_clicked": exp.was_clicked,
+            "was_skipped": exp.was_skipped,
+            "screen_position": exp.screen_position,
+            "observed_at": exp.observed_at or now,
+            "extra_data": exp.extra_data,
+        })
+        observations.append({
+            "panel_type": device.device_type,
+            "panel_id": exp.device_id,
+            "advertiser_id": advertiser_id,
+            "channel": channel or exp.app_name,
+            "ad_detail_id": None,
+            "observed_at": now,
+            "device": device.label,
+            "location": device.region,
+            "is_verified": device.device_type == "real",
+            "extra_data": {"source": source, "app": exp.app_name},
+        })
+    return exposures, observations
+
+
+async def write_exposures(
+    db: AsyncSession,
+    items: list[MobileExposureIn],
+    devices: dict[str, DeviceInfo],
+    source: str,
+) -> int:
+    """노출 + PanelObservation bulk INSERT, last_seen 갱신 후 커밋. 기록한 노출 수 반환."""
+    if not items:
+        return 0
+    advertiser_ids = await load_advertiser_ids(db, (exp.advertiser_name for exp in items))
+
+    now = datetime.utcnow()
+    exposures, observations = build_rows(items, devices, advertiser_ids, source, now)
+    if not exposures:
+        return 0
+    await db.execute(insert(MobilePanelExposure.__table__), exposures)
+    await db.execute(insert(PanelObservation.__table__), observations)
+    await touch_devices(db, {row["device_id"] for row in exposures}, now)
+    await db.commit()
+    return len(exposures)
+
+
+async def touch_devices(db: AsyncSession, device_ids: Iterable[str], now: datetime | None = None) -> None:
+    """디바이스 last_seen 갱신 (UPDATE ... IN, 커밋은 호출자)."""
+    seen = sorted(set(device_ids))
+    now = now or datetime.utcnow()
+    for i in range(0, len(seen), _IN_CHUNK):
+        await db.execute(
+            update(MobilePanelDevice)
+            .where(MobilePanelDevice.device_id.in_(seen[i:i + _IN_CHUNK]))
+            .values(last_seen=now)
+            .execution_options(synchronize_session=False)
+        )
+
+
+# ── 비동기 ack writer ──
+
+class ExposureWriter:
+    """ack=async 노출을 모아 기록하는 백그라운드 태스크 (프로세스당 1개)."""
+
+    def __init__(
+        self,
+        session_factory=None,
+        max_pending: int = QUEUE_MAX,
+        batch_size: int = WRITER_BATCH,
+    ):
+        self._session_factory = session_factory
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._pending = 0
+        self._counters = {"queued": 0, "written": 0, "rejected": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _sessions(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        import database  # 테스트에서 database.async_session 교체를 따르도록 호출 시점에 참조
+
+        return database.async_session()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, items: list[MobileExposureIn], devices: dict[str, DeviceInfo], source: str) -> bool:
+        """큐에 추가. 대기 노출이 max_pending을 넘으면 False (호출자가 503 응답)."""
+        if self._pending + len(items) > self.max_pending:
+            self._counters["rejected"] += len(items)
+            return False
+        self.start()
+        self._queue.put_nowait((items, devices, source))
+        self._pending += len(items)
+        self._counters["queued"] += len(items)
+        return True
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            rows = len(batch[0][0])
+            while rows < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+                rows += len(batch[-1][0])
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: list[tuple]) -> None:
+        count = sum(len(items) for items, _, _ in batch)
+        t0 = time.monotonic()
+        try:
+            async with self._sessions() as db:
+                written = 0
+                for source in {source for _, _, source in batch}:
+                    items = [i for items, _, s in batch if s == source for i in items]
+                    devices = {k: v for _, devs, s in batch if s == source for k, v in devs.items()}
+                    written += await write_exposures(db, items, devices, source)
+            self._counters["written"] += written
+            self._counters["flushes"] += 1
+            logger.debug("mobile ingest flush: %d exposures (%.1f ms)", written, (time.monotonic() - t0) * 1e3)
+        except Exception:
+            self._counters["failed"] += count
+            logger.exception("mobile ingest flush failed: %d exposures dropped", count)
+        finally:
+            self._pending -= count
+
+    async def drain(self) -> None:
+        """큐에 들어간 노출이 모두 기록될 때까지 대기."""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """남은 큐를 기록한 뒤 태스크 종료 (앱 lifespan에서 호출)."""
+        await self.drain()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "batch_size": self.batch_size,
+            **self._counters,
+        }
+
+
+# 싱글톤 인스턴스
+exposure_writer = ExposureWriter()
@@ -0,0 +1,239 @@
+"""API 요청 속도 제한 — GCRA(키당 float 1개) + 교체 가능한 저장소.
+
+기존 RateLimitMiddleware는 키마다 타임스탬프 리스트를 두고 요청마다 리스트
+컴프리헨션으로 재구성했으며(O(한도)), 전역 asyncio.Lock 하나로 모든 키를
+직렬화했고, uvicorn 워커마다 한도가 따로였습니다.
+
+GCRA (Generic Cell Rate Algorithm):
+  - 키당 상태는 TAT(이론적 다음 도착 시각) 하나, 판정은 O(1)
+  - 간격 T = window / limit, 허용 조건: max(TAT, now) + T - window <= now
+  - 비어 있는 키는 limit개까지 즉시 허용(버스트), 이후 T 간격으로 1개씩 회복
+  - 거부 시 Retry-After = 허용 시각 - now
+
+저장소 (RATE_LIMIT_BACKEND):
+  memory  프로세스 로컬 dict + 키 해시별 스트라이프 잠금 (기본)
+  sqlite  워커 간 공유 파일 (RATE_LIMIT_SQLITE_PATH), UPSERT ... RETURNING 1문장으로
+          원자적 판정, 전용 스레드 1개에서 실행 (이벤트 루프 비차단)
+  redis   Redis 호환 서버 (RATE_LIMIT_REDIS_URL), Lua 스크립트 1회 왕복.
+          valkey/dragonfly/KeyDB 등 로컬 대체 서버 사용 가능
+
+저장소 오류 시 요청은 통과시키고(fail-open) 경고를 남깁니다.
+
+사용법:
+  from api.rate_limit import RateLimiter, create_backend
+
+  limiter = RateLimiter(create_backend())
+  decision = await limiter.hit("1.2.3.4:api", limit=120, window=60)
+  if not decision.allowed: ... decision.retry_after
+"""
+
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger("adscope.rate_limit")
+
+DEFAULT_LOCK_STRIPES = 64
+DEFAULT_SWEEP_INTERVAL = 60
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    retry_after: float = 0.0
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def gcra(tat: float | None, now: float, limit: int, window: float) -> tuple[bool, float, float]:
+    """GCRA 1회 판정 → (허용 여부, 새 TAT, 재시도까지 초)."""
+    interval = window / limit
+    new_tat = max(tat or now, now) + interval
+    allow_at = new_tat - window
+    if allow_at > now:
+        return False, tat, allow_at - now
+    return True, new_tat, 0.0
+
+
+class MemoryBackend:
+    """프로세스 로컬 TAT 저장소. 키 해시 → 스트라이프 잠금 (스레드에서 호출돼도 안전)."""
+
+    name = "memory"
+
+    def __init__(self, stripes: int = DEFAULT_LOCK_STRIPES, sweep_interval: float = DEFAULT_SWEEP_INTERVAL):
+        self._tats: dict[str, float] = {}
+        self._locks = [threading.Lock() for _ in range(max(1, stripes))]
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def hit_sync(self, key: str, now: float, limit: int, window: float) -> RateDecision:
+        with self._locks[hash(key) % len(self._locks)]:
+            allowed, tat, retry_after = gcra(self._tats.get(key), now, limit, window)
+            if allowed:
+                self._tats[key] = tat
+        if now >= self._next_sweep:
+            self._sweep(now)
+        return RateDecision(allowed, retry_after)
+
+    async def hit(self, key: str, now: float, limit: int, window: float) -> RateDecision:
+        return self.hit_sync(key, now, limit, window)
+
+    def _sweep(self, now: float) -> None:
+        """TAT가 지난 키 = 빈 키와 같은 상태 → 제거 (메모리 상한)."""
+        self._next_sweep = now + self._sweep_interval
+        stale = [key for key, tat in list(self._tats.items()) if tat <= now]
+        for key in stale:
+            self._tats.pop(key, None)
+        if stale:
+            logger.debug("Rate limiter sweep: removed %d idle keys", len(stale))
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """워커 간 공유 SQLite 파일. 판정은 UPSERT 1문장 (허용일 때만 RETURNING 행 존재)."""
+
+    name = "sqlite"
+
+    _UPSERT = (
+        "INSERT INTO rate_limits (key, tat) VALUES (:key, :now + :interval) "
+        "ON CONFLICT(key) DO UPDATE SET tat = max(tat, :now) + :interval "
+        "WHERE max(tat, :now) + :interval - :window <= :now "
+        "RETURNING tat"
+    )
+
+    def __init__(self, path: str, sweep_interval: float = DEFAULT_SWEEP_INTERVAL):
+        self.path = path
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._conn: sqlite3.Connection | None = None
+        # sqlite3 연결은 생성 스레드 전용 → 전용 스레드 1개에서만 사용
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit-sqlite")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def hit_sync(self, key: str, now: float, limit: int, window: float) -> RateDecision:
+        conn = self._connect()
+        interval = window / limit
+        params = {"key": key, "now": now, "interval": interval, "window": window}
+        row = conn.execute(self._UPSERT, params).fetchone()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self._sweep_interval
+            conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        if row is not None:
+            return RateDecision(True)
+        (tat,) = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+        return RateDecision(False, tat + interval - window - now)
+
+    async def hit(self, key: str, now: float, limit: int, window: float) -> RateDecision:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.hit_sync, key, now, limit, window)
+
+    async def close(self) -> None:
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, _close)
+        self._executor.shutdown(wait=False)
+
+
+class RedisBackend:
+    """Redis 호환 서버. GCRA를 Lua로 서버에서 원자 실행, 키는 TAT 시각에 만료."""
+
+    name = "redis"
+
+    # KEYS[1]=키, ARGV = now, interval, window (초, float). 반환: {허용(1/0), 재시도 ms}
+    _SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if allow_at > now then
+  return {0, math.ceil((allow_at - now) * 1000)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, 0}
+"""
+
+    def __init__(self, url: str, prefix: str = "adscope:rl:", client=None):
+        if client is None:
+            import redis.asyncio as redis_asyncio
+
+            client = redis_asyncio.from_url(url)
+        self._client = client
+        self.prefix = prefix
+        self._script = client.register_script(self._SCRIPT)
+
+    async def hit(self, key: str, now: float, limit: int, window: float) -> RateDecision:
+        allowed, retry_ms = await self._script(
+            keys=[self.prefix + key], args=[repr(now), repr(window / limit), repr(window)],
+        )
+        return RateDecision(bool(int(allowed)), int(retry_ms) / 1000)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_backend(kind: str | None = None):
+    """RATE_LIMIT_BACKEND 환경변수 → 저장소 인스턴스."""
+    kind = (kind or os.getenv("RATE_LIMIT_BACKEND", "memory")).strip().lower()
+    if kind == "sqlite":
+        default_path = Path(__file__).resolve().parent.parent / "logs" / "rate_limits.db"
+        return SQLiteBackend(os.getenv("RATE_LIMIT_SQLITE_PATH", str(default_path)))
+    if kind == "redis":
+        return RedisBackend(os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"))
+    if kind != "memory":
+        logger.warning("Unknown RATE_LIMIT_BACKEND=%r - using memory", kind)
+    return MemoryBackend()
+
+
+class RateLimiter:
+    """저장소 위의 판정기. 저장소 오류는 fail-open (경고는 분당 1회)."""
+
+    def __init__(self, backend=None, clock=time.time):
+        self.backend = backend if backend is not None else create_backend()
+        self._clock = clock
+        self._last_error_log = 0.0
+        self.stats = {"allowed": 0, "limited": 0, "errors": 0}
+
+    async def hit(self, key: str, limit: int, window: float) -> RateDecision:
+        now = self._clock()
+        try:
+            decision = await self.backend.hit(key, now, limit, window)
+        except Exception as exc:
+            self.stats["errors"] += 1
+            if now - self._last_error_log >= 60:
+                self._last_error_log = now
+                logger.warning("Rate limit backend %s failed (allowing request): %s", self.backend.name, exc)
+            return RateDecision(True)
+        self.stats["allowed" if decision.allowed else "limited"] += 1
+        return decision
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,318 @@
+"""읽기 위주 분석 API 응답 캐시 — 인프로세스 LRU + (선택) 디스크 티어.
+
+SOV / 페르소나 히트맵 / 광고비 요약 / 일일 통계처럼 같은 파라미터로 반복
+조회되는 집계 엔드포인트의 응답을 캐시합니다.
+
+- 키: 라우트 + 정규화된 쿼리 파라미터(None 제거, 키 정렬) + 플랜 티어
+- 엔트리별 TTL (RESPONSE_CACHE_TTL, 기본 300초)
+- 동일 키 동시 미스는 1회만 계산 (나머지 요청은 같은 결과를 대기)
+- data_updated / campaign_rebuilt / crawl_complete 이벤트 수신 시 전체 무효화
+- RESPONSE_CACHE_DISK_DIR 지정 시 JSON 파일 티어 사용 (워커 간 공유, 재시작 후 재사용).
+  무효화 시 메모리만 즉시 비우고 파일 삭제는 스레드에서 백그라운드로 수행 — 삭제가 끝나기 전에는
+  무효화 시각 이전에 기록된 파일을 읽지 않음
+
+별도 프로세스(스케줄러)의 이벤트는 이벤트 버스 relay(SQLite 로그 폴링)로 전달됩니다.
+
+사용법:
+  from api.response_cache import plan_tier, response_cache
+
+  return await response_cache.get_or_compute(
+      "analytics.sov", {"days": days}, plan_tier(user), lambda: _compute(),
+  )
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from api.event_bus import (
+    EVT_CAMPAIGN_REBUILT,
+    EVT_CRAWL_COMPLETE,
+    EVT_DATA_UPDATED,
+    event_bus,
+)
+
+logger = logging.getLogger("adscope.response_cache")
+
+# 이 이벤트가 오면 캐시된 집계가 더 이상 최신이 아님
+INVALIDATING_EVENTS = frozenset({EVT_DATA_UPDATED, EVT_CAMPAIGN_REBUILT, EVT_CRAWL_COMPLETE})
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 512
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def plan_tier(user) -> str:
+    """캐시 키에 들어가는 플랜 티어 (admin > full > lite)."""
+    if user is None:
+        return "anonymous"
+    if getattr(user, "role", None) == "admin":
+        return "admin"
+    return getattr(user, "plan", None) or "lite"
+
+
+def make_cache_key(route: str, params: dict[str, Any], tier: str) -> str:
+    """라우트 + 정규화된 쿼리 파라미터 + 플랜 티어 → 캐시 키."""
+    normalized = sorted(
+        (name, value.isoformat() if hasattr(value, "isoformat") else value)
+        for name, value in params.items()
+        if value is not None
+    )
+    return f"{route}?{json.dumps(normalized, ensure_ascii=False, default=str)}|{tier}"
+
+
+class ResponseCache:
+    """TTL + LRU 응답 캐시. 동시 미스 병합과 이벤트 기반 무효화를 지원합니다."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        disk_dir: str | Path | None = None,
+        enabled: bool = True,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.enabled = enabled and ttl_seconds > 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # 무효화 세대 — 계산 도중 무효화되면 그 결과는 저장하지 않음
+        self._generation = 0
+        # 마지막 무효화 시각 — 이전에 기록된 디스크 엔트리는 삭제 전이라도 무시
+        self._invalidated_at = 0.0
+        self._disk_sweeps: set[asyncio.Task] = set()
+        self._invalidator: asyncio.Task | None = None
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            max_entries=_env_int("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            ttl_seconds=_env_int("RESPONSE_CACHE_TTL", DEFAULT_TTL_SECONDS),
+            disk_dir=os.getenv("RESPONSE_CACHE_DISK_DIR", "").strip() or None,
+            enabled=os.getenv("RESPONSE_CACHE_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"},
+        )
+
+    # ── 조회 ──
+
+    async def get_or_compute(
+        self,
+        route: str,
+        params: dict[str, Any],
+        tier: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+    ) -> Any:
+        """캐시 히트면 저장된 응답을, 아니면 compute() 결과를 JSON 호환 형태로 반환."""
+        if not self.enabled:
+            return jsonable_encoder(await compute())
+
+        key = make_cache_key(route, params, tier)
+        now = time.time()
+        cached = self._get_memory(key, now)
+        if cached is not None:
+            self._counters["hits"] += 1
+            return cached[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 선행 요청이 취소됨 (클라이언트 끊김) — 직접 계산
+                return jsonable_encoder(await compute())
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._read_disk(key, now)
+            if value is not None:
+                self._counters["disk_hits"] += 1
+                self._store_memory(key, value[0], value[1])
+            else:
+                self._counters["misses"] += 1
+                generation = self._generation
+                result = jsonable_encoder(await compute())
+                expires_at = time.time() + (ttl or self.ttl_seconds)
+                if generation == self._generation:
+                    self._store_memory(key, expires_at, result)
+                    await self._write_disk(key, expires_at, result)
+                value = (expires_at, result)
+            future.set_result(value[1])
+            return value[1]
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _get_memory(self, key: str, now: float) -> tuple[float, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store_memory(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # ── 디스크 티어 ──
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.json"
+
+    async def _read_disk(self, key: str, now: float) -> tuple[float, Any] | None:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+
+        def _read():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+            if payload.get("key") != key or payload.get("expires_at", 0) <= now:
+                return None
+            if payload.get("written_at", 0) < self._invalidated_at:
+                return None
+            return payload["expires_at"], payload["value"]
+
+        return await asyncio.to_thread(_read)
+
+    async def _write_disk(self, key: str, expires_at: float, value: Any) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        written_at = time.time()
+
+        def _write():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(
+                json.dumps(
+                    {"key": key, "expires_at": expires_at, "written_at": written_at, "value": value},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            tmp.replace(path)
+
+        try:
+            await asyncio.to_thread(_write)
+        except OSError as exc:
+            logger.warning("Response cache disk write failed: %s", exc)
+
+    # ── 무효화 ──
+
+    def invalidate(self, reason: str = "") -> None:
+        """메모리/디스크 엔트리 전체 삭제 (디스크는 이벤트 루프 밖에서 백그라운드로)."""
+        self._generation += 1
+        self._counters["invalidations"] += 1
+        self._entries.clear()
+        self._invalidated_at = time.time()
+        if self.disk_dir is not None:
+            cutoff = self._invalidated_at
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._sweep_disk(cutoff)
+            else:
+                task = loop.create_task(asyncio.to_thread(self._sweep_disk, cutoff))
+                self._disk_sweeps.add(task)
+                task.add_done_callback(self._disk_sweeps.discard)
+        logger.debug("Response cache invalidated (%s)", reason or "manual")
+
+    def _sweep_disk(self, cutoff: float) -> None:
+        """cutoff 이전에 기록된 디스크 엔트리 삭제 (이후 새로 기록된 파일은 유지)."""
+        if not self.disk_dir.is_dir():
+            return
+        removed = 0
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except OSError as exc:
+                logger.warning("Response cache disk sweep failed for %s: %s", path.name, exc)
+        logger.debug("Response cache disk sweep removed %d files", removed)
+
+    async def drain_disk_sweeps(self) -> None:
+        """진행 중인 디스크 삭제가 끝날 때까지 대기 (종료/테스트용)."""
+        if self._disk_sweeps:
+            await asyncio.gather(*self._disk_sweeps, return_exceptions=True)
+
+    async def _consume_events(self) -> None:
+        async for evt in event_bus.subscribe():
+            if evt.event in INVALIDATING_EVENTS:
+                self.invalidate(evt.event)
+
+    def start_invalidator(self) -> None:
+        """이벤트 버스 구독 태스크 시작 (앱 lifespan에서 호출)."""
+        if self.enabled and (self._invalidator is None or self._invalidator.done()):
+            self._invalidator = asyncio.create_task(self._consume_events())
+
+    async def stop_invalidator(self) -> None:
+        if self._invalidator is not None:
+            self._invalidator.cancel()
+            try:
+                await self._invalidator
+            except asyncio.CancelledError:
+                pass
+            self._invalidator = None
+        await self.drain_disk_sweeps()
+
+    def stats(self) -> dict:
+        lookups = self._counters["hits"] + self._counters["disk_hits"] + self._counters["misses"]
+        hit_total = self._counters["hits"] + self._counters["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+            "inflight": len(self._inflight),
+            **self._counters,
+            "hit_rate": round(hit_total / lookups, 4) if lookups else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+response_cache = ResponseCache.from_env()
@@ -12,7 +12,10 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth_cache import principal_cache
 from api.deps import require_admin
+from api.latency import latency_stats
+from api.response_cache import response_cache
 from database import get_db
 from database.models import (
     AdDetail, AdSnapshot, Advertiser, Keyword, Persona, Industry, User,
@@ -162,6 +165,28 @@ async def admin_stats(
     }
 
 
+@router.get("/cache/stats")
+async def response_cache_stats(_admin: User = Depends(require_admin)):
+    """Analytics response cache hit/miss counters."""
+    return response_cache.stats()
+
+
+@router.post("/cache/invalidate")
+async def invalidate_response_cache(_admin: User = Depends(require_admin)):
+    """Drop every cached analytics response."""
+    response_cache.invalidate("admin")
+    return response_cache.stats()
+
+
+@router.get("/latency")
+async def request_latency(reset: bool = False, _admin: User = Depends(require_admin)):
+    """Per-route request latency histograms (time to response headers)."""
+    snapshot = latency_stats.snapshot()
+    if reset:
+        latency_stats.reset()
+    return snapshot
+
+
 @router.get("/crawl-status")
 async def crawl_status(
     db: AsyncSession = Depends(get_db),
@@ -579,6 +604,19 @@ async def start_campaign_rebuild(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/collect/competitor-affinity")
+async def start_competitor_affinity(
+    _admin: User = Depends(require_admin),
+):
+    """Trigger competitor affinity top-N precompute."""
+    try:
+        from processor.competitor_mapper import precompute_competitor_affinities
+        result = await precompute_competitor_affinities(days=30)
+        return {"status": "done", **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/collect/journey-ingest")
 async def start_journey_ingest(
     _admin: User = Depends(require_admin),
@@ -913,6 +951,7 @@ async def activate_payment(
         user.payment_confirmed = True
 
     await db.commit()
+    principal_cache.invalidate_user(record.user_id)
     return {"status": "activated", "payment_id": payment_id, "user_email": user.email if user else None}
 
 
@@ -998,6 +1037,7 @@ async def update_user_permissions(
         changes["is_active"] = is_active
 
     await db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"status": "updated", "user_id": user_id, "changes": changes}
 
 
@@ -1016,6 +1056,7 @@ async def extend_user_plan(
     base = user.plan_expires_at or datetime.now(timezone.utc)
     user.plan_expires_at = base + timedelta(days=days)
     await db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"status": "extended", "new_expires_at": user.plan_expires_at.isoformat()}
 
 
@@ -1034,6 +1075,7 @@ async def deactivate_user(
         raise HTTPException(400, "Cannot deactivate admin")
     user.is_active = False
     await db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"status": "deactivated", "user_id": user_id}
 
 
@@ -10,15 +10,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from api.deps import get_current_user, require_plan, require_paid
+from api.response_cache import plan_tier, response_cache
 from database import get_db
 from database.models import AdDetail, AdSnapshot, Keyword, User
 from database.schemas import AdSnapshotOut, AdSnapshotWithDetails
 from processor.channel_utils import SEARCH_CHANNELS, normalize_channel_for_display
+from processor.image_store import THUMBNAIL_TIERS, get_image_store, thumbnail_path
 
 router = APIRouter(prefix="/api/ads", tags=["ads"],
     dependencies=[Depends(get_current_user)])
 
 _IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "stored_images")
+_S3_STORE = os.getenv("IMAGE_STORE_TYPE", "local").lower() == "s3"
+_S3_PREFIX = os.getenv("AWS_S3_PREFIX", "adscope/images").rstrip("/") + "/"
 
 def _normalize_image_path(path: str) -> str | None:
     """DB 경로를 정규화하고 실제 파일이 존재하면 정규화된 경로를 반환, 없으면 None."""
@@ -38,6 +42,32 @@ def _normalize_image_path(path: str) -> str | None:
     return None
 
 
+def _thumbnail_for(path: str | None, width: int) -> str | None:
+    """요청 폭 이상인 가장 작은 썸네일 티어 경로 (파일이 있을 때만). 아틀라스(#좌표)는 원본 기준이라 제외."""
+    if not path or width <= 0 or "#" in path:
+        return None
+    tiers = [t for t in sorted(THUMBNAIL_TIERS) if t >= width]
+    return _normalize_image_path(thumbnail_path(path, tiers[0])) if tiers else None
+
+
+def _presign_gallery_items(items: list[dict], width: int) -> None:
+    """S3 키(AWS_S3_PREFIX/...)를 presigned URL로 변환 — 페이지 항목만, URL 캐시 재사용."""
+    store = get_image_store()
+    for item in items:
+        path = item["creative_image_path"]
+        if not path or not path.startswith(_S3_PREFIX):
+            item["creative_thumb_path"] = _thumbnail_for(path, width)
+            continue
+        key, hash_sign, fragment = path.partition("#")
+        item["creative_image_path"] = f"{store.presigned_url(key)}{hash_sign}{fragment}"
+        # S3 WebP blob은 업로드 시 썸네일 티어를 함께 올림 (존재 확인 요청 없이 키로 결정)
+        tiers = [t for t in sorted(THUMBNAIL_TIERS) if t >= width] if width > 0 else []
+        if tiers and not hash_sign and key.endswith(".webp") and "/blobs/" in key:
+            item["creative_thumb_path"] = store.presigned_url(thumbnail_path(key, tiers[0]))
+        else:
+            item["creative_thumb_path"] = None
+
+
 @router.get("/snapshots", response_model=list[AdSnapshotOut])
 async def list_snapshots(
     channel: str | None = None,
@@ -105,101 +135,111 @@ async def daily_stats(
     KST = timezone(timedelta(hours=9))
     now_kst = datetime.now(KST)
     target = date or now_kst
-    # KST 00:00~23:59 → UTC로 변환 (DB는 UTC naive)
-    kst_start = target.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
-    day_start = kst_start - timedelta(hours=9)
-    day_end = day_start + timedelta(hours=23, minutes=59, seconds=59)
-
-    # 오늘 데이터 존재 여부 확인 — 없으면 최신 날짜로 fallback
-    if date is None:
-        today_check = await db.execute(
+
+    async def _compute():
+        # KST 00:00~23:59 → UTC로 변환 (DB는 UTC naive)
+        kst_start = target.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        day_start = kst_start - timedelta(hours=9)
+        day_end = day_start + timedelta(hours=23, minutes=59, seconds=59)
+
+        # 오늘 데이터 존재 여부 확인 — 없으면 최신 날짜로 fallback
+        if date is None:
+            today_check = await db.execute(
+                select(func.count(AdSnapshot.id)).where(
+                    AdSnapshot.captured_at.between(day_start, day_end)
+                )
+            )
+            if (today_check.scalar() or 0) == 0:
+                latest = await db.execute(
+                    select(func.max(AdSnapshot.captured_at))
+                )
+                latest_dt = latest.scalar()
+                if latest_dt:
+                    # latest_dt는 UTC → KST로 변환 후 해당 날짜의 UTC 범위
+                    latest_kst = latest_dt + timedelta(hours=9)
+                    kst_day = latest_kst.replace(hour=0, minute=0, second=0, microsecond=0)
+                    day_start = kst_day - timedelta(hours=9)
+                    day_end = day_start + timedelta(hours=23, minutes=59, seconds=59)
+
+        # 스냅샷 수
+        snap_count = await db.execute(
             select(func.count(AdSnapshot.id)).where(
                 AdSnapshot.captured_at.between(day_start, day_end)
             )
         )
-        if (today_check.scalar() or 0) == 0:
-            latest = await db.execute(
-                select(func.max(AdSnapshot.captured_at))
-            )
-            latest_dt = latest.scalar()
-            if latest_dt:
-                # latest_dt는 UTC → KST로 변환 후 해당 날짜의 UTC 범위
-                latest_kst = latest_dt + timedelta(hours=9)
-                kst_day = latest_kst.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_start = kst_day - timedelta(hours=9)
-                day_end = day_start + timedelta(hours=23, minutes=59, seconds=59)
-
-    # 스냅샷 수
-    snap_count = await db.execute(
-        select(func.count(AdSnapshot.id)).where(
-            AdSnapshot.captured_at.between(day_start, day_end)
+        # 광고 수 (전체)
+        ad_count = await db.execute(
+            select(func.count(AdDetail.id))
+            .join(AdSnapshot)
+            .where(AdSnapshot.captured_at.between(day_start, day_end))
+        )
+        # 접촉 광고 수 (is_contact=True)
+        contact_count = await db.execute(
+            select(func.count(AdDetail.id))
+            .join(AdSnapshot)
+            .where(AdSnapshot.captured_at.between(day_start, day_end))
+            .where(AdDetail.is_contact == True)
+        )
+        # 카탈로그 광고 수 (is_contact=False)
+        catalog_count = await db.execute(
+            select(func.count(AdDetail.id))
+            .join(AdSnapshot)
+            .where(AdSnapshot.captured_at.between(day_start, day_end))
+            .where(AdDetail.is_contact == False)
+        )
+        # 채널별 분포
+        channel_dist = await db.execute(
+            select(AdSnapshot.channel, func.count(AdSnapshot.id))
+            .where(AdSnapshot.captured_at.between(day_start, day_end))
+            .group_by(AdSnapshot.channel)
+        )
+        # 접촉 채널별 분포
+        contact_channel_dist = await db.execute(
+            select(AdSnapshot.channel, func.count(AdDetail.id))
+            .join(AdDetail, AdDetail.snapshot_id == AdSnapshot.id)
+            .where(AdSnapshot.captured_at.between(day_start, day_end))
+            .where(AdDetail.is_contact == True)
+            .group_by(AdSnapshot.channel)
         )
-    )
-    # 광고 수 (전체)
-    ad_count = await db.execute(
-        select(func.count(AdDetail.id))
-        .join(AdSnapshot)
-        .where(AdSnapshot.captured_at.between(day_start, day_end))
-    )
-    # 접촉 광고 수 (is_contact=True)
-    contact_count = await db.execute(
-        select(func.count(AdDetail.id))
-        .join(AdSnapshot)
-        .where(AdSnapshot.captured_at.between(day_start, day_end))
-        .where(AdDetail.is_contact == True)
-    )
-    # 카탈로그 광고 수 (is_contact=False)
-    catalog_count = await db.execute(
-        select(func.count(AdDetail.id))
-        .join(AdSnapshot)
-        .where(AdSnapshot.captured_at.between(day_start, day_end))
-        .where(AdDetail.is_contact == False)
-    )
-    # 채널별 분포
-    channel_dist = await db.execute(
-        select(AdSnapshot.channel, func.count(AdSnapshot.id))
-        .where(AdSnapshot.captured_at.between(day_start, day_end))
-        .group_by(AdSnapshot.channel)
-    )
-    # 접촉 채널별 분포
-    contact_channel_dist = await db.execute(
-        select(AdSnapshot.channel, func.count(AdDetail.id))
-        .join(AdDetail, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdSnapshot.captured_at.between(day_start, day_end))
-        .where(AdDetail.is_contact == True)
-        .group_by(AdSnapshot.channel)
-    )
 
-    # 최근 수집 시각 (KST)
-    latest_crawl_q = await db.execute(select(func.max(AdSnapshot.captured_at)))
-    latest_crawl_dt = latest_crawl_q.scalar()
-    latest_crawl_at = None
-    if latest_crawl_dt:
-        latest_crawl_at = (latest_crawl_dt + timedelta(hours=9)).isoformat()
-
-    # 오늘 전체 수집 건수 (KST 기준)
-    today_kst_start = now_kst.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
-    today_utc_start = today_kst_start - timedelta(hours=9)
-    today_ads_q = await db.execute(
-        select(func.count(AdDetail.id))
-        .join(AdSnapshot)
-        .where(AdSnapshot.captured_at >= today_utc_start)
+        # 최근 수집 시각 (KST)
+        latest_crawl_q = await db.execute(select(func.max(AdSnapshot.captured_at)))
+        latest_crawl_dt = latest_crawl_q.scalar()
+        latest_crawl_at = None
+        if latest_crawl_dt:
+            latest_crawl_at = (latest_crawl_dt + timedelta(hours=9)).isoformat()
+
+        # 오늘 전체 수집 건수 (KST 기준)
+        today_kst_start = now_kst.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        today_utc_start = today_kst_start - timedelta(hours=9)
+        today_ads_q = await db.execute(
+            select(func.count(AdDetail.id))
+            .join(AdSnapshot)
+            .where(AdSnapshot.captured_at >= today_utc_start)
+        )
+        today_total_ads = today_ads_q.scalar() or 0
+
+        # 응답 날짜는 KST 기준
+        display_date = (day_start + timedelta(hours=9)).date().isoformat()
+        return {
+            "date": display_date,
+            "total_snapshots": snap_count.scalar() or 0,
+            "total_ads": ad_count.scalar() or 0,
+            "total_contacts": contact_count.scalar() or 0,
+            "total_catalog": catalog_count.scalar() or 0,
+            "by_channel": {row[0]: row[1] for row in channel_dist.all()},
+            "contact_channels": {row[0]: row[1] for row in contact_channel_dist.all()},
+            "latest_crawl_at": latest_crawl_at,
+            "today_total_ads": today_total_ads,
+        }
+
+    # date 미지정은 "KST 오늘" — 날짜가 바뀌면 키도 바뀜
+    return await response_cache.get_or_compute(
+        "ads.stats_daily",
+        {"date": date, "today": now_kst.date()},
+        plan_tier(user),
+        _compute,
     )
-    today_total_ads = today_ads_q.scalar() or 0
-
-    # 응답 날짜는 KST 기준
-    display_date = (day_start + timedelta(hours=9)).date().isoformat()
-    return {
-        "date": display_date,
-        "total_snapshots": snap_count.scalar() or 0,
-        "total_ads": ad_count.scalar() or 0,
-        "total_contacts": contact_count.scalar() or 0,
-        "total_catalog": catalog_count.scalar() or 0,
-        "by_channel": {row[0]: row[1] for row in channel_dist.all()},
-        "contact_channels": {row[0]: row[1] for row in contact_channel_dist.all()},
-        "latest_crawl_at": latest_crawl_at,
-        "today_total_ads": today_total_ads,
-    }
 
 
 @router.get("/stats/daily-trend")
@@ -245,12 +285,16 @@ async def ad_gallery(
     date_from: datetime | None = None,
     date_to: datetime | None = None,
     source: str | None = Query(default=None, description="ads | social | None(all)"),
+    thumb_width: int = Query(default=320, ge=0, description="목록용 썸네일 폭 (0=썸네일 없음)"),
     limit: int = Query(default=60, le=200),
     offset: int = 0,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """creative_image_path가 있는 광고 목록 + 소셜 콘텐츠 (갤러리용)."""
+    """creative_image_path가 있는 광고 목록 + 소셜 콘텐츠 (갤러리용).
+
+    creative_thumb_path: 목록 카드용 썸네일 (없으면 null → creative_image_path 사용).
+    """
     from database.models import BrandChannelContent, Advertiser as AdvModel
 
     ad_items = []
@@ -316,6 +360,8 @@ async def ad_gallery(
         result = await db.execute(query)
         for row in result.all():
             img_path = _normalize_image_path(row[4])
+            if img_path is None and _S3_STORE and row[4] and row[4].startswith(_S3_PREFIX):
+                img_path = row[4]   # 페이징 후 presigned URL로 변환
             extra = row[9] or {}
             landing = extra.get("landing_analysis") if isinstance(extra, dict) else None
             ch = row[7]
@@ -417,5 +463,10 @@ async def ad_gallery(
     all_items.sort(key=lambda x: x.get("captured_at") or "", reverse=True)
     total = len(all_items)
     paged = all_items[offset:offset + limit]
+    if _S3_STORE:
+        _presign_gallery_items(paged, thumb_width)
+    else:
+        for item in paged:
+            item["creative_thumb_path"] = _thumbnail_for(item["creative_image_path"], thumb_width)
 
     return {"total": total, "items": paged}
@@ -5,11 +5,12 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 
 from api.deps import get_current_user, require_paid
+from api.response_cache import plan_tier, response_cache
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from database.models import AdDetail, AdSnapshot, Persona
+from database.models import AdDetail, AdSnapshot, Persona, User
 from database.schemas import (
     ContactRateOut, ContactRateTrendPoint, CompetitiveSOVOut, SOVOut,
     PersonaAdvertiserRankOut, PersonaHeatmapCellOut, PersonaRankingTrendPoint,
@@ -111,27 +112,36 @@ async def get_sov(
     channel: str | None = None,
     days: int = Query(default=30, le=365),
     limit: int = Query(default=20, le=100),
+    user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """키워드/업종별 광고주 점유율(SOV) 분석."""
-    results = await calculate_sov(
-        db,
-        keyword=keyword,
-        industry_id=industry_id,
-        channel=channel,
-        days=days,
-        limit=limit,
-    )
-    return [
-        SOVOut(
-            advertiser_name=r.advertiser_name,
-            advertiser_id=r.advertiser_id,
-            channel=r.channel,
-            sov_percentage=r.sov_percentage,
-            total_impressions=r.total_impressions,
+    async def _compute():
+        results = await calculate_sov(
+            db,
+            keyword=keyword,
+            industry_id=industry_id,
+            channel=channel,
+            days=days,
+            limit=limit,
         )
-        for r in results
-    ]
+        return [
+            SOVOut(
+                advertiser_name=r.advertiser_name,
+                advertiser_id=r.advertiser_id,
+                channel=r.channel,
+                sov_percentage=r.sov_percentage,
+                total_impressions=r.total_impressions,
+            )
+            for r in results
+        ]
+
+    return await response_cache.get_or_compute(
+        "analytics.sov",
+        {"keyword": keyword, "industry_id": industry_id, "channel": channel, "days": days, "limit": limit},
+        plan_tier(user),
+        _compute,
+    )
 
 
 @router.get("/sov/competitive/{advertiser_id}")
@@ -219,27 +229,36 @@ async def get_persona_heatmap(
     days: int = Query(default=30, le=365),
     channel: str | None = None,
     top_advertisers: int = Query(default=15, le=50),
+    user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Persona x Advertiser heatmap matrix.
 
     Returns normalized intensity (0.0-1.0) for each persona-advertiser pair.
     """
-    results = await calculate_persona_heatmap(
-        db, days=days, channel=channel, top_advertisers=top_advertisers
-    )
-    return [
-        PersonaHeatmapCellOut(
-            persona_code=r.persona_code,
-            age_group=r.age_group,
-            gender=r.gender,
-            advertiser_name=r.advertiser_name,
-            advertiser_id=r.advertiser_id,
-            impression_count=r.impression_count,
-            intensity=r.intensity,
+    async def _compute():
+        results = await calculate_persona_heatmap(
+            db, days=days, channel=channel, top_advertisers=top_advertisers
         )
-        for r in results
-    ]
+        return [
+            PersonaHeatmapCellOut(
+                persona_code=r.persona_code,
+                age_group=r.age_group,
+                gender=r.gender,
+                advertiser_name=r.advertiser_name,
+                advertiser_id=r.advertiser_id,
+                impression_count=r.impression_count,
+                intensity=r.intensity,
+            )
+            for r in results
+        ]
+
+    return await response_cache.get_or_compute(
+        "analytics.persona_heatmap",
+        {"days": days, "channel": channel, "top_advertisers": top_advertisers},
+        plan_tier(user),
+        _compute,
+    )
 
 
 @router.get("/persona-ranking/trend")
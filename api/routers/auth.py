@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth_cache import principal_cache
 from api.deps import create_access_token, get_current_user, require_admin, JWT_EXPIRE_HOURS
 from database import get_db
 from database.models import User, UserSession, LoginHistory, PasswordResetToken
@@ -171,6 +172,8 @@ async def login(
         success=True,
     ))
     await db.commit()
+    if user.role != "admin":
+        principal_cache.invalidate_user(user.id)
 
     token = create_access_token(user.id, user.email, user.role, user.plan or "lite", session_id, paid=bool(getattr(user, "payment_confirmed", False)))
     return TokenResponse(
@@ -218,6 +221,7 @@ async def logout_endpoint(
                     )
                 )
                 await db.commit()
+                principal_cache.invalidate_session(user.id, sid)
         except Exception:
             pass
 
@@ -442,7 +446,7 @@ async def revoke_session(
     db: AsyncSession = Depends(get_db),
 ):
     """Admin: force-revoke a user's session."""
-    await db.execute(
+    result = await db.execute(
         update(UserSession)
         .where(UserSession.id == session_id)
         .values(
@@ -450,8 +454,11 @@ async def revoke_session(
             revoked_at=datetime.now(timezone.utc),
             revoke_reason="admin_revoke",
         )
+        .returning(UserSession.user_id)
     )
+    revoked_user_id = result.scalar_one_or_none()
     await db.commit()
+    principal_cache.invalidate_user(revoked_user_id)
     return {"status": "revoked", "session_id": session_id}
 
 
@@ -526,6 +533,7 @@ async def change_password(
 
     user.hashed_password = _hash_password(body.new_password)
     await db.commit()
+    principal_cache.invalidate_user(user.id)
     return {"status": "ok", "message": "Password changed successfully"}
 
 
@@ -613,6 +621,7 @@ async def reset_password(
     user.hashed_password = _hash_password(body.new_password)
     reset_token.used = True
     await db.commit()
+    principal_cache.invalidate_user(user.id)
 
     return {"status": "ok", "message": "Password has been reset successfully"}
 
@@ -664,6 +673,7 @@ async def update_profile(
         raise HTTPException(status_code=400, detail="No fields to update")
 
     await db.commit()
+    principal_cache.invalidate_user(user.id)
 
     return {
         "status": "ok",
@@ -774,6 +784,8 @@ async def _oauth_login_or_register(
         user_agent=ua, device_fingerprint=None, success=True,
     ))
     await db.commit()
+    if user.role != "admin":
+        principal_cache.invalidate_user(user.id)
     token = create_access_token(user.id, user.email, user.role, user.plan or "lite", session_id, paid=bool(getattr(user, "payment_confirmed", False)))
     return {"access_token": token, "user": {
         "id": user.id, "email": user.email, "name": user.name,
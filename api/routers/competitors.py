@@ -32,7 +32,8 @@ async def get_competitors(
 
     Ranks candidates by composite affinity across keyword overlap,
     channel overlap, position zone similarity, spend similarity,
-    and co-occurrence count.
+    and co-occurrence count.  Served from the nightly precomputed
+    top-N when fresh, computed on demand otherwise.
     """
     target = await db.get(Advertiser, advertiser_id)
     if not target:
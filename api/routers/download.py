@@ -1,16 +1,17 @@
 """Download API -- Advertiser report Excel, creative images ZIP, advertiser list CSV, gallery selection ZIP."""
 
+import asyncio
 import csv
+import hashlib
 import io
 import logging
 import os
-import zipfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
@@ -18,6 +19,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user, require_paid, require_plan
+from api.zip_stream import stream_zip
 from database import get_db
 from database.models import (
     AdDetail,
@@ -40,6 +42,10 @@ logger = logging.getLogger("adscope.download")
 KST = timezone(timedelta(hours=9))
 IMAGE_STORE_DIR = Path(os.getenv("IMAGE_STORE_DIR", "stored_images"))
 SCREENSHOTS_DIR = Path("screenshots")
+CACHE_DIR = Path("cache/exports")
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# 소재 ZIP 캐시 키는 최신 ad id를 포함하므로, 이 시간은 기존 소재의 이미지 교체(백필) 반영 주기
+CREATIVE_ZIP_CACHE_HOURS = float(os.getenv("CREATIVE_ZIP_CACHE_HOURS", "24"))
 
 # ---------------------------------------------------------------------------
 # Utility helpers
@@ -391,10 +397,26 @@ async def download_advertiser_creatives(
     if not rows:
         raise HTTPException(status_code=404, detail="No creative images found for this advertiser")
 
-    # Build ZIP in memory
-    buf = io.BytesIO()
-    added_count = 0
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+    safe_name = adv_name.replace(" ", "_").replace("/", "_")
+    filename = f"creatives_{safe_name}_{_today_str()}.zip"
+
+    # 같은 광고주 + 기간 + 최신 ad id(+건수)면 이전에 완성된 ZIP을 디스크에서 바로 응답
+    key = hashlib.md5(
+        f"{advertiser_id}|{_kst_date_str(date_from)}|{_kst_date_str(date_to)}|"
+        f"{max(r[0] for r in rows)}|{len(rows)}".encode()
+    ).hexdigest()[:12]
+    cache_path = CACHE_DIR / f"creatives_{key}.zip"
+    if cache_path.exists():
+        age = datetime.now().timestamp() - cache_path.stat().st_mtime
+        if age < CREATIVE_ZIP_CACHE_HOURS * 3600:
+            return FileResponse(
+                str(cache_path),
+                media_type="application/zip",
+                headers=_safe_content_disposition(filename),
+            )
+
+    def _entries() -> list[tuple[Path, str]]:
+        entries = []
         seen_names = set()
         for r in rows:
             ad_id, img_path, channel, captured_at, ad_text = r
@@ -411,25 +433,18 @@ async def download_advertiser_creatives(
             if arcname in seen_names:
                 arcname = f"{channel or 'unknown'}/{date_prefix}_{ad_id}_dup{ext}"
             seen_names.add(arcname)
+            entries.append((resolved, arcname))
+        return entries
 
-            try:
-                zf.write(str(resolved), arcname)
-                added_count += 1
-            except Exception as e:
-                logger.warning("Failed to add %s to ZIP: %s", resolved, e)
-
-    if added_count == 0:
+    entries = await asyncio.to_thread(_entries)
+    if not entries:
         raise HTTPException(
             status_code=404,
             detail="No accessible creative image files found on disk",
         )
 
-    buf.seek(0)
-    safe_name = adv_name.replace(" ", "_").replace("/", "_")
-    filename = f"creatives_{safe_name}_{_today_str()}.zip"
-
     return StreamingResponse(
-        iter([buf.getvalue()]),
+        stream_zip(entries, cache_path),
         media_type="application/zip",
         headers=_safe_content_disposition(filename),
     )
@@ -578,10 +593,8 @@ async def download_gallery_selection(
     if not rows:
         raise HTTPException(status_code=404, detail="No creative images found for the selected items")
 
-    # Build ZIP
-    buf = io.BytesIO()
-    added_count = 0
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+    def _entries() -> list[tuple[Path, str]]:
+        entries = []
         seen_names = set()
         for r in rows:
             ad_id, img_path, adv_name, channel, captured_at = r
@@ -597,24 +610,20 @@ async def download_gallery_selection(
             if arcname in seen_names:
                 arcname = f"{safe_adv}_{channel or 'unknown'}_{date_prefix}_{ad_id}_dup{ext}"
             seen_names.add(arcname)
+            entries.append((resolved, arcname))
+        return entries
 
-            try:
-                zf.write(str(resolved), arcname)
-                added_count += 1
-            except Exception as e:
-                logger.warning("Failed to add %s to ZIP: %s", resolved, e)
-
-    if added_count == 0:
+    entries = await asyncio.to_thread(_entries)
+    if not entries:
         raise HTTPException(
             status_code=404,
             detail="No accessible creative image files found on disk",
         )
 
-    buf.seek(0)
     filename = f"gallery_selection_{_today_str()}.zip"
 
     return StreamingResponse(
-        iter([buf.getvalue()]),
+        stream_zip(entries),
         media_type="application/zip",
         headers=_safe_content_disposition(filename),
     )
@@ -1,17 +1,18 @@
 """SSE (Server-Sent Events) 엔드포인트 — 실시간 데이터 업데이트 스트림."""
 
-import asyncio
 import logging
 
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import StreamingResponse
 
-from api.event_bus import event_bus, EVT_HEARTBEAT
+from api.event_bus import event_bus
 
 logger = logging.getLogger("adscope.events")
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+HEARTBEAT_SEC = 30
+
 
 @router.get("/stream")
 async def sse_stream(
@@ -24,26 +25,16 @@ async def sse_stream(
     이벤트를 실시간으로 수신합니다.
 
     재연결 시 last_event_ts 파라미터로 놓친 이벤트를 복구할 수 있습니다.
+    링 버퍼보다 많이 놓쳤으면 gap 이벤트가 먼저 옵니다 (클라이언트는 전체 새로고침).
     """
 
     async def generate():
-        try:
-            # 30초마다 heartbeat 전송 (연결 유지)
-            heartbeat_task = asyncio.create_task(_heartbeat_loop())
-
-            async for evt in event_bus.subscribe(since_ts=last_event_ts):
-                # 클라이언트 연결 끊김 감지
-                if await request.is_disconnected():
-                    break
-                yield evt.format_sse()
-        except asyncio.CancelledError:
-            pass
-        finally:
-            heartbeat_task.cancel()
-            try:
-                await heartbeat_task
-            except asyncio.CancelledError:
-                pass
+        # 30초 동안 이벤트가 없으면 heartbeat (연결 유지) — 구독자별 생성, 버스에는 발행하지 않음
+        async for evt in event_bus.subscribe(since_ts=last_event_ts, heartbeat_sec=HEARTBEAT_SEC):
+            # 클라이언트 연결 끊김 감지
+            if await request.is_disconnected():
+                break
+            yield evt.format_sse()
 
     return StreamingResponse(
         generate(),
@@ -62,14 +53,5 @@ async def event_status():
     return {
         "active_subscribers": event_bus.subscriber_count,
         "status": "ok",
+        **event_bus.stats(),
     }
-
-
-async def _heartbeat_loop():
-    """30초 간격 heartbeat 이벤트 전송."""
-    try:
-        while True:
-            await asyncio.sleep(30)
-            await event_bus.publish(EVT_HEARTBEAT, {"type": "ping"})
-    except asyncio.CancelledError:
-        pass
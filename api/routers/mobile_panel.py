@@ -3,11 +3,21 @@
 import hashlib
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user
+from api.mobile_ingest import (
+    IngestBodyError,
+    decode_exposures,
+    exposure_writer,
+    load_devices,
+    read_body,
+    resolve_channel,
+    touch_devices,
+    write_exposures,
+)
 from database import get_db
 from database.models import (
     Advertiser,
@@ -28,28 +38,6 @@ from database.schemas import (
 
 router = APIRouter(prefix="/api/mobile-panel", tags=["mobile-panel"])
 
-# 앱→채널 매핑
-_APP_TO_CHANNEL = {
-    "youtube": "youtube_surf",
-    "instagram": "meta",
-    "facebook": "meta",
-    "tiktok": "tiktok_ads",
-    "naver": "naver_da",
-    "kakao": "kakao_da",
-    "chrome": "google_gdn",
-    "samsung internet": "google_gdn",
-}
-
-
-def _resolve_channel(app_name: str) -> str | None:
-    """앱 이름을 채널명으로 매핑."""
-    lower = (app_name or "").lower().strip()
-    for key, channel in _APP_TO_CHANNEL.items():
-        if key in lower:
-            return channel
-    return None
-
-
 def _generate_device_id(data: MobileDeviceRegisterIn) -> str:
     """디바이스 핑거프린트 생성 (SHA-256)."""
     raw = f"{data.device_type}:{data.os_type}:{data.device_model}:{data.carrier}:{data.age_group}:{data.gender}:{data.persona_code or ''}"
@@ -167,7 +155,7 @@ async def report_exposure(
         if adv:
             advertiser_id = adv.id
 
-    channel = _resolve_channel(data.app_name)
+    channel = resolve_channel(data.app_name)
 
     exposure = MobilePanelExposure(
         device_id=data.device_id,
@@ -215,65 +203,65 @@ async def report_exposure_batch(
     db: AsyncSession = Depends(get_db),
 ):
     """배치 광고 노출 보고 (모바일 SDK용)."""
-    device = (
-        await db.execute(
-            select(MobilePanelDevice).where(MobilePanelDevice.device_id == data.device_id)
-        )
-    ).scalar_one_or_none()
-    if not device:
+    devices = await load_devices(db, [data.device_id])
+    if not devices:
         raise HTTPException(status_code=404, detail="Device not registered")
 
-    saved = 0
+    if not data.exposures:
+        # 빈 배치는 하트비트 — 노출 없이 last_seen만 갱신
+        await touch_devices(db, [data.device_id])
+        await db.commit()
+        return {"status": "ok", "saved": 0, "total": 0}
+
     for exp in data.exposures:
-        advertiser_id = None
-        if exp.advertiser_name:
-            adv = (
-                await db.execute(
-                    select(Advertiser).where(Advertiser.name == exp.advertiser_name).limit(1)
-                )
-            ).scalar_one_or_none()
-            if adv:
-                advertiser_id = adv.id
-
-        channel = _resolve_channel(exp.app_name)
-
-        exposure = MobilePanelExposure(
-            device_id=data.device_id,
-            app_name=exp.app_name,
-            channel=channel,
-            advertiser_id=advertiser_id,
-            advertiser_name_raw=exp.advertiser_name,
-            ad_text=exp.ad_text,
-            ad_type=exp.ad_type,
-            creative_url=exp.creative_url,
-            click_url=exp.click_url,
-            duration_ms=exp.duration_ms,
-            was_clicked=exp.was_clicked,
-            was_skipped=exp.was_skipped,
-            screen_position=exp.screen_position,
-            observed_at=exp.observed_at or datetime.utcnow(),
-            extra_data=exp.extra_data,
-        )
-        db.add(exposure)
-
-        # PanelObservation 연동
-        panel_obs = PanelObservation(
-            panel_type=device.device_type,
-            panel_id=data.device_id,
-            advertiser_id=advertiser_id,
-            channel=channel or exp.app_name,
-            device=f"{device.os_type}_{device.device_model or 'unknown'}",
-            location=device.region,
-            is_verified=device.device_type == "real",
-            extra_data={"source": "mobile_panel_batch", "app": exp.app_name},
+        exp.device_id = data.device_id
+    saved = await write_exposures(db, data.exposures, devices, source="mobile_panel_batch")
+
+    return {"status": "ok", "saved": saved, "total": len(data.exposures)}
+
+
+@router.post("/exposures/ingest")
+async def ingest_exposures(
+    request: Request,
+    response: Response,
+    ack: str = Query("sync", pattern="^(sync|async)$"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """대량 광고 노출 수집 (여러 디바이스, JSON/NDJSON, gzip).
+
+    ack=async: 검증 후 202로 즉시 응답하고 백그라운드 writer가 기록.
+    미등록 디바이스의 노출은 제외하고 unknown_devices로 알려줌.
+    """
+    try:
+        items = decode_exposures(
+            await read_body(request),
+            request.headers.get("content-encoding"),
+            request.headers.get("content-type"),
         )
-        db.add(panel_obs)
-        saved += 1
+    except IngestBodyError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
 
-    device.last_seen = datetime.utcnow()
-    await db.commit()
+    device_ids = {exp.device_id for exp in items}
+    devices = await load_devices(db, device_ids)
+    if items and not devices:
+        raise HTTPException(status_code=404, detail="Device not registered")
+    unknown = sorted(device_ids - devices.keys())
+    accepted = [exp for exp in items if exp.device_id in devices] if unknown else items
+
+    if ack == "async":
+        await db.close()  # writer가 별도 세션으로 기록 — 요청 세션은 여기서 반환
+        if not exposure_writer.submit(accepted, devices, source="mobile_panel_ingest"):
+            raise HTTPException(
+                status_code=503,
+                detail="Ingest queue full. Please retry later.",
+                headers={"Retry-After": "1"},
+            )
+        response.status_code = 202
+        return {"status": "queued", "queued": len(accepted), "total": len(items), "unknown_devices": unknown}
 
-    return {"status": "ok", "saved": saved, "total": len(data.exposures)}
+    saved = await write_exposures(db, accepted, devices, source="mobile_panel_ingest")
+    return {"status": "ok", "saved": saved, "total": len(items), "unknown_devices": unknown}
 
 
 @router.get("/devices", response_model=list[MobileDeviceOut])
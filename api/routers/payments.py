@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth_cache import principal_cache
 from api.deps import get_current_user
 from database import get_db
 from database.models import User, PaymentRecord
@@ -134,6 +135,7 @@ async def complete_payment(
         user.plan_expires_at = now + timedelta(days=30)
 
     await db.commit()
+    principal_cache.invalidate_user(user.id)
     logger.info("Payment confirmed: user=%s plan=%s period=%s", user.email, record.plan, record.plan_period)
 
     return {
@@ -13,11 +13,12 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 
 from api.deps import get_current_user, require_paid
+from api.response_cache import plan_tier, response_cache
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from database.models import Advertiser, Campaign, SpendEstimate
+from database.models import Advertiser, Campaign, SpendEstimate, User
 from database.schemas import SpendEstimateOut
 from processor.spend_reverse_estimator import (
     REAL_EXECUTION_BENCHMARKS,
@@ -67,6 +68,7 @@ async def list_estimates(
 async def spend_summary(
     days: int = Query(default=30, le=90),
     channel: str | None = None,
+    user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """채널별 추정 광고비 요약.
@@ -74,41 +76,46 @@ async def spend_summary(
     campaigns.total_est_spend (관측 기간 실제 합계) 기준으로 집계합니다.
     캠페인 페이지와 동일한 수치를 반환합니다.
     """
-    query = (
-        select(
-            Campaign.channel,
-            func.sum(Campaign.total_est_spend).label("total_spend"),
-            func.count(Campaign.id).label("data_points"),
+    async def _compute():
+        query = (
+            select(
+                Campaign.channel,
+                func.sum(Campaign.total_est_spend).label("total_spend"),
+                func.count(Campaign.id).label("data_points"),
+            )
+            .where(Campaign.total_est_spend > 0)
+            .group_by(Campaign.channel)
         )
-        .where(Campaign.total_est_spend > 0)
-        .group_by(Campaign.channel)
-    )
 
-    if channel:
-        query = query.where(Campaign.channel == channel)
+        if channel:
+            query = query.where(Campaign.channel == channel)
 
-    result = await db.execute(query)
+        result = await db.execute(query)
 
-    # avg_confidence from spend_estimates
-    conf_query = (
-        select(
-            SpendEstimate.channel,
-            func.avg(SpendEstimate.confidence).label("avg_confidence"),
+        # avg_confidence from spend_estimates
+        conf_query = (
+            select(
+                SpendEstimate.channel,
+                func.avg(SpendEstimate.confidence).label("avg_confidence"),
+            )
+            .group_by(SpendEstimate.channel)
         )
-        .group_by(SpendEstimate.channel)
+        conf_result = await db.execute(conf_query)
+        conf_map = {row[0]: round(row[1] or 0, 2) for row in conf_result.all()}
+
+        return [
+            {
+                "channel": row[0],
+                "total_spend": round(row[1] or 0),
+                "avg_confidence": conf_map.get(row[0], 0.5),
+                "data_points": row[2],
+            }
+            for row in result.all()
+        ]
+
+    return await response_cache.get_or_compute(
+        "spend.summary", {"days": days, "channel": channel}, plan_tier(user), _compute,
     )
-    conf_result = await db.execute(conf_query)
-    conf_map = {row[0]: round(row[1] or 0, 2) for row in conf_result.all()}
-
-    return [
-        {
-            "channel": row[0],
-            "total_spend": round(row[1] or 0),
-            "avg_confidence": conf_map.get(row[0], 0.5),
-            "data_points": row[2],
-        }
-        for row in result.all()
-    ]
 
 
 @router.get("/by-advertiser")
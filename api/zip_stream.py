@@ -0,0 +1,97 @@
+"""소재 이미지 ZIP 스트리밍 작성기.
+
+ZIP 전체를 BytesIO에 만든 뒤 보내는 대신, 파일을 하나 추가할 때마다 그
+구간의 바이트를 바로 yield합니다.
+
+- 출력 대상은 seek 불가 싱크 → zipfile이 data descriptor 방식으로 기록
+- WebP/JPEG/PNG/GIF 등 이미 압축된 이미지는 STORED (재압축 CPU 낭비 방지)
+- 파일 읽기와 엔트리 기록은 스레드 풀에서 실행 (이벤트 루프 비차단)
+- cache_path 지정 시 스트리밍과 동시에 .part 파일로 스풀하고, 끝까지 전송된
+  경우에만 cache_path로 교체 → 다음 요청은 디스크에서 바로 응답
+
+사용법:
+  from api.zip_stream import stream_zip
+
+  return StreamingResponse(stream_zip([(path, "naver/20250101_1.webp")], cache_path), ...)
+"""
+
+import asyncio
+import logging
+import os
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+logger = logging.getLogger("adscope.zip_stream")
+
+# 이미 압축된 포맷은 deflate 해도 거의 줄지 않음
+STORED_SUFFIXES = frozenset({".webp", ".jpg", ".jpeg", ".png", ".gif", ".avif", ".mp4", ".webm", ".zip"})
+
+
+class _ChunkSink:
+    """ZipFile 출력 대상. tell/seek가 없어 zipfile이 스트리밍 모드로 동작합니다."""
+
+    def __init__(self, spool: BinaryIO | None = None):
+        self._parts: list[bytes] = []
+        self._spool = spool
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        if self._spool is not None:
+            self._spool.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+    def detach(self) -> None:
+        """스풀 연결 해제 (중단된 ZipFile이 GC 시점에 닫히며 쓰는 꼬리는 버려짐)."""
+        self._spool = None
+
+
+def _add_entry(zf: zipfile.ZipFile, path: Path, arcname: str) -> None:
+    # 읽기 실패 시 로컬 헤더가 쓰이기 전에 예외가 나도록 먼저 전체를 읽음
+    data = path.read_bytes()
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+    zf.writestr(zinfo, data)
+
+
+async def stream_zip(entries: list[tuple[Path, str]], cache_path: Path | None = None) -> AsyncIterator[bytes]:
+    """(파일 경로, 압축 내 이름) 목록을 ZIP 청크 스트림으로 내보냅니다.
+
+    읽을 수 없는 파일은 경고 로그 후 건너뜁니다. 클라이언트가 중간에 끊으면
+    스풀 파일은 삭제되고 캐시는 남지 않습니다.
+    """
+    part_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{id(entries)}.part") if cache_path else None
+    spool = open(part_path, "wb") if part_path else None
+    sink = _ChunkSink(spool)
+    completed = False
+    try:
+        zf = zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED)
+        for path, arcname in entries:
+            try:
+                await asyncio.to_thread(_add_entry, zf, path, arcname)
+            except OSError as e:
+                logger.warning("Failed to add %s to ZIP: %s", path, e)
+                continue
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+        zf.close()
+        yield sink.take()
+        completed = True
+    finally:
+        sink.detach()
+        if spool is not None:
+            spool.close()
+            if completed:
+                os.replace(part_path, cache_path)
+            else:
+                part_path.unlink(missing_ok=True)
@@ -3,66 +3,71 @@
 import asyncio
 import os
 import random
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from loguru import logger
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
+from crawler.browser_pool import BrowserPool, get_browser_pool, launch_options
 from crawler.config import crawler_settings
 from crawler.cookie_store import CookieStore, get_cookie_store
 from crawler.personas.cookie_profiles import RETARGET_WARMUP_URLS, get_warmup_urls
 from crawler.personas.device_config import DEFAULT_MOBILE, PC_DEVICE, DeviceConfig
 from crawler.personas.profiles import PERSONAS, PersonaProfile
+from crawler.rate_limiter import get_domain_bucket
 from processor.image_store import ImageStore, get_image_store
 
+# 키워드별 소요시간 히스토그램 구간 상한 (초)
+KEYWORD_LATENCY_BUCKETS_SEC = (10, 20, 30, 60, 120)
+
 
 class BaseCrawler(ABC):
     """모든 채널 크롤러가 상속하는 베이스 클래스."""
 
     channel: str = ""  # 하위 클래스에서 override
+    rate_domain: str = ""  # 동시 수집 시 토큰 버킷 키 (비어있으면 channel)
+    max_keyword_concurrency: int | None = None  # 설정과 무관한 동시 수집 상한 (공유 상태가 있는 채널)
 
     def __init__(self):
         self.settings = crawler_settings
         self._playwright = None
         self._browser: Browser | None = None
+        self._pool: BrowserPool | None = None
+        self._leased_contexts: set[BrowserContext] = set()
         self._image_store: ImageStore = get_image_store()
         self._cookie_store: CookieStore = get_cookie_store()
 
     # ── Lifecycle ──
 
     async def start(self):
-        """Playwright 브라우저 시작."""
-        self._playwright = await async_playwright().start()
+        """브라우저 준비. 풀 사용 시 기동은 첫 컨텍스트 대여 시점으로 미룸."""
+        use_headless, use_chrome = self._browser_profile()
+        if self.settings.browser_pool_enabled:
+            self._pool = get_browser_pool()
+            logger.debug(f"[{self.channel}] 브라우저 풀 사용 (headless={use_headless}, chrome={use_chrome})")
+            return
 
-        # 채널별 headful 오버라이드
-        headful_list = [c.strip() for c in self.settings.headful_channels.split(",") if c.strip()]
-        use_headless = self.settings.headless and self.channel not in headful_list
-
-        # headful 채널은 실제 Chrome 사용 (Chromium 핑거프린트 회피)
-        use_chrome = self.channel in headful_list
-        launch_opts = dict(
-            headless=use_headless,
-            slow_mo=self.settings.slow_mo_ms or None,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-infobars",
-                "--disable-background-timer-throttling",
-                "--disable-renderer-backgrounding",
-                "--disable-backgrounding-occluded-windows",
-            ],
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            **launch_options(use_headless, use_chrome, self.settings.slow_mo_ms)
         )
-        if use_chrome:
-            launch_opts["channel"] = "chrome"
-
-        self._browser = await self._playwright.chromium.launch(**launch_opts)
         logger.info(f"[{self.channel}] 브라우저 시작 (headless={use_headless}, chrome={use_chrome})")
 
     async def stop(self):
-        """브라우저 종료."""
+        """브라우저 종료. 풀 사용 시 닫히지 않은 컨텍스트만 반납하고 브라우저는 유지."""
+        if self._pool is not None:
+            for context in list(self._leased_contexts):
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"[{self.channel}] 컨텍스트 반납 실패: {e}")
+            self._leased_contexts.clear()
+            self._pool = None
+            return
         if self._browser:
             await self._browser.close()
         if self._playwright:
@@ -83,6 +88,21 @@ class BaseCrawler(ABC):
         headful_list = [c.strip() for c in self.settings.headful_channels.split(",") if c.strip()]
         return self.channel in headful_list
 
+    def _browser_profile(self) -> tuple[bool, bool]:
+        """(headless, chrome 채널). headful 채널은 실제 Chrome 사용 (Chromium 핑거프린트 회피)."""
+        use_chrome = self._is_headful_chrome()
+        return self.settings.headless and not use_chrome, use_chrome
+
+    async def _new_context(self, **options) -> BrowserContext:
+        """풀 또는 전용 브라우저에서 빈 컨텍스트 생성. close() 시 풀에 반납."""
+        if self._pool is None:
+            return await self._browser.new_context(**options)
+        headless, chrome = self._browser_profile()
+        context = await self._pool.new_context(headless=headless, chrome=chrome, **options)
+        self._leased_contexts.add(context)
+        context.on("close", lambda *_: self._leased_contexts.discard(context))
+        return context
+
     async def _create_context(
         self,
         persona: PersonaProfile,
@@ -97,9 +117,9 @@ class BaseCrawler(ABC):
                 ctx_opts["is_mobile"] = True
                 ctx_opts["has_touch"] = True
                 ctx_opts["device_scale_factor"] = device.device_scale_factor
-            context = await self._browser.new_context(**ctx_opts)
+            context = await self._new_context(**ctx_opts)
         else:
-            context = await self._browser.new_context(
+            context = await self._new_context(
                 viewport={"width": device.viewport_width, "height": device.viewport_height},
                 user_agent=device.user_agent,
                 is_mobile=device.is_mobile,
@@ -494,34 +514,87 @@ class BaseCrawler(ABC):
         """
         ...
 
+    def _keyword_concurrency(self) -> int:
+        """채널별 동시 키워드 수. keyword_concurrency_channels > keyword_concurrency, 클래스 상한 적용."""
+        concurrency = self.settings.keyword_concurrency
+        for item in self.settings.keyword_concurrency_channels.split(","):
+            name, _, value = item.partition(":")
+            if name.strip() == self.channel and value.strip().isdigit():
+                concurrency = int(value)
+        if self.max_keyword_concurrency is not None:
+            concurrency = min(concurrency, self.max_keyword_concurrency)
+        return max(1, concurrency)
+
     async def crawl_keywords(
         self,
         keywords: list[str],
         persona_code: str = "M30",
         device_type: str = "pc",
+        on_result: Callable[[dict], Awaitable[None]] | None = None,
     ) -> list[dict]:
-        """여러 키워드를 순차적으로 수집."""
+        """여러 키워드를 수집. 결과는 keywords 순서.
+
+        동시 수집 설정(keyword_concurrency > 1) 시 최대 K개 키워드를 각자의
+        컨텍스트로 병렬 수집하고, 새 키워드 시작은 도메인 토큰 버킷으로 간격을 둠.
+
+        on_result 지정 시 키워드가 끝나는 즉시 결과를 넘기고(대기 = backpressure)
+        결과를 보관하지 않으므로 빈 리스트를 반환.
+        """
         persona = PERSONAS[persona_code]
         device = PC_DEVICE if device_type == "pc" else DEFAULT_MOBILE
-
-        results = []
-        for kw in keywords:
-            try:
-                result = await self._with_retry(self.crawl_keyword, kw, persona, device)
-                results.append(result)
-                logger.info(
-                    f"[{self.channel}] '{kw}' 수집 완료 — "
-                    f"광고 {len(result.get('ads', []))}건 ({persona_code}/{device_type})"
-                )
-            except Exception as e:
-                logger.error(f"[{self.channel}] '{kw}' 수집 실패: {e}")
-                results.append({
-                    "keyword": kw,
-                    "persona_code": persona_code,
-                    "device": device_type,
-                    "channel": self.channel,
-                    "captured_at": datetime.utcnow(),
-                    "error": str(e),
-                    "ads": [],
-                })
-        return results
+        concurrency = min(self._keyword_concurrency(), max(1, len(keywords)))
+        bucket = get_domain_bucket(self.rate_domain or self.channel, self.settings) if concurrency > 1 else None
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+
+        async def _crawl_one(kw: str) -> dict:
+            async with semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+                t0 = time.monotonic()
+                try:
+                    result = await self._with_retry(self.crawl_keyword, kw, persona, device)
+                    logger.info(
+                        f"[{self.channel}] '{kw}' 수집 완료 — "
+                        f"광고 {len(result.get('ads', []))}건 ({persona_code}/{device_type})"
+                    )
+                except Exception as e:
+                    logger.error(f"[{self.channel}] '{kw}' 수집 실패: {e}")
+                    result = {
+                        "keyword": kw,
+                        "persona_code": persona_code,
+                        "device": device_type,
+                        "channel": self.channel,
+                        "captured_at": datetime.utcnow(),
+                        "error": str(e),
+                        "ads": [],
+                    }
+                latencies.append(time.monotonic() - t0)
+                if on_result is not None:
+                    await on_result(result)
+                    return None
+                return result
+
+        t_start = time.monotonic()
+        if concurrency == 1:
+            results = [await _crawl_one(kw) for kw in keywords]
+        else:
+            results = list(await asyncio.gather(*(_crawl_one(kw) for kw in keywords)))
+        if latencies:
+            self._log_keyword_latencies(latencies, time.monotonic() - t_start, concurrency)
+        return [r for r in results if r is not None]
+
+    def _log_keyword_latencies(self, latencies: list[float], wall_sec: float, concurrency: int):
+        """키워드별 소요시간 분포 (p50/p95/max + 구간 히스토그램)."""
+        ordered = sorted(latencies)
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        histogram = []
+        for lower, upper in zip((0, *KEYWORD_LATENCY_BUCKETS_SEC), (*KEYWORD_LATENCY_BUCKETS_SEC, None)):
+            count = sum(1 for t in ordered if t >= lower and (upper is None or t < upper))
+            if count:
+                histogram.append(f"{lower}-{upper}s:{count}" if upper else f"{lower}s+:{count}")
+        logger.info(
+            f"[{self.channel}] 키워드 {len(ordered)}개 {wall_sec:.0f}s (동시 {concurrency}) — "
+            f"p50 {p50:.1f}s / p95 {p95:.1f}s / max {ordered[-1]:.1f}s | {' '.join(histogram)}"
+        )
@@ -0,0 +1,336 @@
+"""프로세스 공유 브라우저 풀 — 크롤러마다 Chromium을 새로 띄우지 않도록.
+
+BaseCrawler.start()가 매번 Playwright + Chromium을 기동하면 콜드 스타트에만
+수 초가 걸립니다 (스케줄러는 채널 x 재시도마다, fast_crawl은 키워드마다).
+풀은 (headless, chrome 채널) 프로필별로 브라우저를 띄워 두고, 크롤러에는
+BrowserContext 단위로 대여합니다. 컨텍스트를 close() 하면 자동 반납됩니다.
+
+- 전체 브라우저 수 상한: CrawlerSettings.max_concurrent_browsers (프로필 합계)
+  상한 도달 시 같은 프로필 브라우저에 컨텍스트를 더 얹고, 프로필이 다르면
+  유휴 브라우저를 내리거나 반납을 대기
+- 재시작(recycle): 브라우저당 browser_pool_recycle_after_contexts 컨텍스트
+  대여 후, 또는 자식 프로세스 RSS 합계가 browser_pool_recycle_rss_mb 초과 시
+  (Linux /proc 기준, 그 외 OS는 생략) — 진행 중 컨텍스트가 모두 닫힌 뒤 종료
+- metrics(): 프로필별 브라우저/활성 컨텍스트 수, 기동/대여/대기/재시작 횟수
+
+사용법:
+  from crawler.browser_pool import get_browser_pool
+
+  context = await get_browser_pool().new_context(headless=True, chrome=False, locale="ko-KR")
+  ...
+  await context.close()  # 반납
+  await get_browser_pool().close()  # 프로세스 종료 시
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, async_playwright
+
+from crawler.config import CrawlerSettings, crawler_settings
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-infobars",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+# RSS 측정은 /proc 전체 스캔이라 대여마다 하지 않음
+RSS_CHECK_INTERVAL_SEC = 30.0
+
+
+def launch_options(headless: bool, chrome: bool, slow_mo_ms: int = 0) -> dict:
+    """chromium.launch() 인자. headful 채널은 실제 Chrome 사용 (Chromium 핑거프린트 회피)."""
+    opts: dict[str, Any] = dict(headless=headless, slow_mo=slow_mo_ms or None, args=list(LAUNCH_ARGS))
+    if chrome:
+        opts["channel"] = "chrome"
+    return opts
+
+
+def _descendant_rss_mb() -> float | None:
+    """현재 프로세스의 모든 하위 프로세스(Playwright 드라이버 + 브라우저) RSS 합계(MB)."""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children: dict[int, list[int]] = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            data = stat.read_text()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..." — comm에 공백/괄호가 있을 수 있어 마지막 ')' 기준
+        fields = data[data.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    pages = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        try:
+            pages += int((proc / str(pid) / "statm").read_text().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(pid, []))
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _profile_label(profile: tuple[bool, bool]) -> str:
+    headless, chrome = profile
+    return f"{'headless' if headless else 'headful'}/{'chrome' if chrome else 'chromium'}"
+
+
+@dataclass(eq=False)
+class _PooledBrowser:
+    browser: Browser
+    profile: tuple[bool, bool]
+    active: int = 0
+    served: int = 0
+    retire_reason: str | None = None
+    closed: bool = False
+
+
+class BrowserPool:
+    """(headless, chrome) 프로필별 웜 브라우저에서 BrowserContext를 대여."""
+
+    def __init__(
+        self,
+        settings: CrawlerSettings = crawler_settings,
+        launcher: Callable[[bool, bool], Awaitable[Browser]] | None = None,
+    ):
+        self.settings = settings
+        self._launcher = launcher
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._playwright = None
+        self._browsers: list[_PooledBrowser] = []
+        self._launching = 0
+        self._closing: set[asyncio.Task] = set()
+        self._stats: Counter = Counter()
+        self._rss_mb: float | None = None
+        self._rss_checked_at = 0.0
+
+    # ── 대여 / 반납 ──
+
+    async def new_context(self, *, headless: bool, chrome: bool = False, **options) -> BrowserContext:
+        """프로필에 맞는 브라우저에서 새 컨텍스트 생성. context.close() 시 반납."""
+        pooled = await self._acquire((headless, chrome))
+        try:
+            context = await pooled.browser.new_context(**options)
+        except Exception:
+            self._release(pooled)
+            raise
+        context.on("close", lambda *_: self._release(pooled))
+        return context
+
+    async def _acquire(self, profile: tuple[bool, bool]) -> _PooledBrowser:
+        self._ensure_loop()
+        await self._maybe_check_rss()
+
+        wait_started: float | None = None
+        while True:
+            pooled = self._pick(profile)
+            if pooled is not None:
+                break
+            if len(self._browsers) + self._launching < self._max_browsers():
+                self._launching += 1
+                try:
+                    pooled = await self._launch(profile)
+                finally:
+                    self._launching -= 1
+                break
+            idle = self._idle_browser()
+            if idle is not None:
+                self._stats["evicted"] += 1
+                await self._close_browser(idle)
+                continue
+            if wait_started is None:
+                wait_started = time.monotonic()
+                self._stats["lease_waits"] += 1
+            self._changed.clear()
+            await self._changed.wait()
+
+        if wait_started is not None:
+            self._stats["lease_wait_ms"] += int((time.monotonic() - wait_started) * 1000)
+        pooled.active += 1
+        pooled.served += 1
+        self._stats["leases"] += 1
+        if pooled.retire_reason is None and pooled.served >= self.settings.browser_pool_recycle_after_contexts:
+            pooled.retire_reason = "contexts"
+        return pooled
+
+    def _release(self, pooled: _PooledBrowser) -> None:
+        if pooled.active > 0:
+            pooled.active -= 1
+        if pooled.retire_reason and pooled.active == 0 and not pooled.closed:
+            self._spawn_close(pooled)
+        self._changed.set()
+
+    def _pick(self, profile: tuple[bool, bool]) -> _PooledBrowser | None:
+        """같은 프로필에서 여유 있는 브라우저. 상한이면 가장 한가한 브라우저를 공유."""
+        candidates = [b for b in self._browsers if b.profile == profile and not b.retire_reason]
+        if not candidates:
+            return None
+        least = min(candidates, key=lambda b: b.active)
+        if least.active < self.settings.browser_pool_contexts_per_browser:
+            return least
+        if len(self._browsers) + self._launching >= self._max_browsers():
+            return least
+        return None
+
+    def _idle_browser(self) -> _PooledBrowser | None:
+        idle = [b for b in self._browsers if b.active == 0]
+        return min(idle, key=lambda b: (b.retire_reason is None, -b.served)) if idle else None
+
+    def _max_browsers(self) -> int:
+        return max(1, self.settings.max_concurrent_browsers)
+
+    # ── 브라우저 기동 / 종료 ──
+
+    async def _launch(self, profile: tuple[bool, bool]) -> _PooledBrowser:
+        headless, chrome = profile
+        if self._launcher is not None:
+            browser = await self._launcher(headless, chrome)
+        else:
+            async with self._pw_lock:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+            browser = await self._playwright.chromium.launch(
+                **launch_options(headless, chrome, self.settings.slow_mo_ms)
+            )
+        pooled = _PooledBrowser(browser=browser, profile=profile)
+        browser.on("disconnected", lambda *_: self._on_disconnected(pooled))
+        self._browsers.append(pooled)
+        self._stats["launches"] += 1
+        logger.info(
+            f"[browser_pool] 브라우저 시작 ({_profile_label(profile)}) "
+            f"— {len(self._browsers)}/{self._max_browsers()}"
+        )
+        return pooled
+
+    async def _close_browser(self, pooled: _PooledBrowser) -> None:
+        if pooled.closed:
+            return
+        pooled.closed = True
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        if pooled.retire_reason:
+            self._stats[f"recycled_{pooled.retire_reason}"] += 1
+            logger.info(
+                f"[browser_pool] 브라우저 재시작 ({_profile_label(pooled.profile)}, "
+                f"reason={pooled.retire_reason}, served={pooled.served})"
+            )
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"[browser_pool] 브라우저 종료 실패: {e}")
+        self._changed.set()
+
+    def _spawn_close(self, pooled: _PooledBrowser) -> None:
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        task = asyncio.ensure_future(self._close_browser(pooled))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _on_disconnected(self, pooled: _PooledBrowser) -> None:
+        if pooled.closed:
+            return
+        pooled.closed = True
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        self._stats["disconnected"] += 1
+        logger.warning(f"[browser_pool] 브라우저 연결 끊김 ({_profile_label(pooled.profile)})")
+        self._changed.set()
+
+    async def _maybe_check_rss(self) -> None:
+        limit = self.settings.browser_pool_recycle_rss_mb
+        now = time.monotonic()
+        if limit <= 0 or not self._browsers or now - self._rss_checked_at < RSS_CHECK_INTERVAL_SEC:
+            return
+        self._rss_checked_at = now
+        self._rss_mb = await asyncio.to_thread(_descendant_rss_mb)
+        if self._rss_mb is None or self._rss_mb <= limit:
+            return
+        # 가장 많이 쓴 브라우저부터 1개씩 교체 (다음 점검에서도 초과면 또 교체)
+        live = [b for b in self._browsers if not b.retire_reason]
+        if not live:
+            return
+        victim = max(live, key=lambda b: b.served)
+        victim.retire_reason = "rss"
+        logger.info(f"[browser_pool] RSS {self._rss_mb:.0f}MB > {limit}MB — {_profile_label(victim.profile)} 교체 예정")
+        if victim.active == 0:
+            self._spawn_close(victim)
+
+    def _ensure_loop(self) -> None:
+        """풀은 이벤트 루프에 묶임. asyncio.run()이 다시 호출되면 이전 루프의 브라우저는 버림."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.warning("[browser_pool] 이벤트 루프 변경 — 이전 브라우저 참조 폐기")
+        self._loop = loop
+        self._browsers = []
+        self._launching = 0
+        self._playwright = None
+        self._changed = asyncio.Event()
+        self._pw_lock = asyncio.Lock()
+
+    # ── 종료 / 지표 ──
+
+    async def close(self) -> None:
+        """모든 브라우저와 Playwright 종료."""
+        if self._loop is None:
+            return
+        for pooled in list(self._browsers):
+            await self._close_browser(pooled)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info(f"[browser_pool] 종료 — {dict(self._stats)}")
+
+    def metrics(self) -> dict:
+        profiles: dict[str, dict] = {}
+        for b in self._browsers:
+            p = profiles.setdefault(_profile_label(b.profile), {"browsers": 0, "active_contexts": 0, "served": 0})
+            p["browsers"] += 1
+            p["active_contexts"] += b.active
+            p["served"] += b.served
+        return {
+            "max_browsers": self._max_browsers(),
+            "browsers": len(self._browsers),
+            "launching": self._launching,
+            "active_contexts": sum(b.active for b in self._browsers),
+            "profiles": profiles,
+            "launches": self._stats["launches"],
+            "leases": self._stats["leases"],
+            "lease_waits": self._stats["lease_waits"],
+            "lease_wait_ms": self._stats["lease_wait_ms"],
+            "recycled_contexts": self._stats["recycled_contexts"],
+            "recycled_rss": self._stats["recycled_rss"],
+            "evicted": self._stats["evicted"],
+            "disconnected": self._stats["disconnected"],
+            "rss_mb": round(self._rss_mb, 1) if self._rss_mb is not None else None,
+        }
+
+
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
@@ -13,7 +13,19 @@ class CrawlerSettings(BaseSettings):
     retry_delay_sec: float = 2.0
 
     # 동시성
-    max_concurrent_browsers: int = 3
+    max_concurrent_browsers: int = 3  # 브라우저 풀 전체 상한 (프로필 합계)
+
+    # 브라우저 풀 (프로세스 공유, 크롤러에는 컨텍스트 단위로 대여)
+    browser_pool_enabled: bool = True
+    browser_pool_contexts_per_browser: int = 4
+    browser_pool_recycle_after_contexts: int = 50
+    browser_pool_recycle_rss_mb: int = 3_072  # 브라우저 프로세스 RSS 합계 (0=비활성, Linux만)
+
+    # 키워드 동시 수집 (1=순차, 기존 동작)
+    keyword_concurrency: int = 1
+    keyword_concurrency_channels: str = ""  # 채널별 오버라이드 "naver_search:3,google_search_ads:2"
+    domain_rate_per_minute: float = 6.0  # 도메인별 키워드 페이지 시작 빈도 (동시 수집 시)
+    domain_rate_burst: int = 1
 
     # 스크린샷
     screenshot_dir: str = "screenshots"
@@ -45,6 +45,7 @@ class GoogleSearchAdsCrawler(BaseCrawler):
     """Google Ads Transparency Center TEXT format -- 구글 검색광고 수집."""
 
     channel = "google_search_ads"
+    rate_domain = "google.com"
 
     async def crawl_keyword(
         self,
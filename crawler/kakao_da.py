@@ -86,12 +86,13 @@ class KakaoDACrawler(BaseCrawler):
         context = await self._create_context(persona, device)
         page = await context.new_page()
 
+        # 수집 상태는 호출 지역 변수로 두고 핸들러에 바인딩 — 키워드 동시 수집 시 섞이지 않음
         # 네트워크 리다이렉트 추적: ad.daum.net → 실제 랜딩 URL 매핑
-        self._redirect_map: dict[str, str] = {}
+        redirect_map: dict[str, str] = {}
         # 네트워크 요청에서 직접 광고 랜딩 URL 캡처
-        self._network_landings: dict[str, str] = {}
+        network_landings: dict[str, str] = {}
         # display.ad.daum.net/sdk/ JSON 응답 캡처
-        self._sdk_ad_captures: list[dict] = []
+        sdk_ad_captures: list[dict] = []
         async def _on_any_response(response: Response):
             """모든 응답: 리다이렉트 추적 + SDK JSON 캡처."""
             # 1) 리다이렉트 추적
@@ -102,7 +103,7 @@ class KakaoDACrawler(BaseCrawler):
                     headers = response.headers
                     location = headers.get("location", "")
                     if location and ("ad.daum.net" in url or "kakaoad" in url or "adfit" in url):
-                        self._redirect_map[url] = location
+                        redirect_map[url] = location
             except Exception:
                 pass
 
@@ -119,12 +120,12 @@ class KakaoDACrawler(BaseCrawler):
                 data = await response.json()
                 if isinstance(data, dict) and data.get('status') == 'OK':
                     ad_type = 'native' if '/sdk/native' in url else 'banner'
-                    self._sdk_ad_captures.append({'type': ad_type, 'data': data, 'url': url})
+                    sdk_ad_captures.append({'type': ad_type, 'data': data, 'url': url})
             except Exception:
                 pass
 
         page.on("response", _on_any_response)
-        page.on("request", lambda req: self._capture_ad_request(req))
+        page.on("request", lambda req: self._capture_ad_request(req, network_landings))
 
         try:
             ads: list[dict] = []
@@ -147,9 +148,9 @@ class KakaoDACrawler(BaseCrawler):
             )
 
             # SDK 네트워크 응답에서 광고 파싱 (핵심 수집원)
-            if self._sdk_ad_captures:
-                sdk_ads = self._parse_sdk_captures(self._sdk_ad_captures)
-                logger.info("[{}] SDK 네트워크 캡처 {}건 -> 광고 {}건", self.channel, len(self._sdk_ad_captures), len(sdk_ads))
+            if sdk_ad_captures:
+                sdk_ads = self._parse_sdk_captures(sdk_ad_captures)
+                logger.info("[{}] SDK 네트워크 캡처 {}건 -> 광고 {}건", self.channel, len(sdk_ad_captures), len(sdk_ads))
                 # 캡처된 크리에이티브 경로를 순서 기반으로 매핑
                 for i, ad in enumerate(sdk_ads):
                     if i < len(captured_creative_paths) and captured_creative_paths[i]:
@@ -163,8 +164,8 @@ class KakaoDACrawler(BaseCrawler):
                 ads.extend(dom_ads)
 
             # 리다이렉트 맵으로 광고 정보 보강
-            if self._redirect_map:
-                self._enrich_with_redirects(ads)
+            if redirect_map:
+                self._enrich_with_redirects(ads, redirect_map)
 
             # 랜딩 클릭으로 광고주 식별 (광고주 미확인 건 대상)
             if self.landing_resolve_limit > 0:
@@ -198,7 +199,7 @@ class KakaoDACrawler(BaseCrawler):
             await page.close()
             await context.close()
 
-    def _track_ad_redirect(self, response):
+    def _track_ad_redirect(self, response, redirect_map: dict[str, str]):
         """네트워크 응답에서 광고 리다이렉트 추적."""
         try:
             url = response.url
@@ -207,7 +208,7 @@ class KakaoDACrawler(BaseCrawler):
                 headers = response.headers
                 location = headers.get("location", "")
                 if location and ("ad.daum.net" in url or "kakaoad" in url or "adfit" in url):
-                    self._redirect_map[url] = location
+                    redirect_map[url] = location
         except Exception:
             pass
 
@@ -394,7 +395,7 @@ class KakaoDACrawler(BaseCrawler):
 
         return ads
 
-    def _capture_ad_request(self, request):
+    def _capture_ad_request(self, request, network_landings: dict[str, str]):
         """네트워크 요청 URL에서 광고 랜딩 URL 파라미터 추출."""
         try:
             url = request.url
@@ -407,12 +408,12 @@ class KakaoDACrawler(BaseCrawler):
                 if values:
                     candidate = unquote(values[0]).strip()
                     if candidate.startswith('http') and not _is_infra_domain(self._extract_domain(candidate)):
-                        self._network_landings[url] = candidate
+                        network_landings[url] = candidate
                         break
         except Exception:
             pass
 
-    def _enrich_with_redirects(self, ads: list[dict]):
+    def _enrich_with_redirects(self, ads: list[dict], redirect_map: dict[str, str]):
         """리다이렉트 맵으로 광고의 실제 랜딩 URL + 광고주 보강."""
         for ad in ads:
             click_url = ad.get("extra_data", {}).get("click_url", "")
@@ -422,7 +423,7 @@ class KakaoDACrawler(BaseCrawler):
             # 리다이렉트 체인 추적 (최대 5홉)
             final_url = click_url
             for _ in range(5):
-                next_url = self._redirect_map.get(final_url)
+                next_url = redirect_map.get(final_url)
                 if not next_url:
                     break
                 final_url = next_url
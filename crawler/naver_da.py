@@ -86,6 +86,7 @@ class NaverDACrawler(BaseCrawler):
     """네이버 메인 DA 배너를 GFP 네트워크 응답 캡처로 수집."""
 
     channel = "naver_da"
+    rate_domain = "naver.com"
     keyword_dependent = False  # 키워드 무관 — 고정 URL 방문
 
     def __init__(self):
@@ -20,6 +20,7 @@ class NaverSearchCrawler(BaseCrawler):
     """네이버 검색 결과 페이지 응답을 캡처하여 광고 추출."""
 
     channel = "naver_search"
+    rate_domain = "naver.com"
 
     NAVER_SEARCH_PC_URL = "https://search.naver.com/search.naver?query={query}"
     NAVER_SEARCH_MOBILE_URL = "https://m.search.naver.com/search.naver?query={query}"
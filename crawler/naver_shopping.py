@@ -36,6 +36,7 @@ class NaverShoppingCrawler(BaseCrawler):
     """네이버 쇼핑탭 검색 결과 응답을 캡처하여 광고 추출."""
 
     channel = "naver_shopping"
+    rate_domain = "naver.com"
 
     # search.shopping.naver.com 은 418 봇차단 → search.naver.com 쇼핑탭 사용
     SEARCH_PC_URL = "https://search.naver.com/search.naver?where=shopping&query={query}"
@@ -0,0 +1,61 @@
+"""도메인별 토큰 버킷 — 키워드 동시 수집 시 같은 사이트 요청 간격 유지.
+
+동시 수집(keyword_concurrency > 1)에서는 여러 컨텍스트가 같은 도메인에
+한꺼번에 검색을 시작할 수 있으므로, 새 키워드 페이지 시작을 도메인 단위
+버킷으로 제한합니다. 버킷은 프로세스 전역이라 같은 도메인을 쓰는 다른
+채널 크롤러(naver_search/naver_shopping 등)와도 공유됩니다.
+
+- 속도: CrawlerSettings.domain_rate_per_minute, 버스트: domain_rate_burst
+- 대기가 필요한 경우 간격의 최대 50% 랜덤 지터를 더해 기계적 주기를 피함
+- 예약 방식 (토큰이 음수가 될 수 있음) → 락 없이 호출 순서대로 슬롯 배정
+
+사용법:
+  from crawler.rate_limiter import get_domain_bucket
+
+  await get_domain_bucket("naver.com").acquire()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from crawler.config import CrawlerSettings, crawler_settings
+
+
+class TokenBucket:
+    """초당 rate개 토큰, 최대 burst개 적립."""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1, jitter_ratio: float = 0.5):
+        self.rate = max(rate_per_sec, 1e-6)
+        self.capacity = float(max(1, burst))
+        self.jitter_ratio = jitter_ratio
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """토큰 1개 예약 후 대기해야 할 초를 반환 (0이면 즉시)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            wait += random.uniform(0, self.jitter_ratio / self.rate)
+            await asyncio.sleep(wait)
+        return wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+
+
+def get_domain_bucket(domain: str, settings: CrawlerSettings = crawler_settings) -> TokenBucket:
+    bucket = _buckets.get(domain)
+    if bucket is None:
+        bucket = TokenBucket(settings.domain_rate_per_minute / 60, settings.domain_rate_burst)
+        _buckets[domain] = bucket
+    return bucket
@@ -216,6 +216,7 @@ class YouTubeAdsCrawler(BaseCrawler):
     """Google Ads Transparency Center RPC API 캡처로 YouTube 광고 수집."""
 
     channel = "youtube_ads"
+    rate_domain = "youtube.com"
 
     async def crawl_keyword(
         self,
@@ -62,6 +62,7 @@ class YouTubeSurfCrawler(BaseCrawler):
     """영상 직접 로드 + doubleclick/googlevideo 네트워크 캡처."""
 
     channel = "youtube_surf"
+    max_keyword_concurrency = 1  # 단일 persistent context 공유
     keyword_dependent = False
 
     # 광고가 붙는 긴 영상 시드 (8분 이상 — 프리롤+미드롤 광고 확보)
@@ -68,6 +68,7 @@ async def init_db():
         await _ensure_mobile_panel_tables(conn)
         await _ensure_dart_columns(conn)
         await _ensure_dedup_tracking_columns(conn)
+        await _ensure_dedup_key_columns(conn)
         await _ensure_ad_platforms_table(conn)
         await _ensure_composite_indexes(conn)
         await _ensure_visual_mark_columns(conn)
@@ -138,6 +139,8 @@ async def _ensure_composite_indexes(conn):
         "CREATE INDEX IF NOT EXISTS ix_details_advertiser_snapshot ON ad_details(advertiser_id, snapshot_id)",
         "CREATE INDEX IF NOT EXISTS ix_spend_campaign_channel_date ON spend_estimates(campaign_id, channel, date)",
         "CREATE INDEX IF NOT EXISTS ix_channel_stats_adv_collected ON channel_stats(advertiser_id, collected_at)",
+        # 증분 캠페인 재빌드: last_seen_at 워터마크 이후 bump된 소재 조회
+        "CREATE INDEX IF NOT EXISTS ix_details_last_seen ON ad_details(last_seen_at)",
     ]:
         try:
             await conn.exec_driver_sql(idx_sql)
@@ -235,6 +238,43 @@ async def _ensure_dedup_tracking_columns(conn):
     )
 
 
+async def _ensure_dedup_key_columns(conn):
+    """Add denormalized channel + text_key (+ creative_phash) to ad_details for dedup probes.
+
+    channel is backfilled here from ad_snapshots; text_key needs Python hashing and
+    is filled by scripts/backfill_dedup_keys.py.
+    """
+    rows = await conn.exec_driver_sql("PRAGMA table_info(ad_details)")
+    existing = {row[1] for row in rows.fetchall()}
+
+    for col, typ in [
+        ("channel", "VARCHAR(30)"),
+        ("text_key", "VARCHAR(64)"),
+        ("creative_phash", "VARCHAR(16)"),
+    ]:
+        if col not in existing:
+            try:
+                await conn.exec_driver_sql(
+                    f"ALTER TABLE ad_details ADD COLUMN {col} {typ}"
+                )
+            except Exception:
+                pass
+
+    await conn.exec_driver_sql(
+        "UPDATE ad_details SET channel = "
+        "(SELECT s.channel FROM ad_snapshots s WHERE s.id = ad_details.snapshot_id) "
+        "WHERE channel IS NULL"
+    )
+    await conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_details_channel_hash "
+        "ON ad_details(channel, creative_hash)"
+    )
+    await conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_details_channel_text_key "
+        "ON ad_details(channel, text_key)"
+    )
+
+
 async def _ensure_dart_columns(conn):
     """Add DART ad expense columns to advertisers table."""
     rows = await conn.exec_driver_sql("PRAGMA table_info(advertisers)")
@@ -6,6 +6,7 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Date,
     DateTime,
     Float,
     ForeignKey,
@@ -192,6 +193,10 @@ class AdDetail(Base):
     promotion_type = Column(String(50))        # Why: 광고 목적 (e.g. "product_launch", "sale")
     creative_image_path = Column(Text)         # 광고 소재/영역 element 스냅샷 경로
     creative_hash = Column(String(64))         # 소재 중복 제거용 이미지 해시 (perceptual hash)
+    creative_phash = Column(String(16))        # 64bit pHash hex — 근접 중복(재인코딩/크롭) 탐지용
+    # ── 중복 판정 키 (비정규화) ──
+    channel = Column(String(30), comment="비정규화: ad_snapshots.channel 복사본 (dedup 인덱스용)")
+    text_key = Column(String(64))              # compute_text_hash(광고주명, 문구, URL) — 텍스트 dedup 키
     # ── 중복 추적 (캠페인 연속성) ──
     first_seen_at = Column(DateTime)             # 최초 수집 시점
     last_seen_at = Column(DateTime)              # 최근 수집 시점
@@ -235,6 +240,9 @@ class AdDetail(Base):
         Index("ix_details_advertiser", "advertiser_id"),
         Index("ix_details_persona", "persona_id"),
         Index("ix_details_creative_hash", "creative_hash"),
+        Index("ix_details_channel_hash", "channel", "creative_hash"),
+        Index("ix_details_channel_text_key", "channel", "text_key"),
+        Index("ix_details_last_seen", "last_seen_at"),
         Index("ix_details_verification_status", "verification_status"),
         Index("ix_details_verification_source", "verification_source"),
     )
@@ -1425,3 +1433,121 @@ class UnknownAdMark(Base):
         Index("ix_unknown_marks_status", "status"),
         Index("ix_unknown_marks_network", "suggested_network"),
     )
+
+
+# ─────────────────────────────────────────────
+# 집계 워터마크 (증분 재빌드용)
+# ─────────────────────────────────────────────
+class BuildWatermark(Base):
+    __tablename__ = "build_watermarks"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)   # "campaign_spend" 등 집계 작업 이름
+    last_id = Column(Integer, default=0)                     # 마지막으로 반영한 원본 최대 id
+    last_seen_at = Column(DateTime)                          # 마지막으로 반영한 시점 (seen bump 감지용)
+    params = Column(JSON)                                    # 집계 조건 (예: excluded_channels) — 바뀌면 전체 재빌드
+    last_full_at = Column(DateTime)                          # 마지막 전체 재빌드 시점
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ─────────────────────────────────────────────
+# 일별 노출 롤업 (SOV / 접촉율 / 페르소나 히트맵 사전 집계)
+# ─────────────────────────────────────────────
+class DailyAdRollup(Base):
+    """ad_details x ad_snapshots 일별 집계 — (날짜, 채널, 키워드, 페르소나, 광고주, 위치, 유형) 단위."""
+
+    __tablename__ = "daily_ad_rollups"
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)                  # ad_snapshots.captured_at (UTC) 날짜
+    channel = Column(String(30), nullable=False)
+    keyword_id = Column(Integer)
+    persona_id = Column(Integer)
+    advertiser_id = Column(Integer)
+    position_zone = Column(String(20))
+    ad_type = Column(String(50))
+    impressions = Column(Integer, nullable=False, default=0)              # ad_details 행 수
+    non_inhouse_impressions = Column(Integer, nullable=False, default=0)  # is_inhouse = False
+    contact_impressions = Column(Integer, nullable=False, default=0)      # is_contact = True
+    snapshot_count = Column(Integer, nullable=False, default=0)           # 이 grain의 고유 스냅샷 수 (grain 간 합산 불가)
+
+    # 커버링 인덱스: 조회 GROUP BY 순서와 맞춰 임시 B-tree 정렬 없이 인덱스만 스캔
+    __table_args__ = (
+        Index("ix_ad_rollup_date_channel", "date", "channel"),
+        Index(
+            "ix_ad_rollup_advertiser_cover",
+            "advertiser_id", "channel", "date", "keyword_id", "position_zone",
+            "non_inhouse_impressions", "impressions",
+        ),
+        Index(
+            "ix_ad_rollup_persona_cover",
+            "persona_id", "channel", "advertiser_id", "position_zone", "ad_type", "date",
+            "contact_impressions", "impressions",
+        ),
+    )
+
+
+class DailySnapshotRollup(Base):
+    """ad_snapshots 일별 집계 — 세션 수는 스냅샷 단위로 겹치지 않아 grain 간 합산 가능."""
+
+    __tablename__ = "daily_snapshot_rollups"
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+    channel = Column(String(30), nullable=False)
+    keyword_id = Column(Integer)
+    persona_id = Column(Integer)
+    snapshot_count = Column(Integer, nullable=False, default=0)
+    contact_snapshot_count = Column(Integer, nullable=False, default=0)   # 접촉 광고가 1건 이상인 스냅샷
+
+    __table_args__ = (
+        Index("ix_snapshot_rollup_date_channel", "date", "channel"),
+    )
+
+
+# ─────────────────────────────────────────────
+# 경쟁사 친밀도 사전 계산 (광고주별 top-N)
+# ─────────────────────────────────────────────
+class CompetitorAffinity(Base):
+    """야간 배치가 계산한 광고주별 경쟁사 top-N — /api/competitors 조회용."""
+
+    __tablename__ = "competitor_affinities"
+
+    id = Column(Integer, primary_key=True)
+    advertiser_id = Column(Integer, ForeignKey("advertisers.id", ondelete="CASCADE"), nullable=False)
+    competitor_id = Column(Integer, ForeignKey("advertisers.id", ondelete="CASCADE"), nullable=False)
+    days = Column(Integer, nullable=False)                # 계산 기간 (일)
+    rank = Column(Integer, nullable=False)                # 1부터
+    affinity_score = Column(Float, nullable=False)
+    keyword_overlap = Column(Float, nullable=False)
+    channel_overlap = Column(Float, nullable=False)
+    position_zone_overlap = Column(Float, nullable=False)
+    spend_similarity = Column(Float, nullable=False)
+    co_occurrence_count = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_competitor_affinity_lookup", "advertiser_id", "days", "rank"),
+    )
+
+
+# ─────────────────────────────────────────────
+# 이미지 blob 인덱스 (content-addressed 이미지 저장소 참조 카운트)
+# ─────────────────────────────────────────────
+class ImageBlob(Base):
+    """processor.image_blobs가 관리 — 같은 내용의 캡처는 blob 1개를 공유."""
+
+    __tablename__ = "image_blobs"
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), nullable=False, unique=True)   # 저장 바이트 sha256 hex
+    key = Column(String(200), nullable=False)                       # blobs/ab/cd/<hash>.webp (저장소 기준 상대 키)
+    size_bytes = Column(Integer, nullable=False, default=0)         # 전체 이미지 크기 (썸네일 제외)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_referenced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_image_blobs_last_referenced", "last_referenced_at"),
+        Index("ix_image_blobs_unreferenced", "ref_count", "last_referenced_at"),
+    )
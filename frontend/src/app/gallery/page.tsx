@@ -573,7 +573,7 @@ function GalleryCard({
       <div className="relative aspect-[4/3] bg-gray-100 overflow-hidden">
         {showImage ? (
           <CreativeImage
-            path={item.creative_image_path}
+            path={item.creative_thumb_path || item.creative_image_path}
             alt={item.advertiser_name_raw || "ad creative"}
             className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
             loading="lazy"
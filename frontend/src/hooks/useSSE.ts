@@ -81,6 +81,18 @@ export function useSSE(onEvent?: (evt: SSEEvent) => void) {
       });
     }
 
+    // gap: 서버 링 버퍼보다 많이 놓침 → 어떤 이벤트였는지 모르므로 관련 쿼리 전체 무효화
+    es.addEventListener("gap", () => {
+      const seen = new Set<string>();
+      for (const keys of Object.values(EVENT_QUERY_MAP)) {
+        for (const key of keys) {
+          if (seen.has(key[0])) continue;
+          seen.add(key[0]);
+          queryClient.invalidateQueries({ queryKey: key });
+        }
+      }
+    });
+
     // heartbeat은 무시 (연결 유지용)
     es.addEventListener("heartbeat", () => {
       // no-op: 연결 유지 확인
@@ -379,6 +379,8 @@ export interface GalleryItem {
   ad_text: string | null;
   ad_type: string | null;
   creative_image_path: string | null;
+  /** 목록 카드용 썸네일 (없으면 creative_image_path 사용) */
+  creative_thumb_path?: string | null;
   url: string | null;
   brand: string | null;
   channel: string;
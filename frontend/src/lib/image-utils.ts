@@ -46,7 +46,10 @@ export function parseImagePath(path: string | null | undefined): ParsedImagePath
   }
 
   let url: string;
-  if (cleanPath.startsWith("stored_images/")) {
+  if (/^https?:\/\//.test(cleanPath)) {
+    // S3 presigned URL 등 절대 경로
+    url = cleanPath;
+  } else if (cleanPath.startsWith("stored_images/")) {
     url = "/images/" + cleanPath.slice("stored_images/".length);
   } else if (cleanPath.startsWith("screenshots/")) {
     url = "/" + cleanPath;
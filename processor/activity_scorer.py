@@ -13,6 +13,7 @@ States: test / scale / push / peak / cooldown
 from __future__ import annotations
 
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import func, select, and_, text
@@ -26,6 +27,7 @@ from database.models import (
     BrandChannelContent,
     Campaign,
 )
+from processor.daily_score_store import upsert_daily_scores
 
 logger = logging.getLogger(__name__)
 
@@ -112,20 +114,247 @@ def _determine_state(
     return "test"
 
 
+def _empty_metrics() -> dict:
+    return {
+        "camp_count": 0,
+        "total_creatives": 0,
+        "creative_variants": 0,
+        "social_count": 0,
+        "channels": [],
+        "prev_score": None,
+    }
+
+
+async def _collect_metrics_single(session, adv_id: int, cutoff: datetime, today_dt: datetime) -> dict:
+    """Per-advertiser metric queries (bulk=False path)."""
+    # 1. Active campaigns count
+    camp_count = (
+        await session.execute(
+            select(func.count(Campaign.id)).where(
+                and_(
+                    Campaign.advertiser_id == adv_id,
+                    Campaign.is_active == True,
+                )
+            )
+        )
+    ).scalar_one()
+
+    # 2. Creative count & variants (unique ad_text in period)
+    creative_q = (
+        select(
+            func.count(AdDetail.id),
+            func.count(func.distinct(AdDetail.ad_text)),
+        )
+        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+        .where(
+            and_(
+                AdDetail.advertiser_id == adv_id,
+                AdSnapshot.captured_at >= cutoff,
+            )
+        )
+    )
+    cr_result = (await session.execute(creative_q)).one()
+
+    # 3. Social post count
+    social_count = (
+        await session.execute(
+            select(func.count(BrandChannelContent.id)).where(
+                and_(
+                    BrandChannelContent.advertiser_id == adv_id,
+                    BrandChannelContent.upload_date >= cutoff,
+                )
+            )
+        )
+    ).scalar_one() or 0
+
+    # 4. Active campaign channels (diversity + stealth matching)
+    adv_channels = (
+        await session.execute(
+            select(func.distinct(Campaign.channel)).where(
+                and_(Campaign.advertiser_id == adv_id, Campaign.is_active == True)
+            )
+        )
+    ).scalars().all()
+
+    # Previous score for state determination
+    prev_q = (
+        select(ActivityScore.composite_score)
+        .where(
+            and_(
+                ActivityScore.advertiser_id == adv_id,
+                ActivityScore.date < today_dt,
+            )
+        )
+        .order_by(ActivityScore.date.desc())
+        .limit(1)
+    )
+    return {
+        "camp_count": camp_count,
+        "total_creatives": cr_result[0] or 0,
+        "creative_variants": cr_result[1] or 0,
+        "social_count": social_count,
+        "channels": list(adv_channels),
+        "prev_score": (await session.execute(prev_q)).scalar_one_or_none(),
+    }
+
+
+async def _collect_metrics_bulk(session, adv_scope, cutoff: datetime, today_dt: datetime) -> dict[int, dict]:
+    """All advertiser metrics with one GROUP BY query per metric (bulk=True path)."""
+    metrics: dict[int, dict] = {}
+
+    def _entry(adv_id: int) -> dict:
+        if adv_id not in metrics:
+            metrics[adv_id] = _empty_metrics()
+        return metrics[adv_id]
+
+    # 1 + 4. Active campaigns per channel → count + channel set
+    camp_rows = await session.execute(
+        select(Campaign.advertiser_id, Campaign.channel, func.count(Campaign.id))
+        .where(Campaign.is_active == True, Campaign.advertiser_id.in_(adv_scope))
+        .group_by(Campaign.advertiser_id, Campaign.channel)
+    )
+    for adv_id, channel, cnt in camp_rows.all():
+        entry = _entry(adv_id)
+        entry["camp_count"] += cnt
+        entry["channels"].append(channel)
+
+    # 2. Creative count & variants
+    creative_rows = await session.execute(
+        select(
+            AdDetail.advertiser_id,
+            func.count(AdDetail.id),
+            func.count(func.distinct(AdDetail.ad_text)),
+        )
+        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+        .where(AdSnapshot.captured_at >= cutoff, AdDetail.advertiser_id.in_(adv_scope))
+        .group_by(AdDetail.advertiser_id)
+    )
+    for adv_id, total, variants in creative_rows.all():
+        entry = _entry(adv_id)
+        entry["total_creatives"] = total or 0
+        entry["creative_variants"] = variants or 0
+
+    # 3. Social post count
+    social_rows = await session.execute(
+        select(BrandChannelContent.advertiser_id, func.count(BrandChannelContent.id))
+        .where(BrandChannelContent.upload_date >= cutoff, BrandChannelContent.advertiser_id.in_(adv_scope))
+        .group_by(BrandChannelContent.advertiser_id)
+    )
+    for adv_id, cnt in social_rows.all():
+        _entry(adv_id)["social_count"] = cnt or 0
+
+    # Previous score: latest row before today per advertiser
+    ranked = (
+        select(
+            ActivityScore.advertiser_id,
+            ActivityScore.composite_score,
+            func.row_number().over(
+                partition_by=ActivityScore.advertiser_id,
+                order_by=ActivityScore.date.desc(),
+            ).label("rn"),
+        )
+        .where(ActivityScore.date < today_dt, ActivityScore.advertiser_id.in_(adv_scope))
+        .subquery()
+    )
+    prev_rows = await session.execute(
+        select(ranked.c.advertiser_id, ranked.c.composite_score).where(ranked.c.rn == 1)
+    )
+    for adv_id, score in prev_rows.all():
+        _entry(adv_id)["prev_score"] = score
+
+    return metrics
+
+
+def _score_advertiser(metrics: dict, stealth_rates: dict[str, float], days: int) -> dict:
+    """Metrics → activity_scores column values."""
+    camp_count = metrics["camp_count"]
+    total_creatives = metrics["total_creatives"]
+    creative_variants = metrics["creative_variants"]
+    social_count = metrics["social_count"]
+    adv_channels = metrics["channels"]
+    chan_count = len(adv_channels)
+
+    # 5. Ad frequency (avg daily ad_hits)
+    daily_ads = total_creatives / max(1, days)
+
+    # 6. Stealth market signal — advertiser's channels matched to stealth contact rates
+    stealth_score = 0.0
+    if stealth_rates and adv_channels:
+        matched_scores = []
+        for ch in adv_channels:
+            net = _CHANNEL_TO_NETWORK.get(ch)
+            if net and net in stealth_rates:
+                matched_scores.append(stealth_rates[net])
+        if matched_scores:
+            stealth_score = sum(matched_scores) / len(matched_scores)
+
+    # Compute composite score
+    s_campaigns = _normalize(camp_count, MAX_CAMPAIGNS)
+    s_creatives = _normalize(creative_variants, MAX_CREATIVES)
+    s_social = _normalize(social_count, MAX_SOCIAL)
+    s_channels = _normalize(chan_count, MAX_CHANNELS)
+    s_frequency = _normalize(daily_ads, 10)
+    s_stealth = stealth_score  # already 0-100
+
+    composite = (
+        s_campaigns * W_CAMPAIGNS
+        + s_creatives * W_CREATIVES
+        + s_social * W_SOCIAL
+        + s_channels * W_CHANNELS
+        + s_frequency * W_FREQUENCY
+        + s_stealth * W_STEALTH
+    )
+    composite = round(min(100.0, composite), 1)
+
+    factors = {
+        "campaigns": camp_count,
+        "creatives": total_creatives,
+        "creative_variants": creative_variants,
+        "social_posts": social_count,
+        "channels": chan_count,
+        "daily_avg_ads": round(daily_ads, 1),
+        "stealth_score": round(stealth_score, 1),
+        "sub_scores": {
+            "campaigns": round(s_campaigns, 1),
+            "creatives": round(s_creatives, 1),
+            "social": round(s_social, 1),
+            "channels": round(s_channels, 1),
+            "frequency": round(s_frequency, 1),
+            "stealth": round(s_stealth, 1),
+        },
+    }
+    return {
+        "active_campaigns": camp_count,
+        "new_creatives": total_creatives,
+        "creative_variants": creative_variants,
+        "social_post_count": social_count,
+        "channel_count": chan_count,
+        "composite_score": composite,
+        "activity_state": _determine_state(composite, metrics["prev_score"]),
+        "factors": factors,
+    }
+
+
 async def calculate_activity_scores(
     session=None,
     days: int = 7,
     advertiser_ids: list[int] | None = None,
+    bulk: bool = True,
 ) -> dict:
     """Calculate activity scores for all active advertisers.
 
-    Returns: {"processed": N, "created": N, "updated": N}
+    bulk=True gathers every metric with one GROUP BY query per metric;
+    bulk=False issues the per-advertiser queries (kept for comparison).
+    Rows are upserted in one batch either way.
+
+    Returns: {"processed": N, "created": N, "updated": N, "elapsed_ms": N}
     """
     own_session = session is None
     if own_session:
         session = async_session()
 
     try:
+        started = time.perf_counter()
         now = datetime.now(UTC).replace(tzinfo=None)
         cutoff = now - timedelta(days=days)
         today = now.date()
@@ -147,185 +376,29 @@ async def calculate_activity_scores(
         active_adv_ids = [r[0] for r in result.fetchall()]
 
         if not active_adv_ids:
-            return {"processed": 0, "created": 0, "updated": 0}
-
-        created = 0
-        updated = 0
-
-        for adv_id in active_adv_ids:
-            # 1. Active campaigns count
-            camp_count = (
-                await session.execute(
-                    select(func.count(Campaign.id)).where(
-                        and_(
-                            Campaign.advertiser_id == adv_id,
-                            Campaign.is_active == True,
-                        )
-                    )
-                )
-            ).scalar_one()
-
-            # 2. Creative count & variants (unique ad_text in period)
-            creative_q = (
-                select(
-                    func.count(AdDetail.id),
-                    func.count(func.distinct(AdDetail.ad_text)),
-                )
-                .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-                .where(
-                    and_(
-                        AdDetail.advertiser_id == adv_id,
-                        AdSnapshot.captured_at >= cutoff,
-                    )
-                )
-            )
-            cr_result = (await session.execute(creative_q)).one()
-            total_creatives = cr_result[0] or 0
-            creative_variants = cr_result[1] or 0
-
-            # 3. Social post count
-            social_count = (
-                await session.execute(
-                    select(func.count(BrandChannelContent.id)).where(
-                        and_(
-                            BrandChannelContent.advertiser_id == adv_id,
-                            BrandChannelContent.upload_date >= cutoff,
-                        )
-                    )
-                )
-            ).scalar_one() or 0
-
-            # 4. Channel diversity
-            chan_count = (
-                await session.execute(
-                    select(func.count(func.distinct(Campaign.channel))).where(
-                        and_(
-                            Campaign.advertiser_id == adv_id,
-                            Campaign.is_active == True,
-                        )
-                    )
-                )
-            ).scalar_one() or 0
-
-            # 5. Ad frequency (avg daily ad_hits)
-            daily_ads = total_creatives / max(1, days)
-
-            # 6. Stealth market signal — advertiser's channels matched to stealth contact rates
-            adv_channels = (
-                await session.execute(
-                    select(func.distinct(Campaign.channel)).where(
-                        and_(Campaign.advertiser_id == adv_id, Campaign.is_active == True)
-                    )
-                )
-            ).scalars().all()
-            stealth_score = 0.0
-            if stealth_rates and adv_channels:
-                matched_scores = []
-                for ch in adv_channels:
-                    net = _CHANNEL_TO_NETWORK.get(ch)
-                    if net and net in stealth_rates:
-                        matched_scores.append(stealth_rates[net])
-                if matched_scores:
-                    stealth_score = sum(matched_scores) / len(matched_scores)
-
-            # Compute composite score
-            s_campaigns = _normalize(camp_count, MAX_CAMPAIGNS)
-            s_creatives = _normalize(creative_variants, MAX_CREATIVES)
-            s_social = _normalize(social_count, MAX_SOCIAL)
-            s_channels = _normalize(chan_count, MAX_CHANNELS)
-            s_frequency = _normalize(daily_ads, 10)
-            s_stealth = stealth_score  # already 0-100
-
-            composite = (
-                s_campaigns * W_CAMPAIGNS
-                + s_creatives * W_CREATIVES
-                + s_social * W_SOCIAL
-                + s_channels * W_CHANNELS
-                + s_frequency * W_FREQUENCY
-                + s_stealth * W_STEALTH
-            )
-            composite = round(min(100.0, composite), 1)
-
-            # Previous score for state determination
-            prev_q = (
-                select(ActivityScore.composite_score)
-                .where(
-                    and_(
-                        ActivityScore.advertiser_id == adv_id,
-                        ActivityScore.date < today_dt,
-                    )
-                )
-                .order_by(ActivityScore.date.desc())
-                .limit(1)
-            )
-            prev_row = (await session.execute(prev_q)).scalar_one_or_none()
-
-            state = _determine_state(composite, prev_row)
-
-            factors = {
-                "campaigns": camp_count,
-                "creatives": total_creatives,
-                "creative_variants": creative_variants,
-                "social_posts": social_count,
-                "channels": chan_count,
-                "daily_avg_ads": round(daily_ads, 1),
-                "stealth_score": round(stealth_score, 1),
-                "sub_scores": {
-                    "campaigns": round(s_campaigns, 1),
-                    "creatives": round(s_creatives, 1),
-                    "social": round(s_social, 1),
-                    "channels": round(s_channels, 1),
-                    "frequency": round(s_frequency, 1),
-                    "stealth": round(s_stealth, 1),
-                },
+            return {"processed": 0, "created": 0, "updated": 0,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000)}
+
+        if bulk:
+            collected = await _collect_metrics_bulk(session, adv_query, cutoff, today_dt)
+            metrics = {adv_id: collected.get(adv_id) or _empty_metrics() for adv_id in active_adv_ids}
+        else:
+            metrics = {
+                adv_id: await _collect_metrics_single(session, adv_id, cutoff, today_dt)
+                for adv_id in active_adv_ids
             }
 
-            # Upsert
-            existing = (
-                await session.execute(
-                    select(ActivityScore).where(
-                        and_(
-                            ActivityScore.advertiser_id == adv_id,
-                            ActivityScore.date == today_dt,
-                        )
-                    )
-                )
-            ).scalar_one_or_none()
-
-            if existing:
-                existing.active_campaigns = camp_count
-                existing.new_creatives = total_creatives
-                existing.creative_variants = creative_variants
-                existing.social_post_count = social_count
-                existing.channel_count = chan_count
-                existing.composite_score = composite
-                existing.activity_state = state
-                existing.factors = factors
-                updated += 1
-            else:
-                session.add(
-                    ActivityScore(
-                        advertiser_id=adv_id,
-                        date=today_dt,
-                        active_campaigns=camp_count,
-                        new_creatives=total_creatives,
-                        creative_variants=creative_variants,
-                        social_post_count=social_count,
-                        channel_count=chan_count,
-                        composite_score=composite,
-                        activity_state=state,
-                        factors=factors,
-                    )
-                )
-                created += 1
+        rows = {adv_id: _score_advertiser(m, stealth_rates, days) for adv_id, m in metrics.items()}
+        created, updated = await upsert_daily_scores(session, ActivityScore, today_dt, rows)
 
         await session.commit()
         total = len(active_adv_ids)
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
         logger.info(
-            "[activity_scorer] processed=%d created=%d updated=%d",
-            total, created, updated,
+            "[activity_scorer] processed=%d created=%d updated=%d bulk=%s elapsed=%dms",
+            total, created, updated, bulk, elapsed_ms,
         )
-        return {"processed": total, "created": created, "updated": updated}
+        return {"processed": total, "created": created, "updated": updated, "elapsed_ms": elapsed_ms}
 
     finally:
         if own_session:
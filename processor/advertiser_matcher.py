@@ -1,8 +1,16 @@
-"""광고주 자동 매칭 — 이름/도메인/별칭 기반 기존 광고주 식별."""
+"""광고주 자동 매칭 — 이름/도메인/별칭 기반 기존 광고주 식별.
 
+퍼지 매칭은 _FuzzyCandidateIndex로 후보를 좁힌 뒤 점수를 계산한다.
+후보 필터는 token_sort_ratio 점수 상한(길이 + 문자 multiset 교집합)에 기반한
+무손실 필터이므로, MATCH_THRESHOLD 이상 결과는 전체 스캔과 동일하다.
+"""
+
+import math
 import re
+from collections import Counter
 from urllib.parse import urlparse
 
+import numpy as np
 from rapidfuzz import fuzz, process
 
 
@@ -12,6 +20,68 @@ _CORP_SUFFIX_RE = re.compile(
 )
 
 
+def _sort_tokens(text: str) -> str:
+    """fuzz.token_sort_ratio가 비교하는 형태 (공백 토큰 정렬 후 단일 공백 결합)."""
+    return " ".join(sorted(text.split()))
+
+
+def _elements(text: str) -> list[tuple[str, int]]:
+    """문자 multiset → (문자, 출현순번) 집합. 집합 교집합 크기 == multiset 교집합 크기."""
+    seen: Counter = Counter()
+    out = []
+    for ch in text:
+        out.append((ch, seen[ch]))
+        seen[ch] += 1
+    return out
+
+
+class _FuzzyCandidateIndex:
+    """문자 단위 역색인 + length/count 필터.
+
+    token_sort_ratio = 200 * LCS / (l1 + l2) 이고 LCS ≤ min(l1, l2), LCS ≤ 문자 multiset 교집합
+    이므로 점수 ≥ 100r 인 후보는 길이 범위와 2 * 교집합 ≥ r * (l1 + l2)를 만족해야 한다.
+    원소를 (문자, 출현순번)으로 두면 교집합 크기 == 질의 원소 posting에 등장한 횟수이므로
+    질의 원소 posting만 NumPy로 누적해 전체 후보의 상한을 한 번에 구한다.
+    한글은 음절 종류가 많아 posting이 짧다.
+    """
+
+    def __init__(self, choices: list[str], min_score: float):
+        self.choices = choices
+        self.ratio = min_score / 100.0
+        postings: dict[tuple[str, int], list[int]] = {}
+        lengths = []
+        for pos, choice in enumerate(choices):
+            sorted_text = _sort_tokens(choice)
+            lengths.append(len(sorted_text))
+            for elem in _elements(sorted_text):
+                postings.setdefault(elem, []).append(pos)
+        self._lengths = np.asarray(lengths, dtype=np.int32)
+        self._postings = {e: np.asarray(p, dtype=np.int32) for e, p in postings.items()}
+
+    def candidates(self, query: str) -> list[int] | None:
+        """후보 위치 목록 (원래 순서). None이면 필터 불가 → 전체 스캔."""
+        q = _sort_tokens(query)
+        l1 = len(q)
+        r = self.ratio
+        if l1 == 0 or r <= 0:
+            return None
+
+        common = np.zeros(len(self.choices), dtype=np.int32)
+        for elem in _elements(q):
+            posting = self._postings.get(elem)
+            if posting is not None:
+                common[posting] += 1
+
+        min_len = math.ceil(l1 * r / (2 - r) - 1e-9)
+        max_len = math.floor(l1 * (2 - r) / r + 1e-9)
+        mask = (
+            (self._lengths >= min_len)
+            & (self._lengths <= max_len)
+            & (2 * common >= r * (l1 + self._lengths) - 1e-9)
+        )
+        return np.flatnonzero(mask).tolist()
+
+
 class AdvertiserMatcher:
     """크롤링된 광고주명을 기존 광고주 DB와 매칭."""
 
@@ -22,6 +92,7 @@ class AdvertiserMatcher:
         self._name_to_id: dict[str, int] = {}
         self._norm_to_id: dict[str, int] = {}
         self._domain_to_id: dict[str, int] = {}  # "samsung.com" -> id
+        self._fuzzy_index: _FuzzyCandidateIndex | None = None
 
     @staticmethod
     def _normalize(name: str) -> str:
@@ -59,6 +130,7 @@ class AdvertiserMatcher:
         self._name_to_id.clear()
         self._norm_to_id.clear()
         self._domain_to_id.clear()
+        self._fuzzy_index = None
 
         for adv in advertisers:
             adv_id = adv["id"]
@@ -97,19 +169,19 @@ class AdvertiserMatcher:
         if not raw_name or not self._name_to_id:
             return None, 0.0
 
-        # 1) 정확 매칭
-        if raw_name in self._name_to_id:
-            return self._name_to_id[raw_name], 100.0
-
-        # 2) 정규화 후 정확 매칭 (대소문자/공백/법인격 표기 무시)
-        norm = self._normalize(raw_name)
-        if norm in self._norm_to_id:
-            return self._norm_to_id[norm], 100.0
+        exact = self._match_exact(raw_name)
+        if exact is not None:
+            return exact
 
-        # 3) 퍼지 매칭
+        # 3) 퍼지 매칭 (후보 인덱스로 좁힌 뒤 점수 계산)
+        index = self._get_fuzzy_index()
+        positions = index.candidates(raw_name)
+        choices = index.choices if positions is None else [index.choices[p] for p in positions]
+        if not choices:
+            return None, 0.0
         result = process.extractOne(
             raw_name,
-            self._name_to_id.keys(),
+            choices,
             scorer=fuzz.token_sort_ratio,
         )
 
@@ -118,3 +190,93 @@ class AdvertiserMatcher:
             return self._name_to_id[matched_name], result[1]
 
         return None, 0.0
+
+    def _match_exact(self, raw_name: str) -> tuple[int, float] | None:
+        # 1) 정확 매칭
+        if raw_name in self._name_to_id:
+            return self._name_to_id[raw_name], 100.0
+
+        # 2) 정규화 후 정확 매칭 (대소문자/공백/법인격 표기 무시)
+        norm = self._normalize(raw_name)
+        if norm in self._norm_to_id:
+            return self._norm_to_id[norm], 100.0
+        return None
+
+    def _get_fuzzy_index(self) -> _FuzzyCandidateIndex:
+        if self._fuzzy_index is None:
+            # 후보 필터는 임계값보다 1점 느슨하게 (float 반올림 여유)
+            self._fuzzy_index = _FuzzyCandidateIndex(
+                list(self._name_to_id.keys()), self.MATCH_THRESHOLD - 1,
+            )
+        return self._fuzzy_index
+
+    def match_many(
+        self,
+        raw_names: list[str],
+        urls: list[str | None] | None = None,
+        workers: int = -1,
+        chunk_size: int = 256,
+    ) -> list[tuple[int | None, float]]:
+        """match()의 배치 버전 — 결과는 match()를 순서대로 호출한 것과 동일.
+
+        도메인/정확 매칭은 메모리에서 처리하고, 남은 이름은 chunk_size개씩 묶어
+        (후보 합집합) x (질의) 행렬을 rapidfuzz.process.cdist(workers 스레드)로 계산한다.
+        """
+        urls = urls if urls is not None else [None] * len(raw_names)
+        results: list[tuple[int | None, float] | None] = [None] * len(raw_names)
+        pending: list[int] = []
+        for i, (raw_name, url) in enumerate(zip(raw_names, urls)):
+            if not raw_name and not url:
+                results[i] = (None, 0.0)
+                continue
+            if url:
+                domain = self._extract_root_domain(url)
+                if domain and domain in self._domain_to_id:
+                    results[i] = (self._domain_to_id[domain], 100.0)
+                    continue
+            if not raw_name or not self._name_to_id:
+                results[i] = (None, 0.0)
+                continue
+            exact = self._match_exact(raw_name)
+            if exact is not None:
+                results[i] = exact
+                continue
+            pending.append(i)
+
+        if pending:
+            index = self._get_fuzzy_index()
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start:start + chunk_size]
+                per_query = [index.candidates(raw_names[i]) for i in chunk]
+                if any(p is None for p in per_query):
+                    columns = list(range(len(index.choices)))
+                else:
+                    columns = sorted(set().union(*per_query))
+                if not columns:
+                    for i in chunk:
+                        results[i] = (None, 0.0)
+                    continue
+                choices = [index.choices[p] for p in columns]
+                scores = process.cdist(
+                    [raw_names[i] for i in chunk],
+                    choices,
+                    scorer=fuzz.token_sort_ratio,
+                    score_cutoff=self.MATCH_THRESHOLD - 1,
+                    dtype=np.float32,
+                    workers=workers,
+                )
+                best = scores.argmax(axis=1)  # 동점이면 앞선 후보 (extractOne과 동일)
+                for row, i in enumerate(chunk):
+                    col = int(best[row])
+                    if scores[row, col] <= 0:
+                        results[i] = (None, 0.0)
+                        continue
+                    matched_name = choices[col]
+                    # float32 행렬 대신 match()와 같은 float64 점수로 재계산
+                    score = fuzz.token_sort_ratio(raw_names[i], matched_name)
+                    if score >= self.MATCH_THRESHOLD:
+                        results[i] = (self._name_to_id[matched_name], score)
+                    else:
+                        results[i] = (None, 0.0)
+
+        return results
@@ -13,13 +13,24 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import UTC, date, datetime, time
+from datetime import UTC, date, datetime, time, timedelta
 import os
 
-from sqlalchemy import delete, func, select
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, or_, select, update
 
 from database import async_session
-from database.models import AdDetail, AdSnapshot, Advertiser, Campaign, Keyword, SpendEstimate
+from database.models import (
+    AdDetail,
+    AdSnapshot,
+    Advertiser,
+    BuildWatermark,
+    Campaign,
+    Keyword,
+    SpendEstimate,
+)
 from processor.advertiser_name_cleaner import clean_name_for_pipeline
 from processor.advertiser_verifier import NameQuality, verify_advertiser_name
 from processor.advertiser_link_collector import extract_website_from_url
@@ -27,6 +38,19 @@ from processor.spend_estimator import SpendEstimatorV2
 
 DEFAULT_EXCLUDED_CHANNELS: set[str] = set()  # youtube_ads 포함 (2,372건 활용)
 
+# ── 증분 재빌드 ──
+# 워터마크(마지막 반영 ad_detail id / last_seen_at) 이후 변경된 (advertiser_id, channel)
+# 키를 찾아 해당 광고주의 캠페인만 재집계한다. 크로스채널 병합이 광고주 단위로 spend를
+# 합산하므로 재집계 단위도 광고주 전체 채널로 맞춘다 (부분 채널만 갱신하면 병합 시 이중 합산).
+# 보정용 전체 재빌드는 CAMPAIGN_FULL_REBUILD_HOURS 주기로 자동 수행.
+_WATERMARK_NAME = "campaign_spend"
+# seen bump는 last_seen_at에 저장 시각이 아닌 크롤 시작 시각(captured_at)을 남기므로, 워터마크 이후
+# 커밋된 장시간 크롤의 bump를 놓치지 않도록 크롤 소요 시간만큼 겹쳐서 재조회 (재집계는 멱등)
+_WATERMARK_OVERLAP = timedelta(hours=2)
+DEFAULT_FULL_REBUILD_HOURS = 24
+# SQLite 바인드 변수 한도 내에서 IN 절을 나눠 실행
+_KEY_CHUNK_SIZE = 500
+
 # ── Channel -> spend_category mapping ──
 _CHANNEL_SPEND_CATEGORY: dict[str, str] = {
     "naver_shopping": "shopping",
@@ -83,21 +107,76 @@ def _parse_excluded_channels(raw: str | None, default: set[str] | None = None) -
     return {chunk.strip() for chunk in raw.split(",") if chunk.strip()}
 
 
+def _parse_full_rebuild_hours(raw: str | None) -> int:
+    try:
+        return max(0, int(raw)) if raw is not None else DEFAULT_FULL_REBUILD_HOURS
+    except ValueError:
+        return DEFAULT_FULL_REBUILD_HOURS
+
+
+def _chunks(values, size: int = _KEY_CHUNK_SIZE):
+    values = sorted(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+_AGG_COLUMNS = (
+    "advertiser_id",
+    "keyword_id",
+    "channel",
+    "snapshot_id",
+    "captured_at",
+    "position",
+    "position_zone",
+    "is_inhouse",
+    "ad_placement",
+    "is_contact",
+    "view_count",
+    "upload_date",
+    "seen_count",
+    "first_seen_at",
+    "last_seen_at",
+)
+
+
+def _empty(dtype=np.int64) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
 @dataclass
 class DayAggregate:
+    """캠페인 하루치 집계 (CampaignAggregate 배열의 한 행을 펼친 뷰)."""
+
     ad_hits: int = 0
-    positions: list[int] = field(default_factory=list)
-    position_zones: list[str] = field(default_factory=list)
     inhouse_count: int = 0
+    position_count: int = 0   # position > 0 관측 수
+    position_sum: int = 0
+    zone_counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def avg_position(self) -> float | None:
+        return self.position_sum / self.position_count if self.position_count else None
 
 
 @dataclass
 class CampaignAggregate:
+    """(advertiser_id, channel) 캠페인 집계.
+
+    일자별 값은 days 순으로 정렬된 NumPy 배열(전체 집계 배열의 슬라이스)로 보관한다.
+    """
+
+    dominant_keyword_id: int | None = None  # 가장 빈번한 keyword_id (동률이면 먼저 관측된 것)
     first_seen: datetime | None = None
     last_seen: datetime | None = None
-    snapshot_ids: set[int] = field(default_factory=set)
+    snapshot_ids: np.ndarray = field(default_factory=_empty)  # 정렬된 고유 snapshot id
     ad_occurrences: int = 0
-    by_day: dict[date, DayAggregate] = field(default_factory=dict)
+    days: np.ndarray = field(default_factory=lambda: _empty("datetime64[D]"))
+    day_hits: np.ndarray = field(default_factory=_empty)
+    day_inhouse: np.ndarray = field(default_factory=_empty)
+    day_position_count: np.ndarray = field(default_factory=_empty)
+    day_position_sum: np.ndarray = field(default_factory=_empty)
+    day_zone_counts: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.int64))
+    zone_labels: tuple[str, ...] = ()
     placements: set[str] = field(default_factory=set)
     has_inhouse: bool = False
     has_contact: bool = False
@@ -105,6 +184,31 @@ class CampaignAggregate:
     total_view_count: int = 0   # 모든 소재의 조회수 합계
     view_count_sources: int = 0  # view_count가 있는 소재 수
 
+    @property
+    def active_days(self) -> int:
+        return len(self.days)
+
+    def iter_days(self):
+        """(date, ad_hits, inhouse_count) 순회."""
+        return zip(self.days.tolist(), self.day_hits.tolist(), self.day_inhouse.tolist())
+
+    @property
+    def by_day(self) -> dict[date, DayAggregate]:
+        return {
+            day: DayAggregate(
+                ad_hits=int(self.day_hits[i]),
+                inhouse_count=int(self.day_inhouse[i]),
+                position_count=int(self.day_position_count[i]),
+                position_sum=int(self.day_position_sum[i]),
+                zone_counts={
+                    label: int(count)
+                    for label, count in zip(self.zone_labels, self.day_zone_counts[i])
+                    if count
+                },
+            )
+            for i, day in enumerate(self.days.tolist())
+        }
+
 
 async def _backfill_advertiser_ids() -> tuple[int, int]:
     """advertiser_id가 NULL인 ad_details에 대해서만 광고주 매칭/생성을 수행한다.
@@ -191,7 +295,14 @@ async def _delete_excluded_campaign_data(excluded_channels: set[str]) -> None:
         await session.commit()
 
 
-async def _backfill_advertiser_industries(excluded_channels: set[str] | None = None) -> int:
+async def _backfill_advertiser_industries(
+    excluded_channels: set[str] | None = None,
+    advertiser_ids: set[int] | None = None,
+) -> int:
+    """업종 미지정 광고주에 키워드 기준 최빈 업종을 채운다.
+
+    advertiser_ids가 주어지면 (증분 재빌드) 해당 광고주 중 업종 미지정인 것만 집계한다.
+    """
     async with async_session() as session:
         query = (
             select(AdDetail.advertiser_id, Keyword.industry_id)
@@ -203,11 +314,24 @@ async def _backfill_advertiser_industries(excluded_channels: set[str] | None = N
         if excluded_channels:
             query = query.where(AdSnapshot.channel.notin_(list(excluded_channels)))
 
-        rows = await session.execute(query)
+        if advertiser_ids is None:
+            queries = [query]
+        else:
+            pending = (
+                await session.execute(
+                    select(Advertiser.id).where(
+                        Advertiser.id.in_(list(advertiser_ids)),
+                        Advertiser.industry_id.is_(None),
+                    )
+                )
+            ).scalars().all()
+            queries = [query.where(AdDetail.advertiser_id.in_(chunk)) for chunk in _chunks(pending)]
 
         counts: dict[int, dict[int, int]] = defaultdict(lambda: defaultdict(int))
-        for advertiser_id, industry_id in rows.all():
-            counts[int(advertiser_id)][int(industry_id)] += 1
+        for q in queries:
+            rows = await session.execute(q)
+            for advertiser_id, industry_id in rows.all():
+                counts[int(advertiser_id)][int(industry_id)] += 1
 
         dominant: dict[int, int] = {}
         for advertiser_id, industry_counts in counts.items():
@@ -239,11 +363,13 @@ async def _backfill_advertiser_industries(excluded_channels: set[str] | None = N
 
 async def _collect_aggregates(
     excluded_channels: set[str] | None = None,
+    advertiser_ids: set[int] | None = None,
 ) -> dict[tuple[int, str], CampaignAggregate]:
     """Collect per-(advertiser, channel) aggregates.
 
     Grouping key: (advertiser_id, channel) — 동일 광고주의 동일 채널 소재는
     하나의 캠페인으로 합산. keyword_id는 가장 빈번한 것을 대표값으로 저장.
+    advertiser_ids가 주어지면 해당 광고주의 소재만 집계한다 (증분 재빌드).
     """
     async with async_session() as session:
         query = (
@@ -258,7 +384,9 @@ async def _collect_aggregates(
                 AdDetail.is_inhouse,
                 AdDetail.ad_placement,
                 AdDetail.is_contact,
-                AdDetail.extra_data,
+                # extra_data 전체를 행마다 역직렬화하지 않고 필요한 키만 추출
+                func.json_extract(AdDetail.extra_data, "$.view_count"),
+                func.json_extract(AdDetail.extra_data, "$.upload_date"),
                 AdDetail.seen_count,
                 AdDetail.first_seen_at,
                 AdDetail.last_seen_at,
@@ -272,88 +400,198 @@ async def _collect_aggregates(
         if excluded_channels:
             query = query.where(AdSnapshot.channel.notin_(list(excluded_channels)))
 
-        rows = await session.execute(query)
-
-        aggregates: dict[tuple[int, str], CampaignAggregate] = {}
-        keyword_counts: dict[tuple[int, str], dict[int, int]] = {}  # track dominant keyword
-        for row in rows.all():
-            advertiser_id, keyword_id, channel, snapshot_id, captured_at, position, \
-                position_zone, is_inhouse, ad_placement, is_contact, extra_data, \
-                seen_count, first_seen_at, last_seen_at = row
-            key = (int(advertiser_id), str(channel))
-            agg = aggregates.get(key)
-            if agg is None:
-                agg = CampaignAggregate()
-                aggregates[key] = agg
-                keyword_counts[key] = {}
-
-            # Track keyword frequency for dominant keyword selection
-            if keyword_id is not None:
-                kw_id = int(keyword_id)
-                keyword_counts[key][kw_id] = keyword_counts[key].get(kw_id, 0) + 1
-
-            # Use seen_count to reflect true observation frequency (post-dedup)
-            effective_count = max(1, seen_count or 1)
-            agg.ad_occurrences += effective_count
-            agg.snapshot_ids.add(int(snapshot_id))
-            # Use dedup-tracked timestamps if available, fallback to snapshot captured_at
-            effective_first = first_seen_at or captured_at
-            effective_last = last_seen_at or captured_at
-            agg.first_seen = effective_first if agg.first_seen is None else min(agg.first_seen, effective_first)
-            agg.last_seen = effective_last if agg.last_seen is None else max(agg.last_seen, effective_last)
-
-            if ad_placement:
-                agg.placements.add(str(ad_placement))
-            if is_inhouse:
-                agg.has_inhouse = True
-            if is_contact:
-                agg.has_contact = True
-            # YouTube view_count from extra_data
-            # 최근 30일 내 업로드 + 10만회 초과 영상만 광고비 계산 대상
-            if isinstance(extra_data, dict):
-                vc = extra_data.get("view_count")
-                if isinstance(vc, (int, float)) and vc > 0:
-                    vc_int = int(vc)
-                    if vc_int > agg.max_view_count:
-                        agg.max_view_count = vc_int
-                    # 최근 30일 내 업로드된 10만회+ 영상만 광고비 추정에 사용
-                    if vc_int >= 100_000:
-                        upload_date_str = extra_data.get("upload_date", "")
-                        is_recent = False
-                        if upload_date_str:
-                            try:
-                                from datetime import datetime as _dt
-                                ud = _dt.strptime(str(upload_date_str)[:8], "%Y%m%d")
-                                is_recent = (_dt.utcnow() - ud).days <= 30
-                            except (ValueError, TypeError):
-                                is_recent = False
-                        if is_recent:
-                            agg.total_view_count += vc_int
-                            agg.view_count_sources += 1
-
-            # Distribute ad_hits across observed date range (dedup-aware)
-            start_date = (first_seen_at or captured_at).date()
-            end_date = (last_seen_at or captured_at).date()
-            active_days_range = max(1, (end_date - start_date).days + 1)
-            hits_per_day = max(1, effective_count // active_days_range)
-
-            from datetime import timedelta
-            current_day = start_date
-            while current_day <= end_date:
-                day_agg = agg.by_day.get(current_day)
-                if day_agg is None:
-                    day_agg = DayAggregate()
-                    agg.by_day[current_day] = day_agg
-                day_agg.ad_hits += hits_per_day
-                if position is not None and position > 0:
-                    day_agg.positions.append(int(position))
-                if position_zone:
-                    day_agg.position_zones.append(str(position_zone))
-                if is_inhouse:
-                    day_agg.inhouse_count += 1
-                current_day += timedelta(days=1)
-
-        return aggregates, keyword_counts
+        if advertiser_ids is None:
+            queries = [query]
+        else:
+            queries = [query.where(AdDetail.advertiser_id.in_(chunk)) for chunk in _chunks(advertiser_ids)]
+
+        rows = []
+        for q in queries:
+            rows.extend((await session.execute(q)).all())
+
+    return _aggregate_rows(rows)
+
+
+def _recent_upload_flags(upload_dates: list, now: datetime) -> list[bool]:
+    """upload_date(YYYYMMDD...)가 최근 30일 이내인지. 같은 값은 한 번만 파싱."""
+    cache: dict[str, bool] = {}
+    flags = []
+    for raw in upload_dates:
+        if not raw:
+            flags.append(False)
+            continue
+        text = str(raw)[:8]
+        recent = cache.get(text)
+        if recent is None:
+            try:
+                recent = (now - datetime.strptime(text, "%Y%m%d")).days <= 30
+            except (ValueError, TypeError):
+                recent = False
+            cache[text] = recent
+        flags.append(recent)
+    return flags
+
+
+def _aggregate_rows(rows) -> dict[tuple[int, str], CampaignAggregate]:
+    """소재 행을 (advertiser_id, channel) 캠페인 집계로 변환 (컬럼 단위 벡터 연산).
+
+    rows: _AGG_COLUMNS 순서의 튜플. 각 소재의 ad_hits를 first_seen~last_seen 일자에
+    나눠 배분(dedup-aware)하고, (키, 일자)별로 hits/인하우스/노출위치/지면 zone을 합산한다.
+    """
+    if not rows:
+        return {}
+
+    df = pd.DataFrame.from_records(rows, columns=_AGG_COLUMNS)
+    n = len(df)
+
+    # ── 캠페인 키: (advertiser_id, channel), 최초 등장 순서 유지 ──
+    channel_codes, channel_labels = pd.factorize(df["channel"].astype(str))
+    advertiser = df["advertiser_id"].to_numpy(dtype=np.int64)
+    key_idx, key_codes = pd.factorize(advertiser * len(channel_labels) + channel_codes)
+    key_count = len(key_codes)
+    key_advertiser = key_codes // len(channel_labels)
+    key_channel = channel_labels.to_numpy(dtype=object)[key_codes % len(channel_labels)]
+
+    # Use seen_count to reflect true observation frequency (post-dedup)
+    effective = np.maximum(1, pd.to_numeric(df["seen_count"]).fillna(1).to_numpy(dtype=np.int64))
+    # Use dedup-tracked timestamps if available, fallback to snapshot captured_at
+    captured = pd.to_datetime(df["captured_at"])
+    first = pd.to_datetime(df["first_seen_at"]).fillna(captured)
+    last = pd.to_datetime(df["last_seen_at"]).fillna(captured)
+
+    by_key = pd.DataFrame({"k": key_idx, "first": first, "last": last, "eff": effective})
+    grouped = by_key.groupby("k", sort=True)
+    first_seen = list(grouped["first"].min().dt.to_pydatetime())
+    last_seen = list(grouped["last"].max().dt.to_pydatetime())
+    occurrences = grouped["eff"].sum().to_numpy()
+
+    is_inhouse = df["is_inhouse"].fillna(False).astype(bool).to_numpy()
+    is_contact = df["is_contact"].fillna(False).astype(bool).to_numpy()
+    has_inhouse = np.bincount(key_idx, weights=is_inhouse, minlength=key_count) > 0
+    has_contact = np.bincount(key_idx, weights=is_contact, minlength=key_count) > 0
+
+    # snapshot id: 키별 정렬된 고유 배열
+    snaps = (
+        pd.DataFrame({"k": key_idx, "s": df["snapshot_id"].to_numpy(dtype=np.int64)})
+        .drop_duplicates()
+        .sort_values(["k", "s"])
+    )
+    snapshot_groups = np.split(
+        snaps["s"].to_numpy(),
+        np.cumsum(np.bincount(snaps["k"].to_numpy(), minlength=key_count))[:-1],
+    )
+
+    placements: dict[int, set[str]] = defaultdict(set)
+    placement = df["ad_placement"]
+    placement_idx, placement_labels = pd.factorize(
+        placement.where(placement.notna() & (placement.astype(str) != "")).astype(object)
+    )
+    placement_labels = [str(p) for p in placement_labels]
+    has_placement = placement_idx >= 0
+    for code in np.unique(key_idx[has_placement].astype(np.int64) * len(placement_labels)
+                          + placement_idx[has_placement]).tolist():
+        placements[code // len(placement_labels)].add(placement_labels[code % len(placement_labels)])
+
+    # ── YouTube view_count: 최근 30일 내 업로드 + 10만회 이상만 광고비 계산 대상 ──
+    max_views = np.zeros(key_count, dtype=np.int64)
+    total_views = np.zeros(key_count, dtype=np.int64)
+    view_sources = np.zeros(key_count, dtype=np.int64)
+    view_rows = [
+        (i, int(vc))
+        for i, vc in zip(np.flatnonzero(df["view_count"].notna().to_numpy()).tolist(),
+                         df["view_count"].dropna().tolist())
+        if isinstance(vc, (int, float)) and vc > 0
+    ]
+    if view_rows:
+        idx = np.array([i for i, _ in view_rows], dtype=np.int64)
+        views = np.array([v for _, v in view_rows], dtype=np.int64)
+        np.maximum.at(max_views, key_idx[idx], views)
+        candidates = views >= 100_000
+        recent = np.array(
+            _recent_upload_flags(df["upload_date"].to_numpy()[idx[candidates]].tolist(), datetime.utcnow()),
+            dtype=bool,
+        )
+        counted_idx = idx[candidates][recent]
+        counted_views = views[candidates][recent]
+        np.add.at(total_views, key_idx[counted_idx], counted_views)
+        np.add.at(view_sources, key_idx[counted_idx], 1)
+
+    # ── Distribute ad_hits across observed date range (dedup-aware) ──
+    # 행마다 관측 일수만큼 repeat 후 cumsum 오프셋으로 일자를 펼친다.
+    start_day = first.to_numpy().astype("datetime64[D]").astype(np.int64)
+    end_day = last.to_numpy().astype("datetime64[D]").astype(np.int64)
+    span = end_day - start_day + 1
+    hits_per_day = np.maximum(1, effective // np.maximum(1, span))
+    n_days = np.maximum(span, 0)
+    row_of = np.repeat(np.arange(n, dtype=np.int32), n_days)
+    day_of = start_day[row_of] + (np.arange(len(row_of)) - np.repeat(np.cumsum(n_days) - n_days, n_days))
+
+    day_min = int(day_of.min()) if len(day_of) else 0
+    day_span = int(day_of.max()) - day_min + 1 if len(day_of) else 1
+    group_codes, group_of = np.unique(key_idx[row_of] * day_span + (day_of - day_min), return_inverse=True)
+    del day_of
+    group_count = len(group_codes)
+    group_key = group_codes // day_span
+    group_day = (group_codes % day_span + day_min).astype("datetime64[D]")
+
+    position = pd.to_numeric(df["position"]).to_numpy(dtype=np.float64)
+    has_position = position > 0
+    position_value = np.where(has_position, position, 0).astype(np.int64)
+    day_hits = np.bincount(group_of, weights=hits_per_day[row_of], minlength=group_count).astype(np.int64)
+    day_inhouse = np.bincount(group_of, weights=is_inhouse[row_of], minlength=group_count).astype(np.int64)
+    day_position_count = np.bincount(group_of, weights=has_position[row_of], minlength=group_count).astype(np.int64)
+    day_position_sum = np.bincount(group_of, weights=position_value[row_of], minlength=group_count).astype(np.int64)
+
+    zone = df["position_zone"]
+    zone_codes, zone_labels = pd.factorize(zone.where(zone.notna() & (zone.astype(str) != "")).astype(object))
+    zone_labels = tuple(str(z) for z in zone_labels)
+    zone_of = zone_codes[row_of]
+    zone_mask = zone_of >= 0
+    day_zone_counts = np.bincount(
+        group_of[zone_mask] * len(zone_labels) + zone_of[zone_mask],
+        minlength=group_count * len(zone_labels),
+    ).reshape(group_count, len(zone_labels))
+
+    bounds = np.searchsorted(group_key, np.arange(key_count + 1))
+
+    # Dominant keyword: 키별 최빈 keyword_id (동률이면 먼저 등장한 키워드)
+    dominant_keyword = np.full(key_count, -1, dtype=np.int64)
+    keyword = df["keyword_id"]
+    has_keyword = keyword.notna().to_numpy()
+    if has_keyword.any():
+        keyword_ids = keyword[has_keyword].astype(np.int64).to_numpy()
+        keyword_span = int(keyword_ids.max()) + 1
+        pair_idx, pair_codes = pd.factorize(key_idx[has_keyword].astype(np.int64) * keyword_span + keyword_ids)
+        pair_sizes = np.bincount(pair_idx, minlength=len(pair_codes))
+        pair_key = pair_codes // keyword_span
+        order = np.lexsort((np.arange(len(pair_codes)), -pair_sizes, pair_key))
+        first_of_key = order[np.r_[True, pair_key[order][1:] != pair_key[order][:-1]]]
+        dominant_keyword[pair_key[first_of_key]] = pair_codes[first_of_key] % keyword_span
+
+    aggregates: dict[tuple[int, str], CampaignAggregate] = {}
+    for k in range(key_count):
+        lo, hi = bounds[k], bounds[k + 1]
+        aggregates[(int(key_advertiser[k]), str(key_channel[k]))] = CampaignAggregate(
+            dominant_keyword_id=int(dominant_keyword[k]) if dominant_keyword[k] >= 0 else None,
+            first_seen=first_seen[k],
+            last_seen=last_seen[k],
+            snapshot_ids=snapshot_groups[k],
+            ad_occurrences=int(occurrences[k]),
+            days=group_day[lo:hi],
+            day_hits=day_hits[lo:hi],
+            day_inhouse=day_inhouse[lo:hi],
+            day_position_count=day_position_count[lo:hi],
+            day_position_sum=day_position_sum[lo:hi],
+            day_zone_counts=day_zone_counts[lo:hi],
+            zone_labels=zone_labels,
+            placements=placements.pop(k, set()),
+            has_inhouse=bool(has_inhouse[k]),
+            has_contact=bool(has_contact[k]),
+            max_view_count=int(max_views[k]),
+            total_view_count=int(total_views[k]),
+            view_count_sources=int(view_sources[k]),
+        )
+    return aggregates
 
 
 # ── Channel ↔ Stealth network mapping ──
@@ -483,26 +721,49 @@ async def _load_stealth_contact_multipliers(
 async def _upsert_campaigns_and_spend(
     active_days: int = 7,
     excluded_channels: set[str] | None = None,
+    advertiser_ids: set[int] | None = None,
 ) -> tuple[int, int]:
+    """캠페인/일자별 추정 광고비 upsert.
+
+    advertiser_ids가 None이면 전체 소재를 재집계하고, 주어지면 해당 광고주의 캠페인만
+    갱신한다. 증분 모드에서는 건드리지 않은 캠페인의 is_active만 SQL로 만료 처리.
+    """
     estimator_v2 = SpendEstimatorV2()
     now = datetime.now(UTC).replace(tzinfo=None)
     active_cutoff = now.timestamp() - (active_days * 24 * 60 * 60)
 
-    result = await _collect_aggregates(excluded_channels=excluded_channels)
-    if not result:
-        return 0, 0
-    aggregates, keyword_counts = result
+    if advertiser_ids is not None:
+        async with async_session() as session:
+            await session.execute(
+                update(Campaign)
+                .where(
+                    Campaign.is_active.is_(True),
+                    Campaign.last_seen < now - timedelta(days=active_days),
+                )
+                .values(is_active=False, status="completed")
+            )
+            await session.commit()
+        if not advertiser_ids:
+            return 0, 0
+
+    aggregates = await _collect_aggregates(excluded_channels=excluded_channels, advertiser_ids=advertiser_ids)
     if not aggregates:
         return 0, 0
 
     async with async_session() as session:
-        keywords = (await session.execute(select(Keyword))).scalars().all()
-        keyword_map = {k.id: k for k in keywords}
-
         campaigns_query = select(Campaign)
         if excluded_channels:
             campaigns_query = campaigns_query.where(Campaign.channel.notin_(list(excluded_channels)))
-        campaigns = (await session.execute(campaigns_query)).scalars().all()
+        if advertiser_ids is None:
+            campaigns = (await session.execute(campaigns_query)).scalars().all()
+        else:
+            campaigns = []
+            for chunk in _chunks(advertiser_ids):
+                campaigns.extend(
+                    (await session.execute(
+                        campaigns_query.where(Campaign.advertiser_id.in_(chunk))
+                    )).scalars().all()
+                )
 
         # Index by (advertiser_id, channel) — merge old keyword-based campaigns
         campaign_by_key: dict[tuple[int, str], Campaign] = {}
@@ -536,9 +797,7 @@ async def _upsert_campaigns_and_spend(
         touched_campaigns: list[Campaign] = []
         for key, agg in aggregates.items():
             advertiser_id, channel = key
-            # Pick dominant keyword_id for this (advertiser, channel)
-            kw_freqs = keyword_counts.get(key, {})
-            dominant_keyword_id = max(kw_freqs, key=kw_freqs.get) if kw_freqs else None
+            dominant_keyword_id = agg.dominant_keyword_id
 
             campaign = campaign_by_key.get(key)
             if campaign is None:
@@ -580,7 +839,7 @@ async def _upsert_campaigns_and_spend(
                 campaign.spend_category = _get_spend_category(channel)
             campaign.extra_data = {
                 "ad_occurrences": agg.ad_occurrences,
-                "active_days_observed": len(agg.by_day),
+                "active_days_observed": agg.active_days,
             }
 
             # -- Campaign metadata fields --
@@ -588,30 +847,33 @@ async def _upsert_campaigns_and_spend(
                 campaign.start_at = agg.first_seen
             campaign.end_at = agg.last_seen
             campaign.status = "active" if campaign.is_active else "completed"
-            campaign.creative_ids = sorted(agg.snapshot_ids) if agg.snapshot_ids else None
+            campaign.creative_ids = agg.snapshot_ids.tolist() if len(agg.snapshot_ids) else None
 
             touched_campaigns.append(campaign)
 
         await session.flush()
 
-        total_estimate_rows = 0
+        # 갱신 대상 캠페인의 기존 추정치는 청크 단위로 일괄 삭제 후 재삽입
+        # (캠페인마다 DELETE를 내면 매번 autoflush가 걸려 캠페인 수에 비례해 느려짐)
+        for chunk in _chunks(campaign.id for campaign in touched_campaigns):
+            await session.execute(delete(SpendEstimate).where(SpendEstimate.campaign_id.in_(chunk)))
+
+        estimate_rows: list[dict] = []
         for campaign in touched_campaigns:
             key = (campaign.advertiser_id, campaign.channel)
             agg = aggregates[key]
 
-            await session.execute(delete(SpendEstimate).where(SpendEstimate.campaign_id == campaign.id))
-
             # campaign_total: 이 캠페인의 모든 일자별 est_daily_spend 합계 (KRW)
             campaign_total = 0.0
-            for day, day_agg in agg.by_day.items():
+            for day, ad_hits, inhouse_count in agg.iter_days():
                 # 인하우스 여부
-                is_day_inhouse = day_agg.inhouse_count > 0 and day_agg.inhouse_count >= day_agg.ad_hits
+                is_day_inhouse = inhouse_count > 0 and inhouse_count >= ad_hits
 
                 ad_data = {
                     "keyword": "unknown",
                     "is_inhouse": is_day_inhouse or agg.has_inhouse,
                 }
-                frequency_data = {"ad_hits": day_agg.ad_hits}
+                frequency_data = {"ad_hits": ad_hits}
 
                 est = estimator_v2.estimate(
                     channel=campaign.channel,
@@ -622,29 +884,28 @@ async def _upsert_campaigns_and_spend(
                 est_daily_spend = est.est_daily_spend
                 confidence = est.confidence
 
-                session.add(
-                    SpendEstimate(
-                        campaign_id=campaign.id,
-                        date=datetime.combine(day, time.min),
-                        channel=campaign.channel,
-                        est_daily_spend=est_daily_spend,
-                        confidence=confidence,
-                        calculation_method=est.calculation_method,
-                        factors=est.factors,
-                    )
-                )
-                total_estimate_rows += 1
+                estimate_rows.append({
+                    "campaign_id": campaign.id,
+                    "date": datetime.combine(day, time.min),
+                    "channel": campaign.channel,
+                    "est_daily_spend": est_daily_spend,
+                    "confidence": confidence,
+                    "calculation_method": est.calculation_method,
+                    "factors": est.factors,
+                })
                 campaign_total += est_daily_spend
 
             # Campaign.total_est_spend: 관측 기간 내 실제 추정 매체비 합계 (KRW)
             # 30일 투영 제거 — 실제 수집된 일별 추정치의 단순 합산
             campaign.total_est_spend = round(campaign_total, 2)
 
+        if estimate_rows:
+            await session.execute(insert(SpendEstimate), estimate_rows)
         await session.commit()
-        return len(touched_campaigns), total_estimate_rows
+        return len(touched_campaigns), len(estimate_rows)
 
 
-async def _merge_cross_channel_campaigns() -> int:
+async def _merge_cross_channel_campaigns(advertiser_ids: set[int] | None = None) -> int:
     """같은 광고주 + 같은 상품 → 크로스채널 캠페인 병합.
 
     그룹핑 규칙 (기초 DB 룰):
@@ -653,12 +914,22 @@ async def _merge_cross_channel_campaigns() -> int:
     → 채널 무관하게 하나의 캠페인으로 합침
     - campaign_name 자동 생성: "광고주명 N월캠페인"
     - model_info, promotion_copy 자동 수집
+
+    advertiser_ids가 주어지면 해당 광고주의 캠페인만 병합한다 (증분 재빌드).
     """
     from datetime import UTC as _utc
 
+    async def _fetch(query, column) -> list:
+        if advertiser_ids is None:
+            return (await session.execute(query)).all()
+        rows = []
+        for chunk in _chunks(advertiser_ids):
+            rows.extend((await session.execute(query.where(column.in_(chunk)))).all())
+        return rows
+
     async with async_session() as session:
         # 1. 캠페인별 대표 product_name 조회 (가장 빈번한 것)
-        product_rows = (await session.execute(
+        product_rows = await _fetch(
             select(
                 AdDetail.advertiser_id,
                 AdSnapshot.channel,
@@ -672,8 +943,9 @@ async def _merge_cross_channel_campaigns() -> int:
                 AdDetail.product_name != "",
             )
             .group_by(AdDetail.advertiser_id, AdSnapshot.channel, AdDetail.product_name)
-            .order_by(AdDetail.advertiser_id, AdSnapshot.channel, func.count().desc())
-        )).all()
+            .order_by(AdDetail.advertiser_id, AdSnapshot.channel, func.count().desc()),
+            AdDetail.advertiser_id,
+        )
 
         dominant_product: dict[tuple[int, str], str] = {}
         for row in product_rows:
@@ -682,7 +954,7 @@ async def _merge_cross_channel_campaigns() -> int:
                 dominant_product[key] = row[2]
 
         # 2. 대표 model_name 조회
-        model_rows = (await session.execute(
+        model_rows = await _fetch(
             select(
                 AdDetail.advertiser_id,
                 AdSnapshot.channel,
@@ -696,8 +968,9 @@ async def _merge_cross_channel_campaigns() -> int:
                 AdDetail.model_name != "",
             )
             .group_by(AdDetail.advertiser_id, AdSnapshot.channel, AdDetail.model_name)
-            .order_by(func.count().desc())
-        )).all()
+            .order_by(func.count().desc()),
+            AdDetail.advertiser_id,
+        )
 
         dominant_model: dict[tuple[int, str], str] = {}
         for row in model_rows:
@@ -706,7 +979,7 @@ async def _merge_cross_channel_campaigns() -> int:
                 dominant_model[key] = row[2]
 
         # 3. 대표 ad_text(카피) 조회
-        copy_rows = (await session.execute(
+        copy_rows = await _fetch(
             select(
                 AdDetail.advertiser_id,
                 AdSnapshot.channel,
@@ -720,8 +993,9 @@ async def _merge_cross_channel_campaigns() -> int:
                 AdDetail.ad_text != "",
             )
             .group_by(AdDetail.advertiser_id, AdSnapshot.channel, AdDetail.ad_text)
-            .order_by(func.count().desc())
-        )).all()
+            .order_by(func.count().desc()),
+            AdDetail.advertiser_id,
+        )
 
         dominant_copy: dict[tuple[int, str], str] = {}
         for row in copy_rows:
@@ -730,9 +1004,10 @@ async def _merge_cross_channel_campaigns() -> int:
                 dominant_copy[key] = row[2]
 
         # 4. 전체 캠페인 로드
-        campaigns = (await session.execute(
-            select(Campaign).order_by(Campaign.advertiser_id)
-        )).scalars().all()
+        campaigns = [
+            row[0]
+            for row in await _fetch(select(Campaign).order_by(Campaign.advertiser_id), Campaign.advertiser_id)
+        ]
 
         # 5. (advertiser_id, normalized_product) 기준 그룹핑
         groups: dict[tuple[int, str], list[Campaign]] = defaultdict(list)
@@ -858,6 +1133,107 @@ async def _merge_cross_channel_campaigns() -> int:
         return merged_count
 
 
+async def _load_watermark() -> BuildWatermark | None:
+    async with async_session() as session:
+        return (
+            await session.execute(select(BuildWatermark).where(BuildWatermark.name == _WATERMARK_NAME))
+        ).scalar_one_or_none()
+
+
+async def _save_watermark(
+    last_id: int,
+    last_seen_at: datetime,
+    excluded_channels: set[str],
+    full: bool,
+) -> None:
+    async with async_session() as session:
+        watermark = (
+            await session.execute(select(BuildWatermark).where(BuildWatermark.name == _WATERMARK_NAME))
+        ).scalar_one_or_none()
+        if watermark is None:
+            watermark = BuildWatermark(name=_WATERMARK_NAME)
+            session.add(watermark)
+        watermark.last_id = last_id
+        watermark.last_seen_at = last_seen_at
+        watermark.params = {"excluded_channels": sorted(excluded_channels)}
+        if full:
+            watermark.last_full_at = last_seen_at
+        await session.commit()
+
+
+def _full_rebuild_reason(
+    watermark: BuildWatermark | None,
+    excluded_channels: set[str],
+    now: datetime,
+) -> str | None:
+    """증분 재빌드가 불가능하면 전체 재빌드 사유를, 가능하면 None을 반환."""
+    if watermark is None or watermark.last_seen_at is None:
+        return "no_watermark"
+    if (watermark.params or {}).get("excluded_channels") != sorted(excluded_channels):
+        return "excluded_channels_changed"
+    full_hours = _parse_full_rebuild_hours(os.getenv("CAMPAIGN_FULL_REBUILD_HOURS"))
+    if watermark.last_full_at is None or now - watermark.last_full_at >= timedelta(hours=full_hours):
+        return "periodic"
+    return None
+
+
+async def _max_detail_id() -> int:
+    async with async_session() as session:
+        return int((await session.execute(select(func.max(AdDetail.id)))).scalar() or 0)
+
+
+async def _unlinked_detail_ids(max_id: int) -> list[int]:
+    """워터마크 이하 id 중 광고주 미연결 소재 — 이번 실행의 백필로 연결될 수 있는 후보."""
+    async with async_session() as session:
+        return list(
+            (
+                await session.execute(
+                    select(AdDetail.id).where(
+                        AdDetail.advertiser_id.is_(None),
+                        AdDetail.id <= max_id,
+                    )
+                )
+            ).scalars().all()
+        )
+
+
+async def _collect_touched_advertisers(
+    watermark: BuildWatermark,
+    backfill_candidate_ids: list[int],
+    excluded_channels: set[str] | None = None,
+) -> set[int]:
+    """워터마크 이후 신규/재노출(seen bump)되거나 백필로 연결된 소재의 광고주 id."""
+    base = (
+        select(AdDetail.advertiser_id)
+        .join(AdSnapshot, AdSnapshot.id == AdDetail.snapshot_id)
+        .where(AdDetail.advertiser_id.is_not(None))
+        .where(AdDetail.url.is_not(None))
+        .where(AdDetail.url != "")
+        .distinct()
+    )
+    if excluded_channels:
+        base = base.where(AdSnapshot.channel.notin_(list(excluded_channels)))
+
+    async with async_session() as session:
+        touched = set(
+            (
+                await session.execute(
+                    base.where(
+                        or_(
+                            AdDetail.id > (watermark.last_id or 0),
+                            AdDetail.last_seen_at > watermark.last_seen_at - _WATERMARK_OVERLAP,
+                        )
+                    )
+                )
+            ).scalars().all()
+        )
+        for chunk in _chunks(backfill_candidate_ids):
+            touched.update(
+                (await session.execute(base.where(AdDetail.id.in_(chunk)))).scalars().all()
+            )
+    return {int(advertiser_id) for advertiser_id in touched}
+
+
 async def _counts() -> tuple[int, int]:
     async with async_session() as session:
         campaign_count = (await session.execute(select(func.count(Campaign.id)))).scalar_one()
@@ -865,8 +1241,17 @@ async def _counts() -> tuple[int, int]:
         return int(campaign_count or 0), int(estimate_count or 0)
 
 
-async def rebuild_campaigns_and_spend(active_days: int = 30) -> dict[str, int]:
-    """Rebuild campaign and spend tables and return execution stats."""
+async def rebuild_campaigns_and_spend(
+    active_days: int = 30,
+    incremental: bool = False,
+) -> dict[str, int]:
+    """Rebuild campaign and spend tables and return execution stats.
+
+    incremental=True면 워터마크 이후 변경된 광고주의 캠페인만 재집계한다. 워터마크가 없거나,
+    제외 채널 설정이 바뀌었거나, 광고주 병합이 일어났거나, 마지막 전체 재빌드가
+    CAMPAIGN_FULL_REBUILD_HOURS(기본 24시간)보다 오래됐으면 전체 재빌드로 전환한다.
+    """
+    run_started = datetime.now(UTC).replace(tzinfo=None)
     excluded_channels = _parse_excluded_channels(
         os.getenv("CAMPAIGN_EXCLUDED_CHANNELS"),
         default=DEFAULT_EXCLUDED_CHANNELS,
@@ -875,15 +1260,50 @@ async def rebuild_campaigns_and_spend(active_days: int = 30) -> dict[str, int]:
     # Clean advertiser names (strip ad copy, merge duplicates)
     from processor.advertiser_name_cleaner import clean_advertiser_names
     name_clean_stats = await clean_advertiser_names()
+
+    watermark: BuildWatermark | None = None
+    backfill_candidate_ids: list[int] = []
+    if incremental:
+        watermark = await _load_watermark()
+        full_reason = _full_rebuild_reason(watermark, excluded_channels, run_started)
+        if full_reason is None and name_clean_stats.get("merged", 0):
+            # 병합된 광고주의 소재가 다른 advertiser_id로 옮겨졌으므로 키 추적 불가
+            full_reason = "advertisers_merged"
+        if full_reason is None:
+            backfill_candidate_ids = await _unlinked_detail_ids(watermark.last_id or 0)
+        else:
+            logger.info("[campaign_builder] incremental rebuild -> full rebuild ({})", full_reason)
+            watermark = None
+    max_detail_id = await _max_detail_id()
+
     linked, created = await _backfill_advertiser_ids()
-    industry_backfilled = await _backfill_advertiser_industries(excluded_channels=excluded_channels)
-    updated_campaigns, inserted_estimates = await _upsert_campaigns_and_spend(
-        active_days=active_days,
-        excluded_channels=excluded_channels,
-    )
 
-    # 크로스채널 캠페인 병합: 같은 광고주 + 같은 상품 → 하나의 캠페인
-    merged = await _merge_cross_channel_campaigns()
+    if watermark is None:
+        industry_backfilled = await _backfill_advertiser_industries(excluded_channels=excluded_channels)
+        updated_campaigns, inserted_estimates = await _upsert_campaigns_and_spend(
+            active_days=active_days,
+            excluded_channels=excluded_channels,
+        )
+        # 크로스채널 캠페인 병합: 같은 광고주 + 같은 상품 → 하나의 캠페인
+        merged = await _merge_cross_channel_campaigns()
+        touched_advertisers = 0
+    else:
+        advertiser_ids = await _collect_touched_advertisers(
+            watermark, backfill_candidate_ids, excluded_channels=excluded_channels,
+        )
+        industry_backfilled = await _backfill_advertiser_industries(
+            excluded_channels=excluded_channels,
+            advertiser_ids=advertiser_ids,
+        )
+        updated_campaigns, inserted_estimates = await _upsert_campaigns_and_spend(
+            active_days=active_days,
+            excluded_channels=excluded_channels,
+            advertiser_ids=advertiser_ids,
+        )
+        merged = await _merge_cross_channel_campaigns(advertiser_ids=advertiser_ids) if advertiser_ids else 0
+        touched_advertisers = len(advertiser_ids)
+
+    await _save_watermark(max_detail_id, run_started, excluded_channels, full=watermark is None)
 
     campaign_total, spend_estimates_total = await _counts()
 
@@ -895,6 +1315,8 @@ async def rebuild_campaigns_and_spend(active_days: int = 30) -> dict[str, int]:
         "updated_campaigns": updated_campaigns,
         "inserted_estimates": inserted_estimates,
         "merged_campaigns": merged,
+        "incremental": int(watermark is not None),
+        "touched_advertisers": touched_advertisers,
         "campaigns_total": campaign_total,
         "spend_estimates_total": spend_estimates_total,
     }
@@ -6,24 +6,37 @@ Computes multi-dimensional similarity between advertisers based on:
   3. Position zone similarity (cosine-like)
   4. Spend similarity (1 - normalised difference)
   5. Co-occurrence count (same snapshot appearances)
+
+Scores are computed from an advertiser feature matrix (sparse keyword and
+snapshot sets, channel bitmask, position-zone vector, spend) so one advertiser
+is ranked against all of its candidates with array operations.  A nightly job
+stores the top-N for every active advertiser in competitor_affinities; the API
+reads that table and falls back to on-demand scoring when it is stale.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Sequence
 
-from sqlalchemy import func, select, and_, distinct, case, Float, Integer
+import numpy as np
+from loguru import logger
+from sqlalchemy import and_, delete, func, insert, select, union
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database import async_session
 from database.models import (
     AdDetail,
     AdSnapshot,
     Advertiser,
+    BuildWatermark,
     Campaign,
+    CompetitorAffinity,
     Industry,
-    Keyword,
     SpendEstimate,
 )
 
@@ -106,257 +119,458 @@ def _position_similarity(dist_a: dict[str, int], dist_b: dict[str, int]) -> floa
     return (dot / (mag_a * mag_b)) * 100.0
 
 
-# ── Main scoring function ──
+# ── Advertiser feature matrix ──
 
+# keyword, channel, position zone, spend, co-occurrence
+_AFFINITY_WEIGHTS = (0.30, 0.20, 0.15, 0.20, 0.15)
 
-async def calculate_competitor_affinity(
-    db: AsyncSession,
-    advertiser_id: int,
-    days: int = 30,
-    limit: int = 20,
-) -> list[CompetitorScore]:
-    """Calculate competitor affinity scores for a given advertiser.
+_PRECOMPUTE_WATERMARK = "competitor_affinity"
+DEFAULT_PRECOMPUTE_TOP_N = 50
+DEFAULT_PRECOMPUTE_MAX_AGE_HOURS = 36
 
-    Steps:
-      1. Find target advertiser and industry_id
-      2. Gather candidates: same industry + keyword co-occurrence
-      3. Batch-query 5 dimensions per candidate
-      4. Composite score = keyword*0.30 + channel*0.20 + position*0.15
-                         + spend*0.20 + co_occurrence*0.15
-      5. Sort descending, return top N
+_precompute_lock = asyncio.Lock()
+
+
+def _ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, end) for every pair, without a Python loop."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class _Incidence:
+    """Sparse advertiser x item membership (keywords, snapshots), CSR in both directions.
+
+    overlap(row) returns |items(row) & items(r)| for every row r by gathering the
+    posting lists of row's items and bincounting them, so the cost is the number
+    of postings touched rather than advertisers x items.
     """
-    since = datetime.utcnow() - timedelta(days=days)
 
-    # Step 1: Target advertiser
-    target = await db.get(Advertiser, advertiser_id)
-    if not target:
-        return []
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, n_rows: int):
+        # rows/cols: distinct (row, col) pairs, cols in 0..n_cols-1
+        n_cols = int(cols.max()) + 1 if len(cols) else 0
+        self.n_rows = n_rows
+        self.row_ptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=self.row_ptr[1:])
+        self.row_cols = cols[np.argsort(rows, kind="stable")]
+        self.col_ptr = np.zeros(n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=n_cols), out=self.col_ptr[1:])
+        self.col_rows = rows[np.argsort(cols, kind="stable")]
+        self.sizes = np.diff(self.row_ptr)
+
+    def overlap(self, row: int) -> np.ndarray:
+        cols = self.row_cols[self.row_ptr[row]:self.row_ptr[row + 1]]
+        postings = _ranges(self.col_ptr[cols], self.col_ptr[cols + 1])
+        return np.bincount(self.col_rows[postings], minlength=self.n_rows)
+
+
+def _incidence(advertiser_ids: np.ndarray, pairs: list[tuple[int, object]]) -> _Incidence:
+    """(advertiser_id, item) pairs -> _Incidence over the matrix rows (unknown ids and duplicates dropped)."""
+    n = len(advertiser_ids)
+    if not pairs:
+        return _Incidence(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), n)
+    adv = np.fromiter((p[0] for p in pairs), dtype=np.int64, count=len(pairs))
+    _, cols = np.unique(np.array([p[1] for p in pairs]), return_inverse=True)
+    rows, known = _rows_for(advertiser_ids, adv)
+    rows, cols = rows[known], cols.astype(np.int64)[known]
+    # the same (advertiser, keyword) repeats once per channel
+    width = int(cols.max()) + 1 if len(cols) else 1
+    unique_keys = np.unique(rows * width + cols)
+    return _Incidence(unique_keys // width, unique_keys % width, n)
+
+
+def _rows_for(advertiser_ids: np.ndarray, ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Matrix row per advertiser id plus a mask of ids present in the matrix."""
+    rows = np.searchsorted(advertiser_ids, ids)
+    clipped = np.minimum(rows, max(len(advertiser_ids) - 1, 0))
+    known = (rows < len(advertiser_ids)) & (advertiser_ids[clipped] == ids) if len(advertiser_ids) else rows < 0
+    return clipped.astype(np.int64), known
 
-    # -- Target's keywords --
-    target_kw_q = (
-        select(distinct(AdSnapshot.keyword_id))
-        .select_from(AdDetail)
-        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id == advertiser_id)
-        .where(AdSnapshot.captured_at >= since)
-    )
-    target_kw_result = await db.execute(target_kw_q)
-    target_keyword_ids: set[int] = {r[0] for r in target_kw_result.all() if r[0] is not None}
 
-    # -- Target's channels --
-    target_ch_q = (
-        select(distinct(AdSnapshot.channel))
+@dataclass
+class AdvertiserFeatureMatrix:
+    """Window features for a set of advertisers, aligned on sorted advertiser_ids.
+
+    keywords / snapshots are sparse incidence sets, channels a uint64 bitmask,
+    zones a count vector per position zone and spend the window spend total.
+    """
+
+    advertiser_ids: np.ndarray
+    names: list[str]
+    industry_ids: np.ndarray              # -1 = no industry
+    keywords: _Incidence
+    channel_masks: np.ndarray             # bit per channel (uint64)
+    zone_counts: np.ndarray               # (n, zones) ad counts
+    spend: np.ndarray
+    snapshots: _Incidence
+    active: np.ndarray                    # any ad in the window
+
+    def __post_init__(self):
+        self.channel_counts = np.bitwise_count(self.channel_masks).astype(np.int64)
+        self.zone_norms = np.sqrt((self.zone_counts ** 2).sum(axis=1))
+
+    def row_of(self, advertiser_id: int) -> int | None:
+        rows, known = _rows_for(self.advertiser_ids, np.array([advertiser_id], dtype=np.int64))
+        return int(rows[0]) if known[0] else None
+
+
+def _candidate_ids_query(target: Advertiser, since: datetime):
+    """Target + same-industry advertisers + advertisers on the target's window keywords."""
+    target_keywords = (
+        select(AdSnapshot.keyword_id)
         .select_from(AdDetail)
         .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id == advertiser_id)
+        .where(AdDetail.advertiser_id == target.id)
         .where(AdSnapshot.captured_at >= since)
+        .where(AdSnapshot.keyword_id.isnot(None))
     )
-    target_ch_result = await db.execute(target_ch_q)
-    target_channels: set[str] = {r[0] for r in target_ch_result.all() if r[0]}
-
-    # -- Target's position zone distribution --
-    target_pos_q = (
-        select(
-            AdDetail.position_zone,
-            func.count(AdDetail.id).label("cnt"),
-        )
+    parts = [
+        select(Advertiser.id).where(Advertiser.id == target.id),
+        select(AdDetail.advertiser_id)
         .select_from(AdDetail)
         .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id == advertiser_id)
+        .where(AdSnapshot.keyword_id.in_(target_keywords))
         .where(AdSnapshot.captured_at >= since)
-        .where(AdDetail.position_zone.isnot(None))
-        .group_by(AdDetail.position_zone)
-    )
-    target_pos_result = await db.execute(target_pos_q)
-    target_position_dist: dict[str, int] = {
-        r.position_zone: r.cnt for r in target_pos_result.all() if r.position_zone
-    }
-
-    # -- Target's total spend --
-    target_spend_q = (
-        select(func.coalesce(func.sum(SpendEstimate.est_daily_spend), 0.0))
+        .where(AdDetail.advertiser_id.isnot(None)),
+    ]
+    if target.industry_id:
+        parts.append(select(Advertiser.id).where(Advertiser.industry_id == target.industry_id))
+    return union(*parts)
+
+
+async def load_advertiser_features(
+    db: AsyncSession,
+    days: int = 30,
+    target: Advertiser | None = None,
+) -> AdvertiserFeatureMatrix:
+    """Build the feature matrix with five set-based queries.
+
+    Without a target every advertiser is loaded (nightly precompute).  With a
+    target only the target and its candidates are loaded, and snapshot sets are
+    limited to the target's snapshots -- enough for its co-occurrence counts.
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    in_window = and_(AdSnapshot.captured_at >= since, AdDetail.advertiser_id.isnot(None))
+    adv_q = select(Advertiser.id, Advertiser.name, Advertiser.industry_id)
+    spend_q = (
+        select(Campaign.advertiser_id, func.sum(SpendEstimate.est_daily_spend))
         .select_from(SpendEstimate)
         .join(Campaign, SpendEstimate.campaign_id == Campaign.id)
-        .where(Campaign.advertiser_id == advertiser_id)
         .where(SpendEstimate.date >= since)
+        .where(Campaign.advertiser_id.isnot(None))
     )
-    target_spend_result = await db.execute(target_spend_q)
-    target_spend: float = float(target_spend_result.scalar() or 0.0)
+    snapshot_q = (
+        select(AdDetail.advertiser_id, AdDetail.snapshot_id)
+        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+        .where(in_window)
+    )
+    if target is not None:
+        candidate_ids = _candidate_ids_query(target, since)
+        adv_q = adv_q.where(Advertiser.id.in_(candidate_ids))
+        in_window = and_(in_window, AdDetail.advertiser_id.in_(candidate_ids))
+        spend_q = spend_q.where(Campaign.advertiser_id.in_(candidate_ids))
+        snapshot_q = snapshot_q.where(
+            AdDetail.advertiser_id.in_(candidate_ids),
+            AdDetail.snapshot_id.in_(select(AdDetail.snapshot_id).where(AdDetail.advertiser_id == target.id)),
+        )
 
-    # Step 2: Gather candidate competitors
-    candidate_ids: set[int] = set()
+    advertisers = (await db.execute(adv_q.order_by(Advertiser.id))).all()
+    advertiser_ids = np.fromiter((a.id for a in advertisers), dtype=np.int64, count=len(advertisers))
+    n = len(advertiser_ids)
 
-    # 2a: Same industry
-    if target.industry_id:
-        industry_q = (
-            select(Advertiser.id)
-            .where(Advertiser.industry_id == target.industry_id)
-            .where(Advertiser.id != advertiser_id)
+    # 1) keyword / channel sets
+    activity = (
+        await db.execute(
+            select(AdDetail.advertiser_id, AdSnapshot.keyword_id, AdSnapshot.channel)
+            .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+            .where(in_window)
+            .distinct()
+        )
+    ).all()
+    keywords = _incidence(advertiser_ids, [(a, k) for a, k, _ in activity if k is not None])
+    active = np.zeros(n, dtype=bool)
+    channel_masks = np.zeros(n, dtype=np.uint64)
+    channel_pairs = [(a, c) for a, _, c in activity if c]
+    if channel_pairs:
+        labels, bits = np.unique(np.array([c for _, c in channel_pairs]), return_inverse=True)
+        if len(labels) > 64:
+            raise ValueError(f"channel bitmask supports up to 64 channels, got {len(labels)}")
+        rows, known = _rows_for(advertiser_ids, np.array([a for a, _ in channel_pairs], dtype=np.int64))
+        np.bitwise_or.at(
+            channel_masks, rows[known], np.left_shift(np.uint64(1), bits[known].astype(np.uint64))
         )
-        industry_result = await db.execute(industry_q)
-        candidate_ids.update(r[0] for r in industry_result.all())
-
-    # 2b: Keyword co-occurrence (advertisers appearing on same keywords)
-    if target_keyword_ids:
-        cooccur_q = (
-            select(distinct(AdDetail.advertiser_id))
-            .select_from(AdDetail)
+    if activity:
+        rows, known = _rows_for(advertiser_ids, np.array([a for a, _, _ in activity], dtype=np.int64))
+        active[rows[known]] = True
+
+    # 2) position zone distribution
+    zone_rows = (
+        await db.execute(
+            select(AdDetail.advertiser_id, AdDetail.position_zone, func.count(AdDetail.id))
             .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-            .where(AdSnapshot.keyword_id.in_(target_keyword_ids))
-            .where(AdDetail.advertiser_id.isnot(None))
-            .where(AdDetail.advertiser_id != advertiser_id)
-            .where(AdSnapshot.captured_at >= since)
+            .where(in_window)
+            .where(AdDetail.position_zone.isnot(None))
+            .group_by(AdDetail.advertiser_id, AdDetail.position_zone)
         )
-        cooccur_result = await db.execute(cooccur_q)
-        candidate_ids.update(r[0] for r in cooccur_result.all())
+    ).all()
+    zone_rows = [r for r in zone_rows if r[1]]
+    zone_labels = sorted({r[1] for r in zone_rows})
+    zone_counts = np.zeros((n, len(zone_labels)), dtype=np.float64)
+    if zone_rows:
+        rows, known = _rows_for(advertiser_ids, np.array([r[0] for r in zone_rows], dtype=np.int64))
+        cols = np.searchsorted(np.array(zone_labels), np.array([r[1] for r in zone_rows]))
+        zone_counts[rows[known], cols[known]] = np.array([r[2] for r in zone_rows], dtype=np.float64)[known]
+
+    # 3) window spend
+    spend = np.zeros(n, dtype=np.float64)
+    spend_rows = (await db.execute(spend_q.group_by(Campaign.advertiser_id))).all()
+    if spend_rows:
+        rows, known = _rows_for(advertiser_ids, np.array([r[0] for r in spend_rows], dtype=np.int64))
+        spend[rows[known]] = np.array([float(r[1] or 0.0) for r in spend_rows])[known]
+
+    # 4) snapshot sets for co-occurrence
+    snapshot_pairs = (await db.execute(snapshot_q.distinct())).all()
+
+    return AdvertiserFeatureMatrix(
+        advertiser_ids=advertiser_ids,
+        names=[a.name for a in advertisers],
+        industry_ids=np.array([a.industry_id or -1 for a in advertisers], dtype=np.int64),
+        keywords=keywords,
+        channel_masks=channel_masks,
+        zone_counts=zone_counts,
+        spend=spend,
+        snapshots=_incidence(advertiser_ids, [tuple(p) for p in snapshot_pairs]),
+        active=active,
+    )
+
 
-    if not candidate_ids:
+def _jaccard_vec(inter: np.ndarray, size_a: int, sizes_b: np.ndarray) -> np.ndarray:
+    union_size = size_a + sizes_b - inter
+    return np.where(union_size > 0, inter / np.maximum(union_size, 1) * 100.0, 0.0)
+
+
+def _score_row(features: AdvertiserFeatureMatrix, t: int, limit: int | None) -> list[CompetitorScore]:
+    """Vectorized affinity of matrix row t against all of its candidates."""
+    kw_inter = features.keywords.overlap(t)
+    candidates = kw_inter > 0
+    if features.industry_ids[t] >= 0:
+        candidates |= features.industry_ids == features.industry_ids[t]
+    candidates[t] = False
+    rows = np.flatnonzero(candidates)
+    if not len(rows):
         return []
 
-    # Step 3: For each candidate, compute 5 dimensions
-    scores: list[CompetitorScore] = []
+    kw_sim = _jaccard_vec(kw_inter[rows], int(features.keywords.sizes[t]), features.keywords.sizes[rows])
+    ch_inter = np.bitwise_count(features.channel_masks[rows] & features.channel_masks[t]).astype(np.int64)
+    ch_sim = _jaccard_vec(ch_inter, int(features.channel_counts[t]), features.channel_counts[rows])
 
-    # Batch query: candidate keywords
-    cand_kw_q = (
-        select(
-            AdDetail.advertiser_id,
-            AdSnapshot.keyword_id,
-        )
-        .select_from(AdDetail)
-        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id.in_(candidate_ids))
-        .where(AdSnapshot.captured_at >= since)
-        .where(AdSnapshot.keyword_id.isnot(None))
-    )
-    cand_kw_result = await db.execute(cand_kw_q)
-    cand_keywords: dict[int, set[int]] = {}
-    for r in cand_kw_result.all():
-        cand_keywords.setdefault(r[0], set()).add(r[1])
+    norms = features.zone_norms[rows] * features.zone_norms[t]
+    dot = features.zone_counts[rows] @ features.zone_counts[t]
+    pos_sim = np.where(norms > 0, dot / np.where(norms > 0, norms, 1.0) * 100.0, 0.0)
 
-    # Batch query: candidate channels
-    cand_ch_q = (
-        select(
-            AdDetail.advertiser_id,
-            AdSnapshot.channel,
-        )
-        .select_from(AdDetail)
-        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id.in_(candidate_ids))
-        .where(AdSnapshot.captured_at >= since)
+    spend_a, spend_b = features.spend[t], features.spend[rows]
+    max_spend = np.maximum(spend_a, spend_b)
+    sp_sim = np.where(
+        ((spend_a <= 0) & (spend_b <= 0)) | (max_spend == 0),
+        100.0,
+        np.maximum(0.0, (1.0 - np.abs(spend_a - spend_b) / np.where(max_spend == 0, 1.0, max_spend)) * 100.0),
     )
-    cand_ch_result = await db.execute(cand_ch_q)
-    cand_channels: dict[int, set[str]] = {}
-    for r in cand_ch_result.all():
-        if r[1]:
-            cand_channels.setdefault(r[0], set()).add(r[1])
 
-    # Batch query: candidate position zones
-    cand_pos_q = (
-        select(
-            AdDetail.advertiser_id,
-            AdDetail.position_zone,
-            func.count(AdDetail.id).label("cnt"),
-        )
-        .select_from(AdDetail)
-        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(AdDetail.advertiser_id.in_(candidate_ids))
-        .where(AdSnapshot.captured_at >= since)
-        .where(AdDetail.position_zone.isnot(None))
-        .group_by(AdDetail.advertiser_id, AdDetail.position_zone)
-    )
-    cand_pos_result = await db.execute(cand_pos_q)
-    cand_position_dist: dict[int, dict[str, int]] = {}
-    for r in cand_pos_result.all():
-        if r.position_zone:
-            cand_position_dist.setdefault(r.advertiser_id, {})[r.position_zone] = r.cnt
-
-    # Batch query: candidate spend
-    cand_spend_q = (
-        select(
-            Campaign.advertiser_id,
-            func.coalesce(func.sum(SpendEstimate.est_daily_spend), 0.0).label("total"),
+    # Co-occurrence only counts when the target has keyword activity (as before)
+    if features.keywords.sizes[t] > 0:
+        cooccur = features.snapshots.overlap(t)[rows]
+    else:
+        cooccur = np.zeros(len(rows), dtype=np.int64)
+    cooccur_norm = cooccur / max(int(cooccur.max()), 1) * 100.0
+
+    w_kw, w_ch, w_pos, w_sp, w_co = _AFFINITY_WEIGHTS
+    affinity = kw_sim * w_kw + ch_sim * w_ch + pos_sim * w_pos + sp_sim * w_sp + cooccur_norm * w_co
+
+    order = np.lexsort((features.advertiser_ids[rows], -affinity))
+    if limit is not None:
+        order = order[:limit]
+    return [
+        CompetitorScore(
+            competitor_id=int(features.advertiser_ids[rows[i]]),
+            competitor_name=features.names[rows[i]],
+            industry_id=int(features.industry_ids[rows[i]]) if features.industry_ids[rows[i]] >= 0 else None,
+            affinity_score=round(float(affinity[i]), 2),
+            keyword_overlap=round(float(kw_sim[i]), 2),
+            channel_overlap=round(float(ch_sim[i]), 2),
+            position_zone_overlap=round(float(pos_sim[i]), 2),
+            spend_similarity=round(float(sp_sim[i]), 2),
+            co_occurrence_count=int(cooccur[i]),
         )
-        .select_from(SpendEstimate)
-        .join(Campaign, SpendEstimate.campaign_id == Campaign.id)
-        .where(Campaign.advertiser_id.in_(candidate_ids))
-        .where(SpendEstimate.date >= since)
-        .group_by(Campaign.advertiser_id)
-    )
-    cand_spend_result = await db.execute(cand_spend_q)
-    cand_spend: dict[int, float] = {r.advertiser_id: float(r.total) for r in cand_spend_result.all()}
-
-    # Batch query: co-occurrence count (same snapshot_id appearances)
-    if target_keyword_ids:
-        # Count snapshots where both target and candidate have ads
-        target_snapshot_q = (
-            select(distinct(AdDetail.snapshot_id))
-            .where(AdDetail.advertiser_id == advertiser_id)
+        for i in order
+    ]
+
+
+def score_competitors(
+    features: AdvertiserFeatureMatrix,
+    advertiser_id: int,
+    limit: int | None = 20,
+) -> list[CompetitorScore]:
+    """Rank every candidate of one advertiser from a loaded feature matrix."""
+    t = features.row_of(advertiser_id)
+    if t is None:
+        return []
+    return _score_row(features, t, limit)
+
+
+# ── Precomputed top-N ──
+
+
+def _precompute_max_age_hours() -> int:
+    try:
+        return max(0, int(os.getenv("COMPETITOR_AFFINITY_MAX_AGE_HOURS", DEFAULT_PRECOMPUTE_MAX_AGE_HOURS)))
+    except ValueError:
+        return DEFAULT_PRECOMPUTE_MAX_AGE_HOURS
+
+
+def _watermark_name(days: int) -> str:
+    return f"{_PRECOMPUTE_WATERMARK}:{days}"
+
+
+async def precompute_competitor_affinities(
+    days: int = 30,
+    top_n: int = DEFAULT_PRECOMPUTE_TOP_N,
+) -> dict:
+    """Nightly job: top-N competitors for every advertiser active in the window.
+
+    Loads one feature matrix for all advertisers and replaces the (days) slice
+    of competitor_affinities.  Advertisers without window activity are left to
+    the on-demand path.
+    """
+    async with _precompute_lock:
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        async with async_session() as session:
+            features = await load_advertiser_features(session, days=days)
+            records = []
+            targets = np.flatnonzero(features.active)
+            for t in targets:
+                advertiser_id = int(features.advertiser_ids[t])
+                for rank, score in enumerate(_score_row(features, int(t), top_n), start=1):
+                    records.append({
+                        "advertiser_id": advertiser_id,
+                        "competitor_id": score.competitor_id,
+                        "days": days,
+                        "rank": rank,
+                        "affinity_score": score.affinity_score,
+                        "keyword_overlap": score.keyword_overlap,
+                        "channel_overlap": score.channel_overlap,
+                        "position_zone_overlap": score.position_zone_overlap,
+                        "spend_similarity": score.spend_similarity,
+                        "co_occurrence_count": score.co_occurrence_count,
+                        "computed_at": now,
+                    })
+
+            await session.execute(delete(CompetitorAffinity).where(CompetitorAffinity.days == days))
+            for start in range(0, len(records), 5000):
+                await session.execute(insert(CompetitorAffinity), records[start:start + 5000])
+
+            name = _watermark_name(days)
+            watermark = (
+                await session.execute(select(BuildWatermark).where(BuildWatermark.name == name))
+            ).scalar_one_or_none()
+            if watermark is None:
+                watermark = BuildWatermark(name=name)
+                session.add(watermark)
+            watermark.params = {"days": days, "top_n": top_n}
+            watermark.last_full_at = now
+            await session.commit()
+
+        stats = {
+            "days": days,
+            "top_n": top_n,
+            "advertisers": len(features.advertiser_ids),
+            "targets": int(len(targets)),
+            "rows": len(records),
+            "elapsed_sec": round(time.perf_counter() - started, 2),
+        }
+        logger.info("[competitor_affinity] precomputed: {}", stats)
+        return stats
+
+
+async def load_precomputed_affinity(
+    db: AsyncSession,
+    advertiser_id: int,
+    days: int,
+    limit: int,
+) -> list[CompetitorScore] | None:
+    """Serve a fresh precomputed ranking, or None when it must be computed on demand."""
+    watermark = (
+        await db.execute(select(BuildWatermark).where(BuildWatermark.name == _watermark_name(days)))
+    ).scalar_one_or_none()
+    if watermark is None or watermark.last_full_at is None:
+        return None
+    if datetime.utcnow() - watermark.last_full_at > timedelta(hours=_precompute_max_age_hours()):
+        return None
+    if limit > int((watermark.params or {}).get("top_n", 0)):
+        return None
+
+    rows = (
+        await db.execute(
+            select(CompetitorAffinity, Advertiser.name, Advertiser.industry_id)
+            .join(Advertiser, Advertiser.id == CompetitorAffinity.competitor_id)
+            .where(CompetitorAffinity.advertiser_id == advertiser_id)
+            .where(CompetitorAffinity.days == days)
+            .order_by(CompetitorAffinity.rank)
+            .limit(limit)
         )
-        cooccur_count_q = (
-            select(
-                AdDetail.advertiser_id,
-                func.count(distinct(AdDetail.snapshot_id)).label("cnt"),
-            )
-            .where(AdDetail.advertiser_id.in_(candidate_ids))
-            .where(AdDetail.snapshot_id.in_(target_snapshot_q))
-            .group_by(AdDetail.advertiser_id)
+    ).all()
+    if not rows:
+        return None
+    return [
+        CompetitorScore(
+            competitor_id=row.competitor_id,
+            competitor_name=name,
+            industry_id=industry_id,
+            affinity_score=row.affinity_score,
+            keyword_overlap=row.keyword_overlap,
+            channel_overlap=row.channel_overlap,
+            position_zone_overlap=row.position_zone_overlap,
+            spend_similarity=row.spend_similarity,
+            co_occurrence_count=row.co_occurrence_count,
         )
-        cooccur_count_result = await db.execute(cooccur_count_q)
-        cooccur_counts: dict[int, int] = {r.advertiser_id: r.cnt for r in cooccur_count_result.all()}
-    else:
-        cooccur_counts = {}
+        for row, name, industry_id in rows
+    ]
 
-    # Find max co-occurrence for normalisation
-    max_cooccur = max(cooccur_counts.values()) if cooccur_counts else 1
 
-    # Load candidate advertiser info
-    cand_adv_q = (
-        select(Advertiser)
-        .where(Advertiser.id.in_(candidate_ids))
-    )
-    cand_adv_result = await db.execute(cand_adv_q)
-    cand_advertisers: dict[int, Advertiser] = {
-        a.id: a for a in cand_adv_result.scalars().all()
-    }
-
-    # Step 4: Compute composite score per candidate
-    for cid in candidate_ids:
-        adv_obj = cand_advertisers.get(cid)
-        if not adv_obj:
-            continue
-
-        kw_sim = _jaccard(target_keyword_ids, cand_keywords.get(cid, set()))
-        ch_sim = _jaccard(target_channels, cand_channels.get(cid, set()))
-        pos_sim = _position_similarity(target_position_dist, cand_position_dist.get(cid, {}))
-        sp_sim = _spend_similarity(target_spend, cand_spend.get(cid, 0.0))
-        cooccur_raw = cooccur_counts.get(cid, 0)
-        cooccur_norm = (cooccur_raw / max(max_cooccur, 1)) * 100.0
-
-        affinity = (
-            kw_sim * 0.30
-            + ch_sim * 0.20
-            + pos_sim * 0.15
-            + sp_sim * 0.20
-            + cooccur_norm * 0.15
-        )
+# ── Main scoring function ──
 
-        scores.append(
-            CompetitorScore(
-                competitor_id=cid,
-                competitor_name=adv_obj.name,
-                industry_id=adv_obj.industry_id,
-                affinity_score=round(affinity, 2),
-                keyword_overlap=round(kw_sim, 2),
-                channel_overlap=round(ch_sim, 2),
-                position_zone_overlap=round(pos_sim, 2),
-                spend_similarity=round(sp_sim, 2),
-                co_occurrence_count=cooccur_raw,
-            )
-        )
 
-    # Step 5: Sort and limit
-    scores.sort(key=lambda s: s.affinity_score, reverse=True)
-    return scores[:limit]
+async def calculate_competitor_affinity(
+    db: AsyncSession,
+    advertiser_id: int,
+    days: int = 30,
+    limit: int = 20,
+    use_precomputed: bool = True,
+) -> list[CompetitorScore]:
+    """Calculate competitor affinity scores for a given advertiser.
+
+    Steps:
+      1. Serve the nightly precomputed top-N when it is fresh and deep enough
+      2. Otherwise load features for the target + candidates
+         (same industry + keyword co-occurrence) and score them vectorized
+      3. Composite score = keyword*0.30 + channel*0.20 + position*0.15
+                         + spend*0.20 + co_occurrence*0.15
+      4. Sort descending, return top N
+    """
+    target = await db.get(Advertiser, advertiser_id)
+    if not target:
+        return []
+
+    if use_precomputed:
+        precomputed = await load_precomputed_affinity(db, advertiser_id, days, limit)
+        if precomputed is not None:
+            return precomputed
+
+    features = await load_advertiser_features(db, days=days, target=target)
+    return score_competitors(features, advertiser_id, limit)
 
 
 # ── Industry landscape ──
@@ -12,7 +12,8 @@ from datetime import datetime, timedelta
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import AdDetail, AdSnapshot, Persona
+from database.models import AdDetail, AdSnapshot, DailyAdRollup, DailySnapshotRollup, Persona
+from processor.daily_rollup import use_rollups, window_start
 
 
 @dataclass
@@ -54,7 +55,12 @@ async def calculate_contact_rates(
     2. ad_snapshots에서 해당 persona의 세션 수 집계
     3. ad_details에서 광고 노출 건수 집계
     4. contact_rate = ad_impressions / sessions
+
+    일별 롤업이 활성화돼 있으면 daily_*_rollups에서 읽습니다 (기간은 일 단위).
     """
+    if await use_rollups(db):
+        return await _calculate_contact_rates_from_rollup(db, days, channel, age_group)
+
     since = datetime.utcnow() - timedelta(days=days)
 
     # 기본 조인: snapshots ↔ personas ↔ details (접촉 데이터만)
@@ -150,6 +156,88 @@ async def calculate_contact_rates(
     return results
 
 
+async def _calculate_contact_rates_from_rollup(
+    db: AsyncSession,
+    days: int,
+    channel: str | None,
+    age_group: str | None,
+) -> list[ContactRateResult]:
+    """calculate_contact_rates의 롤업 버전.
+
+    (persona, channel, advertiser, position_zone, ad_type) 단위 접촉 노출을 한 번에 읽어
+    (연령대, 성별, 채널) 그룹의 합계·고유 광고주·위치/유형 분포를 메모리에서 계산합니다.
+    그룹 수와 무관하게 쿼리 3회.
+    """
+    since = window_start(days)
+    persona_q = select(Persona.id, Persona.age_group, Persona.gender).where(Persona.age_group.isnot(None))
+    if age_group:
+        persona_q = persona_q.where(Persona.age_group == age_group)
+    personas = {pid: (age, gender) for pid, age, gender in (await db.execute(persona_q)).all()}
+    if not personas:
+        return []
+
+    r = DailyAdRollup
+    contact = func.sum(r.contact_impressions)
+    detail_q = (
+        select(r.persona_id, r.channel, r.advertiser_id, r.position_zone, r.ad_type, contact)
+        .where(r.persona_id.in_(personas))
+        .where(r.date >= since)
+        .where(r.contact_impressions > 0)
+        .group_by(r.persona_id, r.channel, r.advertiser_id, r.position_zone, r.ad_type)
+    )
+    snap = DailySnapshotRollup
+    sessions_q = (
+        select(snap.persona_id, snap.channel, func.sum(snap.contact_snapshot_count))
+        .where(snap.persona_id.in_(personas))
+        .where(snap.date >= since)
+        .group_by(snap.persona_id, snap.channel)
+    )
+    if channel:
+        detail_q = detail_q.where(r.channel == channel)
+        sessions_q = sessions_q.where(snap.channel == channel)
+
+    impressions: dict[tuple, int] = {}
+    advertisers: dict[tuple, set[int]] = {}
+    positions: dict[tuple, dict[str, int]] = {}
+    ad_types: dict[tuple, dict[str, int]] = {}
+    for persona_id, ch, advertiser_id, zone, ad_type, cnt in (await db.execute(detail_q)).all():
+        key = (*personas[persona_id], ch)
+        impressions[key] = impressions.get(key, 0) + cnt
+        group_advertisers = advertisers.setdefault(key, set())
+        if advertiser_id is not None:
+            group_advertisers.add(advertiser_id)
+        if zone is not None:
+            dist = positions.setdefault(key, {})
+            dist[zone] = dist.get(zone, 0) + cnt
+        if ad_type is not None:
+            dist = ad_types.setdefault(key, {})
+            dist[ad_type] = dist.get(ad_type, 0) + cnt
+
+    sessions: dict[tuple, int] = {}
+    for persona_id, ch, cnt in (await db.execute(sessions_q)).all():
+        key = (*personas[persona_id], ch)
+        sessions[key] = sessions.get(key, 0) + (cnt or 0)
+
+    results: list[ContactRateResult] = []
+    for key, total in impressions.items():
+        total_sessions = sessions.get(key) or 1
+        results.append(
+            ContactRateResult(
+                age_group=key[0],
+                gender=key[1],
+                channel=key[2],
+                total_sessions=total_sessions,
+                total_ad_impressions=total,
+                contact_rate=round(total / total_sessions, 2),
+                unique_advertisers=len(advertisers[key]),
+                avg_ads_per_session=round(total / total_sessions, 2),
+                top_ad_types=ad_types.get(key, {}),
+                position_distribution=positions.get(key, {}),
+            )
+        )
+    return results
+
+
 async def calculate_contact_rate_trend(
     db: AsyncSession,
     days: int = 30,
@@ -1,10 +1,19 @@
-"""광고 소재 이미지 해시 — 중복 제거용 perceptual hash 유틸리티."""
+"""광고 소재 이미지 해시 — 중복 제거용 perceptual hash 유틸리티.
+
+- compute_creative_hash: 파일 바이트 SHA-256 (정확 일치)
+- compute_perceptual_hash: dHash/pHash 64bit (재인코딩/리사이즈/소폭 크롭에 강건)
+  근접 검색은 processor.phash_index.PerceptualHashIndex 사용.
+"""
 
 import hashlib
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 from loguru import logger
 
+PHASH_METHODS = ("phash", "dhash")
+
 
 def compute_creative_hash(image_path: str | None) -> str | None:
     """이미지 파일의 content hash를 계산.
@@ -55,3 +64,85 @@ def compute_text_hash(advertiser_name: str | None, ad_text: str | None, url: str
     if not combined.replace("|", ""):
         return None
     return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> np.ndarray:
+    """DCT-II 직교 행렬 (n x n)."""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    mat = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    mat[0, :] = np.sqrt(1.0 / n)
+    return mat
+
+
+def _bits_to_hex(bits: np.ndarray) -> str:
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return f"{value:016x}"
+
+
+def _load_gray(image_path: str, size: tuple[int, int]) -> np.ndarray:
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        # 알파 채널은 흰 배경에 합성 (투명 PNG ↔ WebP 변환 결과가 같은 해시가 되도록)
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            bg = Image.new("RGBA", img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(bg, img)
+        gray = img.convert("L").resize(size, Image.LANCZOS)
+        return np.asarray(gray, dtype=np.float32)
+
+
+def dhash_array(gray: np.ndarray) -> np.ndarray:
+    """9x8 그레이스케일 → 가로 인접 픽셀 비교 64bit."""
+    return gray[:, 1:] > gray[:, :-1]
+
+
+def phash_array(gray: np.ndarray) -> np.ndarray:
+    """32x32 그레이스케일 → 2D DCT 저주파 8x8의 중앙값 비교 64bit."""
+    mat = _dct_matrix(gray.shape[0])
+    low = (mat @ gray @ mat.T)[:8, :8]
+    return low > np.median(low.ravel()[1:])  # DC 성분 제외 중앙값
+
+
+def compute_perceptual_hash(image_path: str | None, method: str = "phash") -> str | None:
+    """이미지의 perceptual hash (64bit, 16자 hex)를 계산.
+
+    같은 배너를 WebP로 재인코딩하거나 다른 해상도로 재캡처해도
+    해밍 거리 수 bit 이내로 유지된다.
+
+    Args:
+        image_path: 이미지 파일 경로 (None이면 None 반환)
+        method: "phash" (DCT, 기본) 또는 "dhash" (gradient)
+
+    Returns:
+        16자 hex 문자열 또는 None
+    """
+    if method not in PHASH_METHODS:
+        raise ValueError(f"unknown perceptual hash method: {method}")
+    if not image_path:
+        return None
+
+    path = Path(image_path)
+    if not path.exists():
+        return None
+
+    try:
+        if method == "dhash":
+            return _bits_to_hex(dhash_array(_load_gray(str(path), (9, 8))))
+        return _bits_to_hex(phash_array(_load_gray(str(path), (32, 32))))
+    except Exception as e:
+        logger.debug(f"[creative_hasher] perceptual hash 실패: {image_path} - {e}")
+        return None
+
+
+def hamming_distance(a: str | int, b: str | int) -> int:
+    """두 64bit perceptual hash(hex 또는 int) 간 해밍 거리."""
+    if isinstance(a, str):
+        a = int(a, 16)
+    if isinstance(b, str):
+        b = int(b, 16)
+    return (a ^ b).bit_count()
@@ -0,0 +1,297 @@
+"""일별 노출 롤업 — SOV / 접촉율 / 페르소나 히트맵용 사전 집계 테이블 유지.
+
+calculate_sov / calculate_contact_rates / calculate_persona_heatmap은 매 호출마다
+ad_details x ad_snapshots x keywords/personas를 30~90일 범위로 다시 조인합니다.
+이 모듈은 두 개의 일별 팩트 테이블을 유지하고, 분석 함수는
+ENABLE_DAILY_ROLLUPS=true 이고 롤업이 한 번 이상 빌드된 경우 여기서 읽습니다.
+
+- daily_ad_rollups: (date, channel, keyword_id, persona_id, advertiser_id, position_zone, ad_type)
+  별 노출 수 (전체 / 비인하우스 / 접촉) + 고유 스냅샷 수
+- daily_snapshot_rollups: (date, channel, keyword_id, persona_id) 별 세션(스냅샷) 수
+
+증분 갱신 (크롤 적재 직후 호출):
+  build_watermarks["daily_rollup"]에 마지막으로 반영한 스냅샷/소재 id를 저장하고,
+  그 이후 추가된 스냅샷·소재가 속한 (날짜, 채널) 조합만 원본에서 다시 집계합니다.
+  기존 소재의 사후 변경(광고주 백필/병합, 삭제)은 주기적 전체 재빌드
+  (DAILY_ROLLUP_FULL_REBUILD_HOURS, 기본 24시간)와 check_daily_rollups(repair=True)로 반영합니다.
+
+날짜는 ad_snapshots.captured_at(UTC naive)의 날짜이며, 롤업 기반 조회의 기간 필터는
+일 단위로 맞춰집니다 (경계일 전체 포함).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import and_, case, delete, exists, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import async_session
+from database.models import (
+    AdDetail,
+    AdSnapshot,
+    BuildWatermark,
+    DailyAdRollup,
+    DailySnapshotRollup,
+)
+
+_WATERMARK_NAME = "daily_rollup"
+DEFAULT_FULL_REBUILD_HOURS = 24
+
+_AD_KEY_COLUMNS = ("date", "channel", "keyword_id", "persona_id", "advertiser_id", "position_zone", "ad_type")
+_AD_MEASURE_COLUMNS = ("impressions", "non_inhouse_impressions", "contact_impressions", "snapshot_count")
+_SNAPSHOT_KEY_COLUMNS = ("date", "channel", "keyword_id", "persona_id")
+_SNAPSHOT_MEASURE_COLUMNS = ("snapshot_count", "contact_snapshot_count")
+
+# 같은 프로세스 안에서 동시 갱신(채널 병렬 적재 등)이 워터마크를 경합하지 않도록 직렬화
+_refresh_lock = asyncio.Lock()
+
+
+def rollups_enabled() -> bool:
+    return os.getenv("ENABLE_DAILY_ROLLUPS", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+async def use_rollups(db: AsyncSession) -> bool:
+    """분석 함수가 롤업을 읽어도 되는지 — 활성화 + 최소 1회 빌드 완료."""
+    if not rollups_enabled():
+        return False
+    built = await db.execute(
+        select(BuildWatermark.id).where(
+            BuildWatermark.name == _WATERMARK_NAME,
+            BuildWatermark.last_full_at.isnot(None),
+        )
+    )
+    return built.first() is not None
+
+
+def window_start(days: int, now: datetime | None = None) -> date:
+    """롤업 기간 필터 시작일 — 원본 쿼리의 `captured_at >= now - days`를 일 단위로 내림."""
+    return ((now or datetime.utcnow()) - timedelta(days=days)).date()
+
+
+def _parse_full_rebuild_hours(raw: str | None) -> int:
+    try:
+        return max(0, int(raw)) if raw is not None else DEFAULT_FULL_REBUILD_HOURS
+    except ValueError:
+        return DEFAULT_FULL_REBUILD_HOURS
+
+
+def _full_rebuild_reason(watermark: BuildWatermark | None, now: datetime) -> str | None:
+    if watermark is None or watermark.last_full_at is None:
+        return "no_watermark"
+    full_hours = _parse_full_rebuild_hours(os.getenv("DAILY_ROLLUP_FULL_REBUILD_HOURS"))
+    if now - watermark.last_full_at >= timedelta(hours=full_hours):
+        return "periodic"
+    return None
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+# ── 집계 쿼리 ──
+
+
+def _day_range_filter(days: dict[date, set[str] | None]):
+    """{날짜: 채널 집합 | None(전체 채널)} → captured_at 범위 조건 (인덱스 사용)."""
+    clauses = []
+    for day, channels in sorted(days.items()):
+        start = datetime(day.year, day.month, day.day)
+        clause = and_(AdSnapshot.captured_at >= start, AdSnapshot.captured_at < start + timedelta(days=1))
+        if channels is not None:
+            clause = and_(clause, AdSnapshot.channel.in_(sorted(channels)))
+        clauses.append(clause)
+    return or_(*clauses)
+
+
+def _ad_rollup_select(scope=None):
+    day = func.date(AdSnapshot.captured_at)
+    query = (
+        select(
+            day.label("date"),
+            AdSnapshot.channel,
+            AdSnapshot.keyword_id,
+            AdSnapshot.persona_id,
+            AdDetail.advertiser_id,
+            AdDetail.position_zone,
+            AdDetail.ad_type,
+            func.count(AdDetail.id).label("impressions"),
+            func.sum(case((AdDetail.is_inhouse == False, 1), else_=0)).label("non_inhouse_impressions"),  # noqa: E712
+            func.sum(case((AdDetail.is_contact == True, 1), else_=0)).label("contact_impressions"),  # noqa: E712
+            func.count(func.distinct(AdSnapshot.id)).label("snapshot_count"),
+        )
+        .select_from(AdDetail)
+        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+    )
+    if scope is not None:
+        query = query.where(scope)
+    return query.group_by(
+        day,
+        AdSnapshot.channel,
+        AdSnapshot.keyword_id,
+        AdSnapshot.persona_id,
+        AdDetail.advertiser_id,
+        AdDetail.position_zone,
+        AdDetail.ad_type,
+    )
+
+
+def _snapshot_rollup_select(scope=None):
+    day = func.date(AdSnapshot.captured_at)
+    has_contact = exists().where(
+        AdDetail.snapshot_id == AdSnapshot.id,
+        AdDetail.is_contact == True,  # noqa: E712
+    )
+    query = select(
+        day.label("date"),
+        AdSnapshot.channel,
+        AdSnapshot.keyword_id,
+        AdSnapshot.persona_id,
+        func.count(AdSnapshot.id).label("snapshot_count"),
+        func.sum(case((has_contact, 1), else_=0)).label("contact_snapshot_count"),
+    ).select_from(AdSnapshot)
+    if scope is not None:
+        query = query.where(scope)
+    return query.group_by(day, AdSnapshot.channel, AdSnapshot.keyword_id, AdSnapshot.persona_id)
+
+
+async def _rebuild_scope(session: AsyncSession, days: dict[date, set[str] | None] | None) -> None:
+    """scope(None=전체)의 롤업 행을 지우고 원본에서 INSERT ... SELECT로 다시 채움."""
+    if days is None:
+        await session.execute(delete(DailyAdRollup))
+        await session.execute(delete(DailySnapshotRollup))
+        scope = None
+    else:
+        for day, channels in days.items():
+            for model in (DailyAdRollup, DailySnapshotRollup):
+                stmt = delete(model).where(model.date == day)
+                if channels is not None:
+                    stmt = stmt.where(model.channel.in_(sorted(channels)))
+                await session.execute(stmt)
+        scope = _day_range_filter(days)
+
+    await session.execute(
+        insert(DailyAdRollup).from_select(_AD_KEY_COLUMNS + _AD_MEASURE_COLUMNS, _ad_rollup_select(scope))
+    )
+    await session.execute(
+        insert(DailySnapshotRollup).from_select(
+            _SNAPSHOT_KEY_COLUMNS + _SNAPSHOT_MEASURE_COLUMNS, _snapshot_rollup_select(scope)
+        )
+    )
+
+
+async def _dirty_days(session: AsyncSession, watermark: BuildWatermark, max_snapshot_id: int, max_detail_id: int):
+    """워터마크 이후 추가된 스냅샷/소재가 속한 {날짜: 채널 집합}."""
+    detail_last_id = int((watermark.params or {}).get("detail_last_id", 0))
+    day = func.date(AdSnapshot.captured_at)
+    new_snapshots = select(day, AdSnapshot.channel).where(
+        AdSnapshot.id > (watermark.last_id or 0),
+        AdSnapshot.id <= max_snapshot_id,
+    )
+    new_details = (
+        select(day, AdSnapshot.channel)
+        .select_from(AdDetail)
+        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
+        .where(AdDetail.id > detail_last_id, AdDetail.id <= max_detail_id)
+    )
+    dirty: dict[date, set[str]] = {}
+    for query in (new_snapshots, new_details):
+        for raw_day, channel in (await session.execute(query.distinct())).all():
+            dirty.setdefault(_as_date(raw_day), set()).add(channel)
+    return dirty
+
+
+async def refresh_daily_rollups(full: bool = False) -> dict:
+    """롤업 갱신. 워터마크가 없거나 주기가 지나면 전체 재빌드, 아니면 변경된 (날짜, 채널)만."""
+    async with _refresh_lock:
+        now = datetime.utcnow()
+        async with async_session() as session:
+            watermark = (
+                await session.execute(select(BuildWatermark).where(BuildWatermark.name == _WATERMARK_NAME))
+            ).scalar_one_or_none()
+            reason = "requested" if full else _full_rebuild_reason(watermark, now)
+            max_snapshot_id = int((await session.execute(select(func.max(AdSnapshot.id)))).scalar() or 0)
+            max_detail_id = int((await session.execute(select(func.max(AdDetail.id)))).scalar() or 0)
+
+            if reason is None:
+                dirty = await _dirty_days(session, watermark, max_snapshot_id, max_detail_id)
+            else:
+                dirty = None
+                logger.info("[daily_rollup] full rebuild ({})", reason)
+
+            if dirty is None or dirty:
+                await _rebuild_scope(session, dirty)
+
+            if watermark is None:
+                watermark = BuildWatermark(name=_WATERMARK_NAME)
+                session.add(watermark)
+            watermark.last_id = max_snapshot_id
+            watermark.last_seen_at = now
+            watermark.params = {"detail_last_id": max_detail_id}
+            if dirty is None:
+                watermark.last_full_at = now
+            await session.commit()
+
+        stats = {
+            "full": dirty is None,
+            "reason": reason,
+            "refreshed_days": None if dirty is None else len(dirty),
+            "refreshed_day_channels": None if dirty is None else sum(len(c) for c in dirty.values()),
+        }
+        logger.info("[daily_rollup] refreshed: {}", stats)
+        return stats
+
+
+# ── 정합성 검사 ──
+
+
+def _keyed(rows, key_len: int) -> dict[tuple, tuple]:
+    out = {}
+    for row in rows:
+        key = (str(_as_date(row[0])), *row[1:key_len])
+        out[key] = tuple(int(v or 0) for v in row[key_len:])
+    return out
+
+
+async def check_daily_rollups(days: int = 90, repair: bool = False) -> dict:
+    """최근 N일 롤업을 원본 테이블 재집계와 grain 단위로 비교.
+
+    repair=True면 불일치한 날짜를 원본에서 다시 집계합니다.
+    """
+    start = window_start(days)
+    async with _refresh_lock, async_session() as session:
+        scope = AdSnapshot.captured_at >= datetime(start.year, start.month, start.day)
+        mismatched: set[date] = set()
+        report = {"checked_from": start.isoformat(), "tables": {}}
+        for model, raw_query, keys, measures in (
+            (DailyAdRollup, _ad_rollup_select(scope), _AD_KEY_COLUMNS, _AD_MEASURE_COLUMNS),
+            (DailySnapshotRollup, _snapshot_rollup_select(scope), _SNAPSHOT_KEY_COLUMNS, _SNAPSHOT_MEASURE_COLUMNS),
+        ):
+            raw = _keyed((await session.execute(raw_query)).all(), len(keys))
+            stored_rows = await session.execute(
+                select(*(getattr(model, c) for c in keys + measures)).where(model.date >= start)
+            )
+            stored = _keyed(stored_rows.all(), len(keys))
+            missing = raw.keys() - stored.keys()
+            extra = stored.keys() - raw.keys()
+            changed = {k for k in raw.keys() & stored.keys() if raw[k] != stored[k]}
+            for key in missing | extra | changed:
+                mismatched.add(date.fromisoformat(key[0]))
+            report["tables"][model.__tablename__] = {
+                "raw_rows": len(raw),
+                "rollup_rows": len(stored),
+                "missing": len(missing),
+                "extra": len(extra),
+                "changed": len(changed),
+            }
+
+        report["consistent"] = not mismatched
+        report["mismatched_days"] = sorted(d.isoformat() for d in mismatched)
+        if repair and mismatched:
+            await _rebuild_scope(session, {day: None for day in mismatched})
+            await session.commit()
+            report["repaired_days"] = len(mismatched)
+    return report
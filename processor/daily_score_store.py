@@ -0,0 +1,37 @@
+"""광고주 일별 점수 테이블 일괄 upsert.
+
+activity_scores / meta_signal_composites / social_impact_scores는 모두
+(advertiser_id, date)당 1행입니다. 점수 계산 결과를 광고주마다 SELECT 후
+add/수정하는 대신, 그 날짜의 기존 행 id를 1회 조회하고 INSERT / UPDATE를
+각각 executemany 1회로 반영합니다.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+
+
+async def upsert_daily_scores(session, model, day: datetime, rows: dict[int, dict]) -> tuple[int, int]:
+    """{advertiser_id: 컬럼 값} → (created, updated). 커밋은 호출자가 합니다."""
+    if not rows:
+        return 0, 0
+    existing = dict(
+        (await session.execute(select(model.advertiser_id, model.id).where(model.date == day))).all()
+    )
+    inserts = [
+        {"advertiser_id": adv_id, "date": day, **values}
+        for adv_id, values in rows.items()
+        if adv_id not in existing
+    ]
+    updates = [
+        {"id": existing[adv_id], **values}
+        for adv_id, values in rows.items()
+        if adv_id in existing
+    ]
+    if inserts:
+        await session.execute(insert(model), inserts)
+    if updates:
+        await session.execute(update(model), updates)
+    return len(inserts), len(updates)
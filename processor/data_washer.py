@@ -4,6 +4,7 @@ Crawled ads go through staging_ads first, get washed (validated/filtered),
 and only approved ads are promoted to the live ad_details table.
 """
 
+import asyncio
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -14,17 +15,17 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import (
-    AdDetail, AdSnapshot, Advertiser, Industry, Keyword, Persona, StagingAd,
+    AdDetail, AdSnapshot, StagingAd,
 )
 from processor.korean_filter import is_korean_ad
 from processor.advertiser_name_cleaner import clean_name_for_pipeline
 from processor.advertiser_verifier import NameQuality, verify_advertiser_name
 from processor.advertiser_link_collector import extract_website_from_url
-from processor.creative_hasher import compute_creative_hash, compute_text_hash
+from processor.creative_hasher import compute_creative_hash, compute_perceptual_hash, compute_text_hash
 from processor.extra_data_normalizer import normalize_extra_data
 from processor.channel_utils import is_contact as _is_contact
-from processor.dedup import find_existing_ad, update_seen
-from crawler.personas.profiles import PERSONAS
+from processor.dedup import dedup_key_fields, find_existing_ad, update_seen
+from processor.dimension_cache import DEFAULT_PERSONA, get_dimension_cache
 
 
 AUTO_PROMOTE = os.getenv("STAGING_AUTO_PROMOTE", "true").lower() in ("1", "true", "yes")
@@ -226,44 +227,33 @@ async def promote_approved(session: AsyncSession, batch_id: str) -> dict:
     # Group by (channel, keyword, persona_code, device) for snapshot creation
     first = rows[0]
 
-    # Ensure keyword exists
-    kw_result = await session.execute(
-        select(Keyword).where(Keyword.keyword == first.keyword)
+    # Dimensions go through the shared cache but are created inside this session's
+    # transaction, so a rolled-back promotion leaves no rows behind.
+    # Catalog channels have persona_code=None -> M30.
+    dims = get_dimension_cache()
+    keyword_id = await dims.keyword_id(session, first.keyword or "unknown", create=True, in_session=True)
+    persona_id = await dims.persona_id(
+        session, first.persona_code or DEFAULT_PERSONA, create=True, in_session=True,
     )
-    kw = kw_result.scalar_one_or_none()
-    if not kw:
-        ind_result = await session.execute(
-            select(Industry).where(Industry.name == "기타")
-        )
-        industry = ind_result.scalar_one_or_none()
-        if not industry:
-            industry = Industry(name="기타")
-            session.add(industry)
-            await session.flush()
-        kw = Keyword(keyword=first.keyword or "unknown", industry_id=industry.id, is_active=True)
-        session.add(kw)
-        await session.flush()
-
-    # Ensure persona exists (카탈로그 채널은 persona_code=None → M30 기본값)
-    persona_row = None
-    _pc = first.persona_code or "M30"
-    if _pc:
-        p_result = await session.execute(
-            select(Persona).where(Persona.code == _pc)
-        )
-        persona_row = p_result.scalar_one_or_none()
-        if not persona_row:
-            _p = PERSONAS.get(_pc)
-            _age = str(_p.age_group).replace("\ub300", "") if _p and _p.age_group else "30"  # "10\ub300" -> "10"
-            _gender = "F" if (_p and _p.gender and "\uc5ec" in _p.gender) else ("M" if _pc[0:1] != "F" else "F")  # "\uc5ec\uc131" -> F
-            persona_row = Persona(code=_pc, age_group=_age, gender=_gender, login_type="none")
-            session.add(persona_row)
-            await session.flush()
+
+    adv_names: dict[int, str | None] = {}
+    websites: dict[str, str | None] = {}
+    for row in rows:
+        ad = row.raw_payload or {}
+        adv_name = row.resolved_advertiser_name or ad.get("advertiser_name")
+        # 광고카피/URL 제거
+        if adv_name:
+            adv_name = clean_name_for_pipeline(adv_name)
+        adv_names[row.id] = adv_name
+        if adv_name and not websites.get(adv_name):
+            websites[adv_name] = extract_website_from_url(ad.get("url"), ad.get("display_url"))
+    # Look up known advertisers now; missing ones are created only for rows that get promoted.
+    advertiser_ids = await dims.advertiser_ids(session, websites.keys(), create=False, in_session=True)
 
     # Create snapshot
     snap = AdSnapshot(
-        keyword_id=kw.id,
-        persona_id=persona_row.id if persona_row else None,
+        keyword_id=keyword_id,
+        persona_id=persona_id,
         device=first.device or "pc",
         channel=first.channel,
         captured_at=first.captured_at or datetime.utcnow(),
@@ -280,11 +270,7 @@ async def promote_approved(session: AsyncSession, batch_id: str) -> dict:
     for row in rows:
         try:
             ad = row.raw_payload or {}
-            adv_name = row.resolved_advertiser_name or ad.get("advertiser_name")
-            # 광고카피/URL 제거
-            if adv_name:
-                adv_name = clean_name_for_pipeline(adv_name)
-
+            adv_name = adv_names[row.id]
             c_hash = ad.get("_creative_hash")
 
             # Dedup check: if same ad already exists in this channel, just update seen_count
@@ -300,28 +286,19 @@ async def promote_approved(session: AsyncSession, batch_id: str) -> dict:
                 deduped += 1
                 continue
 
-            # Lookup/create advertiser
-            advertiser_id = None
-            if adv_name:
-                adv_result = await session.execute(
-                    select(Advertiser).where(Advertiser.name == adv_name)
+            advertiser_id = advertiser_ids.get(adv_name) if adv_name else None
+            if adv_name and advertiser_id is None:
+                created = await dims.advertiser_ids(
+                    session, [adv_name], websites={adv_name: websites.get(adv_name)}, in_session=True,
                 )
-                adv = adv_result.scalar_one_or_none()
-                if not adv:
-                    website = extract_website_from_url(
-                        ad.get("url"), ad.get("display_url")
-                    )
-                    adv = Advertiser(name=adv_name, website=website)
-                    session.add(adv)
-                    await session.flush()
-                advertiser_id = adv.id
+                advertiser_id = advertiser_ids[adv_name] = created.get(adv_name)
 
             extra = ad.get("extra_data") or {}
             now = datetime.utcnow()
 
             detail = AdDetail(
                 snapshot_id=snap.id,
-                persona_id=persona_row.id,
+                persona_id=persona_id,
                 advertiser_id=advertiser_id,
                 advertiser_name_raw=adv_name,
                 ad_text=ad.get("ad_text"),
@@ -334,6 +311,8 @@ async def promote_approved(session: AsyncSession, batch_id: str) -> dict:
                 verification_source=ad.get("verification_source"),
                 creative_image_path=ad.get("creative_image_path"),
                 creative_hash=c_hash,
+                creative_phash=await asyncio.to_thread(compute_perceptual_hash, ad.get("creative_image_path")),
+                **dedup_key_fields(snap.channel, adv_name, ad.get("ad_text"), ad.get("url")),
                 extra_data=extra,
                 is_contact=_is_contact(row.channel, ad),
                 first_seen_at=row.captured_at or now,
@@ -1,14 +1,39 @@
 """Dedup logic for ad_details -- prevents duplicate INSERT, updates seen tracking.
 
 Used by data_washer.promote_approved() and fast_crawl.save_to_db().
+DedupIndex is the in-memory variant used by pipeline.save_crawl_results_bulk().
+Both pipeline paths fall back to a same-channel perceptual-hash near-duplicate
+lookup (processor.phash_index) when neither creative_hash nor text_key match
+and CREATIVE_PHASH_MAX_DISTANCE is set (off by default).
+
+Lookups probe the denormalized ad_details.channel / text_key columns through
+the (channel, creative_hash) and (channel, text_key) indexes -- no join to
+ad_snapshots. Rows written before those columns existed need
+scripts/backfill_dedup_keys.py.
 """
 
 from datetime import datetime
 
-from sqlalchemy import select, and_, or_, update
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import AdDetail, AdSnapshot
+from database.models import AdDetail
+from processor.creative_hasher import compute_text_hash
+from processor import phash_index as _phash
+from processor.phash_index import PerceptualHashIndex
+
+
+def dedup_key_fields(
+    channel: str,
+    advertiser_name: str | None,
+    ad_text: str | None,
+    url: str | None,
+) -> dict:
+    """AdDetail 생성 시 함께 저장할 dedup 키 컬럼 (channel, text_key)."""
+    return {
+        "channel": channel,
+        "text_key": compute_text_hash(advertiser_name, ad_text, url),
+    }
 
 
 async def find_existing_ad(
@@ -23,52 +48,37 @@ async def find_existing_ad(
 
     Match priority:
     1. creative_hash (if available) within same channel
-    2. (advertiser_name_raw + ad_text + url) within same channel
+    2. text_key = compute_text_hash(advertiser_name, ad_text, url) within same channel
 
     Returns ad_detail.id if found, None otherwise.
     """
     # Try creative_hash first (most reliable)
     if creative_hash:
-        stmt = (
+        result = await session.execute(
             select(AdDetail.id)
-            .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
             .where(
+                AdDetail.channel == channel,
                 AdDetail.creative_hash == creative_hash,
-                AdSnapshot.channel == channel,
             )
             .limit(1)
         )
-        result = await session.execute(stmt)
         existing_id = result.scalar_one_or_none()
         if existing_id:
             return existing_id
 
-    # Fallback: text-based match (need at least one non-null field to avoid false matches)
-    has_any = bool(advertiser_name or ad_text or url)
-    if not has_any:
-        return None  # All key fields are NULL → cannot determine uniqueness
-
-    conditions = [AdSnapshot.channel == channel]
-    if advertiser_name:
-        conditions.append(AdDetail.advertiser_name_raw == advertiser_name)
-    else:
-        conditions.append(AdDetail.advertiser_name_raw.is_(None))
-    if ad_text:
-        conditions.append(AdDetail.ad_text == ad_text)
-    else:
-        conditions.append(AdDetail.ad_text.is_(None))
-    if url:
-        conditions.append(AdDetail.url == url)
-    else:
-        conditions.append(AdDetail.url.is_(None))
+    # Fallback: text key (None when all key fields are empty → cannot determine uniqueness)
+    text_key = compute_text_hash(advertiser_name, ad_text, url)
+    if not text_key:
+        return None
 
-    stmt = (
+    result = await session.execute(
         select(AdDetail.id)
-        .join(AdSnapshot, AdDetail.snapshot_id == AdSnapshot.id)
-        .where(and_(*conditions))
+        .where(
+            AdDetail.channel == channel,
+            AdDetail.text_key == text_key,
+        )
         .limit(1)
     )
-    result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
@@ -84,3 +94,173 @@ async def update_seen(session: AsyncSession, ad_detail_id: int, captured_at: dat
         )
     )
     await session.execute(stmt)
+
+
+# ── Batch (in-memory) dedup ──
+
+_IN_CHUNK = 500  # SQLite bound-parameter 여유분
+
+
+class DedupIndex:
+    """Per-batch dedup index -- find_existing_ad/_check_duplicate semantics without round-trips.
+
+    Usage:
+        index = DedupIndex()
+        await index.load(session, hashes, text_keys, channels)  # 배치당 2~N회 쿼리
+        ref = index.find(channel, c_hash, name, text, url)      # 메모리 조회
+        index.bump(ref, captured_at)                            # seen 누적
+        await index.flush_seen(session)                         # executemany UPDATE 1회
+
+    Lookups use the *crawler* channel while entries are keyed by the *stored*
+    ad_details.channel, exactly like the per-row SQL path.
+    With phash_index, find() falls back to the nearest perceptual hash (DB rows
+    and pending rows of this batch; DB wins ties) like the per-row path does.
+    New rows registered with add_pending() are dicts; bumps mutate them in place
+    so the later bulk INSERT already carries the final seen_count/last_seen_at.
+    """
+
+    def __init__(self, phash_index: PerceptualHashIndex | None = None, max_distance: int | None = None):
+        self._hash_channels: dict[str, set[str]] = {}
+        self._by_hash: dict[tuple[str, str], int | dict] = {}
+        self._by_text: dict[tuple[str, str], int | dict] = {}
+        self._seen: dict[int, list] = {}  # ad_detail_id -> [increment, last_seen_at]
+        self._phash_index = phash_index
+        self._max_distance = _phash.MAX_DISTANCE if max_distance is None else max_distance
+        self._by_phash: dict[tuple[str, str], tuple[int, int]] = {}  # (channel, phash) -> (ad_id, dist)
+        self._pending_phash = PerceptualHashIndex()
+        self._pending_rows: list[dict] = []
+
+    async def load(
+        self,
+        session: AsyncSession,
+        creative_hashes: set[str],
+        text_keys: set[str],
+        channels: set[str],
+        phash_queries: set[tuple[str, str]] | None = None,
+    ) -> None:
+        """Load existing rows that could collide with this batch.
+
+        phash_queries: (crawler channel, creative_phash) pairs -- phash_index가 있을 때만 사용.
+        """
+        if self._phash_index is not None and phash_queries:
+            self._by_phash = await self._phash_index.nearest_many(session, phash_queries, self._max_distance)
+
+        hashes = sorted(h for h in creative_hashes if h)
+        for i in range(0, len(hashes), _IN_CHUNK):
+            chunk = hashes[i:i + _IN_CHUNK]
+            rows = await session.execute(
+                select(AdDetail.id, AdDetail.creative_hash, AdDetail.channel)
+                .where(AdDetail.creative_hash.in_(chunk))
+                .order_by(AdDetail.id)
+            )
+            for ad_id, c_hash, channel in rows:
+                if channel:
+                    self._register_hash(channel, c_hash, ad_id)
+
+        # 텍스트 폴백은 크롤러 채널 == 저장 채널인 행만 매칭되므로 channel IN 으로 한정
+        keys = sorted(k for k in text_keys if k)
+        if not channels:
+            return
+        for i in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[i:i + _IN_CHUNK]
+            rows = await session.execute(
+                select(AdDetail.id, AdDetail.channel, AdDetail.text_key)
+                .where(AdDetail.text_key.in_(chunk), AdDetail.channel.in_(sorted(channels)))
+                .order_by(AdDetail.id)
+            )
+            for ad_id, channel, text_key in rows:
+                self._by_text.setdefault((channel, text_key), ad_id)
+
+    def _register_hash(self, stored_channel: str, c_hash: str | None, ref: int | dict) -> None:
+        if not c_hash:
+            return
+        self._hash_channels.setdefault(c_hash, set()).add(stored_channel)
+        self._by_hash.setdefault((stored_channel, c_hash), ref)
+
+    def is_cross_channel(self, creative_hash: str | None, channel: str) -> bool:
+        """같은 해시가 다른 채널에 이미 있는지 (_check_duplicate와 동일)."""
+        if not creative_hash:
+            return False
+        return any(c != channel for c in self._hash_channels.get(creative_hash, ()))
+
+    def find(
+        self,
+        channel: str,
+        creative_hash: str | None,
+        advertiser_name: str | None,
+        ad_text: str | None,
+        url: str | None,
+        creative_phash: str | None = None,
+    ) -> int | dict | None:
+        """Return existing ad id, pending row dict, or None (find_existing_ad와 동일 우선순위)."""
+        if creative_hash:
+            ref = self._by_hash.get((channel, creative_hash))
+            if ref is not None:
+                return ref
+        text_key = compute_text_hash(advertiser_name, ad_text, url)
+        if text_key:
+            ref = self._by_text.get((channel, text_key))
+            if ref is not None:
+                return ref
+        return self._find_near(channel, creative_phash)
+
+    def _find_near(self, channel: str, creative_phash: str | None) -> int | dict | None:
+        if not creative_phash or self._phash_index is None or self._max_distance < 0:
+            return None
+        db_hit = self._by_phash.get((channel, creative_phash))
+        pending = self._pending_phash.query(channel, creative_phash, self._max_distance)
+        if pending and (db_hit is None or pending[0][1] < db_hit[1]):
+            return self._pending_rows[pending[0][0]]
+        return db_hit[0] if db_hit else None
+
+    def add_pending(self, row: dict) -> None:
+        """Register a to-be-inserted AdDetail row so later ads in the batch dedup against it."""
+        stored_channel = row["channel"]
+        self._register_hash(stored_channel, row.get("creative_hash"), row)
+        if row.get("text_key"):
+            self._by_text.setdefault((stored_channel, row["text_key"]), row)
+        if row.get("creative_phash"):
+            self._pending_phash.add(stored_channel, row["creative_phash"], len(self._pending_rows))
+            self._pending_rows.append(row)
+
+    def bump(self, ref: int | dict, captured_at: datetime | None = None) -> None:
+        """update_seen 대응 — 메모리에 누적."""
+        now = captured_at or datetime.utcnow()
+        if isinstance(ref, dict):
+            ref["seen_count"] = (ref.get("seen_count") or 0) + 1
+            ref["last_seen_at"] = now
+            return
+        entry = self._seen.setdefault(ref, [0, now])
+        entry[0] += 1
+        entry[1] = now
+
+    @property
+    def seen_updates(self) -> int:
+        """Pending bump() count against existing rows (not distinct ads)."""
+        return sum(inc for inc, _ in self._seen.values())
+
+    async def flush_seen(self, session: AsyncSession) -> int:
+        """Apply accumulated seen bumps with one executemany UPDATE.
+
+        Returns the summed increment, i.e. how many update_seen() calls the
+        per-row path would have made -- not the number of distinct ads.
+        """
+        if not self._seen:
+            return 0
+        tbl = AdDetail.__table__
+        stmt = (
+            update(tbl)
+            .where(tbl.c.id == bindparam("b_id"))
+            .values(
+                seen_count=tbl.c.seen_count + bindparam("b_inc"),
+                last_seen_at=bindparam("b_seen"),
+            )
+        )
+        params = [
+            {"b_id": ad_id, "b_inc": inc, "b_seen": seen_at}
+            for ad_id, (inc, seen_at) in self._seen.items()
+        ]
+        await session.execute(stmt, params)
+        count = self.seen_updates
+        self._seen.clear()
+        return count
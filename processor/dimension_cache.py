@@ -0,0 +1,282 @@
+"""차원 캐시 — 키워드/페르소나/업종/광고주 이름 → id (적재 경로 공용).
+
+scripts/fast_crawl.save_to_db와 data_washer.promote_approved는 키워드 결과/광고마다
+Industry('기타'), Keyword, Persona, Advertiser를 이름으로 다시 조회하고 insert 후
+flush했고, pipeline은 무효화되지 않는 모듈 dict 캐시를 썼습니다. 이 모듈은
+프로세스 전역 캐시 하나를 두고 세 경로가 함께 사용합니다.
+
+- 첫 조회 시 네 테이블의 이름 → id를 한 번에 적재 (warm), DIMENSION_CACHE_TTL_SEC(기본 300초)
+  마다 다시 적재 — API 프로세스의 광고주 병합/키워드 삭제도 TTL 안에 반영
+- 캐시 miss는 bulk get-or-create: 없는 이름을 모아 INSERT 1회 + SELECT 1회
+    industries / personas: 이름이 UNIQUE → INSERT ... ON CONFLICT DO NOTHING
+    keywords / advertisers: 스키마에 UNIQUE가 없음 → 차원별 asyncio.Lock 안에서
+      SELECT → 없는 것만 INSERT → SELECT (같은 이름이 여럿이면 최소 id)
+- 생성은 호출자 세션과 별도 세션에서 즉시 커밋 → 롤백된 행의 id가 캐시에 남지 않음.
+  SQLite 쓰기 잠금이 겹치지 않도록 호출자는 자신의 쓰기(flush) 전에 필요한 차원을 조회
+- in_session=True: 캐시 miss 조회/생성을 호출자 세션(트랜잭션) 안에서 수행하고 커밋하지 않음.
+  해석한 id는 세션별 대기 목록에 두었다가 호출자 커밋 후(after_commit)에만 캐시에 반영,
+  롤백되면 버림 → 승격 롤백/중복 스킵 시 고아 광고주 행이 남지 않음 (data_washer, fast_crawl)
+- 엔진(bind)이 바뀌면 캐시를 비움 (테스트/스크립트별 DB)
+
+사용법:
+  from processor.dimension_cache import get_dimension_cache
+
+  dims = get_dimension_cache()
+  keyword_id = await dims.keyword_id(session, "선크림")                 # 조회만
+  ids = await dims.advertiser_ids(session, ["A사", "B사"], create=True)  # {이름: id}
+  ids = await dims.advertiser_ids(session, ["C사"], in_session=True)     # 호출자 트랜잭션에서 생성
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crawler.personas.profiles import PERSONAS
+from database.models import Advertiser, Industry, Keyword, Persona
+
+DEFAULT_INDUSTRY = "기타"
+DEFAULT_PERSONA = "M30"
+
+# 차원 → (모델, 이름 컬럼, 이름 UNIQUE 여부)
+_DIMENSIONS = {
+    "industry": (Industry, Industry.name, True),
+    "keyword": (Keyword, Keyword.keyword, False),
+    "persona": (Persona, Persona.code, True),
+    "advertiser": (Advertiser, Advertiser.name, False),
+}
+_IN_CHUNK = 500
+
+
+def _persona_row(code: str) -> dict:
+    """프로필 정의(PERSONAS) 기준 신규 페르소나 행 — 없는 코드는 30대/코드 첫 글자 성별."""
+    p = PERSONAS.get(code)
+    age = str(p.age_group).replace("대", "") if p and p.age_group else "30"
+    gender = "F" if (p and p.gender and "여" in p.gender) else ("M" if code[0:1] != "F" else "F")
+    return {"code": code, "age_group": age, "gender": gender, "login_type": "none"}
+
+
+def _insert_ignore(session: AsyncSession, model):
+    """INSERT ... ON CONFLICT DO NOTHING (UNIQUE 컬럼 차원 전용)."""
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+class DimensionCache:
+    """이름 → id 캐시. 조회는 잠금 없이 dict, miss 해석/생성만 차원별 잠금."""
+
+    def __init__(self, ttl_sec: float | None = None):
+        if ttl_sec is None:
+            ttl_sec = float(os.getenv("DIMENSION_CACHE_TTL_SEC", "300"))
+        self.ttl_sec = ttl_sec
+        self._ids: dict[str, dict[str, int]] = {dim: {} for dim in _DIMENSIONS}
+        self._bind = None
+        self._warmed_at = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = {"warms": 0, "hits": 0, "misses": 0, "created": 0}
+
+    def invalidate(self) -> None:
+        """다음 조회 때 전체 재적재."""
+        self._warmed_at = 0.0
+
+    def _lock(self, name: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._locks = {key: asyncio.Lock() for key in (*_DIMENSIONS, "warm")}
+        return self._locks[name]
+
+    async def _ensure_warm(self, session: AsyncSession) -> None:
+        if session.bind is self._bind and time.monotonic() - self._warmed_at < self.ttl_sec:
+            return
+        async with self._lock("warm"):
+            if session.bind is self._bind and time.monotonic() - self._warmed_at < self.ttl_sec:
+                return
+            ids: dict[str, dict[str, int]] = {}
+            async with AsyncSession(bind=session.bind) as own:
+                for dim, (_, name_col, _) in _DIMENSIONS.items():
+                    model_id = name_col.class_.id
+                    rows = await own.execute(select(name_col, func.min(model_id)).group_by(name_col))
+                    ids[dim] = {name: row_id for name, row_id in rows.all()}
+            self._ids = ids
+            self._bind = session.bind
+            self._warmed_at = time.monotonic()
+            self.stats["warms"] += 1
+            logger.debug(
+                "[dimension_cache] warm: "
+                + ", ".join(f"{dim} {len(values)}" for dim, values in ids.items())
+            )
+
+    async def resolve(
+        self,
+        session: AsyncSession,
+        dimension: str,
+        names: Iterable[str],
+        create: bool = False,
+        rows: dict[str, dict] | None = None,
+        in_session: bool = False,
+    ) -> dict[str, int]:
+        """이름 목록 → {이름: id}. create=True면 없는 이름을 bulk 생성.
+
+        rows: 생성 시 이름별 추가 컬럼 (예: {"A사": {"website": ...}}).
+        in_session: miss를 호출자 세션에서 조회/생성 (커밋은 호출자, 캐시 반영은 커밋 후).
+        """
+        await self._ensure_warm(session)
+        wanted = {n for n in names if n}
+        cache = self._ids[dimension]
+        found = {n: cache[n] for n in wanted if n in cache}
+        self.stats["hits"] += len(found)
+        missing = sorted(wanted - found.keys())
+        if not missing:
+            return found
+
+        model, name_col, unique = _DIMENSIONS[dimension]
+        async with self._lock(dimension):
+            missing = [n for n in missing if n not in cache]
+            self.stats["misses"] += len(missing)
+            if in_session:
+                found.update(await self._resolve_in_session(session, dimension, missing, create, rows))
+                return found
+            async with AsyncSession(bind=session.bind) as own:
+                if not unique or not create:
+                    cache.update(await self._select_ids(own, name_col, missing))
+                to_create = [n for n in missing if n not in cache] if create else []
+                if to_create:
+                    values = [self._new_row(dimension, n, (rows or {}).get(n)) for n in to_create]
+                    stmt = _insert_ignore(own, model) if unique else insert(model)
+                    await own.execute(stmt, values)
+                    created = await self._select_ids(own, name_col, to_create)
+                    await own.commit()
+                    cache.update(created)
+                    self.stats["created"] += len(created)
+        found.update({n: cache[n] for n in wanted if n in cache})
+        return found
+
+    async def _resolve_in_session(
+        self,
+        session: AsyncSession,
+        dimension: str,
+        names: list[str],
+        create: bool,
+        rows: dict[str, dict] | None,
+    ) -> dict[str, int]:
+        model, name_col, unique = _DIMENSIONS[dimension]
+        pending = self._pending(session)[dimension]
+        ids = {n: pending[n] for n in names if n in pending}
+        rest = [n for n in names if n not in ids]
+        if rest:
+            ids.update(await self._select_ids(session, name_col, rest))
+            to_create = [n for n in rest if n not in ids] if create else []
+            if to_create:
+                values = [self._new_row(dimension, n, (rows or {}).get(n)) for n in to_create]
+                stmt = _insert_ignore(session, model) if unique else insert(model)
+                await session.execute(stmt, values)
+                created = await self._select_ids(session, name_col, to_create)
+                ids.update(created)
+                self.stats["created"] += len(created)
+            pending.update(ids)
+        return ids
+
+    def _pending(self, session: AsyncSession) -> dict[str, dict[str, int]]:
+        """세션별 미반영 id — 호출자 커밋 시 캐시에 반영, 롤백 시 폐기."""
+        pending = session.info.get("dimension_cache_pending")
+        if pending is not None:
+            return pending
+        pending = session.info["dimension_cache_pending"] = {dim: {} for dim in _DIMENSIONS}
+        bind = session.bind
+
+        def publish(_sync_session) -> None:
+            if self._bind is bind:
+                for dim, values in pending.items():
+                    self._ids[dim].update(values)
+            discard(_sync_session)
+
+        def discard(_sync_session) -> None:
+            for values in pending.values():
+                values.clear()
+
+        event.listen(session.sync_session, "after_commit", publish)
+        event.listen(session.sync_session, "after_rollback", discard)
+        return pending
+
+    @staticmethod
+    async def _select_ids(own: AsyncSession, name_col, names: list[str]) -> dict[str, int]:
+        model_id = name_col.class_.id
+        ids: dict[str, int] = {}
+        for i in range(0, len(names), _IN_CHUNK):
+            result = await own.execute(
+                select(name_col, func.min(model_id))
+                .where(name_col.in_(names[i:i + _IN_CHUNK]))
+                .group_by(name_col)
+            )
+            ids.update(result.all())
+        return ids
+
+    def _new_row(self, dimension: str, name: str, extra: dict | None) -> dict:
+        if dimension == "persona":
+            row = _persona_row(name)
+        elif dimension == "keyword":
+            row = {"keyword": name, "is_active": True}
+        else:
+            row = {"name": name}
+        row.update(extra or {})
+        return row
+
+    # ── 차원별 단건 헬퍼 ──
+
+    async def industry_id(
+        self, session: AsyncSession, name: str = DEFAULT_INDUSTRY, create: bool = True, in_session: bool = False,
+    ) -> int | None:
+        return (await self.resolve(session, "industry", [name], create=create, in_session=in_session)).get(name)
+
+    async def keyword_id(
+        self,
+        session: AsyncSession,
+        keyword: str,
+        create: bool = False,
+        industry: str = DEFAULT_INDUSTRY,
+        in_session: bool = False,
+    ) -> int | None:
+        """키워드 id. create=True면 없을 때 industry(기본 '기타') 소속으로 생성."""
+        rows = None
+        if create and keyword not in self._ids["keyword"]:
+            rows = {keyword: {"industry_id": await self.industry_id(session, industry, in_session=in_session)}}
+        return (await self.resolve(
+            session, "keyword", [keyword], create=create, rows=rows, in_session=in_session,
+        )).get(keyword)
+
+    async def persona_id(
+        self, session: AsyncSession, code: str, create: bool = False, in_session: bool = False,
+    ) -> int | None:
+        return (await self.resolve(session, "persona", [code], create=create, in_session=in_session)).get(code)
+
+    async def advertiser_ids(
+        self,
+        session: AsyncSession,
+        names: Iterable[str],
+        create: bool = True,
+        websites: dict[str, str | None] | None = None,
+        in_session: bool = False,
+    ) -> dict[str, int]:
+        rows = {n: {"website": w} for n, w in (websites or {}).items() if w}
+        return await self.resolve(session, "advertiser", names, create=create, rows=rows, in_session=in_session)
+
+
+_cache: DimensionCache | None = None
+
+
+def get_dimension_cache() -> DimensionCache:
+    global _cache
+    if _cache is None:
+        _cache = DimensionCache()
+    return _cache
@@ -0,0 +1,378 @@
+"""이미지 blob 인덱스 — content-addressed 이미지 저장소의 참조 카운트 (image_blobs 테이블).
+
+같은 소재를 페르소나/키워드별로 수백 번 캡처해도 저장 바이트(변환된 WebP)가 같으면
+blob 하나만 저장하고, image_blobs에 참조 수와 마지막 참조 시각을 기록합니다.
+
+- 키: blobs/ab/cd/<sha256>.webp — 썸네일은 같은 디렉토리의 <sha256>.t320.webp 등
+- 저장(save) 1회 = 참조 +1, 저장소 delete() = 참조 -1 (0이 되면 즉시 삭제)
+- 정리(cleanup)는 파일시스템 순회 대신 인덱스 조회:
+    ref_count <= 0 (유예 BLOB_GRACE_HOURS 경과) 또는 last_referenced_at < 보존 기한
+  같은 소재가 계속 캡처되면 last_referenced_at이 갱신되어 보존 기한이 연장됩니다.
+- 기존 날짜별 트리(channel/YYYYMMDD/category/*.webp)는 migrate_legacy_tree()로
+  DB 경로(ad_snapshots/ad_details) 갱신 → 제자리 이전 → 참조 수 재계산
+
+해시는 지각(perceptual) 해시가 아닌 저장 바이트의 sha256입니다 — 문구/가격만 다른
+소재가 하나로 합쳐지면 증빙 이미지가 바뀌므로, 완전히 같은 캡처만 공유합니다.
+
+참조 수는 저장 요청 기준이라 적재 단계에서 버려진 캡처만큼 많게 잡힐 수 있습니다.
+migrate_legacy_tree()는 DB 경로를 세어 정확한 값으로 맞춥니다 (재실행 가능, 크롤러
+정지 상태에서 실행).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from database import async_session
+from database.models import AdDetail, AdSnapshot, ImageBlob
+
+BLOB_DIR = "blobs"
+BLOB_GRACE_HOURS = int(os.getenv("IMAGE_BLOB_GRACE_HOURS", "24"))
+
+# ImageStore.save 호출 카테고리만 이전 (stored_images/instagram 등 다른 모듈 파일 제외)
+_LEGACY_RE = re.compile(r"^(?!blobs/)[^/]+/\d{8}/(screenshot|element|creative)/[^/]+$")
+_THUMB_RE = re.compile(r"\.t(\d+)\.[^.]+$")
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# 저장소 경로를 담는 DB 컬럼 (참조 수 = 이 컬럼들에서 blob을 가리키는 행 수)
+_PATH_COLUMNS = (
+    (AdSnapshot, "screenshot_path"),
+    (AdDetail, "screenshot_path"),
+    (AdDetail, "creative_image_path"),
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def blob_key(digest: str, ext: str = ".webp") -> str:
+    """blobs/ab/cd/<digest><ext> — 디렉토리당 파일 수를 제한하는 2단계 샤딩."""
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def blob_digest(path: str | None) -> str | None:
+    """저장 경로/키 → blob 해시. blob 경로가 아니면(기존 날짜별 경로 등) None."""
+    if not path:
+        return None
+    p = path.replace("\\", "/").split("#", 1)[0]
+    head, _, name = p.rpartition("/")
+    if f"{BLOB_DIR}/" not in f"{head}/":
+        return None
+    digest = name.split(".", 1)[0]
+    return digest if _DIGEST_RE.match(digest) else None
+
+
+def _expired_clause(older_than_days: int, grace_hours: int):
+    now = datetime.utcnow()
+    return or_(
+        and_(ImageBlob.ref_count <= 0, ImageBlob.last_referenced_at < now - timedelta(hours=grace_hours)),
+        ImageBlob.last_referenced_at < now - timedelta(days=older_than_days),
+    )
+
+
+# ── 참조 카운트 ──
+
+
+async def blob_exists(digest: str) -> bool:
+    async with async_session() as session:
+        found = await session.execute(select(ImageBlob.id).where(ImageBlob.content_hash == digest))
+        return found.first() is not None
+
+
+async def reference_blob(digest: str, key: str, size_bytes: int, count: int = 1) -> int:
+    """참조 +count (없으면 등록). 갱신 후 참조 수 반환."""
+    now = datetime.utcnow()
+    for _ in range(2):
+        async with async_session() as session:
+            bumped = await session.execute(
+                update(ImageBlob)
+                .where(ImageBlob.content_hash == digest)
+                .values(ref_count=ImageBlob.ref_count + count, last_referenced_at=now)
+                .returning(ImageBlob.ref_count)
+            )
+            total = bumped.scalar()
+            if total is not None:
+                await session.commit()
+                return total
+            session.add(ImageBlob(
+                content_hash=digest, key=key, size_bytes=size_bytes,
+                ref_count=count, created_at=now, last_referenced_at=now,
+            ))
+            try:
+                await session.commit()
+                return count
+            except IntegrityError:
+                # 같은 blob을 동시에 등록 → 다음 루프에서 갱신으로 처리
+                await session.rollback()
+    raise RuntimeError(f"image_blobs 등록 실패: {digest}")
+
+
+async def release_blob(digest: str) -> int | None:
+    """참조 -1. 0이 되면 인덱스 행을 지우고 0 반환 (파일 삭제는 호출자). 미등록이면 None."""
+    async with async_session() as session:
+        released = await session.execute(
+            update(ImageBlob)
+            .where(ImageBlob.content_hash == digest)
+            .values(ref_count=ImageBlob.ref_count - 1)
+            .returning(ImageBlob.ref_count)
+        )
+        count = released.scalar()
+        if count is not None and count <= 0:
+            await session.execute(delete(ImageBlob).where(ImageBlob.content_hash == digest))
+        await session.commit()
+        return None if count is None else max(count, 0)
+
+
+async def expired_blob_count(older_than_days: int = 90, grace_hours: int = BLOB_GRACE_HOURS) -> int:
+    async with async_session() as session:
+        return (await session.execute(
+            select(func.count(ImageBlob.id)).where(_expired_clause(older_than_days, grace_hours))
+        )).scalar() or 0
+
+
+async def pop_expired_blobs(
+    older_than_days: int = 90, limit: int = 500, grace_hours: int = BLOB_GRACE_HOURS,
+) -> list[str]:
+    """만료 blob을 최대 limit개 인덱스에서 제거하고 키 목록 반환 (파일 삭제는 호출자).
+
+    삭제 시 조건을 다시 확인하므로, 조회와 삭제 사이에 다시 참조된 blob은 남습니다.
+    """
+    clause = _expired_clause(older_than_days, grace_hours)
+    async with async_session() as session:
+        ids = (await session.execute(
+            select(ImageBlob.id).where(clause).order_by(ImageBlob.last_referenced_at).limit(limit)
+        )).scalars().all()
+        if not ids:
+            return []
+        removed = await session.execute(
+            delete(ImageBlob).where(ImageBlob.id.in_(ids), clause).returning(ImageBlob.key)
+        )
+        keys = list(removed.scalars().all())
+        await session.commit()
+        return keys
+
+
+# ── 기존 날짜별 트리 이전 ──
+
+
+def scan_tree(base_dir: Path) -> dict:
+    """기존 cleanup과 같은 rglob + stat 순회 — 이전 전/후 디스크 사용량 비교용."""
+    t0 = time.perf_counter()
+    files = 0
+    size = 0
+    for f in base_dir.rglob("*"):
+        if f.is_file():
+            files += 1
+            size += f.stat().st_size
+    return {"files": files, "bytes": size, "scan_sec": round(time.perf_counter() - t0, 3)}
+
+
+def _thumbnails_of(f: Path) -> list[tuple[int, Path]]:
+    thumbs = []
+    for t in f.parent.glob(f"{f.stem}.t*{f.suffix}"):
+        m = _THUMB_RE.search(t.name)
+        if m and t.name == f"{f.stem}.t{m.group(1)}{f.suffix}":
+            thumbs.append((int(m.group(1)), t))
+    return thumbs
+
+
+def _plan_legacy_files(base_dir: Path) -> tuple[list[tuple[Path, str]], dict[str, str], dict]:
+    """날짜별 트리의 이미지를 해시만 해서 이동 계획을 만든다 (파일 변경 없음).
+
+    ([(파일, blob 키)], {기존 상대경로: blob 키}, 통계) 반환.
+    """
+    plan: list[tuple[Path, str]] = []
+    mapping: dict[str, str] = {}
+    seen: set[str] = set()
+    stats = {"legacy_files": 0, "duplicates": 0, "duplicate_bytes": 0}
+
+    for f in sorted(base_dir.rglob("*")):
+        rel = f.relative_to(base_dir).as_posix()
+        if not _LEGACY_RE.match(rel) or _THUMB_RE.search(f.name) or not f.is_file():
+            continue
+        data = f.read_bytes()
+        digest = content_hash(data)
+        key = blob_key(digest, f.suffix.lower() or ".webp")
+        mapping[rel] = key
+        plan.append((f, key))
+        stats["legacy_files"] += 1
+        if digest in seen or (base_dir / key).exists():
+            stats["duplicates"] += 1
+            stats["duplicate_bytes"] += len(data) + sum(t.stat().st_size for _, t in _thumbnails_of(f))
+        seen.add(digest)
+    return plan, mapping, stats
+
+
+def _move_legacy_files(base_dir: Path, plan: list[tuple[Path, str]]) -> None:
+    """계획대로 blobs/로 이동 (같은 내용의 blob이 이미 있으면 기존 파일 삭제).
+
+    DB 경로 갱신이 커밋된 뒤에만 호출 — 중간에 멈춰도 남은 파일은 다음 실행에서
+    다시 계획되고, 이미 옮긴 파일은 DB가 blob 경로를 가리키고 있음.
+    """
+    for f, key in plan:
+        if not f.exists():
+            continue
+        dest = base_dir / key
+        digest = dest.name.split(".", 1)[0]
+        thumbs = _thumbnails_of(f)
+        mtime = f.stat().st_mtime
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            f.unlink()
+        else:
+            os.replace(f, dest)
+        for width, t in thumbs:
+            target = dest.with_name(f"{digest}.t{width}{dest.suffix}")
+            if target.exists():
+                t.unlink()
+            else:
+                os.replace(t, target)
+        # 보존 기한은 가장 최근 캡처 기준
+        if dest.stat().st_mtime < mtime:
+            os.utime(dest, (mtime, mtime))
+
+    for d in sorted(base_dir.rglob("*"), reverse=True):
+        if d.is_dir() and d.name != BLOB_DIR and not any(d.iterdir()):
+            d.rmdir()
+
+
+def _rewrite_path(raw: str, prefixes: tuple[str, ...], mapping: dict[str, str]) -> str:
+    p = raw.replace("\\", "/")
+    p, hash_sign, fragment = p.partition("#")   # 아틀라스 좌표(#x,y,w,h) 유지
+    for prefix in prefixes:
+        if p.startswith(prefix) and p[len(prefix):] in mapping:
+            return f"{prefix}{mapping[p[len(prefix):]]}{hash_sign}{fragment}"
+    return raw
+
+
+async def _rewrite_db_paths(
+    base_dir: Path, mapping: dict[str, str], dry_run: bool, chunk_size: int = 2000,
+) -> tuple[Counter, int]:
+    """DB 경로를 blob 경로로 갱신하고 blob별 참조 행 수를 센다."""
+    prefixes = tuple(dict.fromkeys([
+        base_dir.as_posix().rstrip("/") + "/",
+        base_dir.resolve().as_posix().rstrip("/") + "/",
+        "stored_images/",
+    ]))
+    refs: Counter = Counter()
+    updated = 0
+    for model, attr in _PATH_COLUMNS:
+        column = getattr(model, attr)
+        last_id = 0
+        while True:
+            async with async_session() as session:
+                rows = (await session.execute(
+                    select(model.id, column)
+                    .where(model.id > last_id, column.is_not(None))
+                    .order_by(model.id)
+                    .limit(chunk_size)
+                )).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                changes = []
+                for row_id, raw in rows:
+                    new = _rewrite_path(raw, prefixes, mapping)
+                    if new != raw:
+                        changes.append({"id": row_id, attr: new})
+                    digest = blob_digest(new)
+                    if digest:
+                        refs[digest] += 1
+                if changes and not dry_run:
+                    await session.execute(update(model), changes)
+                    await session.commit()
+                updated += len(changes)
+    return refs, updated
+
+
+async def _reconcile_index(base_dir: Path, refs: Counter) -> dict:
+    """blobs/ 파일 기준으로 인덱스 행 등록/참조 수 재계산, 파일 없는 행 삭제."""
+    files: dict[str, Path] = {}
+    for f in (base_dir / BLOB_DIR).rglob("*"):
+        digest = f.name.split(".", 1)[0]
+        if f.is_file() and _DIGEST_RE.match(digest) and not _THUMB_RE.search(f.name):
+            files[digest] = f
+
+    async with async_session() as session:
+        indexed = dict((await session.execute(select(ImageBlob.content_hash, ImageBlob.id))).all())
+        missing = [row_id for digest, row_id in indexed.items() if digest not in files]
+        if missing:
+            await session.execute(delete(ImageBlob).where(ImageBlob.id.in_(missing)))
+        changes = [
+            {"id": indexed[d], "ref_count": refs.get(d, 0)} for d in files if d in indexed
+        ]
+        if changes:
+            await session.execute(update(ImageBlob), changes)
+        now = datetime.utcnow()
+        new_rows = []
+        for digest, f in files.items():
+            if digest in indexed:
+                continue
+            st = f.stat()
+            new_rows.append(ImageBlob(
+                content_hash=digest,
+                key=f.relative_to(base_dir).as_posix(),
+                size_bytes=st.st_size,
+                ref_count=refs.get(digest, 0),
+                created_at=now,
+                last_referenced_at=datetime.utcfromtimestamp(st.st_mtime),
+            ))
+        session.add_all(new_rows)
+        await session.commit()
+    return {
+        "blobs": len(files),
+        "indexed": len(new_rows),
+        "unreferenced": sum(1 for d in files if not refs.get(d)),
+        "dropped_rows": len(missing),
+    }
+
+
+async def migrate_legacy_tree(
+    base_dir: str | Path | None = None, dry_run: bool = False, older_than_days: int = 90,
+) -> dict:
+    """기존 날짜별 트리를 blobs/로 제자리 이전하고 DB 경로·인덱스를 맞춘다.
+
+    순서: 해시(계획) → DB 경로 갱신(청크별 커밋) → 파일 이동/중복 삭제 → 인덱스 재계산.
+    파일은 DB가 새 경로를 가리킨 뒤에만 옮기므로 어느 단계에서 멈춰도 재실행하면 이어집니다.
+    before/after에 디스크 사용량과 정리 비용(rglob 순회 vs 인덱스 조회)을 기록합니다.
+    dry_run이면 파일/DB를 바꾸지 않고 중복 규모만 계산합니다.
+    """
+    base = Path(base_dir or os.getenv("IMAGE_STORE_DIR", "stored_images"))
+    report: dict = {"base_dir": str(base), "dry_run": dry_run}
+    report["before"] = await asyncio.to_thread(scan_tree, base)
+
+    plan, mapping, report["files"] = await asyncio.to_thread(_plan_legacy_files, base)
+    refs, report["db_rows_updated"] = await _rewrite_db_paths(base, mapping, dry_run)
+
+    if dry_run:
+        report["after"] = {
+            "files": report["before"]["files"] - report["files"]["duplicates"],
+            "bytes": report["before"]["bytes"] - report["files"]["duplicate_bytes"],
+        }
+        return report
+
+    await asyncio.to_thread(_move_legacy_files, base, plan)
+    report["index"] = await _reconcile_index(base, refs)
+    report["after"] = await asyncio.to_thread(scan_tree, base)
+    t0 = time.perf_counter()
+    report["after"]["expired_blobs"] = await expired_blob_count(older_than_days)
+    report["after"]["cleanup_query_sec"] = round(time.perf_counter() - t0, 3)
+    before, after = report["before"], report["after"]
+    logger.info(
+        f"[image_blobs] 이전 완료: 파일 {before['files']} → {after['files']} / "
+        f"{before['bytes']:,}B → {after['bytes']:,}B, 중복 {report['files']['duplicates']}건 제거, "
+        f"DB 경로 {report['db_rows_updated']}건 갱신"
+    )
+    return report
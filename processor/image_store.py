@@ -2,20 +2,32 @@
 
 크롤러 스크린샷을 WebP 변환 후 저장.
 IMAGE_STORE_TYPE 환경변수로 백엔드 선택 (local/s3).
+
+변환은 processor.image_worker 프로세스 풀에서 실행되며, 저장은 내용 기반(content-addressed)
+입니다 — 같은 바이트의 캡처는 blob 하나를 공유하고 image_blobs 테이블이 참조 수를
+관리합니다 (processor.image_blobs). 썸네일 티어(기본 320px/64px 폭)는 blob 옆에 저장:
+  blobs/ab/cd/<sha256>.webp       (전체)
+  blobs/ab/cd/<sha256>.t320.webp  (갤러리 목록용)
+  blobs/ab/cd/<sha256>.t64.webp
+
+정리(cleanup)는 트리 순회 없이 인덱스에서 만료 blob을 조회해 삭제합니다.
+기존 날짜별 경로(channel/YYYYMMDD/category/*.webp)는 scripts/migrate_image_store.py로 이전.
 """
 
 from __future__ import annotations
 
 import asyncio
 import os
-import shutil
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from io import BytesIO
+from collections import OrderedDict
 from pathlib import Path
 
 from loguru import logger
-from PIL import Image
+
+from processor import image_blobs
+from processor.image_worker import THUMBNAIL_TIERS, ConvertedImage, get_image_worker
+from processor.s3_client import AsyncS3Client
 
 
 class ImageStore(ABC):
@@ -38,13 +50,37 @@ class ImageStore(ABC):
     async def get_url(self, stored_path: str) -> str:
         """저장된 이미지의 접근 URL 반환."""
 
-    @abstractmethod
     async def delete(self, stored_path: str) -> bool:
-        """이미지 삭제."""
+        """참조 1개 해제 — 마지막 참조였으면 blob(+썸네일) 삭제. 기존 날짜별 경로는 바로 삭제."""
+        digest = image_blobs.blob_digest(stored_path)
+        if digest is None:
+            return await self._remove_legacy(stored_path)
+        try:
+            remaining = await image_blobs.release_blob(digest)
+        except Exception as e:
+            logger.warning(f"[image_store] blob 인덱스 접근 실패, 삭제 보류: {e}")
+            return False
+        if remaining == 0:
+            ext = Path(stored_path.split("#", 1)[0]).suffix or ".webp"
+            await self._remove_blobs([image_blobs.blob_key(digest, ext)])
+        return True
 
-    @abstractmethod
     async def cleanup(self, older_than_days: int = 90) -> int:
-        """오래된 이미지 정리. 삭제 건수 반환."""
+        """만료 blob 정리 (image_blobs 인덱스 조회, 트리 순회 없음). 삭제 건수 반환."""
+        deleted = 0
+        while keys := await image_blobs.pop_expired_blobs(older_than_days):
+            await self._remove_blobs(keys)
+            deleted += len(keys)
+        logger.info(f"[image_store] cleanup: blob {deleted}건 삭제 (>{older_than_days}일 또는 미참조)")
+        return deleted
+
+    @abstractmethod
+    async def _remove_blobs(self, keys: list[str]) -> None:
+        """blob 키(blobs/ab/cd/<hash>.webp) 목록의 전체 이미지 + 썸네일 삭제."""
+
+    @abstractmethod
+    async def _remove_legacy(self, stored_path: str) -> bool:
+        """기존 날짜별 경로 이미지 삭제."""
 
 
 _IMAGE_MAGIC = {
@@ -77,35 +113,89 @@ def _is_valid_image_file(source_path: str) -> bool:
         return False
 
 
-def _convert_to_webp(source_path: str, quality: int = 80) -> bytes:
-    """PNG -> WebP 변환 (평균 60% 용량 절감).
+def thumbnail_path(stored_path: str, width: int) -> str:
+    """저장 경로(.webp) → 해당 폭 썸네일 경로. 썸네일 존재 여부는 확인하지 않음."""
+    stem, dot, ext = stored_path.rpartition(".")
+    return f"{stem}.t{width}.{ext}" if dot else f"{stored_path}.t{width}"
 
-    WebP 최대 16383px 제한을 초과하면 리사이즈.
-    """
-    with Image.open(source_path) as img:
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGBA")
-        else:
-            img = img.convert("RGB")
 
-        # WebP 최대 크기 제한 (16383px)
-        max_dim = 16383
-        if img.width > max_dim or img.height > max_dim:
-            ratio = min(max_dim / img.width, max_dim / img.height)
-            new_w = int(img.width * ratio)
-            new_h = int(img.height * ratio)
-            img = img.resize((new_w, new_h), Image.LANCZOS)
+def _log_converted(source_path: str, converted: ConvertedImage) -> None:
+    orig_size = os.path.getsize(source_path)
+    new_size = len(converted.full)
+    ratio = (1 - new_size / max(orig_size, 1)) * 100
+    t = converted.timings_ms
+    logger.debug(
+        f"[image_store] WebP 변환: {os.path.basename(source_path)} "
+        f"({orig_size:,}B -> {new_size:,}B, -{ratio:.0f}%, 썸네일 {len(converted.thumbs)}개) "
+        f"대기 {t.get('wait', 0):.0f}ms / 디코드 {t['decode']:.0f}ms / "
+        f"인코딩 {t['encode']:.0f}ms / 썸네일 {t['thumbs']:.0f}ms"
+    )
+
+
+async def _encode(source_path: str) -> tuple[str, bytes, dict[int, bytes]]:
+    """(확장자, 저장 바이트, 썸네일) — WebP 변환 실패 시 원본 바이트 그대로."""
+    try:
+        converted = await get_image_worker().convert(source_path)
+        _log_converted(source_path, converted)
+        return ".webp", converted.full, converted.thumbs
+    except Exception as e:
+        logger.warning(f"[image_store] WebP 변환 실패, 원본 저장: {e}")
+        data = await asyncio.to_thread(Path(source_path).read_bytes)
+        return Path(source_path).suffix.lower() or ".png", data, {}
 
-        buf = BytesIO()
-        img.save(buf, format="WebP", quality=quality, method=4)
-        return buf.getvalue()
 
+# 인덱스 기록에 실패한 참조: digest → [키, 크기, 누락 참조 수]. 다음 저장 성공 때 재시도
+_pending_refs: dict[str, list] = {}
+_PENDING_REFS_MAX = 10_000
 
-def _generate_key(channel: str, category: str, source_name: str) -> str:
-    """저장 경로 키 생성: channel/YYYYMMDD/category/filename.webp"""
-    date_str = datetime.now().strftime("%Y%m%d")
-    stem = Path(source_name).stem
-    return f"{channel}/{date_str}/{category}/{stem}.webp"
+
+async def _reference_blob(digest: str, key: str, size_bytes: int) -> None:
+    """참조 +1. 인덱스 기록 실패는 저장 실패로 보지 않고 보류 목록에 쌓아 재시도.
+
+    보류 목록이 _PENDING_REFS_MAX를 넘으면 오래된 항목부터 버림 — 그 blob들은
+    scripts/migrate_image_store.py(참조 수 재계산)로 맞춰야 합니다.
+    """
+    try:
+        await image_blobs.reference_blob(digest, key, size_bytes)
+    except Exception as e:
+        entry = _pending_refs.setdefault(digest, [key, size_bytes, 0])
+        entry[2] += 1
+        logger.warning(
+            f"[image_store] image_blobs 인덱스 기록 실패 ({key}, 보류 {len(_pending_refs)}건): {e}"
+        )
+        while len(_pending_refs) > _PENDING_REFS_MAX:
+            dropped = next(iter(_pending_refs))
+            _pending_refs.pop(dropped)
+            logger.error(
+                f"[image_store] 보류 참조 초과 — {dropped} 참조 기록 포기 "
+                f"(scripts/migrate_image_store.py로 참조 수 재계산 필요)"
+            )
+        return
+    if _pending_refs:
+        await _retry_pending_refs()
+
+
+async def _retry_pending_refs() -> None:
+    """보류된 참조를 다시 기록. 실패하면 남겨 두고 다음 기회에 재시도."""
+    for digest in list(_pending_refs):
+        # 먼저 꺼내 두어 동시에 저장 중인 다른 요청이 같은 참조를 두 번 기록하지 않게 함
+        entry = _pending_refs.pop(digest, None)
+        if entry is None:
+            continue
+        key, size_bytes, count = entry
+        try:
+            await image_blobs.reference_blob(digest, key, size_bytes, count=count)
+        except Exception as e:
+            _pending_refs.setdefault(digest, [key, size_bytes, 0])[2] += count
+            logger.warning(f"[image_store] 보류 참조 재시도 실패 ({len(_pending_refs)}건 남음): {e}")
+            return
+    logger.info("[image_store] 보류된 image_blobs 참조 기록 완료")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 class LocalImageStore(ImageStore):
@@ -128,145 +218,191 @@ class LocalImageStore(ImageStore):
             )
             return source_path
 
-        key = _generate_key(channel, category, os.path.basename(source_path))
+        ext, data, thumbs = await _encode(source_path)
+        digest = image_blobs.content_hash(data)
+        key = image_blobs.blob_key(digest, ext)
         dest = self.base_dir / key
+        if not await asyncio.to_thread(self._write_blob, dest, data, thumbs):
+            logger.debug(f"[image_store] 동일 캡처 — 기존 blob 재사용: {channel}/{category} -> {key}")
+        await _reference_blob(digest, key, len(data))
+        return str(dest)
+
+    @staticmethod
+    def _write_blob(dest: Path, data: bytes, thumbs: dict[int, bytes]) -> bool:
+        """blob이 없을 때만 기록. 전체 이미지를 마지막에 써서 존재하면 썸네일까지 완료된 상태."""
+        if dest.exists():
+            return False
         dest.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            loop = asyncio.get_event_loop()
-            webp_data = await loop.run_in_executor(None, _convert_to_webp, source_path)
-            dest.write_bytes(webp_data)
-
-            orig_size = os.path.getsize(source_path)
-            new_size = len(webp_data)
-            ratio = (1 - new_size / max(orig_size, 1)) * 100
-            logger.debug(
-                f"[image_store] WebP 변환: {os.path.basename(source_path)} "
-                f"({orig_size:,}B -> {new_size:,}B, -{ratio:.0f}%)"
-            )
-            return str(dest)
-        except Exception as e:
-            logger.warning(f"[image_store] WebP 변환 실패, 원본 복사: {e}")
-            # 원본 확장자 유지
-            orig_ext = Path(source_path).suffix or ".png"
-            fallback_dest = dest.with_suffix(orig_ext)
-            shutil.copy2(source_path, fallback_dest)
-            return str(fallback_dest)
+        for width, body in thumbs.items():
+            _atomic_write(Path(thumbnail_path(str(dest), width)), body)
+        _atomic_write(dest, data)
+        return True
 
     async def get_url(self, stored_path: str) -> str:
         return f"/images/{Path(stored_path).relative_to(self.base_dir)}"
 
-    async def delete(self, stored_path: str) -> bool:
+    async def _remove_blobs(self, keys: list[str]) -> None:
+        def _unlink_all():
+            for key in keys:
+                path = self.base_dir / key
+                for thumb in path.parent.glob(f"{path.stem}.t*{path.suffix}"):
+                    thumb.unlink(missing_ok=True)
+                path.unlink(missing_ok=True)
+
+        await asyncio.to_thread(_unlink_all)
+
+    async def _remove_legacy(self, stored_path: str) -> bool:
         try:
             Path(stored_path).unlink(missing_ok=True)
+            for width in THUMBNAIL_TIERS:
+                Path(thumbnail_path(stored_path, width)).unlink(missing_ok=True)
             return True
         except Exception:
             return False
 
-    async def cleanup(self, older_than_days: int = 90) -> int:
-        from datetime import timedelta
-
-        cutoff = datetime.now() - timedelta(days=older_than_days)
-        deleted = 0
-        for f in self.base_dir.rglob("*"):
-            if f.is_file() and datetime.fromtimestamp(f.stat().st_mtime) < cutoff:
-                f.unlink()
-                deleted += 1
-
-        # 빈 디렉토리 정리
-        for d in sorted(self.base_dir.rglob("*"), reverse=True):
-            if d.is_dir() and not any(d.iterdir()):
-                d.rmdir()
-
-        logger.info(f"[image_store] cleanup: {deleted}건 삭제 (>{older_than_days}일)")
-        return deleted
-
     def __repr__(self):
         return f"LocalImageStore({self.base_dir})"
 
 
 class S3ImageStore(ImageStore):
-    """AWS S3 스토리지 (프로덕션용).
+    """S3 호환 오브젝트 스토리지 (프로덕션용) — processor.s3_client 비동기 클라이언트.
+
+    업로드는 커넥션 풀을 공유하며 IMAGE_S3_UPLOAD_CONCURRENCY개까지 동시에 보내고,
+    presigned URL은 만료 IMAGE_S3_URL_REFRESH_SEC초 전까지 캐시에서 재사용합니다.
 
     환경변수:
         AWS_S3_BUCKET: S3 버킷명
         AWS_S3_PREFIX: 키 접두사 (기본: "adscope/images")
         AWS_S3_REGION: 리전 (기본: "ap-northeast-2")
+        AWS_S3_ENDPOINT_URL: S3 호환 엔드포인트 (MinIO 등, 지정 시 path-style)
+        AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY / AWS_SESSION_TOKEN: 자격 증명
+        IMAGE_S3_UPLOAD_CONCURRENCY: 동시 업로드 수 (기본 8)
+        IMAGE_S3_MULTIPART_MB: 멀티파트 업로드 기준/파트 크기 (기본 8, 최소 5)
+        IMAGE_S3_URL_EXPIRES: presigned URL 유효 시간 (초, 기본 3600)
+        IMAGE_S3_URL_REFRESH_SEC: 만료 몇 초 전부터 새로 서명할지 (기본 300)
     """
 
-    def __init__(self):
-        try:
-            import boto3
-        except ImportError:
-            raise ImportError("S3 스토리지를 사용하려면 boto3를 설치하세요: pip install boto3")
+    _URL_CACHE_MAX = 20_000
 
+    def __init__(self, client: AsyncS3Client | None = None):
         self.bucket = os.environ["AWS_S3_BUCKET"]
         self.prefix = os.getenv("AWS_S3_PREFIX", "adscope/images")
         self.region = os.getenv("AWS_S3_REGION", "ap-northeast-2")
-        self.s3 = boto3.client("s3", region_name=self.region)
+        self.client = client or AsyncS3Client.from_env(self.bucket, self.region)
+        self.part_size = int(float(os.getenv("IMAGE_S3_MULTIPART_MB", "8")) * 1024 * 1024)
+        self.url_expires = int(os.getenv("IMAGE_S3_URL_EXPIRES", "3600"))
+        self.url_refresh_sec = min(int(os.getenv("IMAGE_S3_URL_REFRESH_SEC", "300")), self.url_expires // 2)
+        self._upload_slots = asyncio.Semaphore(int(os.getenv("IMAGE_S3_UPLOAD_CONCURRENCY", "8")))
+        self._url_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.url_stats = {"signed": 0, "cached": 0}
+
+    async def _upload(self, key: str, body: bytes) -> None:
+        content_type = "image/webp" if key.endswith(".webp") else f"image/{Path(key).suffix.lstrip('.') or 'png'}"
+        async with self._upload_slots:
+            await self.client.upload(key, body, content_type, part_size=self.part_size)
 
     async def save(self, source_path: str, channel: str, category: str = "screenshot") -> str:
-        key = f"{self.prefix}/{_generate_key(channel, category, os.path.basename(source_path))}"
+        ext, data, thumbs = await _encode(source_path)
+        digest = image_blobs.content_hash(data)
+        key = f"{self.prefix}/{image_blobs.blob_key(digest, ext)}"
 
         try:
-            webp_data = _convert_to_webp(source_path)
+            known = await image_blobs.blob_exists(digest)
         except Exception:
-            with open(source_path, "rb") as f:
-                webp_data = f.read()
-            key = key.replace(".webp", ".png")
-
-        self.s3.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=webp_data,
-            ContentType="image/webp" if key.endswith(".webp") else "image/png",
-        )
-        logger.debug(f"[image_store] S3 업로드: s3://{self.bucket}/{key}")
+            known = False
+        if known:
+            logger.debug(f"[image_store] 동일 캡처 — S3 업로드 생략: {channel}/{category} -> {key}")
+        else:
+            # 전체 + 썸네일 동시 업로드 — 인덱스 등록은 모두 끝난 뒤
+            await asyncio.gather(
+                self._upload(key, data),
+                *(self._upload(thumbnail_path(key, w), body) for w, body in thumbs.items()),
+            )
+            logger.debug(f"[image_store] S3 업로드: s3://{self.bucket}/{key} (+썸네일 {len(thumbs)}개)")
+        await _reference_blob(digest, image_blobs.blob_key(digest, ext), len(data))
         return key
 
-    async def get_url(self, stored_path: str) -> str:
-        return self.s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": self.bucket, "Key": stored_path},
-            ExpiresIn=3600,
-        )
+    def presigned_url(self, stored_path: str) -> str:
+        """캐시된 presigned URL (만료 url_refresh_sec초 전까지 재사용). 서명은 로컬 계산."""
+        now = time.time()
+        cached = self._url_cache.get(stored_path)
+        if cached and cached[1] - self.url_refresh_sec > now:
+            self._url_cache.move_to_end(stored_path)
+            self.url_stats["cached"] += 1
+            return cached[0]
+        url = self.client.presign_get(stored_path, self.url_expires)
+        self._url_cache[stored_path] = (url, now + self.url_expires)
+        self._url_cache.move_to_end(stored_path)
+        if len(self._url_cache) > self._URL_CACHE_MAX:
+            self._url_cache.popitem(last=False)
+        self.url_stats["signed"] += 1
+        return url
 
-    async def delete(self, stored_path: str) -> bool:
+    async def get_url(self, stored_path: str) -> str:
+        return self.presigned_url(stored_path)
+
+    async def _remove_blobs(self, keys: list[str]) -> None:
+        objects = []
+        for key in keys:
+            full = f"{self.prefix}/{key}"
+            objects.append(full)
+            objects.extend(thumbnail_path(full, w) for w in THUMBNAIL_TIERS)
+        failed = await self.client.delete_objects(objects)
+        if failed:
+            logger.warning(f"[image_store] S3 삭제 실패 {len(failed)}건: {failed[:3]}")
+
+    async def _remove_legacy(self, stored_path: str) -> bool:
         try:
-            self.s3.delete_object(Bucket=self.bucket, Key=stored_path)
+            await self.client.delete_object(stored_path)
             return True
         except Exception:
             return False
 
     async def cleanup(self, older_than_days: int = 90) -> int:
-        from datetime import timedelta, timezone
+        """blob은 인덱스 조회로, 이전 전 날짜별 키는 blobs/ 외 접두사만 목록 조회 + DeleteObjects 배치."""
+        from datetime import datetime, timedelta, timezone
 
-        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-        deleted = 0
+        deleted = await super().cleanup(older_than_days)
 
-        paginator = self.s3.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
-            for obj in page.get("Contents", []):
-                if obj["LastModified"].replace(tzinfo=timezone.utc) < cutoff:
-                    self.s3.delete_object(Bucket=self.bucket, Key=obj["Key"])
-                    deleted += 1
-
-        logger.info(f"[image_store] S3 cleanup: {deleted}건 삭제 (>{older_than_days}일)")
-        return deleted
+        # 날짜별 키는 더 이상 생성되지 않으므로 보존 기한이 지나면 목록이 비워짐
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        blob_prefix = f"{self.prefix}/{image_blobs.BLOB_DIR}/"
+        legacy = 0
+        async for top in self.client.list_objects(f"{self.prefix}/", delimiter="/"):
+            for prefix in top.prefixes:
+                if prefix == blob_prefix:
+                    continue
+                async for page in self.client.list_objects(prefix):
+                    expired = [obj.key for obj in page.objects if obj.last_modified < cutoff]
+                    if expired:
+                        failed = await self.client.delete_objects(expired)
+                        legacy += len(expired) - len(failed)
+
+        logger.info(f"[image_store] S3 cleanup: blob {deleted}건 + 날짜별 키 {legacy}건 삭제 (>{older_than_days}일)")
+        return deleted + legacy
+
+    async def close(self) -> None:
+        await self.client.aclose()
 
     def __repr__(self):
         return f"S3ImageStore(s3://{self.bucket}/{self.prefix})"
 
 
+_s3_store: S3ImageStore | None = None
+
+
 def get_image_store() -> ImageStore:
     """환경변수 기반 이미지 스토리지 팩토리.
 
     IMAGE_STORE_TYPE:
         - "local" (기본): 로컬 파일시스템
-        - "s3": AWS S3
+        - "s3": S3 호환 오브젝트 스토리지 (프로세스 전역 1개 — 커넥션 풀/URL 캐시 공유)
     """
+    global _s3_store
     store_type = os.getenv("IMAGE_STORE_TYPE", "local").lower()
 
     if store_type == "s3":
-        return S3ImageStore()
+        if _s3_store is None:
+            _s3_store = S3ImageStore()
+        return _s3_store
     return LocalImageStore()
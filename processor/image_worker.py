@@ -0,0 +1,182 @@
+"""이미지 변환 워커 — PNG→WebP 변환 + 썸네일 티어 생성을 프로세스 풀에서 실행.
+
+PIL 디코드/리사이즈/WebP 인코딩은 CPU 바운드라 기본 스레드 executor에서도
+GIL을 잡고 이벤트 루프(크롤러 페이지 제어, 적재 writer)를 지연시킵니다.
+이 모듈은 전용 ProcessPoolExecutor에서 변환하고, 동시 변환 수를 세마포어로
+제한합니다 (대기 중인 이미지 바이트가 무한히 쌓이지 않도록).
+
+- 원본 1회 디코드 → 전체 WebP + 썸네일 티어(기본 320px, 64px 폭) 동시 생성
+- 이미지별 소요시간(대기/디코드/인코딩/썸네일 ms)을 결과에 포함, 누적 지표는 metrics()
+- IMAGE_WORKERS=0 이면 프로세스 풀 대신 스레드에서 변환 (디버깅/제한 환경용)
+
+환경변수:
+  IMAGE_WORKERS: 변환 프로세스 수 (기본: min(4, CPU 수))
+  IMAGE_QUEUE_MAX: 동시에 처리/대기 가능한 변환 수 (기본: 워커 x 4)
+  IMAGE_THUMB_TIERS: 썸네일 폭 목록 (기본: "320,64", 빈 값이면 생성 안 함)
+
+사용법:
+  from processor.image_worker import get_image_worker
+
+  converted = await get_image_worker().convert("/tmp/shot.png")
+  converted.full, converted.thumbs[320], converted.timings_ms
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from loguru import logger
+from PIL import Image
+
+# WebP 최대 크기 제한 (16383px)
+WEBP_MAX_DIM = 16383
+
+
+def _parse_tiers(raw: str) -> tuple[int, ...]:
+    tiers = {int(v) for v in raw.split(",") if v.strip().isdigit() and int(v) > 0}
+    return tuple(sorted(tiers, reverse=True))
+
+
+THUMBNAIL_TIERS = _parse_tiers(os.getenv("IMAGE_THUMB_TIERS", "320,64"))
+
+
+@dataclass
+class ConvertedImage:
+    """변환 결과. thumbs는 {폭: WebP 바이트}."""
+
+    full: bytes
+    width: int
+    height: int
+    thumbs: dict[int, bytes] = field(default_factory=dict)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+def _encode_webp(img: Image.Image, quality: int) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format="WebP", quality=quality, method=4)
+    return buf.getvalue()
+
+
+def convert_image(source_path: str, quality: int = 80, tiers: tuple[int, ...] = THUMBNAIL_TIERS) -> ConvertedImage:
+    """PNG/JPEG 등 → WebP (평균 60% 용량 절감) + 폭 기준 썸네일. 프로세스 풀에서 실행."""
+    t0 = time.perf_counter()
+    with Image.open(source_path) as src:
+        img = src.convert("RGBA") if src.mode in ("RGBA", "P") else src.convert("RGB")
+    t_decode = time.perf_counter()
+
+    if img.width > WEBP_MAX_DIM or img.height > WEBP_MAX_DIM:
+        ratio = min(WEBP_MAX_DIM / img.width, WEBP_MAX_DIM / img.height)
+        img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.LANCZOS)
+    full = _encode_webp(img, quality)
+    t_full = time.perf_counter()
+
+    # 큰 티어부터 축소 → 작은 티어는 직전 결과에서 다시 축소 (LANCZOS 비용 절감)
+    thumbs: dict[int, bytes] = {}
+    base = img
+    for width in tiers:
+        thumb = base.copy()
+        # 세로로 긴 전체 페이지 스크린샷은 폭 x4 높이까지만
+        thumb.thumbnail((width, width * 4), Image.LANCZOS)
+        thumbs[width] = _encode_webp(thumb, quality)
+        base = thumb
+    t_thumbs = time.perf_counter()
+
+    return ConvertedImage(
+        full=full,
+        width=img.width,
+        height=img.height,
+        thumbs=thumbs,
+        timings_ms={
+            "decode": round((t_decode - t0) * 1000, 1),
+            "encode": round((t_full - t_decode) * 1000, 1),
+            "thumbs": round((t_thumbs - t_full) * 1000, 1),
+        },
+    )
+
+
+class ImageWorker:
+    """프로세스 풀 + 동시 변환 상한."""
+
+    def __init__(self, workers: int | None = None, queue_max: int | None = None):
+        if workers is None:
+            workers = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.workers = max(0, workers)
+        if queue_max is None:
+            queue_max = int(os.getenv("IMAGE_QUEUE_MAX", str(max(1, self.workers) * 4)))
+        self.queue_max = max(1, queue_max)
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats = {"converted": 0, "failed": 0, "wait_ms": 0.0, "convert_ms": 0.0, "max_convert_ms": 0.0}
+
+    def _ensure(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.queue_max)
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    async def convert(self, source_path: str, quality: int = 80) -> ConvertedImage:
+        """변환 슬롯을 기다린 뒤 워커에서 변환. 실패 시 예외 그대로 전달."""
+        self._ensure()
+        t_wait = time.perf_counter()
+        async with self._slots:
+            t_start = time.perf_counter()
+            try:
+                result = await self._loop.run_in_executor(
+                    self._executor, convert_image, source_path, quality, THUMBNAIL_TIERS
+                )
+            except BrokenProcessPool:
+                # 워커 프로세스가 죽으면(OOM 등) 풀 재생성 후 다음 요청부터 복구
+                logger.warning("[image_worker] 프로세스 풀 손상 — 재생성")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._stats["failed"] += 1
+                raise
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+        t_done = time.perf_counter()
+
+        result.timings_ms["wait"] = round((t_start - t_wait) * 1000, 1)
+        result.timings_ms["total"] = round((t_done - t_wait) * 1000, 1)
+        convert_ms = (t_done - t_start) * 1000
+        self._stats["converted"] += 1
+        self._stats["wait_ms"] += result.timings_ms["wait"]
+        self._stats["convert_ms"] += convert_ms
+        self._stats["max_convert_ms"] = max(self._stats["max_convert_ms"], convert_ms)
+        return result
+
+    def metrics(self) -> dict:
+        n = max(1, self._stats["converted"])
+        return {
+            "workers": self.workers,
+            "queue_max": self.queue_max,
+            "converted": self._stats["converted"],
+            "failed": self._stats["failed"],
+            "avg_wait_ms": round(self._stats["wait_ms"] / n, 1),
+            "avg_convert_ms": round(self._stats["convert_ms"] / n, 1),
+            "max_convert_ms": round(self._stats["max_convert_ms"], 1),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_worker: ImageWorker | None = None
+
+
+def get_image_worker() -> ImageWorker:
+    global _worker
+    if _worker is None:
+        _worker = ImageWorker()
+    return _worker
@@ -16,6 +16,7 @@ The spend_multiplier is used by campaign_builder to adjust SpendEstimate.
 from __future__ import annotations
 
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import and_, func, select, text
@@ -30,6 +31,7 @@ from database.models import (
     SmartStoreSnapshot,
     TrafficSignal,
 )
+from processor.daily_score_store import upsert_daily_scores
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +104,11 @@ async def _calc_panel_calibration(
         )
     ).scalar_one() or 0
 
+    return _panel_calibration(ai_count, human_count)
+
+
+def _panel_calibration(ai_count: int, human_count: int) -> float:
+    """AI vs human observation counts → calibration factor (0.8 ~ 1.2)."""
     if human_count == 0:
         return 1.0  # No human data, no calibration
 
@@ -147,8 +154,12 @@ async def _get_advertiser_stealth_score(
             and_(Campaign.advertiser_id == adv_id, Campaign.is_active == True)
         )
     )
-    channels = ch_result.scalars().all()
-    if not channels:
+    return _stealth_for_channels(ch_result.scalars().all(), stealth_scores)
+
+
+def _stealth_for_channels(channels, stealth_scores: dict[str, float]) -> float:
+    """Average stealth network score over an advertiser's active campaign channels."""
+    if not stealth_scores or not channels:
         return 0.0
     matched = []
     for ch in channels:
@@ -158,19 +169,209 @@ async def _get_advertiser_stealth_score(
     return sum(matched) / len(matched) if matched else 0.0
 
 
+async def _collect_signals_single(
+    session, adv_id: int, today_dt: datetime, yesterday_dt: datetime, stealth_net_scores: dict[str, float],
+) -> dict:
+    """Per-advertiser signal queries (bulk=False path)."""
+    # 1. SmartStore (latest snapshot since yesterday)
+    ss_snap = (
+        await session.execute(
+            select(SmartStoreSnapshot)
+            .where(
+                and_(
+                    SmartStoreSnapshot.advertiser_id == adv_id,
+                    SmartStoreSnapshot.captured_at >= yesterday_dt,
+                )
+            )
+            .order_by(SmartStoreSnapshot.captured_at.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+
+    # 2. Traffic (today's composite_index)
+    traffic = (
+        await session.execute(
+            select(TrafficSignal.composite_index).where(
+                and_(
+                    TrafficSignal.advertiser_id == adv_id,
+                    TrafficSignal.date == today_dt,
+                )
+            )
+        )
+    ).scalar_one_or_none()
+
+    # 3. Activity score (today's composite_score)
+    activity = (
+        await session.execute(
+            select(ActivityScore.composite_score).where(
+                and_(
+                    ActivityScore.advertiser_id == adv_id,
+                    ActivityScore.date == today_dt,
+                )
+            )
+        )
+    ).scalar_one_or_none()
+
+    return {
+        "has_smartstore": ss_snap is not None,
+        "review_delta": ss_snap.review_delta if ss_snap else None,
+        "traffic": traffic,
+        "activity": activity,
+        # 4. Stealth contact score / 5. Panel calibration
+        "stealth": await _get_advertiser_stealth_score(session, adv_id, stealth_net_scores),
+        "panel_calibration": await _calc_panel_calibration(session, adv_id),
+    }
+
+
+async def _collect_signals_bulk(
+    session, adv_scope, today_dt: datetime, yesterday_dt: datetime, stealth_net_scores: dict[str, float],
+) -> dict[int, dict]:
+    """All advertiser signals with one query per source (bulk=True path)."""
+    signals: dict[int, dict] = {}
+
+    def _entry(adv_id: int) -> dict:
+        if adv_id not in signals:
+            signals[adv_id] = _empty_signals()
+        return signals[adv_id]
+
+    # 1. SmartStore: latest snapshot since yesterday per advertiser
+    ranked = (
+        select(
+            SmartStoreSnapshot.advertiser_id,
+            SmartStoreSnapshot.review_delta,
+            func.row_number().over(
+                partition_by=SmartStoreSnapshot.advertiser_id,
+                order_by=SmartStoreSnapshot.captured_at.desc(),
+            ).label("rn"),
+        )
+        .where(SmartStoreSnapshot.captured_at >= yesterday_dt, SmartStoreSnapshot.advertiser_id.in_(adv_scope))
+        .subquery()
+    )
+    for adv_id, review_delta in (
+        await session.execute(select(ranked.c.advertiser_id, ranked.c.review_delta).where(ranked.c.rn == 1))
+    ).all():
+        entry = _entry(adv_id)
+        entry["has_smartstore"] = True
+        entry["review_delta"] = review_delta
+
+    # 2. Traffic / 3. Activity: today's rows
+    for model, column, key in (
+        (TrafficSignal, TrafficSignal.composite_index, "traffic"),
+        (ActivityScore, ActivityScore.composite_score, "activity"),
+    ):
+        rows = await session.execute(
+            select(model.advertiser_id, column).where(model.date == today_dt, model.advertiser_id.in_(adv_scope))
+        )
+        for adv_id, value in rows.all():
+            _entry(adv_id)[key] = value
+
+    # 4. Stealth: active campaign channels
+    if stealth_net_scores:
+        channels: dict[int, list[str]] = {}
+        rows = await session.execute(
+            select(Campaign.advertiser_id, Campaign.channel)
+            .where(Campaign.is_active == True, Campaign.advertiser_id.in_(adv_scope))
+            .distinct()
+        )
+        for adv_id, channel in rows.all():
+            channels.setdefault(adv_id, []).append(channel)
+        for adv_id, chs in channels.items():
+            _entry(adv_id)["stealth"] = _stealth_for_channels(chs, stealth_net_scores)
+
+    # 5. Panel calibration: AI / human observation counts (7 days)
+    panel_cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=7)
+    counts: dict[int, dict[str, int]] = {}
+    rows = await session.execute(
+        select(PanelObservation.advertiser_id, PanelObservation.panel_type, func.count(PanelObservation.id))
+        .where(
+            PanelObservation.panel_type.in_(("ai", "human")),
+            PanelObservation.observed_at >= panel_cutoff,
+            PanelObservation.advertiser_id.in_(adv_scope),
+        )
+        .group_by(PanelObservation.advertiser_id, PanelObservation.panel_type)
+    )
+    for adv_id, panel_type, cnt in rows.all():
+        counts.setdefault(adv_id, {})[panel_type] = cnt
+    for adv_id, by_type in counts.items():
+        _entry(adv_id)["panel_calibration"] = _panel_calibration(by_type.get("ai", 0), by_type.get("human", 0))
+
+    return signals
+
+
+def _empty_signals() -> dict:
+    return {
+        "has_smartstore": False,
+        "review_delta": None,
+        "traffic": None,
+        "activity": None,
+        "stealth": 0.0,
+        "panel_calibration": 1.0,
+    }
+
+
+def _composite_row(signals: dict) -> dict:
+    """Signals → meta_signal_composites column values."""
+    # Normalize: 0 delta=0, 5+=50, 20+=100
+    if signals["has_smartstore"]:
+        ss_score = min(100.0, (signals["review_delta"] or 0) * 5.0)
+    else:
+        ss_score = 0.0
+    traffic = signals["traffic"]
+    activity = signals["activity"]
+    traffic_score = float(traffic) if traffic else 0.0
+    activity_score_val = float(activity) if activity else 0.0
+    stealth_val = signals["stealth"]
+    panel_cal = signals["panel_calibration"]
+
+    # Composite score (weighted, stealth included)
+    raw_composite = (
+        ss_score * W_SMARTSTORE
+        + traffic_score * W_TRAFFIC
+        + activity_score_val * W_ACTIVITY
+        + stealth_val * W_STEALTH
+    )
+    # Apply panel calibration to the composite
+    composite = round(min(100.0, raw_composite * panel_cal), 1)
+
+    return {
+        "smartstore_score": round(ss_score, 1),
+        "traffic_score": round(traffic_score, 1),
+        "activity_score": round(activity_score_val, 1),
+        "panel_calibration": panel_cal,
+        "composite_score": composite,
+        "spend_multiplier": _score_to_multiplier(composite),
+        "raw_factors": {
+            "smartstore_raw": round(ss_score, 1),
+            "traffic_raw": round(traffic_score, 1),
+            "activity_raw": round(activity_score_val, 1),
+            "stealth_raw": round(stealth_val, 1),
+            "panel_calibration": panel_cal,
+            "has_smartstore": signals["has_smartstore"],
+            "has_traffic": traffic is not None,
+            "has_activity": activity is not None,
+            "has_stealth": stealth_val > 0,
+        },
+    }
+
+
 async def aggregate_meta_signals(
     session=None,
     advertiser_ids: list[int] | None = None,
+    bulk: bool = True,
 ) -> dict:
     """Aggregate all meta signals into composite score and spend multiplier.
 
-    Returns: {"processed": N, "created": N, "updated": N}
+    bulk=True reads each signal source with one query for all advertisers;
+    bulk=False issues the per-advertiser queries (kept for comparison).
+
+    Returns: {"processed": N, "created": N, "updated": N, "elapsed_ms": N}
     """
     own_session = session is None
     if own_session:
         session = async_session()
 
     try:
+        started = time.perf_counter()
         now = datetime.now(UTC).replace(tzinfo=None)
         today = now.date()
         today_dt = datetime(today.year, today.month, today.day)
@@ -192,137 +393,29 @@ async def aggregate_meta_signals(
         active_adv_ids = [r[0] for r in result.fetchall()]
 
         if not active_adv_ids:
-            return {"processed": 0, "created": 0, "updated": 0}
-
-        created = 0
-        updated = 0
-
-        for adv_id in active_adv_ids:
-            # 1. SmartStore score (latest snapshot's review_delta normalized)
-            ss_snap = (
-                await session.execute(
-                    select(SmartStoreSnapshot)
-                    .where(
-                        and_(
-                            SmartStoreSnapshot.advertiser_id == adv_id,
-                            SmartStoreSnapshot.captured_at >= yesterday_dt,
-                        )
-                    )
-                    .order_by(SmartStoreSnapshot.captured_at.desc())
-                    .limit(1)
-                )
-            ).scalar_one_or_none()
-
-            if ss_snap:
-                # Normalize: 0 delta=0, 5+=50, 20+=100
-                delta = ss_snap.review_delta or 0
-                ss_score = min(100.0, delta * 5.0)
-            else:
-                ss_score = 0.0
-
-            # 2. Traffic score (today's composite_index)
-            traffic = (
-                await session.execute(
-                    select(TrafficSignal.composite_index).where(
-                        and_(
-                            TrafficSignal.advertiser_id == adv_id,
-                            TrafficSignal.date == today_dt,
-                        )
-                    )
-                )
-            ).scalar_one_or_none()
-            traffic_score = float(traffic) if traffic else 0.0
-
-            # 3. Activity score (today's composite_score)
-            activity = (
-                await session.execute(
-                    select(ActivityScore.composite_score).where(
-                        and_(
-                            ActivityScore.advertiser_id == adv_id,
-                            ActivityScore.date == today_dt,
-                        )
-                    )
-                )
-            ).scalar_one_or_none()
-            activity_score_val = float(activity) if activity else 0.0
-
-            # 4. Stealth contact score
-            stealth_val = await _get_advertiser_stealth_score(
-                session, adv_id, stealth_net_scores
-            )
-
-            # 5. Panel calibration
-            panel_cal = await _calc_panel_calibration(session, adv_id)
-
-            # Composite score (weighted, stealth included)
-            raw_composite = (
-                ss_score * W_SMARTSTORE
-                + traffic_score * W_TRAFFIC
-                + activity_score_val * W_ACTIVITY
-                + stealth_val * W_STEALTH
-            )
-            # Apply panel calibration to the composite
-            composite = round(min(100.0, raw_composite * panel_cal), 1)
-
-            # Spend multiplier
-            spend_mult = _score_to_multiplier(composite)
-
-            raw_factors = {
-                "smartstore_raw": round(ss_score, 1),
-                "traffic_raw": round(traffic_score, 1),
-                "activity_raw": round(activity_score_val, 1),
-                "stealth_raw": round(stealth_val, 1),
-                "panel_calibration": panel_cal,
-                "has_smartstore": ss_snap is not None,
-                "has_traffic": traffic is not None,
-                "has_activity": activity is not None,
-                "has_stealth": stealth_val > 0,
+            return {"processed": 0, "created": 0, "updated": 0,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000)}
+
+        if bulk:
+            collected = await _collect_signals_bulk(session, adv_query, today_dt, yesterday_dt, stealth_net_scores)
+            signals = {adv_id: collected.get(adv_id) or _empty_signals() for adv_id in active_adv_ids}
+        else:
+            signals = {
+                adv_id: await _collect_signals_single(session, adv_id, today_dt, yesterday_dt, stealth_net_scores)
+                for adv_id in active_adv_ids
             }
 
-            # Upsert
-            existing = (
-                await session.execute(
-                    select(MetaSignalComposite).where(
-                        and_(
-                            MetaSignalComposite.advertiser_id == adv_id,
-                            MetaSignalComposite.date == today_dt,
-                        )
-                    )
-                )
-            ).scalar_one_or_none()
-
-            if existing:
-                existing.smartstore_score = round(ss_score, 1)
-                existing.traffic_score = round(traffic_score, 1)
-                existing.activity_score = round(activity_score_val, 1)
-                existing.panel_calibration = panel_cal
-                existing.composite_score = composite
-                existing.spend_multiplier = spend_mult
-                existing.raw_factors = raw_factors
-                updated += 1
-            else:
-                session.add(
-                    MetaSignalComposite(
-                        advertiser_id=adv_id,
-                        date=today_dt,
-                        smartstore_score=round(ss_score, 1),
-                        traffic_score=round(traffic_score, 1),
-                        activity_score=round(activity_score_val, 1),
-                        panel_calibration=panel_cal,
-                        composite_score=composite,
-                        spend_multiplier=spend_mult,
-                        raw_factors=raw_factors,
-                    )
-                )
-                created += 1
+        rows = {adv_id: _composite_row(s) for adv_id, s in signals.items()}
+        created, updated = await upsert_daily_scores(session, MetaSignalComposite, today_dt, rows)
 
         await session.commit()
         total = len(active_adv_ids)
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
         logger.info(
-            "[meta_aggregator] processed=%d created=%d updated=%d",
-            total, created, updated,
+            "[meta_aggregator] processed=%d created=%d updated=%d bulk=%s elapsed=%dms",
+            total, created, updated, bulk, elapsed_ms,
         )
-        return {"processed": total, "created": created, "updated": updated}
+        return {"processed": total, "created": created, "updated": updated, "elapsed_ms": elapsed_ms}
 
     finally:
         if own_session:
@@ -6,13 +6,15 @@ generates heatmap data for persona x advertiser matrix, and daily trends.
 
 from __future__ import annotations
 
+from collections import defaultdict, namedtuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 from sqlalchemy import func, select, distinct, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import AdDetail, AdSnapshot, Persona
+from database.models import AdDetail, AdSnapshot, Advertiser, DailyAdRollup, Persona
+from processor.daily_rollup import use_rollups, window_start
 
 
 # ── Dataclasses ──
@@ -47,6 +49,12 @@ class PersonaHeatmapCell:
     intensity: float  # 0.0 ~ 1.0
 
 
+# matrix query row shape shared by the raw and rollup heatmap paths
+_MatrixRow = namedtuple(
+    "_MatrixRow", ["persona_code", "age_group", "gender", "advertiser_name", "impression_count"]
+)
+
+
 # ── Core Functions ──
 
 
@@ -182,7 +190,14 @@ async def calculate_persona_heatmap(
     1. Find top N advertisers by total impressions across ALL personas.
     2. For each persona x advertiser pair, count impressions.
     3. Normalize intensity: max impressions = 1.0, others proportional.
+
+    When daily rollups are enabled, steps 1-2 read daily_ad_rollups instead
+    (day-aligned window, advertisers keyed by advertiser_id / canonical name).
     """
+    if await use_rollups(db):
+        matrix_rows, adv_id_map = await _heatmap_matrix_from_rollup(db, days, channel, top_advertisers)
+        return _heatmap_cells(matrix_rows, adv_id_map)
+
     cutoff = datetime.utcnow() - timedelta(days=days)
 
     # Step 1: Find top N advertisers globally + per-persona top to ensure all ages covered
@@ -277,7 +292,10 @@ async def calculate_persona_heatmap(
 
     matrix_result = await db.execute(matrix_q)
     matrix_rows = matrix_result.all()
+    return _heatmap_cells(matrix_rows, adv_id_map)
+
 
+def _heatmap_cells(matrix_rows, adv_id_map: dict[str, int | None]) -> list[PersonaHeatmapCell]:
     # Step 3: Normalize to 0.0 - 1.0
     max_impressions = max((r.impression_count for r in matrix_rows), default=1)
     if max_impressions == 0:
@@ -300,6 +318,75 @@ async def calculate_persona_heatmap(
     return cells
 
 
+async def _heatmap_matrix_from_rollup(
+    db: AsyncSession,
+    days: int,
+    channel: str | None,
+    top_advertisers: int,
+):
+    """Heatmap steps 1-2 from daily_ad_rollups. Returns (matrix_rows, name -> advertiser_id).
+
+    A single (persona, advertiser) aggregate over the rollup drives the global
+    top N, the per-persona top 3 and the matrix; names are resolved afterwards.
+    """
+    since = window_start(days)
+    r = DailyAdRollup
+    pair_q = (
+        select(r.persona_id, r.channel, r.advertiser_id, func.sum(r.impressions))
+        .where(r.advertiser_id.isnot(None))
+        .where(r.date >= since)
+        .group_by(r.persona_id, r.channel, r.advertiser_id)
+    )
+    if channel:
+        pair_q = pair_q.where(r.channel == channel)
+
+    totals: dict[int, int] = defaultdict(int)
+    pairs: dict[tuple[int, int], int] = defaultdict(int)
+    for persona_id, _channel, advertiser_id, cnt in (await db.execute(pair_q)).all():
+        totals[advertiser_id] += cnt
+        if persona_id is not None:
+            pairs[(persona_id, advertiser_id)] += cnt
+    if not totals:
+        return [], {}
+
+    selected = sorted(totals, key=totals.get, reverse=True)[:top_advertisers]
+    personas = {
+        row.id: row
+        for row in (
+            await db.execute(
+                select(Persona.id, Persona.code, Persona.age_group, Persona.gender)
+                .where(Persona.id.in_({pid for pid, _ in pairs}))
+            )
+        ).all()
+    }
+
+    # Also include top 3 advertisers PER PERSONA to ensure all age groups appear
+    per_persona_counts: dict[str, int] = defaultdict(int)
+    for (persona_id, advertiser_id), _cnt in sorted(pairs.items(), key=lambda item: item[1], reverse=True):
+        persona = personas.get(persona_id)
+        if persona is None or advertiser_id in selected or per_persona_counts[persona.code] >= 3:
+            continue
+        selected.append(advertiser_id)
+        per_persona_counts[persona.code] += 1
+
+    names = dict(
+        (await db.execute(select(Advertiser.id, Advertiser.name).where(Advertiser.id.in_(selected)))).all()
+    )
+    selected_set = set(selected)
+    cells: dict[tuple, int] = defaultdict(int)
+    for (persona_id, advertiser_id), cnt in pairs.items():
+        persona = personas.get(persona_id)
+        if persona is None or advertiser_id not in selected_set or advertiser_id not in names:
+            continue
+        cells[(persona.code, persona.age_group, persona.gender, names[advertiser_id])] += cnt
+
+    matrix_rows = [
+        _MatrixRow(code, age_group, gender, name, cnt)
+        for (code, age_group, gender, name), cnt in cells.items()
+    ]
+    return matrix_rows, {names[adv_id]: adv_id for adv_id in selected if adv_id in names}
+
+
 async def calculate_persona_ranking_trend(
     db: AsyncSession,
     persona_code: str,
@@ -0,0 +1,245 @@
+"""Perceptual hash 근접 검색 인덱스 — multi-index hashing (MIH).
+
+64bit 해시를 16bit 청크 4개로 나눠 청크별 해시 테이블에 넣는다.
+거리 ≤ k 인 두 해시는 비둘기집 원리에 의해 적어도 한 청크가 ≤ k // 4 bit 차이이므로,
+질의 청크의 ≤ k // 4 bit 변형만 테이블에서 찾아 후보를 모은 뒤 전체 거리로 검증한다.
+k ≤ 3 이면 청크 정확 일치만 보면 되어 1M 해시에서도 후보 수십 개 / 질의 1ms 미만.
+
+적재 경로(pipeline.save_crawl_result / save_crawl_results_bulk)는 프로세스 공용 인덱스
+(get_phash_index)로 같은 채널의 근접 중복 소재를 찾습니다 — creative_hash/텍스트 키가
+모두 다를 때 거리 ≤ CREATIVE_PHASH_MAX_DISTANCE면 같은 광고로 보고 seen만 갱신.
+광고주/문구를 보지 않아 다른 광고주의 템플릿형 소재가 합쳐질 수 있으므로 기본은 비활성(-1) —
+채널별로 검증한 뒤 3 정도로 켭니다. 공용 인덱스는 조회 때마다 새 행(id > 마지막 적재 id)만
+증분 적재하고 PHASH_INDEX_TTL_SEC(기본 600초)마다 전체 재적재하며, 후보는 DB의 현재 값으로 거리를
+다시 확인한 뒤 사용합니다 (삭제/병합된 행 제외).
+
+Usage:
+    index = await PerceptualHashIndex.from_db(session)
+    index.add("google_gdn", "a3f0...", ad_id)
+    index.query("google_gdn", "a3f0...", max_distance=3)  # [(ad_id, distance), ...]
+
+    shared = await get_phash_index(session)                  # 증분 갱신된 공용 인덱스
+    ad_id = await shared.find_near_duplicate(session, "google_gdn", "a3f0...")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from itertools import combinations
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import AdDetail
+
+CHUNKS = 4
+CHUNK_BITS = 16
+_CHUNK_MASK = (1 << CHUNK_BITS) - 1
+_IN_CHUNK = 500
+
+MAX_DISTANCE = int(os.getenv("CREATIVE_PHASH_MAX_DISTANCE", "-1"))
+INDEX_TTL_SEC = float(os.getenv("PHASH_INDEX_TTL_SEC", "600"))
+
+
+def _split(value: int) -> list[int]:
+    return [(value >> (CHUNK_BITS * i)) & _CHUNK_MASK for i in range(CHUNKS)]
+
+
+def _variants(chunk: int, radius: int) -> list[int]:
+    """chunk에서 radius bit 이하로 뒤집은 모든 값."""
+    out = [chunk]
+    for r in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), r):
+            flipped = chunk
+            for b in bits:
+                flipped ^= 1 << b
+            out.append(flipped)
+    return out
+
+
+class _ChannelIndex:
+    __slots__ = ("hashes", "ids", "tables")
+
+    def __init__(self):
+        self.hashes: list[int] = []
+        self.ids: list[int] = []
+        self.tables: list[dict[int, list[int]]] = [{} for _ in range(CHUNKS)]
+
+    def add(self, value: int, ad_id: int) -> None:
+        pos = len(self.hashes)
+        self.hashes.append(value)
+        self.ids.append(ad_id)
+        for table, chunk in zip(self.tables, _split(value)):
+            table.setdefault(chunk, []).append(pos)
+
+    def query(self, value: int, max_distance: int) -> list[tuple[int, int]]:
+        radius = max_distance // CHUNKS
+        seen: set[int] = set()
+        hits: list[tuple[int, int]] = []
+        for table, chunk in zip(self.tables, _split(value)):
+            for variant in _variants(chunk, radius):
+                for pos in table.get(variant, ()):
+                    if pos in seen:
+                        continue
+                    seen.add(pos)
+                    dist = (self.hashes[pos] ^ value).bit_count()
+                    if dist <= max_distance:
+                        hits.append((self.ids[pos], dist))
+        hits.sort(key=lambda h: (h[1], h[0]))
+        return hits
+
+
+class PerceptualHashIndex:
+    """채널별 perceptual hash 근접 검색 인덱스."""
+
+    def __init__(self):
+        self._channels: dict[str, _ChannelIndex] = {}
+        self._dead: set[int] = set()
+        self._last_id = 0
+
+    def __len__(self) -> int:
+        return sum(len(idx.hashes) for idx in self._channels.values())
+
+    def add(self, channel: str, phash: str | int, ad_id: int) -> None:
+        value = int(phash, 16) if isinstance(phash, str) else phash
+        idx = self._channels.get(channel)
+        if idx is None:
+            idx = self._channels[channel] = _ChannelIndex()
+        idx.add(value, ad_id)
+
+    def discard(self, ad_ids: Iterable[int]) -> None:
+        """삭제된 행을 이후 조회 결과에서 제외 (전체 재적재 때 정리)."""
+        self._dead.update(ad_ids)
+
+    def query(self, channel: str, phash: str | int, max_distance: int = 3) -> list[tuple[int, int]]:
+        """channel 안에서 거리 ≤ max_distance 인 (ad_id, distance) 목록 (가까운 순)."""
+        idx = self._channels.get(channel)
+        if idx is None:
+            return []
+        value = int(phash, 16) if isinstance(phash, str) else phash
+        hits = idx.query(value, max_distance)
+        return [h for h in hits if h[0] not in self._dead] if self._dead else hits
+
+    def nearest(self, channel: str, phash: str | int, max_distance: int = 3) -> int | None:
+        """거리 ≤ max_distance 인 가장 가까운 ad_id (없으면 None)."""
+        hits = self.query(channel, phash, max_distance)
+        return hits[0][0] if hits else None
+
+    async def refresh(self, session: AsyncSession, channels: list[str] | None = None, batch_size: int = 50_000) -> int:
+        """마지막 적재 이후(id 기준) 새 ad_details 행만 추가. 추가 건수 반환."""
+        added = 0
+        while True:
+            stmt = (
+                select(AdDetail.id, AdDetail.channel, AdDetail.creative_phash)
+                .where(AdDetail.id > self._last_id, AdDetail.creative_phash.isnot(None))
+                .order_by(AdDetail.id)
+                .limit(batch_size)
+            )
+            if channels:
+                stmt = stmt.where(AdDetail.channel.in_(channels))
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return added
+            for ad_id, channel, phash in rows:
+                if channel:
+                    self.add(channel, phash, ad_id)
+                    added += 1
+            self._last_id = rows[-1][0]
+
+    async def nearest_many(
+        self, session: AsyncSession, queries: Iterable[tuple[str, str]], max_distance: int | None = None,
+    ) -> dict[tuple[str, str], tuple[int, int]]:
+        """(channel, phash) 질의별 가장 가까운 (ad_id, distance) — 동률이면 id 작은 쪽.
+
+        후보는 DB의 현재 channel/creative_phash로 거리를 다시 계산한다 (IN 쿼리 500건 단위).
+        삭제됐거나 값이 바뀐 행은 discard 되어 이후 조회에서도 빠진다.
+        max_distance 미지정 시 CREATIVE_PHASH_MAX_DISTANCE.
+        """
+        max_distance = MAX_DISTANCE if max_distance is None else max_distance
+        if max_distance < 0:
+            return {}
+        candidates: dict[tuple[str, str], list[int]] = {}
+        for channel, phash in queries:
+            if phash:
+                hits = self.query(channel, phash, max_distance)
+                if hits:
+                    candidates[(channel, phash)] = [ad_id for ad_id, _ in hits]
+        wanted = sorted({ad_id for ids in candidates.values() for ad_id in ids})
+        stored: dict[int, tuple[str, int]] = {}
+        for i in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[i:i + _IN_CHUNK]
+            rows = await session.execute(
+                select(AdDetail.id, AdDetail.channel, AdDetail.creative_phash).where(AdDetail.id.in_(chunk))
+            )
+            for ad_id, channel, phash in rows:
+                if channel and phash:
+                    stored[ad_id] = (channel, int(phash, 16))
+
+        found: dict[tuple[str, str], tuple[int, int]] = {}
+        stale: set[int] = set(wanted) - set(stored)
+        for (channel, phash), ids in candidates.items():
+            value = int(phash, 16)
+            best: tuple[int, int] | None = None
+            for ad_id in ids:
+                row = stored.get(ad_id)
+                if row is None:
+                    continue
+                dist = (row[1] ^ value).bit_count()
+                if row[0] != channel or dist > max_distance:
+                    stale.add(ad_id)
+                    continue
+                if best is None or (dist, ad_id) < (best[1], best[0]):
+                    best = (ad_id, dist)
+            if best is not None:
+                found[(channel, phash)] = best
+        self.discard(stale)
+        return found
+
+    async def find_near_duplicate(
+        self, session: AsyncSession, channel: str, phash: str | None, max_distance: int | None = None,
+    ) -> int | None:
+        """새 행을 반영한 뒤 channel 안에서 가장 가까운 기존 광고 id (없으면 None)."""
+        max_distance = MAX_DISTANCE if max_distance is None else max_distance
+        if not phash or max_distance < 0:
+            return None
+        await self.refresh(session)
+        hit = (await self.nearest_many(session, [(channel, phash)], max_distance)).get((channel, phash))
+        return hit[0] if hit else None
+
+    @classmethod
+    async def from_db(
+        cls,
+        session: AsyncSession,
+        channels: list[str] | None = None,
+        batch_size: int = 50_000,
+    ) -> PerceptualHashIndex:
+        """ad_details.creative_phash 전체(또는 지정 채널)로 인덱스 구성."""
+        index = cls()
+        await index.refresh(session, channels, batch_size)
+        return index
+
+
+_shared: PerceptualHashIndex | None = None
+_shared_bind = None
+_shared_loaded_at = 0.0
+_shared_lock: asyncio.Lock | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+
+
+async def get_phash_index(session: AsyncSession) -> PerceptualHashIndex:
+    """프로세스 공용 인덱스 — 새 행 증분 적재, TTL 경과/엔진 변경 시 전체 재적재."""
+    global _shared, _shared_bind, _shared_loaded_at, _shared_lock, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_loop is not loop:
+        _shared_loop, _shared_lock = loop, asyncio.Lock()
+    async with _shared_lock:
+        expired = time.monotonic() - _shared_loaded_at >= INDEX_TTL_SEC
+        if _shared is None or session.bind is not _shared_bind or expired:
+            _shared = PerceptualHashIndex()
+            _shared_bind = session.bind
+            _shared_loaded_at = time.monotonic()
+        await _shared.refresh(session)
+        return _shared
@@ -5,49 +5,24 @@ import sys
 from pathlib import Path
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import AdDetail, AdSnapshot, Keyword, Persona
+from database.models import AdDetail, AdSnapshot
 
-# ── 세션 내 키워드/페르소나 캐시 (N+1 쿼리 방지) ──
-_keyword_cache: dict[str, int] = {}  # keyword_text -> keyword_id
-_persona_cache: dict[str, int] = {}  # persona_code -> persona_id
-
-
-async def _get_keyword_id(session: AsyncSession, keyword_text: str) -> int | None:
-    """키워드 ID 조회 (캐시 우선)."""
-    if keyword_text in _keyword_cache:
-        return _keyword_cache[keyword_text]
-    result = await session.execute(
-        select(Keyword.id).where(Keyword.keyword == keyword_text)
-    )
-    kw_id = result.scalar_one_or_none()
-    if kw_id is not None:
-        _keyword_cache[keyword_text] = kw_id
-    return kw_id
-
-
-async def _get_persona_id(session: AsyncSession, persona_code: str) -> int | None:
-    """페르소나 ID 조회 (캐시 우선)."""
-    if persona_code in _persona_cache:
-        return _persona_cache[persona_code]
-    result = await session.execute(
-        select(Persona.id).where(Persona.code == persona_code)
-    )
-    p_id = result.scalar_one_or_none()
-    if p_id is not None:
-        _persona_cache[persona_code] = p_id
-    return p_id
 from processor.ad_classifier import classify_ad
-from processor.advertiser_verifier import NameQuality, verify_advertiser_name
+from processor.advertiser_verifier import NameQuality, VerificationResult, verify_advertiser_name
 from processor.normalizer import NormalizedSnapshot, normalize_crawl_result
 from processor.korean_filter import is_korean_ad, clean_advertiser_name
-from processor.creative_hasher import compute_creative_hash, compute_text_hash
+from processor.creative_hasher import compute_creative_hash, compute_perceptual_hash, compute_text_hash
 from processor.extra_data_normalizer import normalize_extra_data
 from processor.ad_product_classifier import classify_ad_product
-from processor.dedup import find_existing_ad, update_seen
+from processor.dedup import DedupIndex, dedup_key_fields, find_existing_ad, update_seen
+from processor import phash_index as _phash
+from processor.phash_index import get_phash_index
+from processor.channel_utils import CHANNEL_DISPLAY_NORMALIZE
 from processor.landing_cache import get_cached_brand, cache_landing_result, _extract_domain
+from processor.dimension_cache import get_dimension_cache
 
 CHANNEL_VERIFICATION_DEFAULTS: dict[str, tuple[str, str]] = {
     "naver_search": ("unverified", "channel_default"),
@@ -92,14 +67,175 @@ async def _check_duplicate(session: AsyncSession, creative_hash: str | None, cha
     result = await session.execute(
         select(AdDetail.id).where(
             AdDetail.creative_hash == creative_hash,
-            AdDetail.snapshot_id.in_(
-                select(AdSnapshot.id).where(AdSnapshot.channel != channel)
-            ),
+            AdDetail.channel != channel,
         ).limit(1)
     )
     return result.scalar_one_or_none() is not None
 
 
+def _new_filter_counters() -> dict[str, int]:
+    return {
+        "no_url_filtered": 0,
+        "korean_filtered": 0,
+        "inhouse_filtered": 0,
+        "rejected_count": 0,
+    }
+
+
+def resolve_advertiser_name(raw_name: str | None) -> tuple[VerificationResult, str | None]:
+    """광고주명 검증 → (검증 결과, 적재/dedup 키에 쓰는 이름).
+
+    거부된 이름은 None, 정제명이 있으면 정제명, 아니면 원본.
+    scripts/backfill_dedup_keys.py가 같은 규칙으로 text_key를 다시 계산한다.
+    """
+    verification = verify_advertiser_name(raw_name)
+    if verification.quality == NameQuality.REJECTED:
+        return verification, None
+    return verification, verification.cleaned_name or raw_name
+
+
+def _prepare_ad(normalized: NormalizedSnapshot, ad, counters: dict[str, int]) -> dict | None:
+    """광고 1건 필터링/검증/분류 → AdDetail 컬럼 dict (snapshot_id/persona_id 제외).
+
+    필터에 걸리면 counters를 올리고 None 반환. 중복 체크는 호출자 책임.
+    """
+    # URL 필수: 광고주 URL 없으면 광고주 식별 불가 → 제외
+    if not ad.url or not ad.url.strip():
+        counters["no_url_filtered"] += 1
+        return None
+
+    # 한글 필터: 한국 시장 광고만 저장 (접촉형 채널은 면제)
+    if not is_korean_ad(ad.ad_text, ad.advertiser_name, ad.brand, ad.ad_description,
+                        channel=normalized.channel):
+        counters["korean_filtered"] += 1
+        return None
+
+    # 광고주명 검증
+    original_name = ad.advertiser_name
+    name_verification, ad.advertiser_name = resolve_advertiser_name(original_name)
+
+    if name_verification.quality == NameQuality.REJECTED:
+        # 가비지 이름 → 원본 보존하되 advertiser_name 제거
+        counters["rejected_count"] += 1
+        ad.extra_data = {
+            **(ad.extra_data or {}),
+            "original_advertiser_name": name_verification.original_name,
+            "rejection_reason": name_verification.rejection_reason,
+        }
+
+    verification_status, verification_source, extra_data = _resolve_verification_fields(
+        normalized.channel,
+        ad,
+    )
+
+    # 거부된 이름 → verification_status 오버라이드
+    if name_verification.quality == NameQuality.REJECTED:
+        verification_status = "rejected"
+        verification_source = f"name_quality:{name_verification.rejection_reason}"
+
+    # 광고 분류 (마커/인하우스/리타겟팅/위치)
+    classification = classify_ad(
+        channel=normalized.channel,
+        url=ad.url,
+        ad_text=ad.ad_text,
+        advertiser_name=ad.advertiser_name,
+        device=normalized.device,
+        position=ad.position,
+        ad_type=ad.ad_type,
+        ad_placement=ad.ad_placement,
+        extra_data=ad.extra_data,
+    )
+
+    # 인하우스(플랫폼 내부) 광고 제외 — 네이버페이, 해피빈 등은 광고주가 아님
+    if classification.is_inhouse:
+        counters["inhouse_filtered"] += 1
+        return None
+
+    # extra_data 정규화
+    extra_data = normalize_extra_data(extra_data, normalized.channel)
+
+    # creative hash 계산 (이미지 없으면 텍스트 해시)
+    c_hash = compute_creative_hash(ad.creative_image_path)
+    if not c_hash:
+        c_hash = compute_text_hash(ad.advertiser_name, ad.ad_text, ad.url)
+
+    # 광고상품 자동분류
+    ad_raw = {
+        "ad_type": ad.ad_type,
+        "url": ad.url,
+        "ad_text": ad.ad_text,
+        "ad_placement": ad.ad_placement,
+        "extra_data": ad.extra_data,
+    }
+    product_cls = classify_ad_product(normalized.channel, ad_raw)
+
+    return {
+        "advertiser_name_raw": original_name,
+        "brand": ad.brand,
+        "ad_text": ad.ad_text,
+        "ad_description": ad.ad_description,
+        "position": ad.position,
+        "url": ad.url,
+        "display_url": ad.display_url,
+        "ad_type": ad.ad_type,
+        "verification_status": verification_status,
+        "verification_source": verification_source,
+        "product_name": ad.product_name,
+        "product_category": ad.product_category,
+        "ad_placement": ad.ad_placement,
+        "promotion_type": ad.promotion_type,
+        "creative_image_path": ad.creative_image_path,
+        "creative_hash": c_hash,
+        "creative_phash": None,  # PIL 연산 — 호출부에서 _compute_phashes로 스레드 계산
+        **dedup_key_fields(
+            CHANNEL_DISPLAY_NORMALIZE.get(normalized.channel, normalized.channel),
+            ad.advertiser_name, ad.ad_text, ad.url,
+        ),
+        # Phase 3 분류 필드
+        "position_zone": classification.position_zone,
+        "is_inhouse": classification.is_inhouse,
+        "is_retargeted": classification.is_retargeted,
+        "retargeting_network": classification.retargeting_network,
+        "ad_marker_type": classification.ad_marker_type,
+        # 마케팅 플랜 계층 필드
+        "campaign_purpose": getattr(ad, "campaign_purpose", None) or product_cls["campaign_purpose"],
+        "ad_format_type": getattr(ad, "ad_format_type", None) or product_cls["ad_format_type"],
+        "ad_product_name": getattr(ad, "ad_product_name", None) or product_cls["ad_product_name"],
+        "model_name": getattr(ad, "model_name", None),
+        "extra_data": extra_data,
+        "first_seen_at": normalized.captured_at,
+        "last_seen_at": normalized.captured_at,
+        "seen_count": 1,
+    }
+
+
+async def _compute_phashes(batch: list[dict]) -> None:
+    """prepared 목록의 creative_phash를 워커 스레드에서 계산해 채운다 (이벤트 루프 블로킹 방지)."""
+    targets = [p for p in batch if p["creative_image_path"]]
+    hashes = await asyncio.gather(*(
+        asyncio.to_thread(compute_perceptual_hash, p["creative_image_path"]) for p in targets
+    ))
+    for prepared, phash in zip(targets, hashes):
+        prepared["creative_phash"] = phash
+
+
+def _log_saved(normalized: NormalizedSnapshot, counters: dict[str, int]) -> None:
+    log_msg = (
+        f"[pipeline] DB 적재 완료: '{normalized.keyword}' "
+        f"({normalized.channel}/{normalized.device}) "
+        f"- 광고 {len(normalized.ads)}건"
+    )
+    if counters["no_url_filtered"]:
+        log_msg += f" (URL없음 {counters['no_url_filtered']}건)"
+    if counters["inhouse_filtered"]:
+        log_msg += f" (하우스광고 {counters['inhouse_filtered']}건)"
+    if counters["korean_filtered"]:
+        log_msg += f" (비한국 필터 {counters['korean_filtered']}건)"
+    if counters["rejected_count"]:
+        log_msg += f" (광고주명 거부 {counters['rejected_count']}건)"
+    logger.info(log_msg)
+
+
 async def save_crawl_result(session: AsyncSession, raw: dict) -> AdSnapshot | None:
     """크롤링 원본 결과를 정규화 후 DB에 적재.
 
@@ -116,20 +252,19 @@ async def save_crawl_result(session: AsyncSession, raw: dict) -> AdSnapshot | No
         logger.error(f"[pipeline] 정규화 실패: {e}")
         return None
 
-    # keyword_id 조회 (캐시 사용 — N+1 쿼리 방지)
-    keyword_id = await _get_keyword_id(session, normalized.keyword)
+    # keyword_id / persona_id 조회 (공용 차원 캐시 — N+1 쿼리 방지)
+    dims = get_dimension_cache()
+    keyword_id = await dims.keyword_id(session, normalized.keyword)
     if not keyword_id:
         logger.warning(f"[pipeline] 키워드 '{normalized.keyword}' DB에 없음, 스킵")
         return None
 
-    # persona_id 조회 (캐시 사용)
-    persona_id = await _get_persona_id(session, normalized.persona_code)
+    persona_id = await dims.persona_id(session, normalized.persona_code)
     if not persona_id:
         logger.warning(f"[pipeline] 페르소나 '{normalized.persona_code}' DB에 없음, 스킵")
         return None
 
     # AdSnapshot 생성 (채널명 정규화: facebook/instagram → meta)
-    from processor.channel_utils import CHANNEL_DISPLAY_NORMALIZE
     save_channel = CHANNEL_DISPLAY_NORMALIZE.get(normalized.channel, normalized.channel)
     snapshot = AdSnapshot(
         keyword_id=keyword_id,
@@ -146,73 +281,13 @@ async def save_crawl_result(session: AsyncSession, raw: dict) -> AdSnapshot | No
     await session.flush()
 
     # AdDetail 생성 + Phase 3 분류 + 광고주명 검증
-    rejected_count = 0
-    korean_filtered = 0
-    no_url_filtered = 0
-    inhouse_filtered = 0
-    for ad in normalized.ads:
-        # URL 필수: 광고주 URL 없으면 광고주 식별 불가 → 제외
-        if not ad.url or not ad.url.strip():
-            no_url_filtered += 1
-            continue
-
-        # 한글 필터: 한국 시장 광고만 저장 (접촉형 채널은 면제)
-        if not is_korean_ad(ad.ad_text, ad.advertiser_name, ad.brand, ad.ad_description,
-                            channel=normalized.channel):
-            korean_filtered += 1
-            continue
-
-        # 광고주명 검증
-        name_verification = verify_advertiser_name(ad.advertiser_name)
-        original_name = ad.advertiser_name
-
-        if name_verification.quality == NameQuality.REJECTED:
-            # 가비지 이름 → 원본 보존하되 advertiser_name 제거
-            rejected_count += 1
-            ad.advertiser_name = None
-            ad.extra_data = {
-                **(ad.extra_data or {}),
-                "original_advertiser_name": name_verification.original_name,
-                "rejection_reason": name_verification.rejection_reason,
-            }
-        elif name_verification.cleaned_name:
-            ad.advertiser_name = name_verification.cleaned_name
-
-        verification_status, verification_source, extra_data = _resolve_verification_fields(
-            normalized.channel,
-            ad,
-        )
-
-        # 거부된 이름 → verification_status 오버라이드
-        if name_verification.quality == NameQuality.REJECTED:
-            verification_status = "rejected"
-            verification_source = f"name_quality:{name_verification.rejection_reason}"
-
-        # 광고 분류 (마커/인하우스/리타겟팅/위치)
-        classification = classify_ad(
-            channel=normalized.channel,
-            url=ad.url,
-            ad_text=ad.ad_text,
-            advertiser_name=ad.advertiser_name,
-            device=normalized.device,
-            position=ad.position,
-            ad_type=ad.ad_type,
-            ad_placement=ad.ad_placement,
-            extra_data=ad.extra_data,
-        )
-
-        # 인하우스(플랫폼 내부) 광고 제외 — 네이버페이, 해피빈 등은 광고주가 아님
-        if classification.is_inhouse:
-            inhouse_filtered += 1
-            continue
-
-        # extra_data 정규화
-        extra_data = normalize_extra_data(extra_data, normalized.channel)
-
-        # creative hash 계산 + 크롤러간 중복 체크
-        c_hash = compute_creative_hash(ad.creative_image_path)
-        if not c_hash:
-            c_hash = compute_text_hash(ad.advertiser_name, ad.ad_text, ad.url)
+    counters = _new_filter_counters()
+    prepared_ads = [(ad, _prepare_ad(normalized, ad, counters)) for ad in normalized.ads]
+    prepared_ads = [(ad, prepared) for ad, prepared in prepared_ads if prepared is not None]
+    await _compute_phashes([prepared for _, prepared in prepared_ads])
+    phash_index = None
+    for ad, prepared in prepared_ads:
+        c_hash = prepared["creative_hash"]
         if c_hash and await _check_duplicate(session, c_hash, normalized.channel):
             continue  # 다른 채널에서 이미 수집된 광고 -> 스킵
 
@@ -221,76 +296,24 @@ async def save_crawl_result(session: AsyncSession, raw: dict) -> AdSnapshot | No
             session, normalized.channel, c_hash,
             ad.advertiser_name, ad.ad_text, ad.url,
         )
+        if not existing_id and prepared["creative_phash"] and _phash.MAX_DISTANCE >= 0:
+            # 재인코딩/리사이즈된 같은 소재 — 같은 채널 perceptual hash 근접 매칭
+            phash_index = phash_index or await get_phash_index(session)
+            existing_id = await phash_index.find_near_duplicate(
+                session, normalized.channel, prepared["creative_phash"],
+            )
         if existing_id:
             await update_seen(session, existing_id, normalized.captured_at)
             continue
 
-        # 광고상품 자동분류
-        ad_raw = {
-            "ad_type": ad.ad_type,
-            "url": ad.url,
-            "ad_text": ad.ad_text,
-            "ad_placement": ad.ad_placement,
-            "extra_data": ad.extra_data,
-        }
-        product_cls = classify_ad_product(normalized.channel, ad_raw)
-
-        detail = AdDetail(
-            snapshot_id=snapshot.id,
-            persona_id=persona_id,
-            advertiser_name_raw=original_name,
-            brand=ad.brand,
-            ad_text=ad.ad_text,
-            ad_description=ad.ad_description,
-            position=ad.position,
-            url=ad.url,
-            display_url=ad.display_url,
-            ad_type=ad.ad_type,
-            verification_status=verification_status,
-            verification_source=verification_source,
-            product_name=ad.product_name,
-            product_category=ad.product_category,
-            ad_placement=ad.ad_placement,
-            promotion_type=ad.promotion_type,
-            creative_image_path=ad.creative_image_path,
-            creative_hash=c_hash,
-            # Phase 3 분류 필드
-            position_zone=classification.position_zone,
-            is_inhouse=classification.is_inhouse,
-            is_retargeted=classification.is_retargeted,
-            retargeting_network=classification.retargeting_network,
-            ad_marker_type=classification.ad_marker_type,
-            # 마케팅 플랜 계층 필드
-            campaign_purpose=getattr(ad, "campaign_purpose", None) or product_cls["campaign_purpose"],
-            ad_format_type=getattr(ad, "ad_format_type", None) or product_cls["ad_format_type"],
-            ad_product_name=getattr(ad, "ad_product_name", None) or product_cls["ad_product_name"],
-            model_name=getattr(ad, "model_name", None),
-            extra_data=extra_data,
-            first_seen_at=normalized.captured_at,
-            last_seen_at=normalized.captured_at,
-            seen_count=1,
-        )
-        session.add(detail)
+        session.add(AdDetail(snapshot_id=snapshot.id, persona_id=persona_id, **prepared))
 
     await session.flush()
 
     # ── 랜딩 URL 도메인 추출 → 광고주 website 자동 업데이트 ──
     await _auto_update_advertiser_websites(session)
 
-    log_msg = (
-        f"[pipeline] DB 적재 완료: '{normalized.keyword}' "
-        f"({normalized.channel}/{normalized.device}) "
-        f"- 광고 {len(normalized.ads)}건"
-    )
-    if no_url_filtered:
-        log_msg += f" (URL없음 {no_url_filtered}건)"
-    if inhouse_filtered:
-        log_msg += f" (하우스광고 {inhouse_filtered}건)"
-    if korean_filtered:
-        log_msg += f" (비한국 필터 {korean_filtered}건)"
-    if rejected_count:
-        log_msg += f" (광고주명 거부 {rejected_count}건)"
-    logger.info(log_msg)
+    _log_saved(normalized, counters)
     return snapshot
 
 
@@ -439,3 +462,140 @@ async def save_crawl_results(session: AsyncSession, results: list[dict]) -> int:
         })
 
     return saved
+
+
+async def save_crawl_results_bulk(session: AsyncSession, results: list[dict]) -> dict[str, int]:
+    """save_crawl_results의 배치 적재 모드.
+
+    광고 1건당 최대 3회(_check_duplicate / find_existing_ad / update_seen) 왕복하던
+    중복 판정을 배치당 DedupIndex 1회 로드 + 메모리 조회로 바꾸고,
+    신규 AdDetail은 bulk INSERT, seen 갱신은 executemany UPDATE 1회로 처리한다.
+    중복 판정 규칙/필터/로그는 save_crawl_result와 동일.
+
+    Returns:
+        saved_snapshots, ads_total, inserted, seen_updated, cross_channel_skipped
+        및 필터 카운터(no_url_filtered, korean_filtered, inhouse_filtered, rejected_count)
+    """
+    stats = {
+        "saved_snapshots": 0,
+        "ads_total": 0,
+        "inserted": 0,
+        "seen_updated": 0,
+        "cross_channel_skipped": 0,
+        **_new_filter_counters(),
+    }
+    channels_saved: dict[str, int] = {}
+    dims = get_dimension_cache()
+    try:
+        async with session.begin():
+            # 1) 정규화 + 키워드/페르소나 해석 + 스냅샷 생성 (flush 1회)
+            staged: list[tuple[NormalizedSnapshot, AdSnapshot]] = []
+            for raw in results:
+                if raw.get("error"):
+                    continue
+                try:
+                    normalized = normalize_crawl_result(raw)
+                except Exception as e:
+                    logger.error(f"[pipeline] 정규화 실패: {e}")
+                    continue
+                keyword_id = await dims.keyword_id(session, normalized.keyword)
+                if not keyword_id:
+                    logger.warning(f"[pipeline] 키워드 '{normalized.keyword}' DB에 없음, 스킵")
+                    continue
+                persona_id = await dims.persona_id(session, normalized.persona_code)
+                if not persona_id:
+                    logger.warning(f"[pipeline] 페르소나 '{normalized.persona_code}' DB에 없음, 스킵")
+                    continue
+                snapshot = AdSnapshot(
+                    keyword_id=keyword_id,
+                    persona_id=persona_id,
+                    device=normalized.device,
+                    channel=CHANNEL_DISPLAY_NORMALIZE.get(normalized.channel, normalized.channel),
+                    captured_at=normalized.captured_at,
+                    page_url=normalized.page_url,
+                    screenshot_path=normalized.screenshot_path,
+                    ad_count=len(normalized.ads),
+                    crawl_duration_ms=normalized.crawl_duration_ms,
+                )
+                session.add(snapshot)
+                staged.append((normalized, snapshot))
+            if not staged:
+                return stats
+            await session.flush()
+
+            # 2) 필터/분류 → 배치 전체 후보 수집 (perceptual hash는 스레드에서 일괄 계산)
+            prepared_batch: list[tuple[NormalizedSnapshot, AdSnapshot, object, dict]] = []
+            for normalized, snapshot in staged:
+                counters = _new_filter_counters()
+                for ad in normalized.ads:
+                    prepared = _prepare_ad(normalized, ad, counters)
+                    if prepared is not None:
+                        prepared_batch.append((normalized, snapshot, ad, prepared))
+                for key, value in counters.items():
+                    stats[key] += value
+                stats["ads_total"] += len(normalized.ads)
+                _log_saved(normalized, counters)
+            await _compute_phashes([p for _, _, _, p in prepared_batch])
+
+            # 3) 중복 인덱스 1회 로드 후 메모리에서 판정
+            phash_queries = {
+                (n.channel, p["creative_phash"]) for n, _, _, p in prepared_batch if p["creative_phash"]
+            } if _phash.MAX_DISTANCE >= 0 else set()
+            index = DedupIndex(phash_index=await get_phash_index(session) if phash_queries else None)
+            await index.load(
+                session,
+                creative_hashes={p["creative_hash"] for _, _, _, p in prepared_batch if p["creative_hash"]},
+                text_keys={p["text_key"] for _, _, _, p in prepared_batch if p["text_key"]},
+                channels={n.channel for n, _, _, _ in prepared_batch},
+                phash_queries=phash_queries,
+            )
+            new_rows: list[dict] = []
+            for normalized, snapshot, ad, prepared in prepared_batch:
+                c_hash = prepared["creative_hash"]
+                if index.is_cross_channel(c_hash, normalized.channel):
+                    stats["cross_channel_skipped"] += 1
+                    continue
+                ref = index.find(
+                    normalized.channel, c_hash,
+                    ad.advertiser_name, ad.ad_text, ad.url,
+                    prepared["creative_phash"],
+                )
+                if ref is not None:
+                    index.bump(ref, normalized.captured_at)
+                    continue
+                row = {
+                    "snapshot_id": snapshot.id,
+                    "persona_id": snapshot.persona_id,
+                    **prepared,
+                }
+                index.add_pending(row)
+                new_rows.append(row)
+
+            # 4) bulk INSERT + executemany UPDATE
+            if new_rows:
+                await session.execute(insert(AdDetail), new_rows)
+            stats["inserted"] = len(new_rows)
+            stats["seen_updated"] = await index.flush_seen(session)
+
+            await _auto_update_advertiser_websites(session)
+
+            stats["saved_snapshots"] = len(staged)
+            for _, snapshot in staged:
+                ch = snapshot.channel or "unknown"
+                channels_saved[ch] = channels_saved.get(ch, 0) + 1
+    except Exception as e:
+        logger.error(f"[pipeline] save_crawl_results_bulk 트랜잭션 실패, 롤백: {e}")
+        raise
+
+    logger.info(
+        "[pipeline] bulk 적재: 스냅샷 {} / 광고 {} (신규 {}, seen 갱신 {}, 채널간 중복 {})",
+        stats["saved_snapshots"], stats["ads_total"], stats["inserted"],
+        stats["seen_updated"], stats["cross_channel_skipped"],
+    )
+    if stats["saved_snapshots"] > 0:
+        await _emit_event("crawl_complete", {
+            "saved_snapshots": stats["saved_snapshots"],
+            "channels": channels_saved,
+        })
+
+    return stats
@@ -0,0 +1,348 @@
+"""S3 호환 오브젝트 스토리지 비동기 클라이언트 — httpx 커넥션 풀 + SigV4 서명.
+
+S3ImageStore가 동기 boto3 클라이언트를 이벤트 루프에서 호출하던 것을 대체합니다.
+요청은 하나의 httpx.AsyncClient(keep-alive 풀)로 보내고, 서명은 로컬 HMAC 계산이라
+presigned URL 생성에 네트워크/스레드가 필요 없습니다.
+
+- put_object / upload: part_size 이상이면 멀티파트 업로드 (파트 동시 전송, 실패 시 abort)
+- delete_objects: DeleteObjects 배치 (요청당 최대 1000키)
+- list_objects: ListObjectsV2 페이지 단위 비동기 이터레이터
+- presign_get: presigned GET URL (UNSIGNED-PAYLOAD, 로컬 서명)
+- 5xx/연결 오류는 지수 백오프로 최대 3회 시도
+
+endpoint_url을 지정하면 path-style 주소(http://host:9000/bucket/key)를 사용합니다 —
+MinIO / moto 서버 같은 로컬 S3 대체 환경용.
+
+환경변수 (from_env):
+  AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY / AWS_SESSION_TOKEN: 자격 증명
+  AWS_S3_ENDPOINT_URL: S3 호환 엔드포인트 (미지정 시 https://s3.<region>.amazonaws.com)
+  IMAGE_S3_MAX_CONNECTIONS: 커넥션 풀 크기 (기본 32)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator
+from urllib.parse import quote, urlsplit
+from xml.sax.saxutils import escape
+
+import httpx
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+MIN_PART_SIZE = 5 * 1024 * 1024   # S3 멀티파트 최소 파트 크기 (마지막 파트 제외)
+_RETRY_STATUS = {500, 502, 503, 504}
+
+
+class S3Error(Exception):
+    """S3 오류 응답 (status + Code/Message)."""
+
+    def __init__(self, status: int, code: str = "", message: str = ""):
+        super().__init__(f"S3 {status} {code}: {message}".strip())
+        self.status = status
+        self.code = code
+
+
+@dataclass
+class S3Object:
+    key: str
+    last_modified: datetime
+    size: int = 0
+
+
+@dataclass
+class S3ListPage:
+    objects: list[S3Object]
+    prefixes: list[str]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem: ET.Element, name: str) -> str:
+    for child in elem:
+        if _local(child.tag) == name:
+            return child.text or ""
+    return ""
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def _q(value: str, safe: str = "") -> str:
+    # SigV4: 비예약 문자(A-Z a-z 0-9 - _ . ~)만 그대로
+    return quote(value, safe=safe + "~")
+
+
+class AsyncS3Client:
+    """버킷 하나에 대한 비동기 S3 클라이언트."""
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        access_key: str,
+        secret_key: str,
+        session_token: str | None = None,
+        endpoint_url: str | None = None,
+        path_style: bool | None = None,
+        max_connections: int = 32,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.bucket = bucket
+        self.region = region
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._session_token = session_token
+        endpoint = (endpoint_url or f"https://s3.{region}.amazonaws.com").rstrip("/")
+        self.path_style = bool(endpoint_url) if path_style is None else path_style
+        parts = urlsplit(endpoint)
+        if self.path_style:
+            self._base = endpoint
+            self._host = parts.netloc
+            self._path_prefix = f"/{bucket}"
+        else:
+            self._host = f"{bucket}.{parts.netloc}"
+            self._base = f"{parts.scheme}://{self._host}"
+            self._path_prefix = ""
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    @classmethod
+    def from_env(cls, bucket: str, region: str, **kwargs) -> "AsyncS3Client":
+        try:
+            access_key = os.environ["AWS_ACCESS_KEY_ID"]
+            secret_key = os.environ["AWS_SECRET_ACCESS_KEY"]
+        except KeyError:
+            raise RuntimeError("S3 스토리지를 사용하려면 AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY를 설정하세요")
+        return cls(
+            bucket,
+            region,
+            access_key,
+            secret_key,
+            session_token=os.getenv("AWS_SESSION_TOKEN") or None,
+            endpoint_url=os.getenv("AWS_S3_ENDPOINT_URL") or None,
+            max_connections=int(os.getenv("IMAGE_S3_MAX_CONNECTIONS", "32")),
+            **kwargs,
+        )
+
+    # ── 서명 ──
+
+    def _scope(self, now: datetime) -> tuple[str, str, str]:
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+        return amz_date, date, f"{date}/{self.region}/s3/aws4_request"
+
+    def _signature(self, canonical_request: str, amz_date: str, date: str, scope: str) -> str:
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+        key = _hmac(f"AWS4{self._secret_key}".encode(), date)
+        for part in (self.region, "s3", "aws4_request"):
+            key = _hmac(key, part)
+        return hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _canonical_query(params: dict[str, str]) -> str:
+        return "&".join(f"{_q(k)}={_q(str(v))}" for k, v in sorted(params.items()))
+
+    def _path(self, key: str) -> str:
+        return f"{self._path_prefix}/{_q(key, safe='/')}" if key else f"{self._path_prefix}/"
+
+    def sign_headers(
+        self,
+        method: str,
+        key: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        payload_hash: str = EMPTY_SHA256,
+        now: datetime | None = None,
+    ) -> dict[str, str]:
+        """Authorization 헤더를 포함한 요청 헤더 반환 (전달한 헤더는 모두 서명 대상)."""
+        amz_date, date, scope = self._scope(now or datetime.now(timezone.utc))
+        signed = {k.lower(): v.strip() for k, v in (headers or {}).items()}
+        signed.update({"host": self._host, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date})
+        if self._session_token:
+            signed["x-amz-security-token"] = self._session_token
+        names = sorted(signed)
+        canonical_request = "\n".join([
+            method,
+            self._path(key),
+            self._canonical_query(params or {}),
+            "".join(f"{n}:{signed[n]}\n" for n in names),
+            ";".join(names),
+            payload_hash,
+        ])
+        signed["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self._access_key}/{scope}, "
+            f"SignedHeaders={';'.join(names)}, "
+            f"Signature={self._signature(canonical_request, amz_date, date, scope)}"
+        )
+        return signed
+
+    def presign_get(self, key: str, expires: int = 3600, now: datetime | None = None) -> str:
+        """presigned GET URL — 로컬 서명만 수행 (네트워크 호출 없음)."""
+        amz_date, date, scope = self._scope(now or datetime.now(timezone.utc))
+        params = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{self._access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires),
+            "X-Amz-SignedHeaders": "host",
+        }
+        if self._session_token:
+            params["X-Amz-Security-Token"] = self._session_token
+        query = self._canonical_query(params)
+        canonical_request = "\n".join([
+            "GET", self._path(key), query, f"host:{self._host}\n", "host", UNSIGNED_PAYLOAD,
+        ])
+        signature = self._signature(canonical_request, amz_date, date, scope)
+        return f"{self._base}{self._path(key)}?{query}&X-Amz-Signature={signature}"
+
+    # ── 요청 ──
+
+    async def _request(
+        self,
+        method: str,
+        key: str = "",
+        params: dict[str, str] | None = None,
+        body: bytes = b"",
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        # 쿼리는 서명과 같은 인코딩으로 직접 구성 (httpx 기본 인코딩은 공백을 '+'로 바꿈)
+        query = self._canonical_query(params or {})
+        url = f"{self._base}{self._path(key)}" + (f"?{query}" if query else "")
+        payload_hash = hashlib.sha256(body).hexdigest() if body else EMPTY_SHA256
+        for attempt in range(3):
+            signed = self.sign_headers(method, key, params, headers, payload_hash)
+            signed.pop("host")
+            try:
+                resp = await self._client.request(method, url, content=body or None, headers=signed)
+            except httpx.TransportError:
+                if attempt == 2:
+                    raise
+            else:
+                if resp.status_code < 300:
+                    return resp
+                if resp.status_code not in _RETRY_STATUS or attempt == 2:
+                    raise self._error(resp)
+            await asyncio.sleep(0.2 * 2 ** attempt)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _error(resp: httpx.Response) -> S3Error:
+        try:
+            root = ET.fromstring(resp.content)
+            return S3Error(resp.status_code, _child_text(root, "Code"), _child_text(root, "Message"))
+        except ET.ParseError:
+            return S3Error(resp.status_code, "", resp.text[:200])
+
+    async def put_object(self, key: str, body: bytes, content_type: str = "application/octet-stream") -> None:
+        await self._request("PUT", key, body=body, headers={"content-type": content_type})
+
+    async def upload(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str = "application/octet-stream",
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+    ) -> None:
+        """part_size 이상이면 멀티파트, 아니면 단일 PUT."""
+        part_size = max(part_size, MIN_PART_SIZE)
+        if len(body) <= part_size:
+            await self.put_object(key, body, content_type)
+            return
+
+        resp = await self._request("POST", key, params={"uploads": ""}, headers={"content-type": content_type})
+        upload_id = _child_text(ET.fromstring(resp.content), "UploadId")
+        slots = asyncio.Semaphore(concurrency)
+
+        async def _part(number: int, chunk: bytes) -> str:
+            async with slots:
+                part = await self._request(
+                    "PUT", key, params={"partNumber": str(number), "uploadId": upload_id}, body=chunk,
+                )
+                return part.headers["etag"]
+
+        try:
+            etags = await asyncio.gather(*(
+                _part(i + 1, body[offset:offset + part_size])
+                for i, offset in enumerate(range(0, len(body), part_size))
+            ))
+            complete = "".join(
+                f"<Part><PartNumber>{i}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+                for i, etag in enumerate(etags, start=1)
+            )
+            await self._request(
+                "POST", key, params={"uploadId": upload_id},
+                body=f"<CompleteMultipartUpload>{complete}</CompleteMultipartUpload>".encode(),
+            )
+        except BaseException:
+            try:
+                await self._request("DELETE", key, params={"uploadId": upload_id})
+            except Exception:
+                pass
+            raise
+
+    async def delete_object(self, key: str) -> None:
+        await self._request("DELETE", key)
+
+    async def delete_objects(self, keys: list[str]) -> list[str]:
+        """DeleteObjects 배치 (1000키씩). 삭제 실패한 키 목록 반환."""
+        failed: list[str] = []
+        for i in range(0, len(keys), 1000):
+            objects = "".join(f"<Object><Key>{escape(k)}</Key></Object>" for k in keys[i:i + 1000])
+            body = f"<Delete><Quiet>true</Quiet>{objects}</Delete>".encode()
+            resp = await self._request(
+                "POST", params={"delete": ""}, body=body,
+                headers={"content-md5": base64.b64encode(hashlib.md5(body).digest()).decode()},
+            )
+            for elem in ET.fromstring(resp.content):
+                if _local(elem.tag) == "Error":
+                    failed.append(_child_text(elem, "Key"))
+        return failed
+
+    async def list_objects(self, prefix: str = "", delimiter: str | None = None) -> AsyncIterator[S3ListPage]:
+        """ListObjectsV2 페이지 단위 반복."""
+        params = {"list-type": "2", "prefix": prefix}
+        if delimiter:
+            params["delimiter"] = delimiter
+        while True:
+            root = ET.fromstring((await self._request("GET", params=params)).content)
+            objects, prefixes = [], []
+            for elem in root:
+                tag = _local(elem.tag)
+                if tag == "Contents":
+                    modified = _child_text(elem, "LastModified").replace("Z", "+00:00")
+                    objects.append(S3Object(
+                        key=_child_text(elem, "Key"),
+                        last_modified=datetime.fromisoformat(modified),
+                        size=int(_child_text(elem, "Size") or 0),
+                    ))
+                elif tag == "CommonPrefixes":
+                    prefixes.append(_child_text(elem, "Prefix"))
+            yield S3ListPage(objects, prefixes)
+            token = _child_text(root, "NextContinuationToken")
+            if _child_text(root, "IsTruncated") != "true" or not token:
+                return
+            params["continuation-token"] = token
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
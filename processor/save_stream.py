@@ -0,0 +1,106 @@
+"""크롤 결과 스트리밍 적재 — 키워드 결과를 받는 즉시 마이크로 배치로 커밋.
+
+크롤러가 키워드 하나를 끝낼 때마다 결과를 bounded 큐에 넣고, 단일 writer
+태스크가 batch_size개 또는 flush_sec초 단위로 묶어 save_batch(트랜잭션 1개)를
+호출합니다.
+
+- 큐가 가득 차면 put()이 대기 → 적재가 밀리면 크롤러가 자연히 느려짐 (backpressure)
+- 슬롯 메모리 상한: queue_size + batch_size개 키워드 결과
+- 배치마다 별도 트랜잭션 → 이후 배치/크롤러가 실패해도 이미 커밋된 배치는 유지
+- 배치 적재 실패는 로그 + 카운트 후 다음 배치 계속 (슬롯 전체를 잃지 않음)
+- 에러 결과(error 키)는 카운트만 하고 적재 대상에서 제외 (save_crawl_results와 동일)
+- 종료(__aexit__) 시 예외 여부와 무관하게 남은 큐를 모두 적재
+
+사용법:
+  from processor.save_stream import ResultWriter
+
+  async with ResultWriter(save_batch, batch_size=10, flush_sec=5) as writer:
+      await crawler.crawl_keywords(keywords, on_result=writer.put)
+  writer.stats["saved"]
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+_CLOSE = object()
+
+
+class ResultWriter:
+    """bounded 큐 + 단일 writer 태스크. save_batch는 적재된 스냅샷 수를 반환."""
+
+    def __init__(
+        self,
+        save_batch: Callable[[list[dict]], Awaitable[int]],
+        batch_size: int = 10,
+        flush_sec: float = 5.0,
+        queue_size: int = 50,
+    ):
+        self._save_batch = save_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_sec = flush_sec
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self._task: asyncio.Task | None = None
+        self.stats = {
+            "keywords": 0,
+            "ads": 0,
+            "errors": 0,
+            "saved": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "lost_keywords": 0,
+            "backpressure_waits": 0,
+        }
+
+    async def __aenter__(self) -> "ResultWriter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._queue.put(_CLOSE)
+        await self._task
+
+    async def put(self, result: dict) -> None:
+        """결과 1건 투입. 큐가 가득 차면 writer가 비울 때까지 대기."""
+        if self._queue.full():
+            self.stats["backpressure_waits"] += 1
+        await self._queue.put(result)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch: list[dict] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - loop.time()) if batch else None
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                item = None
+            if item is _CLOSE:
+                if batch:
+                    await self._flush(batch)
+                return
+            if item is not None:
+                self.stats["keywords"] += 1
+                self.stats["ads"] += len(item.get("ads", []))
+                if item.get("error"):
+                    self.stats["errors"] += 1
+                else:
+                    if not batch:
+                        deadline = loop.time() + self.flush_sec
+                    batch.append(item)
+            if batch and (item is None or len(batch) >= self.batch_size):
+                await self._flush(batch)
+                batch = []
+
+    async def _flush(self, batch: list[dict]) -> None:
+        try:
+            self.stats["saved"] += await self._save_batch(batch)
+            self.stats["batches"] += 1
+        except Exception:
+            self.stats["failed_batches"] += 1
+            self.stats["lost_keywords"] += len(batch)
+            logger.exception(f"[save_stream] 배치 적재 실패 — 키워드 결과 {len(batch)}건 유실, 다음 배치 계속")
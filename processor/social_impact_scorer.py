@@ -11,9 +11,10 @@ Output: SocialImpactScore row per advertiser per day.
 from __future__ import annotations
 
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, case, func, select
 
 from database import async_session
 from database.models import (
@@ -25,6 +26,7 @@ from database.models import (
     SocialImpactScore,
     TrafficSignal,
 )
+from processor.daily_score_store import upsert_daily_scores
 
 logger = logging.getLogger(__name__)
 
@@ -133,20 +135,368 @@ def _determine_phase(
     return "none"
 
 
+def _empty_metrics() -> dict:
+    return {
+        "article_count": 0,
+        "avg_sentiment": 0.0,
+        "curr_social": 0,
+        "base_social": 0,
+        "curr_eng": 0.0,
+        "base_eng": 0.0,
+        "active_camp": 0,
+        "camp_first": None,
+        "last_end": None,
+        "current_index": None,
+        "wow_change": None,
+        "baseline_traffic": None,
+    }
+
+
+async def _collect_metrics_single(
+    session, adv_id: int, now: datetime, cutoff: datetime, baseline_start: datetime,
+) -> dict:
+    """Per-advertiser metric queries (bulk=False path)."""
+    # ── 1. News impact ──
+    news_q = select(
+        func.count(NewsMention.id),
+        func.avg(NewsMention.sentiment_score),
+    ).where(
+        and_(
+            NewsMention.advertiser_id == adv_id,
+            NewsMention.collected_at >= cutoff,
+        )
+    )
+    news_row = (await session.execute(news_q)).one()
+
+    # ── 2. Social posting impact ──
+    # Current period posts
+    curr_social = (
+        await session.execute(
+            select(func.count(BrandChannelContent.id)).where(
+                and_(
+                    BrandChannelContent.advertiser_id == adv_id,
+                    BrandChannelContent.upload_date >= cutoff,
+                )
+            )
+        )
+    ).scalar_one() or 0
+
+    # Baseline period posts
+    base_social = (
+        await session.execute(
+            select(func.count(BrandChannelContent.id)).where(
+                and_(
+                    BrandChannelContent.advertiser_id == adv_id,
+                    BrandChannelContent.upload_date >= baseline_start,
+                    BrandChannelContent.upload_date < cutoff,
+                )
+            )
+        )
+    ).scalar_one() or 0
+
+    # Current engagement rate (latest ChannelStats)
+    curr_eng = (
+        await session.execute(
+            select(func.avg(ChannelStats.engagement_rate)).where(
+                and_(
+                    ChannelStats.advertiser_id == adv_id,
+                    ChannelStats.collected_at >= cutoff,
+                )
+            )
+        )
+    ).scalar_one() or 0.0
+
+    base_eng = (
+        await session.execute(
+            select(func.avg(ChannelStats.engagement_rate)).where(
+                and_(
+                    ChannelStats.advertiser_id == adv_id,
+                    ChannelStats.collected_at >= baseline_start,
+                    ChannelStats.collected_at < cutoff,
+                )
+            )
+        )
+    ).scalar_one() or 0.0
+
+    # ── 3. Campaign info ──
+    active_camp = (
+        await session.execute(
+            select(func.count(Campaign.id)).where(
+                and_(
+                    Campaign.advertiser_id == adv_id,
+                    Campaign.is_active == True,
+                )
+            )
+        )
+    ).scalar_one() or 0
+
+    # Campaign days active (from earliest active campaign)
+    camp_first = (
+        await session.execute(
+            select(func.min(Campaign.first_seen)).where(
+                and_(
+                    Campaign.advertiser_id == adv_id,
+                    Campaign.is_active == True,
+                )
+            )
+        )
+    ).scalar_one()
+
+    # Days since last campaign ended (for phase)
+    last_end = (
+        await session.execute(
+            select(func.max(Campaign.last_seen)).where(
+                and_(
+                    Campaign.advertiser_id == adv_id,
+                    Campaign.is_active == False,
+                )
+            )
+        )
+    ).scalar_one()
+
+    # ── 4. Search lift ──
+    traffic_q = (
+        select(TrafficSignal.composite_index, TrafficSignal.wow_change_pct)
+        .where(TrafficSignal.advertiser_id == adv_id)
+        .order_by(TrafficSignal.date.desc())
+        .limit(1)
+    )
+    traffic_row = (await session.execute(traffic_q)).one_or_none()
+
+    # Baseline search index (before campaign or 14 days ago)
+    baseline_cutoff = camp_first if camp_first else (now - timedelta(days=14))
+    baseline_traffic = (
+        await session.execute(
+            select(func.avg(TrafficSignal.composite_index)).where(
+                and_(
+                    TrafficSignal.advertiser_id == adv_id,
+                    TrafficSignal.date <= baseline_cutoff,
+                )
+            )
+        )
+    ).scalar_one()
+
+    return {
+        "article_count": news_row[0] or 0,
+        "avg_sentiment": news_row[1] or 0.0,
+        "curr_social": curr_social,
+        "base_social": base_social,
+        "curr_eng": curr_eng,
+        "base_eng": base_eng,
+        "active_camp": active_camp,
+        "camp_first": camp_first,
+        "last_end": last_end,
+        "current_index": traffic_row[0] if traffic_row else None,
+        "wow_change": traffic_row[1] if traffic_row else None,
+        "baseline_traffic": baseline_traffic,
+    }
+
+
+async def _collect_metrics_bulk(
+    session, adv_scope, now: datetime, cutoff: datetime, baseline_start: datetime,
+) -> dict[int, dict]:
+    """All advertiser metrics with one GROUP BY query per source (bulk=True path)."""
+    metrics: dict[int, dict] = {}
+
+    def _entry(adv_id: int) -> dict:
+        if adv_id not in metrics:
+            metrics[adv_id] = _empty_metrics()
+        return metrics[adv_id]
+
+    # ── 1. News impact ──
+    rows = await session.execute(
+        select(NewsMention.advertiser_id, func.count(NewsMention.id), func.avg(NewsMention.sentiment_score))
+        .where(NewsMention.collected_at >= cutoff, NewsMention.advertiser_id.in_(adv_scope))
+        .group_by(NewsMention.advertiser_id)
+    )
+    for adv_id, count, avg_sentiment in rows.all():
+        entry = _entry(adv_id)
+        entry["article_count"] = count or 0
+        entry["avg_sentiment"] = avg_sentiment or 0.0
+
+    # ── 2. Social posting: current / baseline posts and engagement in one pass each ──
+    in_current = BrandChannelContent.upload_date >= cutoff
+    rows = await session.execute(
+        select(
+            BrandChannelContent.advertiser_id,
+            func.sum(case((in_current, 1), else_=0)),
+            func.sum(case((in_current, 0), else_=1)),
+        )
+        .where(BrandChannelContent.upload_date >= baseline_start, BrandChannelContent.advertiser_id.in_(adv_scope))
+        .group_by(BrandChannelContent.advertiser_id)
+    )
+    for adv_id, current, baseline in rows.all():
+        entry = _entry(adv_id)
+        entry["curr_social"] = current or 0
+        entry["base_social"] = baseline or 0
+
+    eng_current = ChannelStats.collected_at >= cutoff
+    rows = await session.execute(
+        select(
+            ChannelStats.advertiser_id,
+            func.avg(case((eng_current, ChannelStats.engagement_rate))),
+            func.avg(case((~eng_current, ChannelStats.engagement_rate))),
+        )
+        .where(ChannelStats.collected_at >= baseline_start, ChannelStats.advertiser_id.in_(adv_scope))
+        .group_by(ChannelStats.advertiser_id)
+    )
+    for adv_id, current, baseline in rows.all():
+        entry = _entry(adv_id)
+        entry["curr_eng"] = current or 0.0
+        entry["base_eng"] = baseline or 0.0
+
+    # ── 3. Campaign info ──
+    is_active = Campaign.is_active == True
+    is_ended = Campaign.is_active == False
+    rows = await session.execute(
+        select(
+            Campaign.advertiser_id,
+            func.sum(case((is_active, 1), else_=0)),
+            func.min(case((is_active, Campaign.first_seen))),
+            func.max(case((is_ended, Campaign.last_seen))),
+        )
+        .where(Campaign.advertiser_id.in_(adv_scope))
+        .group_by(Campaign.advertiser_id)
+    )
+    for adv_id, active_camp, camp_first, last_end in rows.all():
+        entry = _entry(adv_id)
+        entry["active_camp"] = active_camp or 0
+        entry["camp_first"] = camp_first
+        entry["last_end"] = last_end
+
+    # ── 4. Search lift: latest traffic row + baseline average before first active campaign ──
+    ranked = (
+        select(
+            TrafficSignal.advertiser_id,
+            TrafficSignal.composite_index,
+            TrafficSignal.wow_change_pct,
+            func.row_number().over(
+                partition_by=TrafficSignal.advertiser_id,
+                order_by=TrafficSignal.date.desc(),
+            ).label("rn"),
+        )
+        .where(TrafficSignal.advertiser_id.in_(adv_scope))
+        .subquery()
+    )
+    rows = await session.execute(
+        select(ranked.c.advertiser_id, ranked.c.composite_index, ranked.c.wow_change_pct).where(ranked.c.rn == 1)
+    )
+    for adv_id, current_index, wow_change in rows.all():
+        entry = _entry(adv_id)
+        entry["current_index"] = current_index
+        entry["wow_change"] = wow_change
+
+    first_active = (
+        select(Campaign.advertiser_id, func.min(Campaign.first_seen).label("first_seen"))
+        .where(is_active)
+        .group_by(Campaign.advertiser_id)
+        .subquery()
+    )
+    rows = await session.execute(
+        select(TrafficSignal.advertiser_id, func.avg(TrafficSignal.composite_index))
+        .outerjoin(first_active, first_active.c.advertiser_id == TrafficSignal.advertiser_id)
+        .where(
+            TrafficSignal.advertiser_id.in_(adv_scope),
+            TrafficSignal.date <= func.coalesce(first_active.c.first_seen, now - timedelta(days=14)),
+        )
+        .group_by(TrafficSignal.advertiser_id)
+    )
+    for adv_id, baseline_traffic in rows.all():
+        _entry(adv_id)["baseline_traffic"] = baseline_traffic
+
+    return metrics
+
+
+def _impact_row(m: dict, now: datetime) -> dict:
+    """Metrics → social_impact_scores column values."""
+    article_count = m["article_count"]
+    avg_sentiment = m["avg_sentiment"]
+    news_score = _calc_news_impact(article_count, avg_sentiment)
+
+    active_camp = m["active_camp"]
+    has_active = active_camp > 0
+    camp_first = m["camp_first"]
+    campaign_days = (now - camp_first).days if camp_first else 0
+    last_end = m["last_end"]
+    days_since_end = (now - last_end).days if last_end else None
+
+    curr_social, base_social = m["curr_social"], m["base_social"]
+    curr_eng, base_eng = m["curr_eng"], m["base_eng"]
+    social_score, posting_delta, eng_delta = _calc_social_posting_impact(
+        curr_social, base_social, curr_eng, base_eng, has_active,
+    )
+
+    current_index, wow_change = m["current_index"], m["wow_change"]
+    baseline_traffic = m["baseline_traffic"]
+    search_score, search_delta = _calc_search_lift(
+        current_index, baseline_traffic, wow_change, has_active, campaign_days,
+    )
+
+    # ── 5. Composite ──
+    composite = _calc_composite(news_score, social_score, search_score)
+    phase = _determine_phase(has_active, days_since_end)
+
+    factors = {
+        "news": {
+            "article_count": article_count,
+            "avg_sentiment": round(avg_sentiment, 2),
+            "score": news_score,
+        },
+        "social": {
+            "current_posts": curr_social,
+            "baseline_posts": base_social,
+            "current_engagement": round(curr_eng, 2),
+            "baseline_engagement": round(base_eng, 2),
+            "score": social_score,
+        },
+        "search": {
+            "current_index": round(current_index, 1) if current_index else None,
+            "baseline_index": round(baseline_traffic, 1) if baseline_traffic else None,
+            "wow_change": round(wow_change, 1) if wow_change else None,
+            "score": search_score,
+        },
+        "campaign": {
+            "active_count": active_camp,
+            "days_active": campaign_days,
+            "phase": phase,
+        },
+    }
+    return {
+        "news_impact_score": news_score,
+        "social_posting_score": social_score,
+        "search_lift_score": search_score,
+        "composite_score": composite,
+        "news_article_count": article_count,
+        "news_sentiment_avg": round(avg_sentiment, 2) if avg_sentiment else None,
+        "social_engagement_delta_pct": eng_delta,
+        "social_posting_delta_pct": posting_delta,
+        "search_volume_delta_pct": search_delta,
+        "has_active_campaign": has_active,
+        "campaign_days_active": campaign_days,
+        "impact_phase": phase,
+        "factors": factors,
+    }
+
+
 async def calculate_social_impact_scores(
     session=None,
     advertiser_ids: list[int] | None = None,
     days: int = 7,
+    bulk: bool = True,
 ) -> dict:
     """Calculate social impact scores for all active advertisers.
 
-    Returns: {"processed": N, "created": N, "updated": N}
+    bulk=True reads each source with one GROUP BY query for all advertisers;
+    bulk=False issues the per-advertiser queries (kept for comparison).
+
+    Returns: {"processed": N, "created": N, "updated": N, "elapsed_ms": N}
     """
     own_session = session is None
     if own_session:
         session = async_session()
 
     try:
+        started = time.perf_counter()
         now = datetime.now(UTC).replace(tzinfo=None)
         cutoff = now - timedelta(days=days)
         baseline_start = cutoff - timedelta(days=days)
@@ -175,232 +525,30 @@ async def calculate_social_impact_scores(
         adv_ids = [r[0] for r in result.fetchall()]
 
         if not adv_ids:
-            return {"processed": 0, "created": 0, "updated": 0}
-
-        created = 0
-        updated = 0
-
-        for adv_id in adv_ids:
-            # ── 1. News impact ──
-            news_q = select(
-                func.count(NewsMention.id),
-                func.avg(NewsMention.sentiment_score),
-            ).where(
-                and_(
-                    NewsMention.advertiser_id == adv_id,
-                    NewsMention.collected_at >= cutoff,
-                )
-            )
-            news_row = (await session.execute(news_q)).one()
-            article_count = news_row[0] or 0
-            avg_sentiment = news_row[1] or 0.0
-            news_score = _calc_news_impact(article_count, avg_sentiment)
-
-            # ── 2. Social posting impact ──
-            # Current period posts
-            curr_social = (
-                await session.execute(
-                    select(func.count(BrandChannelContent.id)).where(
-                        and_(
-                            BrandChannelContent.advertiser_id == adv_id,
-                            BrandChannelContent.upload_date >= cutoff,
-                        )
-                    )
-                )
-            ).scalar_one() or 0
-
-            # Baseline period posts
-            base_social = (
-                await session.execute(
-                    select(func.count(BrandChannelContent.id)).where(
-                        and_(
-                            BrandChannelContent.advertiser_id == adv_id,
-                            BrandChannelContent.upload_date >= baseline_start,
-                            BrandChannelContent.upload_date < cutoff,
-                        )
-                    )
-                )
-            ).scalar_one() or 0
-
-            # Current engagement rate (latest ChannelStats)
-            curr_eng = (
-                await session.execute(
-                    select(func.avg(ChannelStats.engagement_rate)).where(
-                        and_(
-                            ChannelStats.advertiser_id == adv_id,
-                            ChannelStats.collected_at >= cutoff,
-                        )
-                    )
-                )
-            ).scalar_one() or 0.0
-
-            base_eng = (
-                await session.execute(
-                    select(func.avg(ChannelStats.engagement_rate)).where(
-                        and_(
-                            ChannelStats.advertiser_id == adv_id,
-                            ChannelStats.collected_at >= baseline_start,
-                            ChannelStats.collected_at < cutoff,
-                        )
-                    )
-                )
-            ).scalar_one() or 0.0
-
-            # ── 3. Campaign info ──
-            active_camp = (
-                await session.execute(
-                    select(func.count(Campaign.id)).where(
-                        and_(
-                            Campaign.advertiser_id == adv_id,
-                            Campaign.is_active == True,
-                        )
-                    )
-                )
-            ).scalar_one() or 0
-            has_active = active_camp > 0
-
-            # Campaign days active (from earliest active campaign)
-            camp_first = (
-                await session.execute(
-                    select(func.min(Campaign.first_seen)).where(
-                        and_(
-                            Campaign.advertiser_id == adv_id,
-                            Campaign.is_active == True,
-                        )
-                    )
-                )
-            ).scalar_one()
-            campaign_days = (now - camp_first).days if camp_first else 0
-
-            # Days since last campaign ended (for phase)
-            last_end = (
-                await session.execute(
-                    select(func.max(Campaign.last_seen)).where(
-                        and_(
-                            Campaign.advertiser_id == adv_id,
-                            Campaign.is_active == False,
-                        )
-                    )
-                )
-            ).scalar_one()
-            days_since_end = (now - last_end).days if last_end else None
-
-            social_score, posting_delta, eng_delta = _calc_social_posting_impact(
-                curr_social, base_social, curr_eng, base_eng, has_active,
-            )
-
-            # ── 4. Search lift ──
-            traffic_q = (
-                select(TrafficSignal.composite_index, TrafficSignal.wow_change_pct)
-                .where(TrafficSignal.advertiser_id == adv_id)
-                .order_by(TrafficSignal.date.desc())
-                .limit(1)
-            )
-            traffic_row = (await session.execute(traffic_q)).one_or_none()
-            current_index = traffic_row[0] if traffic_row else None
-            wow_change = traffic_row[1] if traffic_row else None
-
-            # Baseline search index (before campaign or 14 days ago)
-            baseline_cutoff = camp_first if camp_first else (now - timedelta(days=14))
-            baseline_traffic = (
-                await session.execute(
-                    select(func.avg(TrafficSignal.composite_index)).where(
-                        and_(
-                            TrafficSignal.advertiser_id == adv_id,
-                            TrafficSignal.date <= baseline_cutoff,
-                        )
-                    )
-                )
-            ).scalar_one()
-
-            search_score, search_delta = _calc_search_lift(
-                current_index, baseline_traffic, wow_change, has_active, campaign_days,
-            )
-
-            # ── 5. Composite ──
-            composite = _calc_composite(news_score, social_score, search_score)
-            phase = _determine_phase(has_active, days_since_end)
-
-            factors = {
-                "news": {
-                    "article_count": article_count,
-                    "avg_sentiment": round(avg_sentiment, 2),
-                    "score": news_score,
-                },
-                "social": {
-                    "current_posts": curr_social,
-                    "baseline_posts": base_social,
-                    "current_engagement": round(curr_eng, 2),
-                    "baseline_engagement": round(base_eng, 2),
-                    "score": social_score,
-                },
-                "search": {
-                    "current_index": round(current_index, 1) if current_index else None,
-                    "baseline_index": round(baseline_traffic, 1) if baseline_traffic else None,
-                    "wow_change": round(wow_change, 1) if wow_change else None,
-                    "score": search_score,
-                },
-                "campaign": {
-                    "active_count": active_camp,
-                    "days_active": campaign_days,
-                    "phase": phase,
-                },
+            return {"processed": 0, "created": 0, "updated": 0,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000)}
+
+        if bulk:
+            collected = await _collect_metrics_bulk(session, combined, now, cutoff, baseline_start)
+            metrics = {adv_id: collected.get(adv_id) or _empty_metrics() for adv_id in adv_ids}
+        else:
+            metrics = {
+                adv_id: await _collect_metrics_single(session, adv_id, now, cutoff, baseline_start)
+                for adv_id in adv_ids
             }
 
-            # ── 6. Upsert ──
-            existing = (
-                await session.execute(
-                    select(SocialImpactScore).where(
-                        and_(
-                            SocialImpactScore.advertiser_id == adv_id,
-                            SocialImpactScore.date == today_dt,
-                        )
-                    )
-                )
-            ).scalar_one_or_none()
-
-            if existing:
-                existing.news_impact_score = news_score
-                existing.social_posting_score = social_score
-                existing.search_lift_score = search_score
-                existing.composite_score = composite
-                existing.news_article_count = article_count
-                existing.news_sentiment_avg = round(avg_sentiment, 2) if avg_sentiment else None
-                existing.social_engagement_delta_pct = eng_delta
-                existing.social_posting_delta_pct = posting_delta
-                existing.search_volume_delta_pct = search_delta
-                existing.has_active_campaign = has_active
-                existing.campaign_days_active = campaign_days
-                existing.impact_phase = phase
-                existing.factors = factors
-                updated += 1
-            else:
-                session.add(SocialImpactScore(
-                    advertiser_id=adv_id,
-                    date=today_dt,
-                    news_impact_score=news_score,
-                    social_posting_score=social_score,
-                    search_lift_score=search_score,
-                    composite_score=composite,
-                    news_article_count=article_count,
-                    news_sentiment_avg=round(avg_sentiment, 2) if avg_sentiment else None,
-                    social_engagement_delta_pct=eng_delta,
-                    social_posting_delta_pct=posting_delta,
-                    search_volume_delta_pct=search_delta,
-                    has_active_campaign=has_active,
-                    campaign_days_active=campaign_days,
-                    impact_phase=phase,
-                    factors=factors,
-                ))
-                created += 1
+        # ── 6. Upsert ──
+        rows = {adv_id: _impact_row(m, now) for adv_id, m in metrics.items()}
+        created, updated = await upsert_daily_scores(session, SocialImpactScore, today_dt, rows)
 
         await session.commit()
         total = len(adv_ids)
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
         logger.info(
-            "[social_impact] processed=%d created=%d updated=%d",
-            total, created, updated,
+            "[social_impact] processed=%d created=%d updated=%d bulk=%s elapsed=%dms",
+            total, created, updated, bulk, elapsed_ms,
         )
-        return {"processed": total, "created": created, "updated": updated}
+        return {"processed": total, "created": created, "updated": updated, "elapsed_ms": elapsed_ms}
 
     except Exception:
         logger.exception("[social_impact] calculate_social_impact_scores failed")
@@ -12,7 +12,16 @@ from datetime import datetime, timedelta
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import AdDetail, AdSnapshot, Advertiser, Campaign, Keyword, Persona
+from database.models import (
+    AdDetail,
+    AdSnapshot,
+    Advertiser,
+    Campaign,
+    DailyAdRollup,
+    Keyword,
+    Persona,
+)
+from processor.daily_rollup import use_rollups, window_start
 
 
 @dataclass
@@ -53,7 +62,12 @@ async def calculate_sov(
     2. advertiser별 그룹핑
     3. 전체 대비 비율 계산
     4. 위치별(top/middle/bottom) 세부 SOV도 함께 계산
+
+    일별 롤업이 활성화돼 있으면 daily_ad_rollups에서 읽습니다 (기간은 일 단위).
     """
+    if await use_rollups(db):
+        return await _calculate_sov_from_rollup(db, keyword, industry_id, channel, days, limit)
+
     since = datetime.utcnow() - timedelta(days=days)
 
     # 전체 시장 노출 수
@@ -158,6 +172,88 @@ async def calculate_sov(
     return results
 
 
+async def _calculate_sov_from_rollup(
+    db: AsyncSession,
+    keyword: str | None,
+    industry_id: int | None,
+    channel: str | None,
+    days: int,
+    limit: int,
+) -> list[SOVResult]:
+    """calculate_sov의 롤업 버전.
+
+    롤업 테이블만 광고주 id 기준으로 집계하고(커버링 인덱스 스캔) 이름은 상위 N개만 조회.
+    위치별 SOV는 광고주 전체를 한 번에 조회합니다.
+    """
+    since = window_start(days)
+    r = DailyAdRollup
+    impressions = func.sum(r.non_inhouse_impressions)
+
+    def _scoped(q):
+        q = q.where(r.date >= since)
+        if channel:
+            q = q.where(r.channel == channel)
+        if keyword or industry_id:
+            keyword_ids = select(Keyword.id)
+            if keyword:
+                keyword_ids = keyword_ids.where(Keyword.keyword == keyword)
+            if industry_id:
+                keyword_ids = keyword_ids.where(Keyword.industry_id == industry_id)
+            q = q.where(r.keyword_id.in_(keyword_ids))
+        return q
+
+    total_market = (await db.execute(_scoped(select(impressions)))).scalar() or 0
+    if total_market == 0:
+        return []
+
+    adv_q = (
+        _scoped(select(r.advertiser_id, r.channel, impressions.label("impressions")))
+        .where(r.advertiser_id.isnot(None))
+        .group_by(r.advertiser_id, r.channel)
+        .having(impressions > 0)
+        .order_by(impressions.desc())
+        .limit(limit)
+    )
+    rows = (await db.execute(adv_q)).all()
+    if not rows:
+        return []
+    advertiser_ids = {row.advertiser_id for row in rows}
+    names = dict(
+        (await db.execute(select(Advertiser.id, Advertiser.name).where(Advertiser.id.in_(advertiser_ids)))).all()
+    )
+
+    # 위치별 SOV: 원본과 동일하게 광고주 + channel 파라미터 기준 (인하우스 포함)
+    pos_q = (
+        select(r.advertiser_id, r.position_zone, func.sum(r.impressions).label("cnt"))
+        .where(r.advertiser_id.in_(advertiser_ids))
+        .where(r.date >= since)
+        .where(r.position_zone.isnot(None))
+        .group_by(r.advertiser_id, r.position_zone)
+    )
+    if channel:
+        pos_q = pos_q.where(r.channel == channel)
+    position_sov: dict[int, dict[str, float]] = {}
+    for pr in (await db.execute(pos_q)).all():
+        if pr.position_zone:
+            position_sov.setdefault(pr.advertiser_id, {})[pr.position_zone] = round(
+                pr.cnt / total_market * 100, 2
+            )
+
+    return [
+        SOVResult(
+            advertiser_name=names[row.advertiser_id],
+            advertiser_id=row.advertiser_id,
+            channel=row.channel,
+            total_impressions=row.impressions,
+            total_market_impressions=total_market,
+            sov_percentage=round(row.impressions / total_market * 100, 2),
+            position_sov=position_sov.get(row.advertiser_id, {}),
+        )
+        for row in rows
+        if row.advertiser_id in names
+    ]
+
+
 async def calculate_competitive_sov(
     db: AsyncSession,
     advertiser_id: int,
@@ -3,13 +3,17 @@
 import asyncio
 import json
 import os
+import time
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
 
+from crawler.browser_pool import get_browser_pool
+from crawler.config import crawler_settings
 from crawler.google_gdn import GoogleGDNCrawler
 from crawler.google_search_ads import GoogleSearchAdsCrawler
 from crawler.kakao_da import KakaoDACrawler
@@ -24,7 +28,9 @@ from crawler.naver_shopping import NaverShoppingCrawler
 from database import async_session
 from processor.ai_enricher import enrich_ads
 from processor.campaign_builder import rebuild_campaigns_and_spend
-from processor.pipeline import save_crawl_results
+from processor.daily_rollup import refresh_daily_rollups, rollups_enabled
+from processor.pipeline import save_crawl_results, save_crawl_results_bulk
+from processor.save_stream import ResultWriter
 from scripts.sync_db_to_railway import sync as sync_db_to_railway
 from scheduler.schedules import WEEKDAY_SCHEDULE, WEEKEND_SCHEDULE, ScheduleSlot
 from scheduler.weekend_rules import get_weekend_boost_keywords
@@ -156,6 +162,16 @@ class AdScopeScheduler:
         self.scheduler = AsyncIOScheduler(timezone="Asia/Seoul")
         self._keywords: list[str] = []
         self.enable_campaign_rebuild = _env_bool("ENABLE_CAMPAIGN_REBUILD", default=True)
+        self.enable_bulk_ingest = _env_bool("ENABLE_BULK_INGEST", default=False)
+        self.enable_incremental_rebuild = _env_bool("ENABLE_INCREMENTAL_CAMPAIGN_REBUILD", default=False)
+        self.enable_daily_rollups = rollups_enabled()
+        self.enable_competitor_precompute = _env_bool("ENABLE_COMPETITOR_PRECOMPUTE", default=False)
+        self.competitor_refresh_min_interval_minutes = _env_int(
+            "COMPETITOR_PRECOMPUTE_MIN_INTERVAL_MINUTES",
+            default=60,
+            minimum=0,
+        )
+        self._competitor_refreshed_at: float | None = None
         self.crawl_channels = _parse_channels(os.getenv("CRAWL_CHANNELS", "naver_search"))
         self.non_keyword_channel_min_interval_minutes = _env_int(
             "NON_KEYWORD_CHANNEL_MIN_INTERVAL_MINUTES",
@@ -187,6 +203,16 @@ class AdScopeScheduler:
         self._channel_fail_count: dict[str, int] = {}
         self._circuit_breaker_threshold = _env_int("CIRCUIT_BREAKER_THRESHOLD", default=5, minimum=2)
         self._retry_max = _env_int("CRAWL_RETRY_MAX", default=2, minimum=0)
+        # 채널 동시 실행 수 (브라우저는 풀이 max_concurrent_browsers로 제한, 1=순차)
+        self.channel_concurrency = _env_int(
+            "CRAWL_CHANNEL_CONCURRENCY",
+            default=crawler_settings.max_concurrent_browsers,
+            minimum=1,
+        )
+        # 스트리밍 적재: 키워드 결과 마이크로 배치 크기 / 최대 대기(초) / 큐 상한 (backpressure)
+        self.save_batch_size = _env_int("CRAWL_SAVE_BATCH_SIZE", default=10, minimum=1)
+        self.save_flush_sec = _env_int("CRAWL_SAVE_FLUSH_SEC", default=5, minimum=1)
+        self.save_queue_size = _env_int("CRAWL_SAVE_QUEUE_SIZE", default=50, minimum=1)
         logger.info("[schedule] crawl channels: {}", ", ".join(self.crawl_channels))
 
     def load_keywords(self, keywords_path: str = "database/seed_data/keywords.json"):
@@ -291,6 +317,16 @@ class AdScopeScheduler:
             )
             logger.info("[schedule] Traffic signal scheduled daily at 04:30")
 
+        # Competitor affinity: 매일 04:45 (광고주별 경쟁사 top-N 사전 계산)
+        if self.enable_competitor_precompute:
+            self.scheduler.add_job(
+                self._run_competitor_precompute,
+                CronTrigger(hour=4, minute=45, timezone="Asia/Seoul"),
+                id="competitor_affinity_daily",
+                replace_existing=True,
+            )
+            logger.info("[schedule] Competitor affinity precompute scheduled daily at 04:45")
+
         # Activity score: 매일 05:00
         if _env_bool("ENABLE_ACTIVITY_SCORE", default=True):
             self.scheduler.add_job(
@@ -533,107 +569,44 @@ class AdScopeScheduler:
             f"({datetime.now().strftime('%H:%M')})"
         )
 
-        results: list[dict] = []
-        for channel in self.crawl_channels:
-            # 서킷브레이커: 연속 N회 실패한 채널은 스킵
-            fail_count = self._channel_fail_count.get(channel, 0)
-            if fail_count >= self._circuit_breaker_threshold:
-                logger.warning(
-                    "[schedule] circuit breaker OPEN for {} ({} consecutive failures, threshold {}). "
-                    "Skipping. Reset with CIRCUIT_BREAKER_THRESHOLD env or restart.",
-                    channel, fail_count, self._circuit_breaker_threshold,
-                )
-                continue
-
-            crawler_cls = SUPPORTED_CRAWLER_MAP[channel]
-            logger.info("[schedule] channel start: {}", channel)
-            is_keyword_dependent = getattr(crawler_cls, "keyword_dependent", True)
-            channel_keywords = _limit_keywords_for_channel(
-                job_keywords=job_keywords,
-                channel=channel,
-                crawler_cls=crawler_cls,
-                channel_keyword_limits=self.channel_keyword_limits,
-            )
-            channel_min_interval = _resolve_min_interval_for_channel(
-                channel=channel,
-                is_keyword_dependent=is_keyword_dependent,
-                default_non_keyword_interval=self.non_keyword_channel_min_interval_minutes,
-                channel_min_intervals=self.channel_min_intervals,
-            )
-            if channel_min_interval > 0:
-                now_utc = datetime.now(UTC)
-                last_run_at = self._channel_last_run_at.get(channel)
-                if should_skip_keyword_independent_channel(
-                    last_run_at=last_run_at,
-                    now_utc=now_utc,
-                    min_interval_minutes=channel_min_interval,
-                ):
-                    logger.info(
-                        "[schedule] skip channel {} (min interval {}m)",
-                        channel,
-                        channel_min_interval,
-                    )
-                    continue
+        # 키워드 결과는 끝나는 즉시 writer 큐로 → 마이크로 배치 커밋 (슬롯 전체를 메모리에 모으지 않음)
+        semaphore = asyncio.Semaphore(self.channel_concurrency)
+        async with ResultWriter(
+            self._save_results_batch,
+            batch_size=self.save_batch_size,
+            flush_sec=self.save_flush_sec,
+            queue_size=self.save_queue_size,
+        ) as writer:
+
+            async def _channel_task(channel: str):
+                async with semaphore:
+                    await self._run_channel(channel, job_keywords, persona_code, device_type, writer.put)
+
+            await asyncio.gather(*(_channel_task(channel) for channel in self.crawl_channels))
+        totals = writer.stats
+        logger.info(
+            "[schedule] streamed save: batches {} / failed {} (lost keywords {}) / backpressure waits {}",
+            totals["batches"], totals["failed_batches"], totals["lost_keywords"], totals["backpressure_waits"],
+        )
 
-            # 재시도 로직 (최대 _retry_max 회)
-            last_exc = None
-            for attempt in range(1 + self._retry_max):
-                try:
-                    async with crawler_cls() as crawler:
-                        channel_results = await crawler.crawl_keywords(
-                            keywords=channel_keywords,
-                            persona_code=persona_code,
-                            device_type=device_type,
-                        )
-                        results.extend(channel_results)
-                    if channel_min_interval > 0:
-                        self._channel_last_run_at[channel] = datetime.now(UTC)
-                    # 성공 → 서킷브레이커 카운트 리셋
-                    self._channel_fail_count[channel] = 0
-                    last_exc = None
-                    break
-                except Exception as exc:
-                    last_exc = exc
-                    if attempt < self._retry_max:
-                        wait_sec = 10 * (attempt + 1)
-                        logger.warning(
-                            "[schedule] channel {} attempt {}/{} failed: {}. Retrying in {}s...",
-                            channel, attempt + 1, 1 + self._retry_max,
-                            str(exc)[:100], wait_sec,
-                        )
-                        await asyncio.sleep(wait_sec)
-
-            if last_exc is not None:
-                # 모든 재시도 실패 → 서킷브레이커 카운트 증가
-                self._channel_fail_count[channel] = fail_count + 1
-                logger.exception("[schedule] channel failed after %d attempts: %s", 1 + self._retry_max, channel)
-                now = datetime.now(UTC)
-                results.extend(
-                    [
-                        {
-                            "keyword": kw,
-                            "persona_code": persona_code,
-                            "device": device_type,
-                            "channel": channel,
-                            "captured_at": now,
-                            "error": str(last_exc),
-                            "ads": [],
-                        }
-                        for kw in channel_keywords
-                    ]
-                )
-                if channel_min_interval > 0:
-                    self._channel_last_run_at[channel] = datetime.now(UTC)
+        pool = get_browser_pool().metrics()
+        logger.info(
+            "[schedule] browser pool: browsers {}/{} / launches {} / leases {} / waits {} / recycled {}+{}",
+            pool["browsers"], pool["max_browsers"], pool["launches"], pool["leases"],
+            pool["lease_waits"], pool["recycled_contexts"], pool["recycled_rss"],
+        )
 
-        total_ads = sum(len(r.get("ads", [])) for r in results)
-        errors = sum(1 for r in results if r.get("error"))
-        async with async_session() as session:
-            saved = await save_crawl_results(session, results)
+        total_ads = totals["ads"]
+        errors = totals["errors"]
+        saved = totals["saved"]
 
         rebuild_stats: dict | None = None
         if saved > 0 and self.enable_campaign_rebuild:
             try:
-                rebuild_stats = await rebuild_campaigns_and_spend(active_days=7)
+                rebuild_stats = await rebuild_campaigns_and_spend(
+                    active_days=7,
+                    incremental=self.enable_incremental_rebuild,
+                )
                 logger.info(
                     "[schedule] campaign/spend rebuild complete - campaigns {} / spend_estimates {}",
                     rebuild_stats["campaigns_total"],
@@ -644,6 +617,17 @@ class AdScopeScheduler:
         elif saved > 0:
             logger.info("[schedule] campaign rebuild disabled by ENABLE_CAMPAIGN_REBUILD=false")
 
+        # 경쟁사 top-N: 캠페인/광고비 재구축 직후 갱신 (최소 간격 내 재실행은 생략)
+        if rebuild_stats is not None and self.enable_competitor_precompute:
+            await self._refresh_competitor_affinities()
+
+        # 일별 노출 롤업: 이번 적재분이 속한 (날짜, 채널)만 재집계 (광고주 백필 이후)
+        if saved > 0 and self.enable_daily_rollups:
+            try:
+                await refresh_daily_rollups()
+            except Exception:
+                logger.exception("[schedule] daily rollup refresh failed")
+
         # ── AI Panel: record panel observations from crawl results ──
         if saved > 0:
             try:
@@ -692,7 +676,7 @@ class AdScopeScheduler:
 
         logger.info(
             f"[schedule] crawl finished: {persona_code} / {device_type} / {label} - "
-            f"keywords {len(results)}, ads {total_ads}, errors {errors}, saved {saved}"
+            f"keywords {totals['keywords']}, ads {total_ads}, errors {errors}, saved {saved}"
         )
 
         return {
@@ -707,6 +691,126 @@ class AdScopeScheduler:
             "campaign_rebuild": rebuild_stats,
         }
 
+    async def _run_channel(
+        self,
+        channel: str,
+        job_keywords: list[str],
+        persona_code: str,
+        device_type: str,
+        on_result: Callable[[dict], Awaitable[None]],
+    ) -> None:
+        """Crawl one channel with circuit breaker, min interval and retries, streaming results to on_result."""
+        # 서킷브레이커: 연속 N회 실패한 채널은 스킵
+        fail_count = self._channel_fail_count.get(channel, 0)
+        if fail_count >= self._circuit_breaker_threshold:
+            logger.warning(
+                "[schedule] circuit breaker OPEN for {} ({} consecutive failures, threshold {}). "
+                "Skipping. Reset with CIRCUIT_BREAKER_THRESHOLD env or restart.",
+                channel, fail_count, self._circuit_breaker_threshold,
+            )
+            return
+
+        crawler_cls = SUPPORTED_CRAWLER_MAP[channel]
+        logger.info("[schedule] channel start: {}", channel)
+        is_keyword_dependent = getattr(crawler_cls, "keyword_dependent", True)
+        channel_keywords = _limit_keywords_for_channel(
+            job_keywords=job_keywords,
+            channel=channel,
+            crawler_cls=crawler_cls,
+            channel_keyword_limits=self.channel_keyword_limits,
+        )
+        channel_min_interval = _resolve_min_interval_for_channel(
+            channel=channel,
+            is_keyword_dependent=is_keyword_dependent,
+            default_non_keyword_interval=self.non_keyword_channel_min_interval_minutes,
+            channel_min_intervals=self.channel_min_intervals,
+        )
+        if channel_min_interval > 0:
+            now_utc = datetime.now(UTC)
+            last_run_at = self._channel_last_run_at.get(channel)
+            if should_skip_keyword_independent_channel(
+                last_run_at=last_run_at,
+                now_utc=now_utc,
+                min_interval_minutes=channel_min_interval,
+            ):
+                logger.info(
+                    "[schedule] skip channel {} (min interval {}m)",
+                    channel,
+                    channel_min_interval,
+                )
+                return
+
+        streamed: set[str] = set()
+
+        async def _stream(result: dict):
+            streamed.add(result.get("keyword"))
+            await on_result(result)
+
+        # 재시도 로직 (최대 _retry_max 회)
+        last_exc = None
+        attempts = 0
+        for attempt in range(1 + self._retry_max):
+            attempts = attempt + 1
+            try:
+                async with crawler_cls() as crawler:
+                    await crawler.crawl_keywords(
+                        keywords=channel_keywords,
+                        persona_code=persona_code,
+                        device_type=device_type,
+                        on_result=_stream,
+                    )
+                if channel_min_interval > 0:
+                    self._channel_last_run_at[channel] = datetime.now(UTC)
+                # 성공 → 서킷브레이커 카운트 리셋
+                self._channel_fail_count[channel] = 0
+                last_exc = None
+                break
+            except Exception as exc:
+                last_exc = exc
+                # 이미 적재 큐로 보낸 결과가 있으면 재시도하지 않음 (중복 스냅샷 방지)
+                if streamed:
+                    logger.warning(
+                        "[schedule] channel {} failed after streaming {} keywords, not retrying: {}",
+                        channel, len(streamed), str(exc)[:100],
+                    )
+                    break
+                if attempt < self._retry_max:
+                    wait_sec = 10 * (attempt + 1)
+                    logger.warning(
+                        "[schedule] channel {} attempt {}/{} failed: {}. Retrying in {}s...",
+                        channel, attempt + 1, 1 + self._retry_max,
+                        str(exc)[:100], wait_sec,
+                    )
+                    await asyncio.sleep(wait_sec)
+
+        if last_exc is not None:
+            # 모든 재시도 실패 → 서킷브레이커 카운트 증가
+            self._channel_fail_count[channel] = fail_count + 1
+            logger.exception("[schedule] channel failed after {} attempts: {}", attempts, channel)
+            now = datetime.now(UTC)
+            for kw in channel_keywords:
+                if kw in streamed:
+                    continue
+                await on_result({
+                    "keyword": kw,
+                    "persona_code": persona_code,
+                    "device": device_type,
+                    "channel": channel,
+                    "captured_at": now,
+                    "error": str(last_exc),
+                    "ads": [],
+                })
+            if channel_min_interval > 0:
+                self._channel_last_run_at[channel] = datetime.now(UTC)
+
+    async def _save_results_batch(self, results: list[dict]) -> int:
+        """Persist one micro-batch of keyword results in its own transaction."""
+        async with async_session() as session:
+            if self.enable_bulk_ingest:
+                ingest_stats = await save_crawl_results_bulk(session, results)
+                return ingest_stats["saved_snapshots"]
+            return await save_crawl_results(session, results)
+
     async def _run_brand_monitor(self):
         """Daily brand channel content monitoring."""
         try:
@@ -934,6 +1038,24 @@ class AdScopeScheduler:
         except Exception:
             logger.exception("[schedule] Traffic signal failed")
 
+    async def _refresh_competitor_affinities(self):
+        """Competitor affinity refresh after a campaign rebuild, throttled by
+        COMPETITOR_PRECOMPUTE_MIN_INTERVAL_MINUTES (default 60)."""
+        last = self._competitor_refreshed_at
+        if last is not None and time.monotonic() - last < self.competitor_refresh_min_interval_minutes * 60:
+            return
+        await self._run_competitor_precompute()
+
+    async def _run_competitor_precompute(self):
+        """Daily competitor affinity top-N precompute."""
+        self._competitor_refreshed_at = time.monotonic()
+        try:
+            from processor.competitor_mapper import precompute_competitor_affinities
+            stats = await precompute_competitor_affinities(days=30)
+            logger.info("[schedule] Competitor affinity precompute done: %s", stats)
+        except Exception:
+            logger.exception("[schedule] Competitor affinity precompute failed")
+
     async def _run_activity_score(self):
         """Daily activity score calculation."""
         try:
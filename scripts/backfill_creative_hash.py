@@ -1,7 +1,18 @@
-"""Backfill creative_hash for existing AdDetail rows that have NULL creative_hash."""
+"""Backfill creative_hash for existing AdDetail rows that have NULL creative_hash.
+
+--phash: instead fill creative_phash (perceptual hash) for rows that have a
+creative image, hashing images in parallel across a process pool.
+
+Usage:
+    python scripts/backfill_creative_hash.py
+    python scripts/backfill_creative_hash.py --phash --workers 8
+"""
+import argparse
 import asyncio
 import io
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 _root = str(Path(__file__).resolve().parent.parent)
@@ -10,15 +21,14 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="repla
 
 from database import async_session, init_db
 from database.models import AdDetail
-from processor.creative_hasher import compute_creative_hash, compute_text_hash
-from sqlalchemy import select, func
+from processor.creative_hasher import compute_creative_hash, compute_perceptual_hash, compute_text_hash
+from sqlalchemy import bindparam, select, func, update
 
 BATCH_SIZE = 500
+PHASH_BATCH_SIZE = 2000
 
 
-async def main():
-    await init_db()
-
+async def backfill_sha():
     async with async_session() as session:
         # Count total rows with NULL creative_hash
         count_result = await session.execute(
@@ -75,5 +85,74 @@ async def main():
     print(f"Done. Total processed: {processed}, total hashed: {hashed}, skipped: {processed - hashed}")
 
 
+async def backfill_phash(workers: int):
+    base = (
+        (AdDetail.creative_phash == None)
+        & (AdDetail.creative_image_path != None)
+        & (AdDetail.creative_image_path != "")
+    )
+    async with async_session() as session:
+        total = (await session.execute(select(func.count(AdDetail.id)).where(base))).scalar_one()
+    print(f"Total rows with image and NULL creative_phash: {total} (workers={workers})")
+
+    tbl = AdDetail.__table__
+    stmt = (
+        update(tbl)
+        .where(tbl.c.id == bindparam("b_id"))
+        .values(creative_phash=bindparam("b_phash"))
+    )
+
+    loop = asyncio.get_running_loop()
+    processed = 0
+    hashed = 0
+    last_id = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            async with async_session() as session:
+                rows = (await session.execute(
+                    select(AdDetail.id, AdDetail.creative_image_path)
+                    .where(base, AdDetail.id > last_id)
+                    .order_by(AdDetail.id)
+                    .limit(PHASH_BATCH_SIZE)
+                )).all()
+            if not rows:
+                break
+
+            paths = [path for _, path in rows]
+            phashes = await loop.run_in_executor(
+                None,
+                lambda: list(pool.map(compute_perceptual_hash, paths, chunksize=64)),
+            )
+            params = [
+                {"b_id": ad_id, "b_phash": ph}
+                for (ad_id, _), ph in zip(rows, phashes)
+                if ph
+            ]
+            if params:
+                async with async_session() as session:
+                    await session.execute(stmt, params)
+                    await session.commit()
+
+            last_id = rows[-1][0]
+            processed += len(rows)
+            hashed += len(params)
+            print(f"Progress: {processed}/{total} processed, {hashed} phashed")
+
+    print(f"Done. Total processed: {processed}, phashed: {hashed}, unreadable: {processed - hashed}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill creative_hash / creative_phash")
+    parser.add_argument("--phash", action="store_true", help="perceptual hash 백필")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    await init_db()
+    if args.phash:
+        await backfill_phash(max(1, args.workers))
+    else:
+        await backfill_sha()
+
+
 if __name__ == "__main__":
     asyncio.run(main())
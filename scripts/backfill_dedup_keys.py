@@ -0,0 +1,98 @@
+"""Backfill ad_details.text_key for rows written before the dedup key columns.
+
+init_db (_ensure_dedup_key_columns) adds the columns and backfills channel from
+ad_snapshots; this script fills text_key with the pipeline's own inputs --
+dedup_key_fields(stored channel, advertiser name as resolved by
+pipeline.resolve_advertiser_name, ad_text, url) -- so backfilled rows match
+the keys save_crawl_result computes for new crawls.
+
+Idempotent: by default only rows with NULL text_key are touched.
+--all recomputes every row (e.g. keys written by an older version of this script).
+
+Usage:
+    python scripts/backfill_dedup_keys.py
+    python scripts/backfill_dedup_keys.py --all
+"""
+import argparse
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+_root = str(Path(__file__).resolve().parent.parent)
+sys.path.insert(0, _root)
+
+from database import async_session, init_db
+from database.models import AdDetail
+from processor.dedup import dedup_key_fields
+from processor.pipeline import resolve_advertiser_name
+from sqlalchemy import bindparam, func, select, true, update
+
+BATCH_SIZE = 5000
+
+
+def _text_key(channel: str | None, raw_name: str | None, ad_text: str | None, url: str | None) -> str | None:
+    _, name = resolve_advertiser_name(raw_name)
+    return dedup_key_fields(channel, name, ad_text, url)["text_key"]
+
+
+async def backfill(session_factory=async_session, recompute_all: bool = False) -> dict[str, int]:
+    """text_key 채우기 — 처리/갱신 건수 반환."""
+    pending = true() if recompute_all else AdDetail.text_key.is_(None)
+    async with session_factory() as session:
+        total = (await session.execute(select(func.count(AdDetail.id)).where(pending))).scalar_one()
+    print(f"Rows to key: {total}")
+
+    tbl = AdDetail.__table__
+    stmt = (
+        update(tbl)
+        .where(tbl.c.id == bindparam("b_id"))
+        .values(text_key=bindparam("b_key"))
+    )
+
+    processed = 0
+    keyed = 0
+    last_id = 0
+    while True:
+        async with session_factory() as session:
+            rows = (await session.execute(
+                select(AdDetail.id, AdDetail.channel, AdDetail.advertiser_name_raw, AdDetail.ad_text,
+                       AdDetail.url, AdDetail.text_key)
+                .where(AdDetail.id > last_id, pending)
+                .order_by(AdDetail.id)
+                .limit(BATCH_SIZE)
+            )).all()
+            if not rows:
+                break
+
+            params = []
+            for ad_id, channel, name, ad_text, url, current in rows:
+                key = _text_key(channel, name, ad_text, url)
+                if key != current:
+                    params.append({"b_id": ad_id, "b_key": key})
+            if params:
+                await session.execute(stmt, params)
+            await session.commit()
+
+        last_id = rows[-1][0]
+        processed += len(rows)
+        keyed += len(params)
+        print(f"Progress: {processed}/{total} processed, {keyed} updated")
+
+    return {"processed": processed, "updated": keyed}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill ad_details.text_key")
+    parser.add_argument("--all", action="store_true", help="recompute text_key for every row")
+    args = parser.parse_args()
+
+    # init_db adds the columns/indexes and backfills channel from ad_snapshots
+    await init_db()
+    result = await backfill(recompute_all=args.all)
+    print(f"Done. Total processed: {result['processed']}, updated: {result['updated']}")
+
+
+if __name__ == "__main__":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    asyncio.run(main())
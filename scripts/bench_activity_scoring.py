@@ -0,0 +1,133 @@
+"""Benchmark: daily advertiser scoring jobs -- per-advertiser queries vs bulk GROUP BY.
+
+Builds a throwaway SQLite DB with N advertisers, each with campaigns, ads,
+brand content, channel stats, news, traffic, SmartStore and panel rows, then
+runs calculate_activity_scores / aggregate_meta_signals /
+calculate_social_impact_scores with bulk=False (one set of queries per
+advertiser, the previous behaviour) and bulk=True, and prints each job's runtime.
+
+Usage:
+    python scripts/bench_activity_scoring.py --advertisers 3000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_db_path = Path(tempfile.mkdtemp()) / "bench_activity_scoring.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path.as_posix()}"
+
+from sqlalchemy import insert, text
+
+from database import async_session, init_db
+from database.models import (
+    AdDetail, AdSnapshot, Advertiser, BrandChannelContent, Campaign, ChannelStats, Industry, Keyword,
+    NewsMention, PanelObservation, Persona, SmartStoreSnapshot, TrafficSignal,
+)
+from processor.activity_scorer import calculate_activity_scores
+from processor.meta_signal_aggregator import aggregate_meta_signals
+from processor.social_impact_scorer import calculate_social_impact_scores
+
+CHANNELS = ["naver_search", "naver_da", "kakao_da", "mobile_gdn", "instagram", "youtube_ads"]
+NOW = datetime.utcnow().replace(microsecond=0)
+TODAY = datetime(NOW.year, NOW.month, NOW.day)
+
+
+async def _populate(rng: random.Random, advertisers: int) -> None:
+    ago = lambda days: NOW - timedelta(days=days, minutes=rng.randint(0, 1439))  # noqa: E731
+    ids = range(1, advertisers + 1)
+    async with async_session() as session:
+        await session.execute(text(
+            "CREATE TABLE IF NOT EXISTS serpapi_ads (advertiser_name TEXT, extra_data TEXT, collected_at TEXT)"
+        ))
+        await session.execute(text("INSERT INTO serpapi_ads VALUES (:name, :extra, :at)"), [
+            {"name": "stealth_bench", "extra": json.dumps({"network": net, "persona": f"p{i % 5}"}),
+             "at": ago(rng.randint(0, 20)).isoformat()}
+            for i, net in enumerate(rng.choice(["gdn", "naver", "kakao", "meta"]) for _ in range(2000))
+        ])
+        await session.execute(insert(Industry), [{"id": 1, "name": "벤치업종"}])
+        await session.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "벤치키워드"}])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "B1", "age_group": "30대", "gender": "female", "login_type": "none"},
+        ])
+        await session.execute(insert(Advertiser), [{"id": a, "name": f"벤치광고주{a}", "aliases": []} for a in ids])
+        await session.execute(insert(Campaign), [
+            {"advertiser_id": a, "channel": rng.choice(CHANNELS), "first_seen": ago(rng.randint(5, 60)),
+             "last_seen": ago(rng.randint(0, 6)), "is_active": rng.random() < 0.8}
+            for a in ids for _ in range(rng.randint(1, 4))
+        ])
+        await session.execute(insert(AdSnapshot), [
+            {"keyword_id": 1, "persona_id": 1, "channel": rng.choice(CHANNELS), "device": "pc",
+             "captured_at": ago(rng.randint(0, 9))}
+            for _ in range(advertisers * 3)
+        ])
+        await session.execute(insert(AdDetail), [
+            {"snapshot_id": rng.randint(1, advertisers * 3), "advertiser_id": a, "ad_text": f"문구{rng.randint(0, 20)}"}
+            for a in ids for _ in range(rng.randint(5, 40))
+        ])
+        await session.execute(insert(BrandChannelContent), [
+            {"advertiser_id": a, "platform": "youtube", "channel_url": "u", "content_id": f"{a}-{i}",
+             "upload_date": ago(rng.randint(0, 14))}
+            for a in ids for i in range(rng.randint(0, 8))
+        ])
+        await session.execute(insert(ChannelStats), [
+            {"advertiser_id": a, "platform": "youtube", "channel_url": "u",
+             "engagement_rate": rng.uniform(0, 5), "collected_at": ago(rng.randint(0, 14))}
+            for a in ids for _ in range(rng.randint(0, 4))
+        ])
+        await session.execute(insert(NewsMention), [
+            {"advertiser_id": a, "source": "naver_news", "article_url": f"n/{a}/{i}",
+             "sentiment_score": rng.uniform(-1, 1), "collected_at": ago(rng.randint(0, 7))}
+            for a in ids for i in range(rng.randint(0, 5))
+        ])
+        await session.execute(insert(TrafficSignal), [
+            {"advertiser_id": a, "date": TODAY - timedelta(days=d),
+             "composite_index": rng.uniform(0, 100), "wow_change_pct": rng.uniform(-50, 50)}
+            for a in ids for d in range(0, 28, 3)
+        ])
+        await session.execute(insert(SmartStoreSnapshot), [
+            {"advertiser_id": a, "captured_at": ago(rng.randint(0, 2)), "review_delta": rng.randint(0, 30)}
+            for a in ids if rng.random() < 0.5
+        ])
+        await session.execute(insert(PanelObservation), [
+            {"advertiser_id": a, "panel_type": rng.choice(["ai", "human"]), "panel_id": "bench",
+             "observed_at": ago(rng.randint(0, 7))}
+            for a in ids for _ in range(rng.randint(0, 6))
+        ])
+        await session.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--advertisers", type=int, default=3_000)
+    args = parser.parse_args()
+
+    await init_db()
+    t0 = time.perf_counter()
+    await _populate(random.Random(5), args.advertisers)
+    print(f"populated {args.advertisers} advertisers in {time.perf_counter() - t0:.1f}s ({_db_path})")
+
+    # 메타시그널은 당일 activity_scores를 읽으므로 정의된 순서대로 실행
+    for name, job in (
+        ("calculate_activity_scores", calculate_activity_scores),
+        ("aggregate_meta_signals", aggregate_meta_signals),
+        ("calculate_social_impact_scores", calculate_social_impact_scores),
+    ):
+        for bulk in (False, True):
+            t0 = time.perf_counter()
+            stats = await job(bulk=bulk)
+            label = "bulk" if bulk else "per-advertiser"
+            print(f"{name:31s} {label:14s}: {time.perf_counter() - t0:7.2f}s ({stats['processed']} advertisers)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""Benchmark: AdvertiserMatcher fuzzy matching -- full scan vs candidate index vs match_many.
+
+Synthesizes N advertisers (Korean-like names + aliases) and M raw names
+(perturbed copies and unrelated names). The full-scan baseline (the old
+extractOne over every name/alias) is timed on a sample and extrapolated;
+results on that sample are checked for equality with the indexed path.
+
+Usage:
+    python scripts/bench_advertiser_matcher.py --advertisers 100000 --names 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rapidfuzz import fuzz, process
+
+from processor.advertiser_matcher import AdvertiserMatcher
+
+# 상호에 실제로 쓰이는 규모(~1,500자)의 한글 음절 집합
+SYLLABLES = random.Random(0).sample([chr(c) for c in range(0xAC00, 0xD7A4)], 1500)
+SUFFIXES = ["", "", "", "(주)", "㈜", " 코리아", " 본사"]
+
+
+def _name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 8))) + rng.choice(SUFFIXES)
+
+
+def _perturb(rng: random.Random, name: str) -> str:
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        pos = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            chars[pos] = rng.choice(SYLLABLES)
+        else:
+            chars.insert(pos, rng.choice(SYLLABLES))
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--advertisers", type=int, default=100_000)
+    parser.add_argument("--names", type=int, default=50_000)
+    parser.add_argument("--baseline-sample", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=-1)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = [_name(rng) for _ in range(args.advertisers)]
+    matcher = AdvertiserMatcher()
+    matcher.load_advertisers([
+        {"id": i, "name": n, "aliases": [_perturb(rng, n)] if i % 4 == 0 else []}
+        for i, n in enumerate(names)
+    ])
+    raw_names = [
+        _perturb(rng, rng.choice(names)) if rng.random() < 0.7 else _name(rng)
+        for _ in range(args.names)
+    ]
+
+    t0 = time.perf_counter()
+    matcher._get_fuzzy_index()
+    print(f"index build over {len(matcher._name_to_id)} names/aliases: {time.perf_counter() - t0:.1f}s")
+
+    sample = raw_names[: args.baseline_sample]
+    keys = matcher._name_to_id.keys()
+    t0 = time.perf_counter()
+    baseline = []
+    for q in sample:
+        exact = matcher._match_exact(q)
+        if exact is not None:
+            baseline.append(exact)
+            continue
+        r = process.extractOne(q, keys, scorer=fuzz.token_sort_ratio)
+        baseline.append(
+            (matcher._name_to_id[r[0]], r[1]) if r and r[1] >= matcher.MATCH_THRESHOLD else (None, 0.0)
+        )
+    per_name = (time.perf_counter() - t0) / len(sample)
+    print(f"full scan   : {per_name * 1e3:.2f} ms/name -> ~{per_name * args.names:.0f}s for {args.names}")
+
+    t0 = time.perf_counter()
+    indexed = [matcher.match(q) for q in raw_names]
+    elapsed = time.perf_counter() - t0
+    print(f"match()     : {elapsed / args.names * 1e3:.3f} ms/name -> {elapsed:.1f}s")
+
+    t0 = time.perf_counter()
+    batched = matcher.match_many(raw_names, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"match_many(): {elapsed / args.names * 1e3:.3f} ms/name -> {elapsed:.1f}s")
+
+    matched = sum(1 for adv_id, _ in indexed if adv_id is not None)
+    print(f"matched {matched}/{args.names}; "
+          f"sample identical to full scan: {indexed[: len(sample)] == baseline}; "
+          f"match_many identical to match: {batched == indexed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: per-request overhead of the auth dependency chain.
+
+Resolves get_current_user -> require_paid directly (no HTTP stack) against a
+throwaway SQLite DB with one viewer (active session) and one admin, with the
+principal cache disabled (every request: JWT decode + users SELECT +
+user_sessions SELECT) and enabled (warm: JWT decode + merge of the cached
+snapshot). Each request opens its own session, like get_db does.
+
+Usage:
+    python scripts/bench_auth_deps.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api import deps
+from api.auth_cache import PrincipalCache
+from database.models import Base, User, UserSession
+
+
+async def _seed(factory) -> dict[str, str]:
+    now = datetime.now(timezone.utc)
+    async with factory() as session:
+        viewer = User(email="viewer@bench.kr", hashed_password="x", role="viewer", is_active=True,
+                      plan="full", payment_confirmed=True, plan_expires_at=now + timedelta(days=30))
+        admin = User(email="admin@bench.kr", hashed_password="x", role="admin", is_active=True)
+        session.add_all([viewer, admin])
+        await session.flush()
+        session.add(UserSession(user_id=viewer.id, session_token="bench-sid", device_fingerprint="fp",
+                                is_active=True, expires_at=now + timedelta(hours=1)))
+        await session.commit()
+        return {
+            "viewer": deps.create_access_token(viewer.id, viewer.email, "viewer", "full", "bench-sid", paid=True),
+            "admin": deps.create_access_token(admin.id, admin.email, "admin", "admin"),
+        }
+
+
+async def _run(factory, token: str, requests: int) -> list[float]:
+    request = SimpleNamespace(headers={"X-Device-Fingerprint": "fp"}, query_params={})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    timings = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        async with factory() as db:
+            user = await deps.get_current_user(request, credentials, db)
+            await deps.require_paid(user)
+        timings.append((time.perf_counter() - t0) * 1e6)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "bench_auth.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path.as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    tokens = await _seed(factory)
+
+    statements = [0]
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+    print(f"{'principal':<10}{'cache':<8}{'p50 (us)':>10}{'p99 (us)':>10}{'req/s':>10}{'SQL/req':>9}")
+    for principal, token in tokens.items():
+        for label, ttl in (("off", 0), ("warm", 300)):
+            deps.principal_cache = PrincipalCache(ttl_seconds=ttl)
+            await _run(factory, token, 50)  # warm-up (cache fill, connection pool)
+            statements[0] = 0
+            timings = await _run(factory, token, args.requests)
+            p50 = statistics.median(timings)
+            p99 = statistics.quantiles(timings, n=100)[98]
+            rps = len(timings) / (sum(timings) / 1e6)
+            print(f"{principal:<10}{label:<8}{p50:>10.1f}{p99:>10.1f}{rps:>10.0f}{statements[0] / args.requests:>9.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+"""Benchmark: campaign aggregation -- legacy per-row/per-day loop vs columnar _aggregate_rows.
+
+Synthesizes N ad rows in the shape returned by _collect_aggregates' query
+(no DB involved) and times the original interpreted loop (kept here as the
+reference implementation) against the vectorized path. Outputs are compared
+per (advertiser, channel) and per day for equality.
+
+Usage:
+    python scripts/bench_campaign_aggregates.py --rows 2000000
+"""
+
+import argparse
+import gc
+import hashlib
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.campaign_builder import _aggregate_rows
+
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "naver_da", "meta", "youtube_ads"]
+ZONES = ["top", "middle", "bottom", "unknown", None, ""]
+
+
+def synthesize(count: int, advertisers: int, seed: int = 3) -> list[tuple]:
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    upload_dates = [(now - timedelta(days=d)).strftime("%Y%m%d") for d in range(90)]
+    rows = []
+    for _ in range(count):
+        channel = rng.choice(CHANNELS)
+        captured = now - timedelta(days=rng.randint(0, 120), minutes=rng.randint(0, 1440))
+        first = None if rng.random() < 0.1 else captured - timedelta(days=rng.randint(0, 3))
+        last = None if first is None else first + timedelta(days=rng.randint(0, 14), hours=rng.randint(0, 23))
+        view_count = upload_date = None
+        if channel == "youtube_ads" and rng.random() < 0.8:
+            view_count = rng.choice([rng.randint(1, 99_999), rng.randint(100_000, 5_000_000)])
+            upload_date = rng.choice(upload_dates + ["", "bad"])
+        rows.append((
+            rng.randint(1, advertisers),
+            rng.choice([None, *range(1, 40)]),
+            channel,
+            rng.randint(1, count // 20 + 1),
+            captured,
+            rng.choice([None, 0, *range(1, 11)]),
+            rng.choice(ZONES),
+            rng.random() < 0.05,
+            rng.choice([None, "", "main_top", "sidebar", "feed"]),
+            rng.random() < 0.9,
+            view_count,
+            upload_date,
+            rng.choice([None, 0, *range(1, 30)]),
+            first,
+            last,
+        ))
+    return rows
+
+
+def legacy_aggregate(rows) -> tuple[dict, dict]:
+    """벡터화 이전 _collect_aggregates 루프 (행 x 관측일수 인터프리터 연산)."""
+    aggregates: dict = {}
+    keyword_counts: dict = {}
+    for row in rows:
+        advertiser_id, keyword_id, channel, snapshot_id, captured_at, position, \
+            position_zone, is_inhouse, ad_placement, is_contact, view_count, upload_date, \
+            seen_count, first_seen_at, last_seen_at = row
+        extra_data = {"view_count": view_count, "upload_date": upload_date} if view_count is not None else None
+        key = (int(advertiser_id), str(channel))
+        agg = aggregates.get(key)
+        if agg is None:
+            agg = {
+                "first_seen": None, "last_seen": None, "snapshot_ids": set(), "ad_occurrences": 0,
+                "by_day": {}, "placements": set(), "has_inhouse": False, "has_contact": False,
+                "max_view_count": 0, "total_view_count": 0, "view_count_sources": 0,
+            }
+            aggregates[key] = agg
+            keyword_counts[key] = {}
+        if keyword_id is not None:
+            kw_id = int(keyword_id)
+            keyword_counts[key][kw_id] = keyword_counts[key].get(kw_id, 0) + 1
+
+        effective_count = max(1, seen_count or 1)
+        agg["ad_occurrences"] += effective_count
+        agg["snapshot_ids"].add(int(snapshot_id))
+        effective_first = first_seen_at or captured_at
+        effective_last = last_seen_at or captured_at
+        agg["first_seen"] = effective_first if agg["first_seen"] is None else min(agg["first_seen"], effective_first)
+        agg["last_seen"] = effective_last if agg["last_seen"] is None else max(agg["last_seen"], effective_last)
+        if ad_placement:
+            agg["placements"].add(str(ad_placement))
+        if is_inhouse:
+            agg["has_inhouse"] = True
+        if is_contact:
+            agg["has_contact"] = True
+        if isinstance(extra_data, dict):
+            vc = extra_data.get("view_count")
+            if isinstance(vc, (int, float)) and vc > 0:
+                vc_int = int(vc)
+                if vc_int > agg["max_view_count"]:
+                    agg["max_view_count"] = vc_int
+                if vc_int >= 100_000:
+                    upload_date_str = extra_data.get("upload_date", "")
+                    is_recent = False
+                    if upload_date_str:
+                        try:
+                            ud = datetime.strptime(str(upload_date_str)[:8], "%Y%m%d")
+                            is_recent = (datetime.utcnow() - ud).days <= 30
+                        except (ValueError, TypeError):
+                            is_recent = False
+                    if is_recent:
+                        agg["total_view_count"] += vc_int
+                        agg["view_count_sources"] += 1
+
+        start_date = (first_seen_at or captured_at).date()
+        end_date = (last_seen_at or captured_at).date()
+        active_days_range = max(1, (end_date - start_date).days + 1)
+        hits_per_day = max(1, effective_count // active_days_range)
+        current_day = start_date
+        while current_day <= end_date:
+            day = agg["by_day"].setdefault(current_day, [0, [], [], 0])
+            day[0] += hits_per_day
+            if position is not None and position > 0:
+                day[1].append(int(position))
+            if position_zone:
+                day[2].append(str(position_zone))
+            if is_inhouse:
+                day[3] += 1
+            current_day += timedelta(days=1)
+    return aggregates, keyword_counts
+
+
+# 2M행에서는 두 결과를 동시에 메모리에 둘 수 없어 키별 다이제스트로 비교
+def _digest(value) -> str:
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).hexdigest()
+
+
+def _legacy_digests(aggregates: dict, keyword_counts: dict) -> dict:
+    dominant = {key: max(freqs, key=freqs.get) if freqs else None for key, freqs in keyword_counts.items()}
+    return {
+        key: _digest((
+            dominant[key], agg["first_seen"], agg["last_seen"], sorted(agg["snapshot_ids"]), agg["ad_occurrences"],
+            sorted(
+                (d, v[0], v[3], len(v[1]), sum(v[1]), sorted(Counter(v[2]).items()))
+                for d, v in agg["by_day"].items()
+            ),
+            sorted(agg["placements"]), agg["has_inhouse"], agg["has_contact"],
+            agg["max_view_count"], agg["total_view_count"], agg["view_count_sources"],
+        ))
+        for key, agg in aggregates.items()
+    }
+
+
+def _digests(aggregates: dict) -> dict:
+    return {
+        key: _digest((
+            agg.dominant_keyword_id, agg.first_seen, agg.last_seen, agg.snapshot_ids.tolist(), agg.ad_occurrences,
+            sorted(
+                (d, v.ad_hits, v.inhouse_count, v.position_count, v.position_sum, sorted(v.zone_counts.items()))
+                for d, v in agg.by_day.items()
+            ),
+            sorted(agg.placements), agg.has_inhouse, agg.has_contact,
+            agg.max_view_count, agg.total_view_count, agg.view_count_sources,
+        ))
+        for key, agg in aggregates.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--advertisers", type=int, default=20_000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rows = synthesize(args.rows, args.advertisers)
+    print(f"synthesized {len(rows)} rows in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    columnar = _aggregate_rows(rows)
+    print(f"columnar    : {time.perf_counter() - t0:.2f}s ({len(columnar)} campaigns)")
+    columnar = _digests(columnar)
+    gc.collect()
+
+    t0 = time.perf_counter()
+    legacy, legacy_keywords = legacy_aggregate(rows)
+    print(f"legacy loop : {time.perf_counter() - t0:.2f}s ({len(legacy)} campaigns)")
+    del rows
+    legacy = _legacy_digests(legacy, legacy_keywords)
+    print(f"identical aggregates (incl. dominant keyword): {legacy == columnar}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark: full vs incremental rebuild_campaigns_and_spend on a synthetic history.
+
+Builds a throwaway SQLite DB with N historical ad_details rows, runs a full
+rebuild (sets the watermark), then simulates one post-crawl delta (new rows +
+seen_count bumps for a few advertisers) and times the incremental rebuild.
+A final full rebuild is compared against the incremental result per campaign
+(spend totals, snapshot counts, spend_estimates rows) to check equivalence.
+
+Usage:
+    python scripts/bench_campaign_rebuild.py --rows 200000 --advertisers 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_db_path = Path(tempfile.mkdtemp()) / "bench_campaign_rebuild.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path.as_posix()}"
+os.environ["CAMPAIGN_EXCLUDED_CHANNELS"] = ""
+
+from sqlalchemy import func, insert, select, update
+
+from database import async_session, init_db
+from database.models import (
+    AdDetail,
+    AdSnapshot,
+    Advertiser,
+    Campaign,
+    Industry,
+    Keyword,
+    Persona,
+    SpendEstimate,
+)
+from processor.campaign_builder import rebuild_campaigns_and_spend
+
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "naver_da", "meta"]
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+def _detail_rows(rng: random.Random, snapshot_ids: list[int], advertisers: int, count: int, days_back: int):
+    rows = []
+    for _ in range(count):
+        adv = rng.randrange(1, advertisers + 1)
+        if days_back:
+            # 과거 이력은 하루 전까지만 관측된 것으로 (워터마크 overlap 밖)
+            first = NOW - timedelta(days=rng.randint(1, days_back), hours=rng.randint(0, 23))
+            last = min(NOW - timedelta(days=1), first + timedelta(days=rng.randint(0, 10)))
+        else:
+            first = last = NOW
+        rows.append({
+            "snapshot_id": rng.choice(snapshot_ids),
+            "advertiser_id": adv,
+            "advertiser_name_raw": f"벤치광고주{adv}",
+            "ad_text": f"벤치 문구 {rng.randrange(10**6)}",
+            "url": f"https://bench{adv}.co.kr/",
+            "position": rng.randint(1, 10),
+            "position_zone": rng.choice(["top", "middle", "bottom"]),
+            "is_inhouse": False,
+            "is_contact": True,
+            "first_seen_at": first,
+            "last_seen_at": last,
+            "seen_count": rng.randint(1, 20),
+        })
+    return rows
+
+
+async def _populate(rng: random.Random, rows: int, advertisers: int) -> None:
+    async with async_session() as session:
+        await session.execute(insert(Industry), [{"id": i, "name": f"벤치업종{i}"} for i in range(1, 6)])
+        await session.execute(insert(Persona), [{"id": 1, "code": "B0", "login_type": "none"}])
+        await session.execute(
+            insert(Keyword),
+            [{"id": i, "industry_id": i % 5 + 1, "keyword": f"벤치키워드{i}"} for i in range(1, 51)],
+        )
+        await session.execute(
+            insert(Advertiser),
+            [{"id": i, "name": f"벤치광고주{i}", "aliases": []} for i in range(1, advertisers + 1)],
+        )
+        snapshots = [
+            {
+                "keyword_id": rng.randint(1, 50),
+                "persona_id": 1,
+                "channel": rng.choice(CHANNELS),
+                "device": "pc",
+                "captured_at": NOW - timedelta(days=rng.randint(0, 90)),
+            }
+            for _ in range(max(1, rows // 20))
+        ]
+        await session.execute(insert(AdSnapshot), snapshots)
+        snapshot_ids = list((await session.execute(select(AdSnapshot.id))).scalars().all())
+        for start in range(0, rows, 20000):
+            await session.execute(
+                insert(AdDetail),
+                _detail_rows(rng, snapshot_ids, advertisers, min(20000, rows - start), 90),
+            )
+        await session.commit()
+
+
+async def _simulate_crawl(rng: random.Random, advertisers: int, new_rows: int, bumps: int) -> None:
+    """크롤 1회분: 소수 광고주의 신규 소재 + 기존 소재 seen bump."""
+    active = rng.sample(range(1, advertisers + 1), max(1, advertisers // 100))
+    async with async_session() as session:
+        snapshot_ids = list((await session.execute(select(AdSnapshot.id).limit(200))).scalars().all())
+        rows = _detail_rows(rng, snapshot_ids, advertisers, new_rows, 0)
+        for row in rows:
+            row["advertiser_id"] = rng.choice(active)
+        await session.execute(insert(AdDetail), rows)
+        bump_ids = (
+            await session.execute(
+                select(AdDetail.id).where(AdDetail.advertiser_id.in_(active)).limit(bumps)
+            )
+        ).scalars().all()
+        await session.execute(
+            update(AdDetail)
+            .where(AdDetail.id.in_(list(bump_ids)))
+            .values(seen_count=AdDetail.seen_count + 1, last_seen_at=NOW)
+        )
+        await session.commit()
+
+
+async def _campaign_state() -> dict:
+    async with async_session() as session:
+        campaigns = {
+            (row.advertiser_id, row.channel): (round(row.total_est_spend or 0, 2), row.snapshot_count, row.is_active)
+            for row in (await session.execute(select(Campaign))).scalars().all()
+        }
+        estimates = (
+            await session.execute(
+                select(SpendEstimate.channel, func.count(), func.round(func.sum(SpendEstimate.est_daily_spend), 2))
+                .group_by(SpendEstimate.channel)
+            )
+        ).all()
+        return {"campaigns": campaigns, "estimates": sorted(tuple(r) for r in estimates)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--advertisers", type=int, default=5_000)
+    parser.add_argument("--new-rows", type=int, default=500)
+    parser.add_argument("--bumps", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    await init_db()
+    t0 = time.perf_counter()
+    await _populate(rng, args.rows, args.advertisers)
+    print(f"populated {args.rows} ad_details in {time.perf_counter() - t0:.1f}s ({_db_path})")
+
+    t0 = time.perf_counter()
+    stats = await rebuild_campaigns_and_spend(active_days=7)
+    print(f"full rebuild       : {time.perf_counter() - t0:.2f}s campaigns={stats['campaigns_total']}")
+
+    await _simulate_crawl(rng, args.advertisers, args.new_rows, args.bumps)
+    t0 = time.perf_counter()
+    stats = await rebuild_campaigns_and_spend(active_days=7, incremental=True)
+    print(
+        f"incremental rebuild: {time.perf_counter() - t0:.2f}s "
+        f"incremental={stats['incremental']} touched_advertisers={stats['touched_advertisers']}"
+    )
+    incremental_state = await _campaign_state()
+
+    t0 = time.perf_counter()
+    await rebuild_campaigns_and_spend(active_days=7)
+    print(f"full rebuild       : {time.perf_counter() - t0:.2f}s")
+    print(f"incremental identical to full: {incremental_state == await _campaign_state()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Benchmark: competitor affinity -- on-demand vectorized scoring vs precomputed top-N.
+
+Builds a throwaway SQLite DB with N ad_details over a 30-day window (10 ads per
+snapshot drawn from each keyword's 30-advertiser competitor pool, advertisers
+spread over 20 industries, one campaign + daily spend per advertiser), runs the
+nightly precompute for every advertiser, then times per-advertiser lookups on
+the on-demand path and from the precomputed table.
+
+Usage:
+    python scripts/bench_competitor_affinity.py --rows 300000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_db_path = Path(tempfile.mkdtemp()) / "bench_competitor_affinity.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path.as_posix()}"
+
+from sqlalchemy import insert, select
+
+from database import async_session, init_db
+from database.models import AdDetail, AdSnapshot, Advertiser, Campaign, Industry, Keyword, Persona, SpendEstimate
+from processor.competitor_mapper import calculate_competitor_affinity, precompute_competitor_affinities
+
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "naver_da", "meta"]
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+async def _populate(rng: random.Random, rows: int, advertisers: int, keywords: int) -> None:
+    async with async_session() as session:
+        await session.execute(insert(Industry), [{"id": i, "name": f"벤치업종{i}"} for i in range(1, 21)])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "B1", "age_group": "30대", "gender": "female", "login_type": "none"},
+        ])
+        await session.execute(
+            insert(Keyword),
+            [{"id": i, "industry_id": i % 20 + 1, "keyword": f"벤치키워드{i}"} for i in range(1, keywords + 1)],
+        )
+        await session.execute(insert(Advertiser), [
+            {"id": i, "name": f"벤치광고주{i}", "industry_id": i % 20 + 1, "aliases": []}
+            for i in range(1, advertisers + 1)
+        ])
+        await session.execute(insert(Campaign), [
+            {"id": i, "advertiser_id": i, "channel": "naver_search", "first_seen": NOW, "last_seen": NOW}
+            for i in range(1, advertisers + 1)
+        ])
+        await session.execute(insert(SpendEstimate), [
+            {"campaign_id": i, "date": NOW - timedelta(days=d), "channel": "naver_search",
+             "est_daily_spend": rng.uniform(1e4, 1e6)}
+            for i in range(1, advertisers + 1) for d in range(0, 30, 3)
+        ])
+        await session.execute(insert(AdSnapshot), [
+            {"keyword_id": rng.randint(1, keywords), "persona_id": 1, "channel": rng.choice(CHANNELS),
+             "device": "pc", "captured_at": NOW - timedelta(days=rng.randint(0, 29), minutes=rng.randint(0, 1439))}
+            for _ in range(max(1, rows // 10))
+        ])
+        snapshots = (await session.execute(select(AdSnapshot.id, AdSnapshot.keyword_id))).all()
+        for start in range(0, len(snapshots), 5000):
+            batch = []
+            for snapshot_id, keyword_id in snapshots[start:start + 5000]:
+                pool = [(keyword_id * 37 + k) % advertisers + 1 for k in range(30)]
+                for position in range(10):
+                    adv = rng.choice(pool)
+                    batch.append({
+                        "snapshot_id": snapshot_id,
+                        "advertiser_id": adv,
+                        "advertiser_name_raw": f"벤치광고주{adv}",
+                        "position_zone": "top" if position < 3 else "middle" if position < 7 else "bottom",
+                    })
+            await session.execute(insert(AdDetail), batch)
+        await session.commit()
+
+
+async def _time_lookups(label: str, sample: list[int], use_precomputed: bool) -> None:
+    async with async_session() as db:
+        t0 = time.perf_counter()
+        for advertiser_id in sample:
+            await calculate_competitor_affinity(db, advertiser_id, days=30, limit=20, use_precomputed=use_precomputed)
+        elapsed = (time.perf_counter() - t0) * 1e3 / len(sample)
+    print(f"{label:28s}: {elapsed:8.1f} ms / advertiser ({len(sample)} lookups)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--advertisers", type=int, default=3_000)
+    parser.add_argument("--keywords", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    await init_db()
+    t0 = time.perf_counter()
+    await _populate(rng, args.rows, args.advertisers, args.keywords)
+    print(f"populated {args.rows} ad_details in {time.perf_counter() - t0:.1f}s ({_db_path})")
+
+    stats = await precompute_competitor_affinities(days=30)
+    print(f"nightly precompute: {stats}")
+
+    sample = rng.sample(range(1, args.advertisers + 1), min(args.sample, args.advertisers))
+    await _time_lookups("on-demand (vectorized)", sample, use_precomputed=False)
+    await _time_lookups("precomputed top-N", sample, use_precomputed=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""Benchmark: SOV / contact-rate / persona heatmap -- raw joins vs daily rollups.
+
+Builds a throwaway SQLite DB with N ad_details over a 90-day history (10 ads
+per snapshot drawn from each keyword's 30-advertiser competitor pool), builds
+the rollups (full), times each analytics function over a 90-day window on the
+raw tables and on the rollups, then simulates one crawl save and times the
+incremental refresh. The consistency checker runs at the end.
+
+Usage:
+    python scripts/bench_daily_rollups.py --rows 500000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_db_path = Path(tempfile.mkdtemp()) / "bench_daily_rollups.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path.as_posix()}"
+
+from sqlalchemy import insert, select
+
+from database import async_session, init_db
+from database.models import AdDetail, AdSnapshot, Advertiser, Industry, Keyword, Persona
+from processor.contact_rate import calculate_contact_rates
+from processor.daily_rollup import check_daily_rollups, refresh_daily_rollups
+from processor.persona_ranking import calculate_persona_heatmap
+from processor.sov_analyzer import calculate_sov
+
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "naver_da", "meta"]
+AGES = ["20대", "30대", "40대", "50대", "60대"]
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+def _snapshots(rng: random.Random, count: int, days_back: int) -> list[dict]:
+    return [
+        {
+            "keyword_id": rng.randint(1, 50),
+            "persona_id": rng.randint(1, 10),
+            "channel": rng.choice(CHANNELS),
+            "device": "pc",
+            "captured_at": NOW - timedelta(days=rng.randint(0, days_back), minutes=rng.randint(0, 1439))
+            if days_back else NOW,
+        }
+        for _ in range(count)
+    ]
+
+
+def _details(rng: random.Random, snapshots: list[tuple], advertisers: int, per_snapshot: int) -> list[dict]:
+    """스냅샷마다 해당 키워드의 경쟁 광고주 풀(30곳)에서 광고 per_snapshot건."""
+    rows = []
+    for snapshot_id, keyword_id, channel in snapshots:
+        pool = [(keyword_id * 37 + k) % advertisers + 1 for k in range(30)]
+        for position in range(per_snapshot):
+            adv = rng.choice(pool)
+            rows.append({
+                "snapshot_id": snapshot_id,
+                "advertiser_id": adv if rng.random() < 0.95 else None,
+                "advertiser_name_raw": f"벤치광고주{adv}",
+                "position_zone": "top" if position < 3 else "middle" if position < 7 else "bottom",
+                "ad_type": f"{channel}_ad",
+                "is_inhouse": rng.random() < 0.03,
+                "is_contact": channel != "meta",
+            })
+    return rows
+
+
+async def _populate(rng: random.Random, rows: int, advertisers: int) -> None:
+    async with async_session() as session:
+        await session.execute(insert(Industry), [{"id": i, "name": f"벤치업종{i}"} for i in range(1, 6)])
+        await session.execute(insert(Persona), [
+            {"id": i, "code": f"B{i}", "age_group": AGES[i % 5], "gender": "male" if i % 2 else "female",
+             "login_type": "none"}
+            for i in range(1, 11)
+        ])
+        await session.execute(
+            insert(Keyword),
+            [{"id": i, "industry_id": i % 5 + 1, "keyword": f"벤치키워드{i}"} for i in range(1, 51)],
+        )
+        await session.execute(
+            insert(Advertiser),
+            [{"id": i, "name": f"벤치광고주{i}", "aliases": []} for i in range(1, advertisers + 1)],
+        )
+        await session.execute(insert(AdSnapshot), _snapshots(rng, max(1, rows // 10), 90))
+        snapshots = (await session.execute(select(AdSnapshot.id, AdSnapshot.keyword_id, AdSnapshot.channel))).all()
+        for start in range(0, len(snapshots), 5000):
+            await session.execute(insert(AdDetail), _details(rng, snapshots[start:start + 5000], advertisers, 10))
+        await session.commit()
+
+
+async def _time_queries(label: str) -> None:
+    async with async_session() as db:
+        for name, call in (
+            ("calculate_sov", lambda: calculate_sov(db, days=90)),
+            ("calculate_sov(industry)", lambda: calculate_sov(db, industry_id=2, days=90)),
+            ("calculate_contact_rates", lambda: calculate_contact_rates(db, days=90)),
+            ("calculate_persona_heatmap", lambda: calculate_persona_heatmap(db, days=90)),
+        ):
+            t0 = time.perf_counter()
+            result = await call()
+            print(f"{label:7s} {name:27s}: {(time.perf_counter() - t0) * 1e3:8.1f} ms ({len(result)} rows)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--advertisers", type=int, default=3_000)
+    parser.add_argument("--new-snapshots", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    await init_db()
+    t0 = time.perf_counter()
+    await _populate(rng, args.rows, args.advertisers)
+    print(f"populated {args.rows} ad_details in {time.perf_counter() - t0:.1f}s ({_db_path})")
+
+    t0 = time.perf_counter()
+    await refresh_daily_rollups(full=True)
+    print(f"full rollup build: {time.perf_counter() - t0:.2f}s")
+
+    os.environ["ENABLE_DAILY_ROLLUPS"] = "false"
+    await _time_queries("raw")
+    os.environ["ENABLE_DAILY_ROLLUPS"] = "true"
+    await _time_queries("rollup")
+
+    async with async_session() as session:
+        await session.execute(insert(AdSnapshot), _snapshots(rng, args.new_snapshots, 0))
+        new_snapshots = (
+            await session.execute(
+                select(AdSnapshot.id, AdSnapshot.keyword_id, AdSnapshot.channel)
+                .order_by(AdSnapshot.id.desc())
+                .limit(args.new_snapshots)
+            )
+        ).all()
+        await session.execute(insert(AdDetail), _details(rng, new_snapshots, args.advertisers, 10))
+        await session.commit()
+    t0 = time.perf_counter()
+    stats = await refresh_daily_rollups()
+    print(f"incremental refresh after one save: {time.perf_counter() - t0:.2f}s {stats}")
+
+    t0 = time.perf_counter()
+    report = await check_daily_rollups(days=90)
+    print(f"consistency check: {time.perf_counter() - t0:.2f}s consistent={report['consistent']} {report['tables']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""Benchmark: dedup lookup latency -- snapshot JOIN vs denormalized channel indexes.
+
+Builds a throwaway SQLite DB with N ad_details rows (default 1,000,000) spread
+over channels/snapshots, then times the three dedup queries in their old form
+(JOIN ad_snapshots, full-column text match) and new form
+((channel, creative_hash) / (channel, text_key) index probes).
+
+Usage:
+    python scripts/bench_dedup_lookup.py --rows 1000000 --probes 2000
+"""
+
+import argparse
+import hashlib
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+
+from database.models import Base
+from processor.creative_hasher import compute_text_hash
+
+CHANNELS = ["naver_search", "naver_da", "google_gdn", "kakao_da", "youtube_ads", "meta"]
+
+OLD_HASH = (
+    "SELECT d.id FROM ad_details d JOIN ad_snapshots s ON d.snapshot_id = s.id "
+    "WHERE d.creative_hash = ? AND s.channel = ? LIMIT 1"
+)
+OLD_CROSS = (
+    "SELECT id FROM ad_details WHERE creative_hash = ? AND snapshot_id IN "
+    "(SELECT id FROM ad_snapshots WHERE channel != ?) LIMIT 1"
+)
+OLD_TEXT = (
+    "SELECT d.id FROM ad_details d JOIN ad_snapshots s ON d.snapshot_id = s.id "
+    "WHERE s.channel = ? AND d.advertiser_name_raw = ? AND d.ad_text = ? AND d.url = ? LIMIT 1"
+)
+NEW_HASH = "SELECT id FROM ad_details WHERE channel = ? AND creative_hash = ? LIMIT 1"
+NEW_CROSS = "SELECT id FROM ad_details WHERE creative_hash = ? AND channel != ? LIMIT 1"
+NEW_TEXT = "SELECT id FROM ad_details WHERE channel = ? AND text_key = ? LIMIT 1"
+
+
+def _row(i: int) -> tuple:
+    name = f"광고주{i % 50000}"
+    ad_text = f"광고 문구 {i}"
+    url = f"https://adv{i % 50000}.co.kr/p/{i}"
+    c_hash = hashlib.sha256(f"img{i}".encode()).hexdigest() if i % 3 else None
+    return name, ad_text, url, c_hash
+
+
+def build_db(path: Path, rows: int, snapshots: int) -> None:
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("INSERT INTO industries (id, name) VALUES (1, '기타')")
+    conn.execute("INSERT INTO keywords (id, industry_id, keyword) VALUES (1, 1, 'bench')")
+    conn.execute("INSERT INTO personas (id, code, login_type) VALUES (1, 'B1', 'none')")
+    conn.executemany(
+        "INSERT INTO ad_snapshots (id, keyword_id, persona_id, device, channel, captured_at) "
+        "VALUES (?, 1, 1, 'pc', ?, '2026-01-01 00:00:00')",
+        ((s, CHANNELS[s % len(CHANNELS)]) for s in range(1, snapshots + 1)),
+    )
+
+    def gen():
+        for i in range(rows):
+            snap = i % snapshots + 1
+            name, ad_text, url, c_hash = _row(i)
+            yield (snap, CHANNELS[snap % len(CHANNELS)], name, ad_text, url, c_hash,
+                   compute_text_hash(name, ad_text, url))
+
+    conn.executemany(
+        "INSERT INTO ad_details (snapshot_id, channel, advertiser_name_raw, ad_text, url, "
+        "creative_hash, text_key) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        gen(),
+    )
+    # 운영 DB와 동일하게 init_db 마이그레이션 인덱스도 생성
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_details_dedup ON ad_details(creative_hash, snapshot_id)")
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def _time(conn: sqlite3.Connection, sql: str, params: list[tuple]) -> tuple[float, float]:
+    samples = []
+    for p in params:
+        t0 = time.perf_counter()
+        conn.execute(sql, p).fetchone()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--snapshots", type=int, default=40_000)
+    parser.add_argument("--probes", type=int, default=2000)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "bench_dedup.db"
+    t0 = time.perf_counter()
+    build_db(path, args.rows, args.snapshots)
+    print(f"built {args.rows} ad_details in {time.perf_counter() - t0:.1f}s ({path})")
+
+    rng = random.Random(7)
+    ids = [rng.randrange(args.rows) for _ in range(args.probes)]
+    hash_ids = [i if i % 3 else i + 1 for i in ids]
+    probes = []
+    for i in ids:
+        snap = i % args.snapshots + 1
+        probes.append((CHANNELS[snap % len(CHANNELS)], *_row(i)))
+    hash_probes = []
+    for i in hash_ids:
+        snap = i % args.snapshots + 1
+        hash_probes.append((CHANNELS[snap % len(CHANNELS)], _row(i)[3]))
+
+    conn = sqlite3.connect(path)
+    cases = [
+        ("hash (same channel)",
+         OLD_HASH, [(h, ch) for ch, h in hash_probes],
+         NEW_HASH, [(ch, h) for ch, h in hash_probes]),
+        ("hash (cross channel)",
+         OLD_CROSS, [(h, ch) for ch, h in hash_probes],
+         NEW_CROSS, [(h, ch) for ch, h in hash_probes]),
+        ("text fallback",
+         OLD_TEXT, [(ch, n, t, u) for ch, n, t, u, _ in probes],
+         NEW_TEXT, [(ch, compute_text_hash(n, t, u)) for ch, n, t, u, _ in probes]),
+    ]
+    print(f"{'lookup':<22}{'old p50/p99 (us)':>22}{'new p50/p99 (us)':>22}")
+    for label, old_sql, old_params, new_sql, new_params in cases:
+        old_p50, old_p99 = _time(conn, old_sql, old_params)
+        new_p50, new_p99 = _time(conn, new_sql, new_params)
+        print(f"{label:<22}{old_p50:>12.1f} / {old_p99:<8.1f}{new_p50:>12.1f} / {new_p99:<8.1f}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Benchmark: gallery export -- materialized vs streamed CSV / XLSX.
+
+Builds a throwaway SQLite DB with N ad_details (10 per snapshot over the last
+20 days), then runs each export mode in its own child process so peak RSS
+(ru_maxrss) is measured per mode. Time-to-first-byte is the time until the
+first body chunk is available (for XLSX: until the file is ready, since the
+zip directory is written last).
+
+Modes:
+  csv-legacy   result.all() -> row list -> StringIO (previous implementation)
+  csv-stream   GET /api/export/gallery body iterator (server-side cursor)
+  xlsx-legacy  in-memory Workbook, capped at --legacy-xlsx-rows
+  xlsx-stream  GET /api/export/gallery.xlsx (write-only workbook)
+
+Usage:
+    python scripts/bench_export_streaming.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = Path(tempfile.mkdtemp()) / "bench_export_streaming.db"
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path.as_posix()}"
+
+from openpyxl import Workbook
+from sqlalchemy import insert, select
+
+from api.routers import export
+from database import async_session, init_db
+from database.models import AdDetail, AdSnapshot, Advertiser, Industry, Keyword, Persona
+
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "naver_da", "meta"]
+NOW = datetime.utcnow().replace(microsecond=0)
+DATE_FROM = NOW - timedelta(days=30)
+
+
+def _rss_mb() -> float:
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _populate(rng: random.Random, rows: int, advertisers: int) -> None:
+    async with async_session() as session:
+        await session.execute(insert(Industry), [{"id": 1, "name": "벤치업종"}])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "B1", "age_group": "30대", "gender": "female", "login_type": "none"},
+        ])
+        await session.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "벤치키워드"}])
+        await session.execute(
+            insert(Advertiser),
+            [{"id": i, "name": f"벤치광고주{i}", "aliases": []} for i in range(1, advertisers + 1)],
+        )
+        await session.execute(insert(AdSnapshot), [
+            {
+                "keyword_id": 1, "persona_id": 1, "channel": rng.choice(CHANNELS), "device": "pc",
+                "captured_at": NOW - timedelta(days=rng.randint(0, 19), minutes=rng.randint(0, 1439)),
+            }
+            for _ in range(max(1, rows // 10))
+        ])
+        snapshot_ids = (await session.execute(select(AdSnapshot.id))).scalars().all()
+        for start in range(0, len(snapshot_ids), 5000):
+            batch = []
+            for snapshot_id in snapshot_ids[start:start + 5000]:
+                for position in range(10):
+                    adv = rng.randint(1, advertisers)
+                    batch.append({
+                        "snapshot_id": snapshot_id,
+                        "advertiser_id": adv,
+                        "advertiser_name_raw": f"벤치광고주{adv}",
+                        "ad_text": f"벤치 광고 문구 {snapshot_id}-{position} 지금 구매하면 최대 50% 할인",
+                        "ad_type": "text",
+                        "url": f"https://example.com/landing/{adv}/{snapshot_id}?utm_source=bench",
+                        "product_category": "뷰티",
+                        "verification_status": "verified",
+                    })
+            await session.execute(insert(AdDetail), batch)
+        await session.commit()
+
+
+async def _csv_legacy() -> tuple[float, int]:
+    t0 = time.perf_counter()
+    async with async_session() as db:
+        rows_raw = (await db.execute(export._gallery_query(None, None, DATE_FROM, NOW))).all()
+    rows = [export._gallery_row(r) for r in rows_raw]
+    buf = io.StringIO()
+    buf.write("\ufeff")
+    writer = csv.writer(buf)
+    writer.writerow(["captured_at"] * 8)
+    writer.writerows(rows)
+    body = buf.getvalue()
+    return time.perf_counter() - t0, len(body.encode("utf-8"))
+
+
+async def _csv_stream() -> tuple[float, int]:
+    t0 = time.perf_counter()
+    response = await export.export_gallery(
+        channel=None, advertiser_id=None, date_from=DATE_FROM, date_to=NOW, user=None,
+    )
+    ttfb, size = None, 0
+    async for chunk in response.body_iterator:
+        if ttfb is None and len(chunk) > 1000:
+            ttfb = time.perf_counter() - t0
+        size += len(chunk)
+    return ttfb, size
+
+
+async def _xlsx_legacy(limit: int) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    async with async_session() as db:
+        rows_raw = (await db.execute(export._gallery_query(None, None, DATE_FROM, NOW).limit(limit))).all()
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["수집일시"] * 8)
+    for r in rows_raw:
+        ws.append(export._gallery_row(r))
+    buf = io.BytesIO()
+    wb.save(buf)
+    return time.perf_counter() - t0, len(buf.getvalue())
+
+
+async def _xlsx_stream() -> tuple[float, int]:
+    export.CACHE_DIR = Path(tempfile.mkdtemp())
+    t0 = time.perf_counter()
+    response = await export.export_gallery_xlsx(
+        channel=None, advertiser_id=None, date_from=DATE_FROM, date_to=NOW, user=None,
+    )
+    return time.perf_counter() - t0, Path(response.path).stat().st_size
+
+
+async def _child(mode: str, legacy_xlsx_rows: int) -> None:
+    baseline = _rss_mb()
+    t0 = time.perf_counter()
+    if mode == "csv-legacy":
+        ttfb, size = await _csv_legacy()
+    elif mode == "csv-stream":
+        ttfb, size = await _csv_stream()
+    elif mode == "xlsx-legacy":
+        ttfb, size = await _xlsx_legacy(legacy_xlsx_rows)
+    else:
+        ttfb, size = await _xlsx_stream()
+    print(json.dumps({
+        "mode": mode,
+        "ttfb_s": round(ttfb, 3),
+        "total_s": round(time.perf_counter() - t0, 2),
+        "bytes": size,
+        "peak_rss_mb": round(_rss_mb(), 1),
+        "rss_growth_mb": round(_rss_mb() - baseline, 1),
+    }))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--advertisers", type=int, default=3_000)
+    parser.add_argument("--legacy-xlsx-rows", type=int, default=200_000,
+                        help="in-memory Workbook grows ~GBs at 1M rows; cap the legacy XLSX run")
+    parser.add_argument("--modes", default="csv-legacy,csv-stream,xlsx-legacy,xlsx-stream")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        await _child(args.child, args.legacy_xlsx_rows)
+        return
+
+    await init_db()
+    t0 = time.perf_counter()
+    await _populate(random.Random(5), args.rows, args.advertisers)
+    print(f"populated {args.rows} ad_details in {time.perf_counter() - t0:.1f}s ({os.environ['DATABASE_URL']})")
+
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--legacy-xlsx-rows", str(args.legacy_xlsx_rows)],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if out.returncode != 0:
+            print(f"{mode}: failed\n{out.stderr[-2000:]}")
+            continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{r['mode']:12s} ttfb {r['ttfb_s']:7.3f}s  total {r['total_s']:7.2f}s  "
+            f"{r['bytes'] / 1e6:7.1f} MB out  peak RSS {r['peak_rss_mb']:7.1f} MB "
+            f"(+{r['rss_growth_mb']:.1f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""Benchmark: screenshot WebP conversion -- default thread executor vs process pool.
+
+Converts N synthetic full-page screenshots concurrently while a ticker task
+measures event-loop lag (how late a 10 ms sleep wakes up). Thread mode is the
+previous LocalImageStore behaviour (run_in_executor(None, ...)); process mode
+is processor.image_worker with thumbnail tiers.
+
+Usage:
+    python scripts/bench_image_worker.py --images 40 --workers 4
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image, ImageDraw
+
+from processor.image_worker import ImageWorker
+
+
+def _make_screenshots(directory: Path, count: int) -> list[str]:
+    rng = random.Random(7)
+    paths = []
+    for i in range(count):
+        img = Image.new("RGB", (1280, 3000), (255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for _ in range(400):
+            x, y = rng.randint(0, 1200), rng.randint(0, 2950)
+            draw.rectangle([x, y, x + rng.randint(10, 300), y + rng.randint(5, 60)],
+                           fill=(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+        path = directory / f"shot_{i}.png"
+        img.save(path, format="PNG")
+        paths.append(str(path))
+    return paths
+
+
+async def _measure(label: str, convert, paths: list[str]) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            t = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append((time.perf_counter() - t - 0.01) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(convert(p) for p in paths))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await tick
+    lags.sort()
+    print(
+        f"{label:8s} {len(paths)} images in {elapsed:6.2f}s ({len(paths) / elapsed:5.1f}/s)  "
+        f"loop lag p50 {statistics.median(lags):6.1f} ms  p99 {lags[int(len(lags) * 0.99)]:6.1f} ms  "
+        f"max {lags[-1]:6.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_screenshots(Path(tmp), args.images)
+
+        thread_worker = ImageWorker(workers=0, queue_max=args.images)
+        await _measure("thread", thread_worker.convert, paths)
+
+        process_worker = ImageWorker(workers=args.workers)
+        try:
+            await _measure("process", process_worker.convert, paths)
+            print(f"process metrics: {process_worker.metrics()}")
+        finally:
+            process_worker.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""Load test: API middleware stack -- BaseHTTPMiddleware vs pure ASGI.
+
+Builds two small FastAPI apps with the same routes (a JSON endpoint, a path
+parameter endpoint and a 200-chunk streaming endpoint) and the same
+middleware order as api/main.py (CORS > rate limit > security headers >
+request logging):
+
+  before  the previous BaseHTTPMiddleware implementations (copied below)
+  after   api.main RateLimitMiddleware / SecurityHeadersMiddleware /
+          RequestLoggingMiddleware (raw ASGI)
+
+Requests go through httpx.ASGITransport (no network, no server). Latency
+p50/p99 is measured with one request in flight at a time (full request, body
+included); throughput with --concurrency client tasks. The rate limit is
+raised so no request is rejected, but both stacks still pay for the limiter
+lookup.
+
+Usage:
+    python scripts/bench_middleware_stack.py --requests 5000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.latency import LatencyStats
+from api.main import RateLimitMiddleware, RequestLoggingMiddleware, SecurityHeadersMiddleware
+from api.rate_limit import MemoryBackend, RateLimiter
+
+logger = logging.getLogger("adscope.api")
+
+BENCH_LIMIT = 10**9
+
+
+class BenchRateLimitMiddleware(RateLimitMiddleware):
+    RULES = (("/api/", BENCH_LIMIT, 60, "api"),)
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, limiter):
+        super().__init__(app)
+        self.limiter = limiter
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        decision = await self.limiter.hit(f"{client_ip}:api", BENCH_LIMIT, 60)
+        if not decision.allowed:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests."})
+        return await call_next(request)
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        return response
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start = time.time()
+        response = await call_next(request)
+        logger.info("%s %s -> %d (%.2fs)", request.method, request.url.path,
+                    response.status_code, time.time() - start)
+        return response
+
+
+def _build(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items")
+    async def items():
+        return {"items": [{"id": i, "name": f"item{i}"} for i in range(20)]}
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def body():
+            for i in range(200):
+                yield f"row,{i}\n".encode()
+
+        return StreamingResponse(body(), media_type="text/csv")
+
+    limiter = RateLimiter(MemoryBackend())
+    if pure_asgi:
+        app.add_middleware(RequestLoggingMiddleware, stats=LatencyStats())
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(BenchRateLimitMiddleware, limiter=limiter)
+    else:
+        app.add_middleware(LegacyRequestLoggingMiddleware)
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyRateLimitMiddleware, limiter=limiter)
+    app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_methods=["*"], allow_headers=["*"])
+    return app
+
+
+async def _latency(client: httpx.AsyncClient, path: str, requests: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        resp = await client.get(path)
+        timings.append((time.perf_counter() - t0) * 1e3)
+        assert resp.status_code == 200, resp.status_code
+    return timings
+
+
+async def _throughput(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> float:
+    counter = iter(range(requests))
+
+    async def worker():
+        for _ in counter:
+            await client.get(path)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - t0)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    logging.getLogger("adscope.api").setLevel(logging.WARNING)
+
+    apps = {"before": _build(pure_asgi=False), "after": _build(pure_asgi=True)}
+    print(f"{args.requests} requests per route; throughput with concurrency {args.concurrency}")
+    print(f"{'route':<16}{'stack':<8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>9}")
+    for path in ("/api/items", "/api/items/7", "/api/stream"):
+        for name, app in apps.items():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                await _latency(client, path, 200)  # warm-up
+                timings = await _latency(client, path, args.requests)
+                rps = await _throughput(client, path, args.requests, args.concurrency)
+            p99 = statistics.quantiles(timings, n=100)[98]
+            print(f"{path:<16}{name:<8}{statistics.median(timings):>10.3f}{p99:>10.3f}{rps:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
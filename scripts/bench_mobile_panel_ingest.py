@@ -0,0 +1,199 @@
+"""Load test: mobile panel exposure ingest -- 1,000 devices reporting at once.
+
+Registers --devices panel devices and --advertisers advertisers in a fresh
+temporary SQLite database (WAL, like init_db) per mode, then every device
+posts one batch of --exposures exposures with --concurrency requests in
+flight. Modes:
+
+  legacy   the previous /exposures/batch (one advertiser SELECT + two ORM
+           objects per exposure, copied below)
+  batch    /exposures/batch (JSON, bulk path)
+  ndjson   /exposures/ingest with a gzip NDJSON body, ack=sync
+  async    /exposures/ingest with a gzip NDJSON body, ack=async; the clock
+           stops when the background writer has drained the queue
+
+Requests go through httpx.ASGITransport (no network, no server) to an app
+with only the mobile panel router; auth is overridden.
+
+Usage:
+    python scripts/bench_mobile_panel_ingest.py --devices 1000 --exposures 20 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.deps import get_current_user
+from api.mobile_ingest import ExposureWriter, resolve_channel
+from api.routers import mobile_panel
+from database import get_db
+from database.models import Advertiser, Base, MobilePanelDevice, MobilePanelExposure, PanelObservation, User
+from database.schemas import MobileExposureBatchIn
+
+APPS = ["YouTube", "Instagram", "Naver", "KakaoTalk", "TikTok", "Chrome"]
+
+
+def _legacy_route(app: FastAPI) -> None:
+    @app.post("/legacy/batch")
+    async def legacy_batch(data: MobileExposureBatchIn, db: AsyncSession = Depends(get_db)):
+        device = (
+            await db.execute(select(MobilePanelDevice).where(MobilePanelDevice.device_id == data.device_id))
+        ).scalar_one_or_none()
+        if not device:
+            raise HTTPException(status_code=404, detail="Device not registered")
+        saved = 0
+        for exp in data.exposures:
+            advertiser_id = None
+            if exp.advertiser_name:
+                adv = (
+                    await db.execute(select(Advertiser).where(Advertiser.name == exp.advertiser_name).limit(1))
+                ).scalar_one_or_none()
+                if adv:
+                    advertiser_id = adv.id
+            channel = resolve_channel(exp.app_name)
+            db.add(MobilePanelExposure(
+                device_id=data.device_id, app_name=exp.app_name, channel=channel,
+                advertiser_id=advertiser_id, advertiser_name_raw=exp.advertiser_name,
+                ad_text=exp.ad_text, ad_type=exp.ad_type, creative_url=exp.creative_url,
+                click_url=exp.click_url, duration_ms=exp.duration_ms, was_clicked=exp.was_clicked,
+                was_skipped=exp.was_skipped, screen_position=exp.screen_position,
+                observed_at=exp.observed_at or datetime.utcnow(), extra_data=exp.extra_data,
+            ))
+            db.add(PanelObservation(
+                panel_type=device.device_type, panel_id=data.device_id, advertiser_id=advertiser_id,
+                channel=channel or exp.app_name, device=f"{device.os_type}_{device.device_model or 'unknown'}",
+                location=device.region, is_verified=device.device_type == "real",
+                extra_data={"source": "mobile_panel_batch", "app": exp.app_name},
+            ))
+            saved += 1
+        device.last_seen = datetime.utcnow()
+        await db.commit()
+        return {"status": "ok", "saved": saved, "total": len(data.exposures)}
+
+
+async def _setup(path: Path, devices: int, advertisers: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path.as_posix()}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all([Advertiser(name=f"광고주{i}") for i in range(advertisers)])
+        session.add_all([
+            MobilePanelDevice(device_id=f"dev{i:05d}", device_type="ai", os_type="android",
+                              device_model="SM-S918N", region="서울")
+            for i in range(devices)
+        ])
+        await session.commit()
+    return engine, factory
+
+
+def _payload(device_id: str, exposures: int, advertisers: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "device_id": device_id,
+            "app_name": rng.choice(APPS),
+            "advertiser_name": f"광고주{rng.randrange(advertisers * 2)}",  # 절반은 미등록 이름
+            "ad_text": "지금 바로 확인하세요",
+            "ad_type": "video_preroll",
+            "duration_ms": rng.randrange(500, 15000),
+            "was_clicked": rng.random() < 0.02,
+        }
+        for _ in range(exposures)
+    ]
+
+
+async def _run(mode: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, factory = await _setup(Path(tmp) / "bench.db", args.devices, args.advertisers)
+        writer = ExposureWriter(session_factory=factory)
+        mobile_panel.exposure_writer = writer
+
+        async def _db():
+            async with factory() as session:
+                yield session
+
+        app = FastAPI()
+        app.include_router(mobile_panel.router)
+        _legacy_route(app)
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: User(id=1, email="bench@test", role="admin")
+
+        rng = random.Random(42)
+        payloads = [_payload(f"dev{i:05d}", args.exposures, args.advertisers, rng) for i in range(args.devices)]
+        timings: list[float] = []
+
+        def _request(exposures: list[dict]) -> tuple[str, dict]:
+            if mode in ("legacy", "batch"):
+                path = "/legacy/batch" if mode == "legacy" else "/api/mobile-panel/exposures/batch"
+                return path, {"json": {"device_id": exposures[0]["device_id"], "exposures": exposures}}
+            body = gzip.compress("\n".join(json.dumps(e, ensure_ascii=False) for e in exposures).encode())
+            ack = "async" if mode == "async" else "sync"
+            return f"/api/mobile-panel/exposures/ingest?ack={ack}", {
+                "content": body,
+                "headers": {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+            }
+
+        requests = iter(payloads)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+            async def device_worker():
+                for exposures in requests:
+                    path, kwargs = _request(exposures)
+                    t0 = time.perf_counter()
+                    resp = await client.post(path, **kwargs)
+                    timings.append((time.perf_counter() - t0) * 1e3)
+                    assert resp.status_code in (200, 202), (resp.status_code, resp.text)
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(device_worker() for _ in range(args.concurrency)))
+            await writer.drain()
+            elapsed = time.perf_counter() - t0
+        await writer.stop()
+
+        async with factory() as session:
+            stored = (await session.execute(select(func.count(MobilePanelExposure.id)))).scalar_one()
+        await engine.dispose()
+
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "stored": stored,
+        "rate": stored / elapsed,
+        "p50": statistics.median(timings),
+        "p99": statistics.quantiles(timings, n=100)[98],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--exposures", type=int, default=20, help="exposures per device batch")
+    parser.add_argument("--advertisers", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--modes", default="legacy,batch,ndjson,async")
+    args = parser.parse_args()
+
+    print(f"{args.devices} devices x {args.exposures} exposures, concurrency {args.concurrency}")
+    print(f"{'mode':<8}{'wall (s)':>10}{'stored':>9}{'exp/s':>9}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for mode in args.modes.split(","):
+        r = await _run(mode.strip(), args)
+        print(f"{r['mode']:<8}{r['elapsed']:>10.2f}{r['stored']:>9}{r['rate']:>9.0f}{r['p50']:>10.1f}{r['p99']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Benchmark: PerceptualHashIndex near-duplicate lookup over N hashes.
+
+Usage:
+    python scripts/bench_phash_index.py --hashes 1000000 --distance 3
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.phash_index import PerceptualHashIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hashes", type=int, default=1_000_000)
+    parser.add_argument("--distance", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    hashes = [rng.getrandbits(64) for _ in range(args.hashes)]
+
+    index = PerceptualHashIndex()
+    t0 = time.perf_counter()
+    for ad_id, h in enumerate(hashes):
+        index.add("google_gdn", h, ad_id)
+    print(f"built index over {len(index)} hashes in {time.perf_counter() - t0:.1f}s")
+
+    samples = []
+    found = 0
+    for _ in range(args.queries):
+        target = rng.randrange(args.hashes)
+        query = hashes[target]
+        for bit in rng.sample(range(64), rng.randint(0, args.distance)):
+            query ^= 1 << bit
+        t = time.perf_counter()
+        hits = index.query("google_gdn", query, max_distance=args.distance)
+        samples.append((time.perf_counter() - t) * 1e3)
+        found += any(ad_id == target for ad_id, _ in hits)
+    samples.sort()
+    print(
+        f"k<={args.distance}: p50 {statistics.median(samples):.3f}ms, "
+        f"p99 {samples[int(len(samples) * 0.99) - 1]:.3f}ms, recall {found / args.queries:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark: save_crawl_results (per-row) vs save_crawl_results_bulk.
+
+Replays a recorded crawl `results` list (JSON) -- or a synthetic one built from
+tests/test_crawlers/crawl_result_sample.json -- into a throwaway SQLite DB.
+Each mode runs twice on a fresh DB: pass 1 is mostly inserts, pass 2 is mostly
+seen_count bumps (dedup hot path). Row counts and seen totals are compared so
+the two modes are checked for identical results.
+
+Usage:
+    python scripts/bench_pipeline_ingest.py --ads 5000
+    python scripts/bench_pipeline_ingest.py --results recorded_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_root))
+
+SAMPLE_PATH = _root / "tests" / "test_crawlers" / "crawl_result_sample.json"
+CHANNELS = ["naver_search", "google_gdn", "kakao_da", "youtube_surf", "youtube_ads"]
+
+
+def build_synthetic_results(total_ads: int, ads_per_keyword: int = 30) -> list[dict]:
+    """Sample 광고를 템플릿으로 키워드x채널 결과 리스트를 합성 (~1/3은 배치 내 중복)."""
+    sample = json.loads(SAMPLE_PATH.read_text(encoding="utf-8"))
+    templates = [ad for snap in sample.values() for ad in snap.get("ads", [])]
+    base_time = datetime(2026, 1, 1, 9, 0, 0)
+    results: list[dict] = []
+    n = 0
+    k = 0
+    while n < total_ads:
+        channel = CHANNELS[k % len(CHANNELS)]
+        ads = []
+        for pos in range(ads_per_keyword):
+            t = templates[(n + pos) % len(templates)]
+            uniq = (n + pos) % max(1, (total_ads * 2) // 3)
+            ads.append({
+                **t,
+                "advertiser_name": f"벤치광고주{uniq % 997}",
+                "ad_text": f"{t.get('ad_text') or '광고'} #{uniq}",
+                "url": f"https://bench{uniq % 997}.co.kr/landing/{uniq}",
+                "position": pos + 1,
+            })
+        results.append({
+            "keyword": f"벤치키워드{k % 50}",
+            "persona_code": f"B{k % 6}",
+            "device": "pc" if k % 2 else "mobile",
+            "channel": channel,
+            "captured_at": base_time + timedelta(minutes=k),
+            "ads": ads,
+        })
+        n += len(ads)
+        k += 1
+    return results
+
+
+def load_results(path: str) -> list[dict]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = list(data.values())
+    for r in data:
+        if isinstance(r.get("captured_at"), str):
+            r["captured_at"] = datetime.fromisoformat(r["captured_at"])
+    return data
+
+
+async def _run_mode(mode: str, results: list[dict]) -> dict:
+    db_path = Path(tempfile.mkdtemp()) / f"bench_{mode}.db"
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path.as_posix()}"
+
+    # database 모듈은 import 시점에 엔진을 만들므로 모드마다 새로 로드
+    for name in [m for m in sys.modules if m == "database" or m.startswith("processor.pipeline")]:
+        del sys.modules[name]
+    from sqlalchemy import func, select
+
+    import database
+    from database.models import AdDetail, Industry, Keyword, Persona
+    from processor import pipeline
+
+    await database.init_db()
+    async with database.async_session() as session:
+        industry = Industry(name="기타")
+        session.add(industry)
+        await session.flush()
+        for kw in sorted({r["keyword"] for r in results}):
+            session.add(Keyword(industry_id=industry.id, keyword=kw))
+        for code in sorted({r["persona_code"] for r in results}):
+            session.add(Persona(code=code, login_type="none"))
+        await session.commit()
+
+    timings = []
+    for _ in range(2):
+        async with database.async_session() as session:
+            t0 = time.perf_counter()
+            if mode == "bulk":
+                await pipeline.save_crawl_results_bulk(session, results)
+            else:
+                await pipeline.save_crawl_results(session, results)
+            timings.append(time.perf_counter() - t0)
+
+    async with database.async_session() as session:
+        rows = (await session.execute(select(func.count(AdDetail.id)))).scalar_one()
+        seen = (await session.execute(select(func.sum(AdDetail.seen_count)))).scalar_one()
+    await database.engine.dispose()
+    return {"mode": mode, "insert_pass_s": timings[0], "dedup_pass_s": timings[1],
+            "ad_details": rows, "seen_total": seen}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ads", type=int, default=3000, help="합성 광고 수 (--results 미지정 시)")
+    parser.add_argument("--results", help="기록된 results JSON 경로")
+    args = parser.parse_args()
+
+    from loguru import logger
+    logger.remove()
+
+    results = load_results(args.results) if args.results else build_synthetic_results(args.ads)
+    total_ads = sum(len(r.get("ads", [])) for r in results)
+    print(f"replaying {len(results)} results / {total_ads} ads")
+
+    reports = [await _run_mode("row", results), await _run_mode("bulk", results)]
+    for r in reports:
+        print(
+            f"  {r['mode']:>4}: insert pass {r['insert_pass_s']:.2f}s "
+            f"({total_ads / r['insert_pass_s']:.0f} ads/s), "
+            f"dedup pass {r['dedup_pass_s']:.2f}s "
+            f"({total_ads / r['dedup_pass_s']:.0f} ads/s) "
+            f"-> ad_details={r['ad_details']} seen_total={r['seen_total']}"
+        )
+    row, bulk = reports
+    same = (row["ad_details"], row["seen_total"]) == (bulk["ad_details"], bulk["seen_total"])
+    print(f"  speedup: insert x{row['insert_pass_s'] / bulk['insert_pass_s']:.1f}, "
+          f"dedup x{row['dedup_pass_s'] / bulk['dedup_pass_s']:.1f}; identical results: {same}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
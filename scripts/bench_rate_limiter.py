@@ -0,0 +1,102 @@
+"""Benchmark: rate limiter per-request overhead with many distinct client IPs.
+
+Replays N requests from --ips distinct client IPs (Zipf-like: a few hot IPs,
+a long tail) against:
+
+  legacy   timestamp list per key, rebuilt per request under one asyncio.Lock
+           (previous RateLimitMiddleware body)
+  memory   GCRA, in-process dict + striped locks
+  sqlite   GCRA, shared SQLite file (one UPSERT per request, dedicated thread)
+  redis    GCRA Lua script (only with --redis-url; any Redis-compatible server)
+
+Requests are issued by --concurrency tasks, like concurrent uvicorn requests.
+
+Usage:
+    python scripts/bench_rate_limiter.py --requests 200000 --ips 10000
+    python scripts/bench_rate_limiter.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.rate_limit import MemoryBackend, RateLimiter, RedisBackend, SQLiteBackend
+
+
+class LegacyLimiter:
+    """Previous implementation, kept only for comparison."""
+
+    def __init__(self):
+        self.requests: dict[str, list[float]] = defaultdict(list)
+        self._lock = asyncio.Lock()
+
+    async def hit(self, key: str, limit: int, window: float) -> bool:
+        async with self._lock:
+            now = time.time()
+            self.requests[key] = [t for t in self.requests[key] if now - t < window]
+            if len(self.requests[key]) >= limit:
+                return False
+            self.requests[key].append(now)
+            return True
+
+
+async def _replay(hit, keys: list[str], concurrency: int) -> list[float]:
+    timings: list[float] = []
+    chunk = len(keys) // concurrency
+
+    async def worker(part: list[str]):
+        for key in part:
+            t0 = time.perf_counter()
+            await hit(key, 120, 60)
+            timings.append((time.perf_counter() - t0) * 1e6)
+
+    await asyncio.gather(*(worker(keys[i * chunk:(i + 1) * chunk]) for i in range(concurrency)))
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--ips", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    ips = [f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(args.ips)]
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(args.ips)]
+    keys = [f"{ip}:api" for ip in rng.choices(ips, weights=weights, k=args.requests)]
+
+    modes = {
+        "legacy": LegacyLimiter(),
+        "memory": RateLimiter(MemoryBackend()),
+        "sqlite": RateLimiter(SQLiteBackend(str(Path(tempfile.mkdtemp()) / "rate_limits.db"))),
+    }
+    if args.redis_url:
+        modes["redis"] = RateLimiter(RedisBackend(args.redis_url, prefix=f"bench:{time.time_ns()}:"))
+
+    print(f"{args.requests} requests, {args.ips} IPs, concurrency {args.concurrency}")
+    print(f"{'backend':<9}{'p50 (us)':>10}{'p99 (us)':>10}{'mean (us)':>11}{'wall req/s':>12}")
+    for name, limiter in modes.items():
+        t0 = time.perf_counter()
+        timings = await _replay(limiter.hit, keys, args.concurrency)
+        wall = time.perf_counter() - t0
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(
+            f"{name:<9}{statistics.median(timings):>10.1f}{p99:>10.1f}"
+            f"{statistics.fmean(timings):>11.1f}{len(timings) / wall:>12.0f}"
+        )
+        if hasattr(limiter, "close"):
+            await limiter.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,11 @@
-"""Rebuild campaigns and spend_estimates from current DB snapshot data."""
+"""Rebuild campaigns and spend_estimates from current DB snapshot data.
 
+Usage:
+    python scripts/build_campaigns_and_spend.py                # 전체 재빌드 (보정용)
+    python scripts/build_campaigns_and_spend.py --incremental  # 워터마크 이후 변경분만
+"""
+
+import argparse
 import asyncio
 import os
 from pathlib import Path
@@ -14,15 +20,22 @@ from processor.campaign_builder import rebuild_campaigns_and_spend
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Rebuild campaigns and spend_estimates")
+    parser.add_argument("--incremental", action="store_true", help="워터마크 이후 변경된 광고주만 재집계")
+    args = parser.parse_args()
+
     await init_db()
     logger.info(
         "Campaign rebuild excluded channels: {}",
         os.getenv("CAMPAIGN_EXCLUDED_CHANNELS", "youtube_ads"),
     )
-    stats = await rebuild_campaigns_and_spend(active_days=7)
+    stats = await rebuild_campaigns_and_spend(active_days=7, incremental=args.incremental)
     logger.info(
-        "Done: linked_details={} created_advertisers={} industry_backfilled={} "
-        "updated_campaigns={} inserted_estimates={} totals(campaigns={}, spend_estimates={})",
+        "Done: incremental={} touched_advertisers={} linked_details={} created_advertisers={} "
+        "industry_backfilled={} updated_campaigns={} inserted_estimates={} "
+        "totals(campaigns={}, spend_estimates={})",
+        stats["incremental"],
+        stats["touched_advertisers"],
         stats["linked_details"],
         stats["created_advertisers"],
         stats["industry_backfilled"],
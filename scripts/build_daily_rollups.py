@@ -0,0 +1,47 @@
+"""Build / verify the daily exposure rollups (daily_ad_rollups, daily_snapshot_rollups).
+
+Usage:
+    python scripts/build_daily_rollups.py                     # 워터마크 이후 변경분 (없으면 전체)
+    python scripts/build_daily_rollups.py --full              # 전체 재빌드
+    python scripts/build_daily_rollups.py --check --days 90   # 원본 대비 정합성 검사
+    python scripts/build_daily_rollups.py --check --repair    # 불일치 날짜 재집계
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import init_db
+from processor.daily_rollup import check_daily_rollups, refresh_daily_rollups
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Build or verify daily exposure rollups")
+    parser.add_argument("--full", action="store_true", help="전체 재빌드")
+    parser.add_argument("--check", action="store_true", help="원본 테이블과 grain 단위 비교")
+    parser.add_argument("--repair", action="store_true", help="--check 불일치 날짜를 원본에서 재집계")
+    parser.add_argument("--days", type=int, default=90, help="--check 대상 기간 (일)")
+    args = parser.parse_args()
+
+    await init_db()
+    if args.check:
+        report = await check_daily_rollups(days=args.days, repair=args.repair)
+        for table, counts in report["tables"].items():
+            logger.info("{}: {}", table, counts)
+        logger.info(
+            "consistent={} mismatched_days={} repaired_days={}",
+            report["consistent"], report["mismatched_days"], report.get("repaired_days", 0),
+        )
+        return
+
+    stats = await refresh_daily_rollups(full=args.full)
+    logger.info("Done: {}", stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,7 @@
 """오래된 스크린샷/이미지 정리 스크립트.
 
+image_blobs 인덱스에서 보존 기한이 지났거나 참조가 없는 blob을 조회해 삭제합니다.
+
 사용법:
     python scripts/cleanup_images.py --days 90
 """
@@ -7,10 +9,12 @@
 import argparse
 import asyncio
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from database import init_db
 from processor.image_store import get_image_store
 
 
@@ -19,12 +23,14 @@ async def main():
     parser.add_argument("--days", type=int, default=90, help="Delete images older than N days")
     args = parser.parse_args()
 
+    await init_db()
     store = get_image_store()
     print(f"Image store: {store}")
     print(f"Cleaning up images older than {args.days} days...")
 
+    t0 = time.perf_counter()
     deleted = await store.cleanup(older_than_days=args.days)
-    print(f"Deleted {deleted} files")
+    print(f"Deleted {deleted} images in {time.perf_counter() - t0:.2f}s")
 
 
 if __name__ == "__main__":
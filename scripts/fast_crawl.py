@@ -59,20 +59,22 @@ from loguru import logger
 logger.remove()
 logger.add(sys.stderr, level="INFO")
 
+from crawler.browser_pool import get_browser_pool
 from crawler.stealth_patch import enable_stealth
 enable_stealth()  # playwright-stealth 전체 크롤러 적용
 
 from database import init_db
-from database.models import AdSnapshot, AdDetail, Keyword, Persona, Advertiser, Industry
-from sqlalchemy import select
+from database.models import AdSnapshot, AdDetail
 from processor.advertiser_name_cleaner import clean_name_for_pipeline
 from processor.korean_filter import is_korean_ad, clean_advertiser_name
 from crawler.personas.profiles import PERSONAS
 from crawler.personas.device_config import DEFAULT_MOBILE, PC_DEVICE, get_device_for_persona
-from processor.creative_hasher import compute_creative_hash, compute_text_hash
+from processor.creative_hasher import compute_creative_hash, compute_perceptual_hash, compute_text_hash
+from processor.dedup import dedup_key_fields
 from processor.extra_data_normalizer import normalize_extra_data
 from processor.landing_cache import get_cached_brand, cache_landing_result
 from processor.data_washer import save_to_staging, wash_and_promote
+from processor.dimension_cache import DEFAULT_PERSONA, get_dimension_cache
 from processor.channel_utils import (
     CONTACT_CHANNELS,
     CATALOG_CHANNELS,
@@ -346,43 +348,33 @@ TOTAL_TIMEOUT = 900  # 15분
 async def save_to_db(channel_name, result, keyword_text, persona_code, device_type):
     """수집 결과를 DB에 저장."""
     from database import async_session
+    dims = get_dimension_cache()
     async with async_session() as session:
-        ind_result = await session.execute(
-            select(Industry).where(Industry.name == "기타")
-        )
-        industry = ind_result.scalar_one_or_none()
-        if not industry:
-            industry = Industry(name="기타")
-            session.add(industry)
-            await session.flush()
-
-        kw_result = await session.execute(
-            select(Keyword).where(Keyword.keyword == keyword_text)
+        # 차원(키워드/페르소나/광고주)은 공용 캐시에서 bulk 조회/생성 — 생성은 이 세션 트랜잭션 안에서
+        keyword_id = await dims.keyword_id(session, keyword_text, create=True, in_session=True)
+        # 카탈로그 채널도 persona_id 필요 (NOT NULL) — 없으면 M30 기본값
+        persona_id = await dims.persona_id(
+            session, persona_code or DEFAULT_PERSONA, create=True, in_session=True,
         )
-        kw = kw_result.scalar_one_or_none()
-        if not kw:
-            kw = Keyword(keyword=keyword_text, industry_id=industry.id, is_active=True)
-            session.add(kw)
-            await session.flush()
 
-        # 카탈로그 채널도 persona_id 필요 (NOT NULL) — 없으면 M30 기본값
-        _code = persona_code or "M30"
-        persona_row = None
-        p_result = await session.execute(
-            select(Persona).where(Persona.code == _code)
+        # Korean filter: only store Korean-market ads
+        ads = []
+        for ad in result.get("ads", []):
+            if not is_korean_ad(ad.get("ad_text"), ad.get("advertiser_name"),
+                                ad.get("brand"), ad.get("ad_description")):
+                continue
+            adv_name = clean_advertiser_name(ad.get("advertiser_name"))
+            # 추가 정리: URL, 도메인, 광고카피 제거
+            adv_name = clean_name_for_pipeline(adv_name) if adv_name else adv_name
+            ads.append((ad, adv_name))
+        korean_filtered = len(result.get("ads", [])) - len(ads)
+        advertiser_ids = await dims.advertiser_ids(
+            session, [name for _, name in ads], create=True, in_session=True,
         )
-        persona_row = p_result.scalar_one_or_none()
-        if not persona_row:
-            _p = PERSONAS.get(_code)
-            _age = str(_p.age_group).replace("대", "") if _p and _p.age_group else "30"
-            _gender = "F" if (_p and _p.gender and "여" in _p.gender) else ("M" if _code[0:1] != "F" else "F")
-            persona_row = Persona(code=_code, age_group=_age, gender=_gender, login_type="none")
-            session.add(persona_row)
-            await session.flush()
 
         snap = AdSnapshot(
-            keyword_id=kw.id,
-            persona_id=persona_row.id if persona_row else None,
+            keyword_id=keyword_id,
+            persona_id=persona_id,
             device=device_type,
             channel=channel_name,
             captured_at=result.get("captured_at"),
@@ -393,28 +385,8 @@ async def save_to_db(channel_name, result, keyword_text, persona_code, device_ty
         session.add(snap)
         await session.flush()
 
-        korean_filtered = 0
-        for ad in result.get("ads", []):
-            # Korean filter: only store Korean-market ads
-            if not is_korean_ad(ad.get("ad_text"), ad.get("advertiser_name"),
-                                ad.get("brand"), ad.get("ad_description")):
-                korean_filtered += 1
-                continue
-
-            adv_name = clean_advertiser_name(ad.get("advertiser_name"))
-            # 추가 정리: URL, 도메인, 광고카피 제거
-            adv_name = clean_name_for_pipeline(adv_name) if adv_name else adv_name
-            advertiser_id = None
-            if adv_name:
-                adv_result = await session.execute(
-                    select(Advertiser).where(Advertiser.name == adv_name)
-                )
-                adv = adv_result.scalar_one_or_none()
-                if not adv:
-                    adv = Advertiser(name=adv_name)
-                    session.add(adv)
-                    await session.flush()
-                advertiser_id = adv.id
+        for ad, adv_name in ads:
+            advertiser_id = advertiser_ids.get(adv_name) if adv_name else None
 
             # extra_data 정규화
             raw_extra = ad.get("extra_data") or {}
@@ -438,7 +410,7 @@ async def save_to_db(channel_name, result, keyword_text, persona_code, device_ty
 
             detail = AdDetail(
                 snapshot_id=snap.id,
-                persona_id=persona_row.id,
+                persona_id=persona_id,
                 advertiser_id=advertiser_id,
                 advertiser_name_raw=adv_name,
                 ad_text=ad.get("ad_text"),
@@ -451,6 +423,8 @@ async def save_to_db(channel_name, result, keyword_text, persona_code, device_ty
                 verification_source=ad.get("verification_source"),
                 creative_image_path=ad.get("creative_image_path"),
                 creative_hash=c_hash,
+                creative_phash=await asyncio.to_thread(compute_perceptual_hash, ad.get("creative_image_path")),
+                **dedup_key_fields(channel_name, adv_name, ad.get("ad_text"), ad_url),
                 extra_data=normalized_extra,
                 is_contact=_is_contact(channel_name, ad),
             )
@@ -625,6 +599,14 @@ async def main():
 
     print(f"\n  TOTAL: {grand_total} collected -> {grand_promoted} promoted to live DB")
 
+    # 브라우저 풀 정리 (키워드마다 크롤러를 만들어도 브라우저는 재사용됨)
+    pool = get_browser_pool().metrics()
+    print(
+        f"  Browser pool: {pool['launches']} launches / {pool['leases']} contexts / "
+        f"{pool['lease_waits']} waits / recycled {pool['recycled_contexts'] + pool['recycled_rss']}"
+    )
+    await get_browser_pool().close()
+
     # Campaign & spend rebuild
     if grand_promoted > 0:
         print("\n  Rebuilding campaigns & spend estimates...", flush=True)
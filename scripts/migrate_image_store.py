@@ -0,0 +1,51 @@
+"""기존 날짜별 이미지 트리를 content-addressed blob 저장소로 제자리 이전.
+
+stored_images/<channel>/<YYYYMMDD>/<category>/*.webp → stored_images/blobs/ab/cd/<sha256>.webp
+ad_snapshots/ad_details 경로를 먼저 blob 경로로 갱신(커밋)한 뒤 파일을 옮기고
+같은 내용의 파일은 하나만 남긴 다음, image_blobs 인덱스의 참조 수를 DB 기준으로
+재계산합니다. 중간에 실패해도 재실행하면 남은 파일부터 이어서 처리합니다
+(이미 이전된 blob은 참조 수만 다시 맞춤). 크롤러를 멈춘 상태에서 실행하세요.
+
+사용법:
+    python scripts/migrate_image_store.py --dry-run   # 중복 규모만 계산
+    python scripts/migrate_image_store.py             # 이전 + 전/후 디스크·정리 비용 출력
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import init_db
+from processor.image_blobs import migrate_legacy_tree
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Migrate stored_images/ to content-addressed blobs")
+    parser.add_argument("--dir", default=None, help="이미지 저장소 경로 (기본: IMAGE_STORE_DIR 또는 stored_images)")
+    parser.add_argument("--dry-run", action="store_true", help="파일/DB 변경 없이 중복 규모만 계산")
+    parser.add_argument("--days", type=int, default=90, help="정리 조회 보존 기한 (일)")
+    args = parser.parse_args()
+
+    await init_db()
+    report = await migrate_legacy_tree(args.dir, dry_run=args.dry_run, older_than_days=args.days)
+
+    before, after, files = report["before"], report["after"], report["files"]
+    mb = 1024 * 1024
+    print(f"Image store: {report['base_dir']}{' (dry run)' if args.dry_run else ''}")
+    print(f"  legacy files:   {files['legacy_files']:,} ({files['duplicates']:,} duplicates)")
+    print(f"  DB paths:       {report['db_rows_updated']:,} rows {'to update' if args.dry_run else 'updated'}")
+    print(f"  disk before:    {before['files']:,} files / {before['bytes'] / mb:,.1f} MB")
+    print(f"  disk after:     {after['files']:,} files / {after['bytes'] / mb:,.1f} MB")
+    print(f"  cleanup before: tree walk {before['scan_sec']:.3f}s")
+    if not args.dry_run:
+        index = report["index"]
+        print(f"  cleanup after:  index query {after['cleanup_query_sec']:.3f}s "
+              f"({after['expired_blobs']:,} expired of {index['blobs']:,} blobs, "
+              f"{index['unreferenced']:,} unreferenced)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
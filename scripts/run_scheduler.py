@@ -44,6 +44,7 @@ logger.add(
     encoding="utf-8",
 )
 
+from crawler.browser_pool import get_browser_pool  # noqa: E402
 from crawler.stealth_patch import enable_stealth  # noqa: E402
 enable_stealth()  # playwright-stealth 전체 크롤러 적용
 
@@ -155,6 +156,7 @@ async def main():
     logger.info("Scheduler running. Ctrl+C to stop.")
     await _shutdown_event.wait()
 
+    await get_browser_pool().close()
     logger.info("Scheduler stopped.")
 
 
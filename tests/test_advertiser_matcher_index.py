@@ -0,0 +1,77 @@
+from pathlib import Path
+import random
+import sys
+
+from rapidfuzz import fuzz, process
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.advertiser_matcher import AdvertiserMatcher
+
+SYLLABLES = list("삼성전자엘지현대기아카드보험생명증권은행쇼핑몰스토어코리아") + ["(주)", " ", "㈜"]
+
+
+def _name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 9))).strip() or "가"
+
+
+def _perturb(rng: random.Random, name: str) -> str:
+    chars = list(name)
+    for _ in range(rng.randint(0, 2)):
+        op = rng.randrange(3)
+        pos = rng.randrange(len(chars) + 1)
+        if op == 0:
+            chars.insert(pos, rng.choice(SYLLABLES))
+        elif op == 1 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice(SYLLABLES)
+    return "".join(chars)
+
+
+def _brute_force(matcher: AdvertiserMatcher, raw_name: str):
+    """인덱스 도입 전 match()의 퍼지 단계 (전체 extractOne)."""
+    result = process.extractOne(raw_name, matcher._name_to_id.keys(), scorer=fuzz.token_sort_ratio)
+    if result and result[1] >= matcher.MATCH_THRESHOLD:
+        return matcher._name_to_id[result[0]], result[1]
+    return None, 0.0
+
+
+def _matcher(rng: random.Random, count: int) -> tuple[AdvertiserMatcher, list[str]]:
+    names = [_name(rng) for _ in range(count)]
+    matcher = AdvertiserMatcher()
+    matcher.load_advertisers([
+        {"id": i, "name": n, "aliases": [_perturb(rng, n)] if i % 5 == 0 else []}
+        for i, n in enumerate(names)
+    ])
+    return matcher, names
+
+
+def test_indexed_match_equals_full_scan():
+    rng = random.Random(5)
+    matcher, names = _matcher(rng, 800)
+    queries = [_perturb(rng, rng.choice(names)) for _ in range(400)] + [_name(rng) for _ in range(100)]
+
+    for q in queries:
+        if matcher._match_exact(q) is not None:
+            continue
+        assert matcher.match(q) == _brute_force(matcher, q), q
+
+
+def test_match_many_equals_match():
+    rng = random.Random(9)
+    matcher, names = _matcher(rng, 500)
+    queries = [_perturb(rng, rng.choice(names)) for _ in range(300)] + ["", "  "]
+    urls = [None] * len(queries)
+
+    expected = [matcher.match(q, u) for q, u in zip(queries, urls)]
+    assert matcher.match_many(queries, urls, workers=2, chunk_size=64) == expected
+
+
+def test_domain_match_wins_in_batch():
+    matcher = AdvertiserMatcher()
+    matcher.load_advertisers([{"id": 7, "name": "삼성전자", "website": "https://www.samsung.com"}])
+    assert matcher.match_many(["아무개", None], ["https://shop.samsung.com/x", None]) == [
+        (7, 100.0),
+        (None, 0.0),
+    ]
@@ -0,0 +1,84 @@
+import logging
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from api.latency import LatencyStats, RouteHistogram
+from api.main import RequestLoggingMiddleware, SecurityHeadersMiddleware
+
+
+def _app(stats: LatencyStats) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def body():
+            for i in range(3):
+                yield f"event {i}\n\n".encode()
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    app.add_middleware(RequestLoggingMiddleware, stats=stats)
+    app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def test_stream_chunks_pass_through_with_security_headers():
+    app = _app(LatencyStats())
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/stream", "raw_path": b"/api/stream", "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+
+    start = messages[0]
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    assert headers["x-frame-options"] == "DENY" and headers["x-content-type-options"] == "nosniff"
+    # 본문을 다시 감싸지 않음 → 청크가 그대로 개별 메시지로 전달
+    chunks = [m["body"] for m in messages[1:] if m.get("body")]
+    assert chunks == [b"event 0\n\n", b"event 1\n\n", b"event 2\n\n"]
+
+
+async def test_latency_histogram_per_route_template_and_log_line(caplog):
+    stats = LatencyStats()
+    app = _app(stats)
+    with caplog.at_level(logging.INFO, logger="adscope.api"):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            for i in range(5):
+                assert (await client.get(f"/api/items/{i}")).status_code == 200
+            assert (await client.get("/api/missing")).status_code == 404
+
+    routes = {(r["method"], r["route"]): r for r in stats.snapshot()["routes"]}
+    assert routes[("GET", "/api/items/{item_id}")]["count"] == 5
+    assert routes[("GET", "/api/items/{item_id}")]["status"] == {"2xx": 5}
+    assert routes[("GET", "<unmatched>")]["status"] == {"4xx": 1}
+    assert "GET /api/items/3 -> 200" in caplog.text
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    hist = RouteHistogram()
+    for ms in [3] * 90 + [40] * 9 + [20_000]:
+        hist.observe(ms, 200)
+    snap = hist.snapshot()
+    assert 2.5 < snap["p50_ms"] <= 5
+    assert 25 < snap["p95_ms"] <= 50
+    assert snap["p99_ms"] <= 50
+    assert snap["max_ms"] == 20_000 and snap["buckets"]["le_inf"] == 1
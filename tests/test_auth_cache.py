@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api import deps
+from api.auth_cache import PrincipalCache
+from database import get_db
+from database.models import Base, User, UserSession
+
+
+async def _app(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'auth.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    cache = PrincipalCache(ttl_seconds=60)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+
+    statements: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    async def _db():
+        async with factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = _db
+
+    @app.get("/me")
+    async def me(user: User = Depends(deps.get_current_user)):
+        return {"id": user.id, "name": user.name, "plan": user.plan}
+
+    @app.post("/rename")
+    async def rename(name: str, user: User = Depends(deps.get_current_user), db: AsyncSession = Depends(get_db)):
+        user.name = name
+        await db.commit()
+        cache.invalidate_user(user.id)
+        return {"ok": True}
+
+    @app.get("/paid")
+    async def paid(user: User = Depends(deps.require_paid)):
+        return {"ok": True}
+
+    async with factory() as session:
+        user = User(email="u@test.kr", hashed_password="x", name="before", role="viewer",
+                    is_active=True, plan="full", payment_confirmed=False,
+                    plan_expires_at=datetime.now(timezone.utc) + timedelta(days=3))
+        session.add(user)
+        await session.flush()
+        session.add(UserSession(user_id=user.id, session_token="sid-1", device_fingerprint="fp-1",
+                                is_active=True, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)))
+        await session.commit()
+        user_id = user.id
+
+    statements.clear()
+    token = deps.create_access_token(user_id, "u@test.kr", "viewer", "full", "sid-1")
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    client.headers.update({"Authorization": f"Bearer {token}", "X-Device-Fingerprint": "fp-1"})
+    return client, cache, factory, statements, user_id
+
+
+async def test_warm_requests_skip_db_and_updates_still_persist(tmp_path, monkeypatch):
+    client, cache, factory, statements, user_id = await _app(tmp_path, monkeypatch)
+    async with client:
+        assert (await client.get("/me")).json()["name"] == "before"
+        assert len(statements) == 2  # users + user_sessions
+
+        statements.clear()
+        for _ in range(5):
+            assert (await client.get("/me")).status_code == 200
+        assert statements == []
+        assert cache.stats()["hits"] == 5
+
+        # 캐시 적중으로 만든 user도 요청 세션 소속 → 수정이 UPDATE로 반영
+        assert (await client.post("/rename", params={"name": "after"})).status_code == 200
+        assert any(s.startswith("UPDATE users") for s in statements)
+        assert (await client.get("/me")).json()["name"] == "after"
+        assert (await client.get("/paid")).status_code == 403
+
+    async with factory() as session:
+        assert (await session.get(User, user_id)).name == "after"
+
+
+async def test_invalidated_session_and_fingerprint_mismatch_are_rejected(tmp_path, monkeypatch):
+    client, cache, factory, statements, user_id = await _app(tmp_path, monkeypatch)
+    async with client:
+        assert (await client.get("/me")).status_code == 200
+
+        # 캐시 적중 경로에서도 기기 지문 불일치 → 세션 폐기
+        resp = await client.get("/me", headers={"X-Device-Fingerprint": "other"})
+        assert resp.status_code == 401
+        async with factory() as session:
+            revoked = (await session.execute(select(UserSession))).scalar_one()
+            assert not revoked.is_active and revoked.revoke_reason == "fingerprint_mismatch"
+        assert (await client.get("/me")).status_code == 401
+
+
+def test_put_is_dropped_when_invalidated_during_lookup():
+    cache = PrincipalCache(ttl_seconds=60)
+    user = User(id=7, email="a@b.c", hashed_password="x", role="viewer", is_active=True)
+
+    generation = cache.generation
+    cache.invalidate_user(7)  # 조회 도중 로그아웃/플랜 변경
+    cache.put(user, "sid", None, generation)
+    assert cache.get(7, "sid") is None
+
+    cache.put(user, "sid", None, cache.generation)
+    assert cache.get(7, "sid").values["email"] == "a@b.c"
+    cache.invalidate_session(7, "sid")
+    assert cache.get(7, "sid") is None
+    assert PrincipalCache(ttl_seconds=0).get(7, "sid") is None
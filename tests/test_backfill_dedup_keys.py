@@ -0,0 +1,59 @@
+from datetime import datetime
+import importlib.util
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import AdDetail, Base, Industry, Keyword, Persona
+from processor.pipeline import save_crawl_results
+
+_spec = importlib.util.spec_from_file_location(
+    "backfill_dedup_keys", Path(__file__).resolve().parent.parent / "scripts" / "backfill_dedup_keys.py",
+)
+backfill_dedup_keys = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backfill_dedup_keys)
+
+
+async def test_backfill_reproduces_pipeline_text_keys(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'keys.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        industry = Industry(name="기타")
+        session.add(industry)
+        await session.flush()
+        session.add_all([
+            Keyword(industry_id=industry.id, keyword="대출"),
+            Persona(code="M30", age_group="30", gender="M", login_type="none"),
+        ])
+        await session.commit()
+
+    ads = [
+        # 정제되는 이름 / 그대로인 이름 — 키는 정제 후 이름 기준
+        {"advertiser_name": "(주)삼성전자", "ad_text": "갤럭시 사전예약", "url": "https://www.samsung.com/sec/"},
+        {"advertiser_name": "쿠팡", "ad_text": "로켓배송 특가", "url": "https://www.coupang.com/"},
+    ]
+    async with factory() as session:
+        await save_crawl_results(session, [{
+            "keyword": "대출", "persona_code": "M30", "device": "pc", "channel": "naver_search",
+            "captured_at": datetime(2026, 5, 1), "ads": ads,
+        }])
+    async with factory() as session:
+        expected = dict((await session.execute(select(AdDetail.id, AdDetail.text_key))).all())
+        await session.execute(update(AdDetail).values(text_key=None))
+        await session.commit()
+    assert len(expected) == 2 and all(expected.values())
+
+    result = await backfill_dedup_keys.backfill(factory)
+    assert result == {"processed": 2, "updated": 2}
+    async with factory() as session:
+        assert dict((await session.execute(select(AdDetail.id, AdDetail.text_key))).all()) == expected
+
+    # --all: 이미 맞는 키는 다시 쓰지 않음
+    assert await backfill_dedup_keys.backfill(factory, recompute_all=True) == {"processed": 2, "updated": 0}
+    await engine.dispose()
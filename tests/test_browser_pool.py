@@ -0,0 +1,145 @@
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import base_crawler
+from crawler.base_crawler import BaseCrawler
+from crawler.browser_pool import BrowserPool
+from crawler.config import CrawlerSettings
+
+
+class _Emitter:
+    def __init__(self):
+        self._handlers: dict[str, list] = {}
+
+    def on(self, event, handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def _emit(self, event):
+        for handler in self._handlers.get(event, []):
+            handler(self)
+
+
+class FakeContext(_Emitter):
+    def __init__(self, browser, options):
+        super().__init__()
+        self.browser = browser
+        self.options = options
+        self.closed = False
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            self._emit("close")
+
+
+class FakeBrowser(_Emitter):
+    def __init__(self, headless, chrome):
+        super().__init__()
+        self.profile = (headless, chrome)
+        self.closed = False
+
+    async def new_context(self, **options):
+        return FakeContext(self, options)
+
+    async def close(self):
+        self.closed = True
+        self._emit("disconnected")
+
+
+def _pool(**overrides) -> tuple[BrowserPool, list[FakeBrowser]]:
+    launched: list[FakeBrowser] = []
+
+    async def launcher(headless, chrome):
+        launched.append(FakeBrowser(headless, chrome))
+        return launched[-1]
+
+    settings = CrawlerSettings(**{
+        "max_concurrent_browsers": 2,
+        "browser_pool_contexts_per_browser": 2,
+        "browser_pool_recycle_after_contexts": 100,
+        "browser_pool_recycle_rss_mb": 0,
+        **overrides,
+    })
+    return BrowserPool(settings, launcher=launcher), launched
+
+
+async def test_pool_reuses_browsers_and_caps_launches():
+    pool, launched = _pool()
+    contexts = [await pool.new_context(headless=True, locale="ko-KR") for _ in range(5)]
+
+    # 2개 브라우저 x 2 컨텍스트 후 상한 → 한가한 브라우저에 추가
+    assert len(launched) == 2
+    assert contexts[0].options == {"locale": "ko-KR"}
+    assert pool.metrics()["active_contexts"] == 5
+    assert pool.metrics()["profiles"]["headless/chromium"]["browsers"] == 2
+
+    for context in contexts:
+        await context.close()
+    again = await pool.new_context(headless=True)
+    assert len(launched) == 2 and again.browser in launched
+    assert pool.metrics()["leases"] == 6
+
+    await pool.close()
+    assert all(b.closed for b in launched)
+    assert pool.metrics()["browsers"] == 0
+    assert pool.metrics()["disconnected"] == 0
+
+
+async def test_other_profile_waits_for_idle_browser_then_evicts():
+    pool, launched = _pool(max_concurrent_browsers=1)
+    headless = await pool.new_context(headless=True)
+
+    waiter = asyncio.create_task(pool.new_context(headless=False, chrome=True))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert pool.metrics()["lease_waits"] == 1
+
+    await headless.close()
+    headful = await asyncio.wait_for(waiter, 1)
+    assert headful.browser.profile == (False, True)
+    assert launched[0].closed
+    assert pool.metrics()["evicted"] == 1
+    assert pool.metrics()["profiles"] == {"headful/chrome": {"browsers": 1, "active_contexts": 1, "served": 1}}
+    await pool.close()
+
+
+async def test_browser_recycled_after_n_contexts_once_idle():
+    pool, launched = _pool(browser_pool_recycle_after_contexts=2, browser_pool_contexts_per_browser=4)
+    first = await pool.new_context(headless=True)
+    second = await pool.new_context(headless=True)
+    third = await pool.new_context(headless=True)
+    assert second.browser is launched[0]
+    assert third.browser is launched[1]  # 은퇴 예정 브라우저에는 더 배정하지 않음
+
+    await first.close()
+    assert not launched[0].closed  # 진행 중 컨텍스트가 있으면 유지
+    await second.close()
+    await asyncio.sleep(0)
+    assert launched[0].closed
+    assert pool.metrics()["recycled_contexts"] == 1
+    assert pool.metrics()["browsers"] == 1
+    await pool.close()
+
+
+async def test_crawler_leases_from_pool_and_returns_on_stop(monkeypatch):
+    pool, launched = _pool()
+    monkeypatch.setattr(base_crawler, "get_browser_pool", lambda: pool)
+
+    class _Crawler(BaseCrawler):
+        channel = "naver_da"
+
+        async def crawl_keyword(self, keyword, persona_code, device_type="pc"):
+            return {}
+
+    for _ in range(3):
+        async with _Crawler() as crawler:
+            leaked = await crawler._new_context(locale="ko-KR")
+        assert leaked.closed
+
+    assert len(launched) == 1
+    assert pool.metrics()["leases"] == 3
+    assert pool.metrics()["active_contexts"] == 0
+    await pool.close()
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import (
+    ActivityScore, AdDetail, AdSnapshot, Advertiser, Base, BrandChannelContent, Campaign, ChannelStats, Industry,
+    Keyword, MetaSignalComposite, NewsMention, PanelObservation, Persona, SmartStoreSnapshot, SocialImpactScore,
+    TrafficSignal,
+)
+from processor.activity_scorer import calculate_activity_scores
+from processor.meta_signal_aggregator import aggregate_meta_signals
+from processor.social_impact_scorer import calculate_social_impact_scores
+
+NOW = datetime.utcnow().replace(microsecond=0)
+TODAY = datetime(NOW.year, NOW.month, NOW.day)
+CHANNELS = ["naver_search", "naver_da", "kakao_da", "mobile_gdn", "instagram", "tiktok_ads"]
+
+
+async def _seed(session, rng: random.Random, advertisers: int = 30):
+    await session.execute(text(
+        "CREATE TABLE serpapi_ads (advertiser_name TEXT, extra_data TEXT, collected_at TEXT)"
+    ))
+    await session.execute(
+        text("INSERT INTO serpapi_ads VALUES (:name, :extra, :at)"),
+        [
+            {"name": "stealth_x", "extra": json.dumps({"network": net, "persona": f"p{i % 3}"}),
+             "at": (NOW - timedelta(days=1)).isoformat()}
+            for i, net in enumerate(["gdn"] * 40 + ["naver"] * 9 + ["meta"] * 4)
+        ],
+    )
+    await session.execute(insert(Industry), [{"id": 1, "name": "뷰티"}])
+    await session.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "선크림"}])
+    await session.execute(insert(Persona), [
+        {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+    ])
+    await session.execute(insert(Advertiser), [
+        {"id": a, "name": f"광고주{a}", "aliases": []} for a in range(1, advertisers + 1)
+    ])
+    ago = lambda days: NOW - timedelta(days=days, hours=rng.randint(0, 20))  # noqa: E731
+    for a in range(1, advertisers + 1):
+        for _ in range(rng.randint(0, 4)):
+            await session.execute(insert(Campaign), [{
+                "advertiser_id": a, "channel": rng.choice(CHANNELS),
+                "first_seen": ago(rng.randint(5, 40)), "last_seen": ago(rng.randint(0, 20)),
+                "is_active": rng.choice([True, True, False, None]),
+            }])
+        for _ in range(rng.randint(0, 3)):
+            await session.execute(insert(AdSnapshot), [{
+                "keyword_id": 1, "persona_id": 1, "channel": "naver_search", "device": "pc",
+                "captured_at": ago(rng.randint(0, 10)),
+            }])
+            snap_id = (await session.execute(select(AdSnapshot.id).order_by(AdSnapshot.id.desc()))).first()[0]
+            await session.execute(insert(AdDetail), [
+                {"snapshot_id": snap_id, "advertiser_id": a, "ad_text": f"문구{rng.randint(0, 3)}"}
+                for _ in range(rng.randint(1, 4))
+            ])
+        for i in range(rng.randint(0, 5)):
+            await session.execute(insert(BrandChannelContent), [{
+                "advertiser_id": a, "platform": "youtube", "channel_url": "u", "content_id": f"{a}-{i}",
+                "upload_date": ago(rng.randint(0, 15)),
+            }])
+        for _ in range(rng.randint(0, 3)):
+            await session.execute(insert(ChannelStats), [{
+                "advertiser_id": a, "platform": "youtube", "channel_url": "u",
+                "engagement_rate": rng.uniform(0, 5), "collected_at": ago(rng.randint(0, 15)),
+            }])
+        for i in range(rng.randint(0, 3)):
+            await session.execute(insert(NewsMention), [{
+                "advertiser_id": a, "source": "naver_news", "article_url": f"n/{a}/{i}",
+                "sentiment_score": rng.uniform(-1, 1), "collected_at": ago(rng.randint(0, 10)),
+            }])
+        for d in rng.sample(range(0, 20), rng.randint(0, 4)):
+            await session.execute(insert(TrafficSignal), [{
+                "advertiser_id": a, "date": TODAY - timedelta(days=d),
+                "composite_index": rng.choice([None, rng.uniform(0, 100)]), "wow_change_pct": rng.uniform(-50, 50),
+            }])
+        for _ in range(rng.randint(0, 2)):
+            await session.execute(insert(SmartStoreSnapshot), [{
+                "advertiser_id": a, "captured_at": ago(rng.randint(0, 2)), "review_delta": rng.randint(0, 30),
+            }])
+        for _ in range(rng.randint(0, 4)):
+            await session.execute(insert(PanelObservation), [{
+                "advertiser_id": a, "panel_type": rng.choice(["ai", "human"]), "panel_id": "x",
+                "observed_at": ago(rng.randint(0, 9)),
+            }])
+        if rng.random() < 0.5:
+            await session.execute(insert(ActivityScore), [{
+                "advertiser_id": a, "date": TODAY - timedelta(days=rng.randint(1, 3)),
+                "composite_score": rng.uniform(0, 100),
+            }])
+    await session.commit()
+
+
+async def _rows(session, model):
+    columns = [c for c in model.__table__.columns if c.name != "id"]
+    result = await session.execute(select(*columns).where(model.date == TODAY).order_by(model.advertiser_id))
+    return [tuple(r) for r in result.all()]
+
+
+async def test_bulk_mode_matches_per_advertiser_mode(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'scores.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await _seed(session, random.Random(3))
+
+    for job, model in (
+        (calculate_activity_scores, ActivityScore),
+        (aggregate_meta_signals, MetaSignalComposite),
+        (calculate_social_impact_scores, SocialImpactScore),
+    ):
+        async with factory() as session:
+            per_advertiser = await job(session=session, bulk=False)
+            expected = await _rows(session, model)
+            await session.execute(delete(model).where(model.date == TODAY))
+            await session.commit()
+
+            bulk = await job(session=session, bulk=True)
+            assert bulk["created"] == per_advertiser["created"] > 0
+            assert await _rows(session, model) == expected
+
+            # 같은 날 재실행은 UPDATE
+            again = await job(session=session, bulk=True)
+            assert (again["created"], again["updated"]) == (0, bulk["processed"])
+            assert await _rows(session, model) == expected
+    await engine.dispose()
+
+
+async def test_no_active_advertisers_returns_same_shape(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'empty.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("CREATE TABLE serpapi_ads (advertiser_name TEXT, extra_data TEXT, collected_at TEXT)"))
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    for job in (calculate_activity_scores, aggregate_meta_signals, calculate_social_impact_scores):
+        async with factory() as session:
+            result = await job(session=session)
+        assert set(result) == {"processed", "created", "updated", "elapsed_ms"}
+        assert result["processed"] == result["created"] == result["updated"] == 0
+        assert result["elapsed_ms"] >= 0
+    await engine.dispose()
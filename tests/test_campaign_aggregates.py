@@ -0,0 +1,86 @@
+from datetime import date, datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.campaign_builder import _aggregate_rows
+
+
+def _row(**overrides):
+    values = {
+        "advertiser_id": 1,
+        "keyword_id": 10,
+        "channel": "naver_search",
+        "snapshot_id": 100,
+        "captured_at": datetime(2026, 3, 1, 9),
+        "position": 2,
+        "position_zone": "top",
+        "is_inhouse": False,
+        "ad_placement": "powerlink",
+        "is_contact": True,
+        "view_count": None,
+        "upload_date": None,
+        "seen_count": 1,
+        "first_seen_at": None,
+        "last_seen_at": None,
+    }
+    values.update(overrides)
+    return tuple(values.values())
+
+
+def test_hits_are_spread_over_observed_days():
+    rows = [
+        _row(seen_count=7, first_seen_at=datetime(2026, 3, 1, 23), last_seen_at=datetime(2026, 3, 3, 1)),
+        _row(snapshot_id=101, keyword_id=11, position=None, position_zone="", is_inhouse=True),
+        _row(snapshot_id=100, keyword_id=11, channel="google_gdn", seen_count=None),
+    ]
+    aggregates = _aggregate_rows(rows)
+
+    naver = aggregates[(1, "naver_search")]
+    assert naver.first_seen == datetime(2026, 3, 1, 9)
+    assert naver.last_seen == datetime(2026, 3, 3, 1)
+    assert naver.ad_occurrences == 8
+    assert naver.snapshot_ids.tolist() == [100, 101]
+    assert naver.has_inhouse and naver.has_contact
+    assert naver.placements == {"powerlink"}
+    # 7 hits / 3 days -> 2 per day; 인하우스 행은 captured_at 하루에만 1 hit
+    by_day = naver.by_day
+    assert list(by_day) == [date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)]
+    assert by_day[date(2026, 3, 1)].ad_hits == 3
+    assert by_day[date(2026, 3, 1)].inhouse_count == 1
+    assert by_day[date(2026, 3, 1)].position_count == 1
+    assert by_day[date(2026, 3, 1)].zone_counts == {"top": 1}
+    assert by_day[date(2026, 3, 3)].avg_position == 2
+    # 10/11 동률 -> 먼저 관측된 10
+    assert naver.dominant_keyword_id == 10
+
+    gdn = aggregates[(1, "google_gdn")]
+    assert gdn.ad_occurrences == 1
+    assert gdn.active_days == 1
+    assert gdn.dominant_keyword_id == 11
+
+
+def test_reversed_range_contributes_no_days():
+    rows = [_row(first_seen_at=datetime(2026, 3, 5), last_seen_at=datetime(2026, 3, 4))]
+    agg = _aggregate_rows(rows)[(1, "naver_search")]
+    assert agg.active_days == 0
+    assert agg.ad_occurrences == 1
+
+
+def test_view_counts_only_recent_large_uploads():
+    today = datetime.utcnow().strftime("%Y%m%d")
+    rows = [
+        _row(channel="youtube_ads", view_count=250_000, upload_date=today),
+        _row(channel="youtube_ads", view_count=300_000, upload_date="20000101"),
+        _row(channel="youtube_ads", view_count=5_000, upload_date=today),
+        _row(channel="youtube_ads", view_count=400_000, upload_date=""),
+    ]
+    agg = _aggregate_rows(rows)[(1, "youtube_ads")]
+    assert agg.max_view_count == 400_000
+    assert agg.total_view_count == 250_000
+    assert agg.view_count_sources == 1
+
+
+def test_empty_rows():
+    assert _aggregate_rows([]) == {}
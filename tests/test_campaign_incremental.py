@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import (
+    AdDetail, AdSnapshot, Advertiser, Base, BuildWatermark, Campaign, Industry, Keyword, Persona, SpendEstimate,
+)
+from processor import advertiser_name_cleaner, campaign_builder
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _watermark(**overrides) -> BuildWatermark:
+    values = {
+        "name": "campaign_spend",
+        "last_id": 100,
+        "last_seen_at": NOW - timedelta(minutes=30),
+        "params": {"excluded_channels": ["youtube_ads"]},
+        "last_full_at": NOW - timedelta(hours=3),
+    }
+    values.update(overrides)
+    return BuildWatermark(**values)
+
+
+def test_incremental_allowed_with_fresh_watermark(monkeypatch):
+    monkeypatch.delenv("CAMPAIGN_FULL_REBUILD_HOURS", raising=False)
+    assert campaign_builder._full_rebuild_reason(_watermark(), {"youtube_ads"}, NOW) is None
+
+
+@pytest.mark.parametrize(
+    ("watermark", "excluded", "reason"),
+    [
+        (None, set(), "no_watermark"),
+        (_watermark(last_seen_at=None), {"youtube_ads"}, "no_watermark"),
+        (_watermark(), {"google_gdn"}, "excluded_channels_changed"),
+        (_watermark(last_full_at=NOW - timedelta(hours=25)), {"youtube_ads"}, "periodic"),
+        (_watermark(last_full_at=None), {"youtube_ads"}, "periodic"),
+    ],
+)
+def test_full_rebuild_reasons(monkeypatch, watermark, excluded, reason):
+    monkeypatch.delenv("CAMPAIGN_FULL_REBUILD_HOURS", raising=False)
+    assert campaign_builder._full_rebuild_reason(watermark, excluded, NOW) == reason
+
+
+def test_full_rebuild_hours_env(monkeypatch):
+    monkeypatch.setenv("CAMPAIGN_FULL_REBUILD_HOURS", "2")
+    assert campaign_builder._full_rebuild_reason(_watermark(), {"youtube_ads"}, NOW) == "periodic"
+    monkeypatch.setenv("CAMPAIGN_FULL_REBUILD_HOURS", "abc")
+    assert campaign_builder._full_rebuild_reason(_watermark(), {"youtube_ads"}, NOW) is None
+
+
+# ── DB 수준: 증분 재빌드 결과 == 같은 데이터의 전체 재빌드 결과 ──
+
+_DAY = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+
+# (광고주명, 채널, 노출 시작 일수 전, 노출 일수, seen_count)
+_BATCH_1 = [
+    ("삼성전자", "naver_search", 6, 3, 4),
+    ("삼성전자", "naver_search", 5, 1, 1),
+    ("쿠팡", "google_gdn", 4, 2, 2),
+    ("현대자동차", "kakao_da", 3, 1, 1),
+]
+_BATCH_2 = [
+    ("삼성전자", "kakao_da", 1, 1, 2),   # 기존 광고주의 새 채널
+    ("무신사", "naver_search", 1, 1, 1),  # 새 광고주
+]
+_BUMPED = "쿠팡"  # batch 2 사이에 기존 소재 재노출(seen bump)만 있는 광고주
+_BUMPED_AT = datetime.utcnow()  # 워터마크 겹침(_WATERMARK_OVERLAP) 안의 크롤 시각
+
+
+async def _engine(tmp_path, name, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / name).as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(campaign_builder, "async_session", factory)
+    monkeypatch.setattr(advertiser_name_cleaner, "async_session", factory)
+    async with factory() as session:
+        industry = Industry(name="전자")
+        session.add(industry)
+        await session.flush()
+        session.add_all([
+            Keyword(industry_id=industry.id, keyword="스마트폰"),
+            Persona(code="M30", age_group="30", gender="M", login_type="none"),
+        ])
+        await session.commit()
+    return engine, factory
+
+
+async def _seed(factory, batch):
+    async with factory() as session:
+        for i, (name, channel, days_ago, span, seen) in enumerate(batch):
+            first = _DAY - timedelta(days=days_ago)
+            snapshot = AdSnapshot(keyword_id=1, persona_id=1, device="pc", channel=channel, captured_at=first)
+            session.add(snapshot)
+            await session.flush()
+            session.add(AdDetail(
+                snapshot_id=snapshot.id, persona_id=1, channel=channel, advertiser_name_raw=name,
+                ad_text=f"{name} 광고 {i}", url=f"https://ad{i}.example.co.kr/{channel}",
+                first_seen_at=first, last_seen_at=first + timedelta(days=span - 1), seen_count=seen,
+            ))
+        await session.commit()
+
+
+async def _bump(factory):
+    async with factory() as session:
+        await session.execute(
+            update(AdDetail)
+            .where(AdDetail.advertiser_name_raw == _BUMPED)
+            .values(seen_count=AdDetail.seen_count + 3, last_seen_at=_BUMPED_AT)
+        )
+        await session.commit()
+
+
+async def _state(factory):
+    async with factory() as session:
+        names = dict((await session.execute(select(Advertiser.id, Advertiser.name))).all())
+        campaigns = {
+            (names[c.advertiser_id], c.channel): (
+                c.first_seen, c.last_seen, c.is_active, c.status, c.total_est_spend,
+                c.snapshot_count, c.channels, c.spend_category, c.extra_data, c.creative_ids,
+            )
+            for c in (await session.execute(select(Campaign))).scalars()
+        }
+        spend = sorted(
+            (names[adv_id], channel, day, amount, confidence, method)
+            for adv_id, channel, day, amount, confidence, method in (await session.execute(
+                select(Campaign.advertiser_id, SpendEstimate.channel, SpendEstimate.date,
+                       SpendEstimate.est_daily_spend, SpendEstimate.confidence, SpendEstimate.calculation_method)
+                .join(Campaign, Campaign.id == SpendEstimate.campaign_id)
+            )).all()
+        )
+    return campaigns, spend
+
+
+async def test_incremental_rebuild_matches_full_rebuild(tmp_path, monkeypatch):
+    monkeypatch.delenv("CAMPAIGN_EXCLUDED_CHANNELS", raising=False)
+    monkeypatch.delenv("CAMPAIGN_FULL_REBUILD_HOURS", raising=False)
+
+    engine, factory = await _engine(tmp_path, "incremental.db", monkeypatch)
+    await _seed(factory, _BATCH_1)
+    first = await campaign_builder.rebuild_campaigns_and_spend(incremental=True)
+    assert first["incremental"] == 0  # 워터마크 없음 → 전체
+    await _seed(factory, _BATCH_2)
+    await _bump(factory)
+    second = await campaign_builder.rebuild_campaigns_and_spend(incremental=True)
+    assert second["incremental"] == 1
+    assert second["touched_advertisers"] == 3  # 삼성전자(새 채널), 무신사(신규), 쿠팡(seen bump)
+    incremental = await _state(factory)
+    await engine.dispose()
+
+    engine, factory = await _engine(tmp_path, "full.db", monkeypatch)
+    await _seed(factory, _BATCH_1)
+    await _seed(factory, _BATCH_2)
+    await _bump(factory)
+    full = await campaign_builder.rebuild_campaigns_and_spend(incremental=False)
+    assert full["incremental"] == 0
+    expected = await _state(factory)
+    await engine.dispose()
+
+    assert incremental[0].keys() == expected[0].keys()
+    assert ("무신사", "naver_search") in expected[0] and expected[1]
+    assert incremental == expected
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import (
+    AdDetail, AdSnapshot, Advertiser, Base, Campaign, Industry, Keyword, Persona,
+    SpendEstimate,
+)
+from processor import competitor_mapper
+from processor.competitor_mapper import (
+    _jaccard,
+    _position_similarity,
+    _spend_similarity,
+    calculate_competitor_affinity,
+)
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+# (snapshot_id, days_ago, channel, keyword_id, [(advertiser_id, position_zone), ...])
+SNAPSHOTS = [
+    (1, 1, "naver_search", 1, [(1, "top"), (2, "top"), (3, "middle")]),
+    (2, 2, "naver_search", 2, [(1, "middle"), (2, "bottom"), (4, "top")]),
+    (3, 3, "google_gdn", 1, [(1, "top"), (3, None), (4, "top")]),
+    (4, 4, "kakao_da", 3, [(2, "top"), (4, "middle")]),
+    (5, 90, "naver_search", 1, [(1, "top"), (5, "top")]),   # 기간 밖
+]
+INDUSTRY = {1: 1, 2: 1, 3: None, 4: 2, 5: 1, 6: 1}
+SPEND = {1: 100_000.0, 2: 80_000.0, 4: 10_000.0}
+
+
+def _expected(target: int, days: int = 30) -> dict[int, tuple]:
+    """기존 스칼라 헬퍼로 계산한 기대값 (동시 노출은 조회 기간 내 스냅샷 기준)."""
+    recent = [s for s in SNAPSHOTS if s[1] < days]
+    keywords, channels, zones, snaps = {}, {}, {}, {}
+    for snap_id, _, channel, keyword_id, ads in recent:
+        for adv, zone in ads:
+            keywords.setdefault(adv, set()).add(keyword_id)
+            channels.setdefault(adv, set()).add(channel)
+            snaps.setdefault(adv, set()).add(snap_id)
+            if zone:
+                zones.setdefault(adv, {}).setdefault(zone, 0)
+                zones[adv][zone] += 1
+    candidates = {a for a in keywords if keywords[a] & keywords.get(target, set())}
+    if INDUSTRY[target]:
+        candidates |= {a for a, ind in INDUSTRY.items() if ind == INDUSTRY[target]}
+    candidates.discard(target)
+    cooccur = {c: len(snaps.get(c, set()) & snaps.get(target, set())) for c in candidates}
+    max_cooccur = max([v for v in cooccur.values() if v] or [1])
+    out = {}
+    for c in candidates:
+        parts = (
+            _jaccard(keywords.get(target, set()), keywords.get(c, set())),
+            _jaccard(channels.get(target, set()), channels.get(c, set())),
+            _position_similarity(zones.get(target, {}), zones.get(c, {})),
+            _spend_similarity(SPEND.get(target, 0.0), SPEND.get(c, 0.0)),
+            cooccur[c] / max_cooccur * 100.0,
+        )
+        affinity = sum(p * w for p, w in zip(parts, (0.30, 0.20, 0.15, 0.20, 0.15)))
+        out[c] = (round(affinity, 2), *(round(p, 2) for p in parts[:4]), cooccur[c])
+    return out
+
+
+async def _session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'affinity.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(competitor_mapper, "async_session", factory)
+    async with factory() as session:
+        await session.execute(insert(Industry), [{"id": 1, "name": "뷰티"}, {"id": 2, "name": "패션"}])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+        ])
+        await session.execute(insert(Keyword), [
+            {"id": k, "industry_id": 1, "keyword": f"키워드{k}"} for k in (1, 2, 3)
+        ])
+        await session.execute(insert(Advertiser), [
+            {"id": a, "name": f"광고주{a}", "industry_id": ind, "aliases": []} for a, ind in INDUSTRY.items()
+        ])
+        for snap_id, days_ago, channel, keyword_id, ads in SNAPSHOTS:
+            await session.execute(insert(AdSnapshot), [{
+                "id": snap_id, "keyword_id": keyword_id, "persona_id": 1, "channel": channel,
+                "device": "pc", "captured_at": NOW - timedelta(days=days_ago),
+            }])
+            await session.execute(insert(AdDetail), [
+                {"snapshot_id": snap_id, "advertiser_id": adv, "advertiser_name_raw": f"광고주{adv}",
+                 "position_zone": zone}
+                for adv, zone in ads
+            ])
+        for adv, spend in SPEND.items():
+            await session.execute(insert(Campaign), [{
+                "id": adv, "advertiser_id": adv, "channel": "naver_search", "first_seen": NOW, "last_seen": NOW,
+            }])
+            await session.execute(insert(SpendEstimate), [{
+                "campaign_id": adv, "date": NOW - timedelta(days=1), "channel": "naver_search",
+                "est_daily_spend": spend,
+            }])
+        await session.commit()
+    return engine, factory
+
+
+def _as_tuples(scores):
+    return {
+        s.competitor_id: (
+            s.affinity_score, s.keyword_overlap, s.channel_overlap,
+            s.position_zone_overlap, s.spend_similarity, s.co_occurrence_count,
+        )
+        for s in scores
+    }
+
+
+async def test_vectorized_scores_match_scalar_reference(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    async with factory() as db:
+        for target in (1, 2, 3, 4):
+            scores = await calculate_competitor_affinity(db, target, days=30, limit=100)
+            assert _as_tuples(scores) == _expected(target)
+            assert [s.affinity_score for s in scores] == sorted((s.affinity_score for s in scores), reverse=True)
+        # 기간 내 활동 없는 광고주: 같은 업종 후보만 (키워드/동시노출 0)
+        inactive = await calculate_competitor_affinity(db, 6, days=30, limit=100)
+        assert {s.competitor_id for s in inactive} == {1, 2, 5}
+        assert all(s.co_occurrence_count == 0 for s in inactive)
+    await engine.dispose()
+
+
+async def test_precomputed_table_served_with_on_demand_fallback(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    stats = await competitor_mapper.precompute_competitor_affinities(days=30, top_n=2)
+    assert stats["targets"] == 4
+
+    async with factory() as db:
+        on_demand = await calculate_competitor_affinity(db, 1, days=30, limit=2, use_precomputed=False)
+        assert await competitor_mapper.load_precomputed_affinity(db, 1, days=30, limit=2) == on_demand
+        assert await calculate_competitor_affinity(db, 1, days=30, limit=2) == on_demand
+
+        # top_n보다 깊은 조회, 다른 기간, 오래된 사전 계산은 즉시 계산으로 대체
+        assert await competitor_mapper.load_precomputed_affinity(db, 1, days=30, limit=3) is None
+        assert await competitor_mapper.load_precomputed_affinity(db, 1, days=7, limit=2) is None
+        monkeypatch.setenv("COMPETITOR_AFFINITY_MAX_AGE_HOURS", "0")
+        assert await competitor_mapper.load_precomputed_affinity(db, 1, days=30, limit=2) is None
+        assert _as_tuples(await calculate_competitor_affinity(db, 1, days=30, limit=100)) == _expected(1)
+    await engine.dispose()
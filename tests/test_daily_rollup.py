@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import AdDetail, AdSnapshot, Advertiser, Base, Industry, Keyword, Persona
+from processor import daily_rollup
+from processor.contact_rate import calculate_contact_rates
+from processor.persona_ranking import calculate_persona_heatmap
+from processor.sov_analyzer import calculate_sov
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+async def _session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'rollup.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(daily_rollup, "async_session", factory)
+    async with factory() as session:
+        await session.execute(insert(Industry), [{"id": 1, "name": "뷰티"}])
+        await session.execute(insert(Keyword), [
+            {"id": 1, "industry_id": 1, "keyword": "선크림"},
+            {"id": 2, "industry_id": 1, "keyword": "토너"},
+        ])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+            {"id": 2, "code": "F30", "age_group": "30대", "gender": "female", "login_type": "none"},
+        ])
+        await session.execute(insert(Advertiser), [
+            {"id": i, "name": f"광고주{i}", "aliases": []} for i in (1, 2, 3)
+        ])
+        await session.commit()
+    return engine, factory
+
+
+async def _add_snapshot(session, snap_id, captured_at, channel, keyword_id, persona_id, ads):
+    await session.execute(insert(AdSnapshot), [{
+        "id": snap_id, "keyword_id": keyword_id, "persona_id": persona_id, "channel": channel,
+        "device": "pc", "captured_at": captured_at,
+    }])
+    if ads:
+        await session.execute(insert(AdDetail), [
+            {
+                "snapshot_id": snap_id,
+                "advertiser_id": adv,
+                "advertiser_name_raw": f"광고주{adv}",
+                "position_zone": zone,
+                "ad_type": "text",
+                "is_inhouse": inhouse,
+                "is_contact": contact,
+            }
+            for adv, zone, inhouse, contact in ads
+        ])
+
+
+async def _seed(session):
+    days_ago = lambda d: NOW.replace(hour=6) - timedelta(days=d)  # noqa: E731
+    await _add_snapshot(session, 1, days_ago(3), "naver_search", 1, 1, [
+        (1, "top", False, True), (2, "middle", False, True), (1, "bottom", True, False),
+    ])
+    await _add_snapshot(session, 2, days_ago(2), "naver_search", 2, 2, [
+        (2, "top", False, True), (3, None, False, False), (1, "top", None, True),
+    ])
+    await _add_snapshot(session, 3, days_ago(2), "google_gdn", 1, 2, [(3, "top", False, True)])
+    await _add_snapshot(session, 4, days_ago(1), "google_gdn", 2, 1, [])
+    await session.commit()
+
+
+async def test_full_then_incremental_refresh_matches_raw(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    async with factory() as session:
+        await _seed(session)
+
+    stats = await daily_rollup.refresh_daily_rollups()
+    assert stats["full"] and stats["reason"] == "no_watermark"
+    assert (await daily_rollup.check_daily_rollups(days=30))["consistent"]
+
+    async with factory() as session:
+        await _add_snapshot(session, 5, NOW, "naver_search", 1, 1, [(2, "top", False, True)])
+        await session.commit()
+    assert not (await daily_rollup.check_daily_rollups(days=30))["consistent"]
+
+    stats = await daily_rollup.refresh_daily_rollups()
+    assert not stats["full"]
+    assert stats["refreshed_day_channels"] == 1
+    assert (await daily_rollup.check_daily_rollups(days=30))["consistent"]
+    await engine.dispose()
+
+
+async def test_analytics_read_same_numbers_from_rollups(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    async with factory() as session:
+        await _seed(session)
+    await daily_rollup.refresh_daily_rollups()
+
+    async def _run():
+        async with factory() as db:
+            return (
+                await calculate_sov(db, days=30),
+                await calculate_sov(db, keyword="선크림", days=30),
+                await calculate_contact_rates(db, days=30),
+                await calculate_persona_heatmap(db, days=30),
+            )
+
+    monkeypatch.delenv("ENABLE_DAILY_ROLLUPS", raising=False)
+    raw = await _run()
+    monkeypatch.setenv("ENABLE_DAILY_ROLLUPS", "true")
+    rolled = await _run()
+
+    sort_key = lambda x: repr(x)  # noqa: E731
+    for raw_result, rollup_result in zip(raw, rolled):
+        assert raw_result, "seed data should produce results"
+        assert sorted(raw_result, key=sort_key) == sorted(rollup_result, key=sort_key)
+    await engine.dispose()
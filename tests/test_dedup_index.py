@@ -0,0 +1,190 @@
+import copy
+from datetime import datetime
+from pathlib import Path
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import AdDetail, AdSnapshot, Base, Industry, Keyword, Persona
+from processor.dedup import DedupIndex, dedup_key_fields
+from processor.pipeline import save_crawl_results, save_crawl_results_bulk
+
+
+def _row(channel="naver_search", c_hash="h1", name="광고주", text="광고 문구", url="https://a.co.kr"):
+    return {
+        "creative_hash": c_hash,
+        "advertiser_name_raw": name,
+        "ad_text": text,
+        "url": url,
+        **dedup_key_fields(channel, name, text, url),
+        "seen_count": 1,
+        "last_seen_at": datetime(2026, 1, 1),
+    }
+
+
+def test_pending_row_is_found_and_bumped_in_place():
+    index = DedupIndex()
+    row = _row()
+    index.add_pending(row)
+
+    ref = index.find("naver_search", "h1", None, None, None)
+    assert ref is row
+
+    seen_at = datetime(2026, 1, 2)
+    index.bump(ref, seen_at)
+    assert row["seen_count"] == 2
+    assert row["last_seen_at"] == seen_at
+    assert index.seen_updates == 0
+
+
+def test_cross_channel_uses_stored_channel():
+    index = DedupIndex()
+    index.add_pending(_row(channel="youtube_ads", c_hash="yt"))
+
+    assert index.is_cross_channel("yt", "youtube_surf") is True
+    assert index.is_cross_channel("yt", "youtube_ads") is False
+    assert index.is_cross_channel(None, "youtube_surf") is False
+
+
+def test_text_fallback_matches_normalized_text_key():
+    index = DedupIndex()
+    index.add_pending(_row(channel="kakao_da", c_hash=None, name="광고주", text="문구"))
+
+    # compute_text_hash: 광고주명 대소문자/URL 쿼리스트링 무시
+    assert index.find("kakao_da", None, "광고주", "문구", "https://A.co.kr?utm=1") is not None
+    assert index.find("google_gdn", None, "광고주", "문구", "https://a.co.kr") is None
+    assert index.find("kakao_da", None, None, None, None) is None
+
+
+def test_bump_existing_id_accumulates():
+    index = DedupIndex()
+    index.bump(10, datetime(2026, 1, 1))
+    index.bump(10, datetime(2026, 1, 3))
+    index.bump(11)
+    assert index.seen_updates == 3  # bump 횟수 합계 (광고 2건)
+
+
+async def test_flush_seen_returns_summed_increment(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'seen.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        ad = AdDetail(snapshot_id=1, seen_count=1)
+        session.add(ad)
+        await session.flush()
+
+        index = DedupIndex()
+        index.bump(ad.id, datetime(2026, 1, 2))
+        index.bump(ad.id, datetime(2026, 1, 3))
+        assert await index.flush_seen(session) == 2
+        assert index.seen_updates == 0
+        row = (await session.execute(select(AdDetail.seen_count, AdDetail.last_seen_at))).one()
+        assert tuple(row) == (3, datetime(2026, 1, 3))
+    await engine.dispose()
+
+
+# ── DB 수준: save_crawl_results(행 단위) == save_crawl_results_bulk ──
+
+def _crawl(channel: str, ads: list[dict], hour: int, keyword: str = "선크림") -> dict:
+    return {
+        "keyword": keyword, "persona_code": "M30", "device": "pc", "channel": channel,
+        "captured_at": datetime(2026, 5, 1, hour), "ads": ads,
+    }
+
+
+def _ad(n: int, **extra) -> dict:
+    return {
+        "advertiser_name": f"광고주{n}", "ad_text": f"여름 자외선 차단 {n}",
+        "url": f"https://shop{n}.example.co.kr/?utm_source=x", **extra,
+    }
+
+
+def _batches(tmp_path) -> list[list[dict]]:
+    banner = tmp_path / "banner.png"
+    Image.new("RGB", (300, 120), (200, 30, 30)).save(banner)
+    creative = {"creative_image_path": str(banner)}
+    first = [
+        _crawl("naver_search", [
+            _ad(1, position=1), _ad(2, position=2),
+            _ad(1, position=3, url="https://SHOP1.example.co.kr/"),  # 배치 내 텍스트 키 중복
+        ], hour=1),
+        _crawl("youtube_ads", [_ad(3, **creative), _ad(3, **creative)], hour=1),  # 배치 내 해시 중복
+        _crawl("google_gdn", [_ad(4, **creative)], hour=1),  # 다른 채널에 같은 소재 → 스킵
+        # 저장 채널 meta — 두 번째는 크롤러 채널(facebook) 기준 채널간 중복으로 스킵
+        _crawl("facebook", [_ad(5), _ad(5)], hour=1),
+        _crawl("naver_search", [_ad(6, advertiser_name="http://x.com")], hour=1),  # 광고주명 거부
+    ]
+    second = [
+        _crawl("naver_search", [_ad(1), _ad(7)], hour=2),  # DB 행 seen 갱신 + 신규
+        _crawl("google_gdn", [_ad(8, **creative)], hour=2),
+        _crawl("facebook", [_ad(5)], hour=2),
+        _crawl("youtube_ads", [_ad(3, **creative)], hour=3, keyword="없는키워드"),  # 스냅샷 스킵
+    ]
+    return [first, second]
+
+
+async def _save_all(tmp_path, name: str, batches, bulk: bool):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / name).as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        industry = Industry(name="기타")
+        session.add(industry)
+        await session.flush()
+        session.add_all([
+            Keyword(industry_id=industry.id, keyword="선크림"),
+            Persona(code="M30", age_group="30", gender="M", login_type="none"),
+        ])
+        await session.commit()
+
+    stats = []
+    for batch in copy.deepcopy(batches):
+        async with factory() as session:
+            if bulk:
+                stats.append(await save_crawl_results_bulk(session, batch))
+            else:
+                stats.append(await save_crawl_results(session, batch))
+
+    columns = [c for c in AdDetail.__table__.columns]
+    async with factory() as session:
+        details = [dict(row._mapping) for row in await session.execute(
+            select(*columns, AdSnapshot.channel.label("snapshot_channel"))
+            .join(AdSnapshot, AdSnapshot.id == AdDetail.snapshot_id)
+            .order_by(AdDetail.id)
+        )]
+        snapshots = (await session.execute(
+            select(AdSnapshot.id, AdSnapshot.channel, AdSnapshot.ad_count).order_by(AdSnapshot.id)
+        )).all()
+    await engine.dispose()
+    return stats, details, snapshots
+
+
+async def test_bulk_save_matches_per_row_save(tmp_path):
+    batches = _batches(tmp_path)
+    saved, per_row, per_row_snapshots = await _save_all(tmp_path, "per_row.db", batches, bulk=False)
+    stats, bulk, bulk_snapshots = await _save_all(tmp_path, "bulk.db", batches, bulk=True)
+
+    assert saved == [5, 3]
+    assert [s["saved_snapshots"] for s in stats] == saved
+    assert bulk_snapshots == per_row_snapshots
+    assert bulk == per_row
+
+    by_text = {(d["channel"], d["ad_text"]): d for d in bulk}
+    assert len(bulk) == 6
+    assert by_text[("naver_search", "여름 자외선 차단 1")]["seen_count"] == 3
+    assert by_text[("naver_search", "여름 자외선 차단 1")]["last_seen_at"] == datetime(2026, 5, 1, 2)
+    assert by_text[("youtube_ads", "여름 자외선 차단 3")]["seen_count"] == 2
+    assert by_text[("meta", "여름 자외선 차단 5")]["seen_count"] == 1
+    assert by_text[("naver_search", "여름 자외선 차단 6")]["verification_status"] == "rejected"
+    # youtube_ads에 먼저 적재된 소재 → google_gdn 광고는 두 배치 모두 채널간 중복으로 스킵
+    assert not any(d["channel"] == "google_gdn" for d in bulk)
+    assert [s["cross_channel_skipped"] for s in stats] == [2, 2]
+    assert [s["inserted"] for s in stats] == [5, 1]
+    assert [s["seen_updated"] for s in stats] == [0, 1]
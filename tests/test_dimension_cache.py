@@ -0,0 +1,146 @@
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import Advertiser, Base, Industry, Keyword, Persona
+from processor.dimension_cache import DimensionCache
+
+
+async def _factory(path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path.as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _count(factory, model) -> int:
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+async def test_warm_then_concurrent_bulk_create_without_duplicates(tmp_path):
+    factory = await _factory(tmp_path / "dims.db")
+    async with factory() as session:
+        industry = Industry(name="기타")
+        session.add(industry)
+        await session.flush()
+        session.add(Keyword(keyword="선크림", industry_id=industry.id, is_active=True))
+        session.add(Advertiser(name="A사"))
+        await session.commit()
+
+    dims = DimensionCache(ttl_sec=300)
+
+    async def save(i: int) -> dict:
+        async with factory() as session:
+            kw = await dims.keyword_id(session, f"kw{i % 3}", create=True)
+            persona = await dims.persona_id(session, "F20", create=True)
+            ads = await dims.advertiser_ids(
+                session, ["A사", "B사", f"C{i % 2}"], websites={"B사": "b.co.kr"},
+            )
+            return {"kw": kw, "persona": persona, "ads": ads}
+
+    results = await asyncio.gather(*(save(i) for i in range(12)))
+
+    assert dims.stats["warms"] == 1
+    assert await _count(factory, Keyword) == 4
+    assert await _count(factory, Persona) == 1
+    assert await _count(factory, Advertiser) == 4
+    assert len({r["persona"] for r in results}) == 1
+    assert len({r["ads"]["B사"] for r in results}) == 1
+    async with factory() as session:
+        b = (await session.execute(select(Advertiser).where(Advertiser.name == "B사"))).scalar_one()
+        f20 = (await session.execute(select(Persona).where(Persona.code == "F20"))).scalar_one()
+        assert b.website == "b.co.kr"
+        assert f20.gender == "F" and f20.age_group == "20"
+        # 이미 있던 키워드는 캐시 적중, 조회 전용(create=False)은 생성하지 않음
+        assert await dims.keyword_id(session, "선크림") is not None
+        assert await dims.keyword_id(session, "없는키워드") is None
+    assert await _count(factory, Keyword) == 4
+
+
+async def test_persona_insert_ignores_rows_created_elsewhere(tmp_path):
+    factory = await _factory(tmp_path / "dims.db")
+    dims = DimensionCache(ttl_sec=300)
+    async with factory() as session:
+        assert await dims.persona_id(session, "M30") is None
+
+    # 다른 프로세스가 캐시 warm 이후 같은 코드를 생성 → ON CONFLICT DO NOTHING + SELECT
+    async with factory() as session:
+        session.add(Persona(code="M30", age_group="30", gender="M", login_type="none"))
+        await session.commit()
+
+    async with factory() as session:
+        persona_id = await dims.persona_id(session, "M30", create=True)
+    assert persona_id is not None
+    assert await _count(factory, Persona) == 1
+
+
+async def test_engine_change_resets_cache(tmp_path):
+    first = await _factory(tmp_path / "first.db")
+    second = await _factory(tmp_path / "second.db")
+    dims = DimensionCache(ttl_sec=300)
+
+    async with first() as session:
+        await dims.advertiser_ids(session, ["A사"])
+    async with second() as session:
+        ids = await dims.advertiser_ids(session, ["A사"], create=False)
+
+    assert ids == {}
+    assert dims.stats["warms"] == 2
+
+
+async def test_in_session_creation_follows_caller_transaction(tmp_path):
+    factory = await _factory(tmp_path / "dims.db")
+    dims = DimensionCache(ttl_sec=300)
+
+    async with factory() as session:
+        ids = await dims.advertiser_ids(session, ["롤백사"], in_session=True)
+        assert ids["롤백사"] is not None
+        await session.rollback()
+    assert await _count(factory, Advertiser) == 0
+    assert "롤백사" not in dims._ids["advertiser"]
+
+    async with factory() as session:
+        ids = await dims.advertiser_ids(session, ["커밋사"], in_session=True)
+        assert "커밋사" not in dims._ids["advertiser"]  # 커밋 전에는 캐시에 반영하지 않음
+        await session.commit()
+    assert dims._ids["advertiser"]["커밋사"] == ids["커밋사"]
+    assert await _count(factory, Advertiser) == 1
+
+
+async def test_promote_creates_advertisers_only_for_promoted_rows(tmp_path, monkeypatch):
+    from database.models import StagingAd
+    from processor import data_washer
+
+    factory = await _factory(tmp_path / "dims.db")
+    monkeypatch.setattr(data_washer, "get_dimension_cache", lambda: DimensionCache(ttl_sec=300))
+
+    def staging(batch_id: str, advertiser: str) -> StagingAd:
+        return StagingAd(
+            batch_id=batch_id, channel="naver_search", keyword="선크림", device="pc",
+            status="approved", resolved_advertiser_name=advertiser,
+            raw_payload={
+                "advertiser_name": advertiser, "ad_text": f"{advertiser} 여름 세일",
+                "url": "https://shop.example.co.kr/", "_creative_hash": "same-creative",
+            },
+        )
+
+    async with factory() as session:
+        session.add_all([staging("a", "한빛화장품"), staging("b", "누리제약")])
+        await session.commit()
+
+    async with factory() as session:
+        first = await data_washer.promote_approved(session, "a")
+    async with factory() as session:
+        second = await data_washer.promote_approved(session, "b")
+
+    assert first["promoted"] == 1
+    assert second["promoted"] == 0 and second["deduped"] == 1
+    async with factory() as session:
+        names = (await session.execute(select(Advertiser.name))).scalars().all()
+    assert names == ["한빛화장품"]
@@ -0,0 +1,118 @@
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.event_bus import EVT_GAP, EVT_HEARTBEAT, EventBus, SQLiteEventLog, SSEEvent
+
+
+async def _take(stream, n: int, timeout: float = 1.0) -> list:
+    return [await asyncio.wait_for(stream.__anext__(), timeout) for _ in range(n)]
+
+
+async def test_fan_out_serializes_once_and_slow_subscriber_gets_gap():
+    bus = EventBus(max_history=4)
+    fast = [bus.subscribe() for _ in range(50)]
+    slow = bus.subscribe()
+    pending = [asyncio.ensure_future(s.__anext__()) for s in fast]
+    slow_first = asyncio.ensure_future(slow.__anext__())
+    await asyncio.sleep(0)
+    assert bus.subscriber_count == 51
+
+    await bus.publish("crawl_complete", {"channel": "naver_da"})
+    received = await asyncio.gather(*pending)
+    assert {id(evt) for evt in received} == {id(received[0])}
+    assert len({id(evt.format_sse()) for evt in received}) == 1
+    assert (await slow_first).event == "crawl_complete"
+
+    # 느린 구독자: 링(4)보다 많이 밀리면 끊기지 않고 gap 후 보관분부터 계속
+    for i in range(10):
+        await bus.publish("data_updated", {"i": i})
+    events = await _take(slow, 5)
+    assert events[0].event == EVT_GAP and events[0].data == {"missed": 6}
+    assert [e.data["i"] for e in events[1:]] == [6, 7, 8, 9]
+
+    for stream in [*fast, slow]:
+        await stream.aclose()
+    assert bus.subscriber_count == 0
+
+
+async def test_replay_since_ts_uses_ring_and_flags_evicted_history():
+    bus = EventBus(max_history=8)
+    for i in range(6):
+        bus.publish_nowait("data_updated", {"i": i})
+    since = bus._ring[2].timestamp
+
+    replay = bus.subscribe(since_ts=since)
+    assert [e.data["i"] for e in await _take(replay, 3)] == [3, 4, 5]
+    await replay.aclose()
+
+    for i in range(6, 20):
+        bus.publish_nowait("data_updated", {"i": i})
+    stale = bus.subscribe(since_ts=since)
+    events = await _take(stale, 2)
+    assert events[0].event == EVT_GAP and events[1].data["i"] == 12
+    await stale.aclose()
+
+
+async def test_heartbeat_is_generated_per_subscriber():
+    bus = EventBus()
+    stream = bus.subscribe(heartbeat_sec=0.01)
+    assert (await _take(stream, 1))[0].event == EVT_HEARTBEAT
+    await stream.aclose()
+    assert bus.stats()["published"] == 0
+
+
+async def test_sqlite_log_relays_events_between_processes(tmp_path):
+    path = str(tmp_path / "event_bus.db")
+    scheduler = EventBus(log=SQLiteEventLog(path))
+    api = EventBus(log=SQLiteEventLog(path))
+    await scheduler.publish("crawl_start", {"channel": "old"})  # relay 시작 전 이벤트는 재생하지 않음
+
+    api.start_relay(poll_sec=0.01)
+    await asyncio.sleep(0.05)
+    stream = api.subscribe()
+    first = asyncio.ensure_future(stream.__anext__())
+    await scheduler.publish("crawl_complete", {"channel": "youtube_ads", "new_ads": 42})
+    await api.publish("campaign_rebuilt", {"campaigns_total": 1})  # 자기 이벤트는 다시 받지 않음
+
+    events = {e.event: e for e in [await asyncio.wait_for(first, 1.0), *await _take(stream, 1)]}
+    assert set(events) == {"campaign_rebuilt", "crawl_complete"}
+    assert events["crawl_complete"].data == {"channel": "youtube_ads", "new_ads": 42}
+    await asyncio.sleep(0.05)
+    assert api.stats()["relayed"] == 1
+
+    await stream.aclose()
+    await api.stop_relay()
+
+
+async def test_log_creates_directory_and_relay_survives_failed_first_read(tmp_path, monkeypatch):
+    log = SQLiteEventLog(str(tmp_path / "nested" / "dir" / "event_bus.db"))
+    assert log.last_seq() == 0
+    assert log._connection() is log._connection()  # 프로세스당 연결 1개 재사용
+
+    bus = EventBus(log=log)
+    calls = {"n": 0}
+    real_last_seq = log.last_seq
+
+    def flaky_last_seq():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return real_last_seq()
+
+    monkeypatch.setattr(log, "last_seq", flaky_last_seq)
+    bus.start_relay(poll_sec=0.01)
+    await asyncio.sleep(0.05)
+    stats = bus.stats()
+    assert stats["log_errors"] == 1 and not bus._relay.done()
+
+    other = SQLiteEventLog(log.path)
+    other.append("scheduler", SSEEvent(event="crawl_complete", data={"channel": "naver_da"}))
+    await asyncio.sleep(0.05)
+    assert bus.stats()["relayed"] == 1
+    await bus.stop_relay()
+    log.close()
+    other.close()
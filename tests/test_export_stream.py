@@ -0,0 +1,125 @@
+import csv
+from datetime import datetime, timedelta
+import io
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openpyxl import load_workbook
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api import export_stream
+from api.routers import export
+from database.models import (
+    AdDetail, AdSnapshot, Advertiser, Base, Campaign, Industry, Keyword, Persona, SpendEstimate,
+)
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+async def _session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'export.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(export_stream, "async_session", factory)
+    monkeypatch.setattr(export_stream, "EXPORT_BATCH_ROWS", 3)
+    monkeypatch.setattr(export, "CACHE_DIR", tmp_path)
+    async with factory() as session:
+        await session.execute(insert(Industry), [{"id": 1, "name": "뷰티"}])
+        await session.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "선크림"}])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+        ])
+        await session.execute(insert(Advertiser), [{"id": 1, "name": "광고주 A", "aliases": []}])
+        await session.execute(insert(AdSnapshot), [
+            {"id": s, "keyword_id": 1, "persona_id": 1, "channel": "naver_search", "device": "pc",
+             "captured_at": NOW - timedelta(hours=s)}
+            for s in range(1, 5)
+        ])
+        await session.execute(insert(AdDetail), [
+            {"snapshot_id": s, "advertiser_id": 1, "advertiser_name_raw": "광고주 A",
+             "ad_text": f'문구 {s}-{i}, "따옴표"', "url": None}
+            for s in range(1, 5) for i in range(2)
+        ])
+        await session.execute(insert(Campaign), [{
+            "id": 1, "advertiser_id": 1, "channel": "naver_search", "first_seen": NOW, "last_seen": NOW,
+        }])
+        await session.execute(insert(SpendEstimate), [
+            {"campaign_id": 1, "date": NOW - timedelta(days=d), "channel": "naver_search",
+             "est_daily_spend": 1_234_567.0 + d, "confidence": 0.8}
+            for d in range(1, 6)
+        ])
+        await session.commit()
+    return engine, factory
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def test_csv_is_streamed_in_batches_with_same_content(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    async with factory() as db:
+        rows = (await db.execute(export._gallery_query(None, None, NOW - timedelta(days=1), NOW))).all()
+    header = ["captured_at", "channel", "advertiser_name_raw", "ad_text",
+              "ad_type", "url", "product_category", "verification_status"]
+    expected = io.StringIO()
+    expected.write("\ufeff")
+    csv.writer(expected).writerows([header] + [export._gallery_row(r) for r in rows])
+
+    chunks = [
+        c async for c in export_stream.stream_csv(
+            [header],
+            export_stream.ExportQuery(export._gallery_query(None, None, NOW - timedelta(days=1), NOW),
+                                      export._gallery_row),
+        )
+    ]
+    assert len(chunks) == 1 + 3  # 헤더 + 8행 / 3행 배치
+    assert b"".join(chunks).decode("utf-8") == expected.getvalue()
+
+    response = await export.export_gallery(
+        channel=None, advertiser_id=None, date_from=NOW - timedelta(days=1), date_to=NOW, user=None,
+    )
+    assert (await _body(response)).decode("utf-8") == expected.getvalue()
+
+    async with factory() as db:
+        report = await export.export_report(1, date_from=NOW - timedelta(days=10), date_to=NOW, user=None, db=db)
+    lines = list(csv.reader(io.StringIO((await _body(report)).decode("utf-8-sig"))))
+    assert lines[0] == ["AdScope Report - 광고주 A"]
+    assert lines.index(["=== Campaigns ==="]) == 5 + 1 + 8 + 1
+    assert lines[-1][:3] == ["naver_search", export._kst_date_str(NOW - timedelta(days=5)), "1234572.0"]
+    await engine.dispose()
+
+
+async def test_xlsx_written_with_write_only_workbook(tmp_path, monkeypatch):
+    engine, factory = await _session_factory(tmp_path, monkeypatch)
+    async with factory() as db:
+        response = await export.export_report_xlsx(
+            1, date_from=NOW - timedelta(days=10), date_to=NOW, user=None, db=db,
+        )
+    wb = load_workbook(response.path)
+    assert wb.sheetnames == ["광고소재", "캠페인", "Spend", "Social"]
+
+    ads = wb["광고소재"]
+    assert ads.max_row == 1 + 8
+    assert ads["A1"].font.bold and ads["A1"].fill.start_color.rgb.endswith("2563EB")
+    assert ads.auto_filter.ref == "A1:M9"
+    assert ads["C2"].value == '문구 1-0, "따옴표"'
+
+    spend = wb["Spend"]
+    assert [c.value for c in spend["C"][1:]] == [1_234_568 + d for d in range(5)]
+    assert all(c.number_format == "#,##0" for c in spend["C"][1:])
+    assert not spend.auto_filter.ref
+    assert wb["Social"].max_row == 1
+
+    # 1시간 이내 재요청은 캐시 파일 (쿼리 미실행)
+    monkeypatch.setattr(export_stream, "async_session", None)
+    async with factory() as db:
+        cached = await export.export_report_xlsx(
+            1, date_from=NOW - timedelta(days=10), date_to=NOW, user=None, db=db,
+        )
+    assert cached.path == response.path
+    await engine.dispose()
@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import AdDetail, AdSnapshot, Base, ImageBlob, Industry, Keyword, Persona
+from processor import image_blobs, image_store
+from processor.image_store import LocalImageStore, thumbnail_path
+from processor.image_worker import ImageWorker
+
+
+async def _index(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'blobs.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(image_blobs, "async_session", factory)
+    monkeypatch.setattr(image_store, "get_image_worker", lambda: ImageWorker(workers=0))
+    return factory
+
+
+def _png(path: Path, color=(200, 30, 30), size=(640, 200)) -> str:
+    Image.new("RGB", size, color).save(path, format="PNG")
+    return str(path)
+
+
+async def _blob_rows(factory):
+    async with factory() as session:
+        return (await session.execute(select(ImageBlob))).scalars().all()
+
+
+async def test_same_capture_is_stored_once_and_refcounted(tmp_path, monkeypatch):
+    factory = await _index(tmp_path, monkeypatch)
+    store = LocalImageStore(str(tmp_path / "stored_images"))
+
+    paths = [
+        await store.save(_png(tmp_path / f"persona{i}.png"), "naver_da", "creative") for i in range(3)
+    ]
+    other = await store.save(_png(tmp_path / "other.png", color=(0, 90, 200)), "naver_da", "creative")
+
+    assert len(set(paths)) == 1 and paths[0] != other
+    assert "/blobs/" in Path(paths[0]).as_posix()
+    assert Path(thumbnail_path(paths[0], 320)).exists()
+    blobs = sorted(p for p in (tmp_path / "stored_images").rglob("*.webp") if ".t" not in p.name)
+    assert len(blobs) == 2
+    rows = {row.content_hash: row.ref_count for row in await _blob_rows(factory)}
+    assert rows[image_blobs.blob_digest(paths[0])] == 3
+    assert rows[image_blobs.blob_digest(other)] == 1
+
+    # 마지막 참조가 해제될 때만 파일 삭제
+    assert await store.delete(paths[0])
+    assert Path(paths[0]).exists()
+    await store.delete(paths[0])
+    await store.delete(paths[0])
+    assert not Path(paths[0]).exists()
+    assert not Path(thumbnail_path(paths[0], 64)).exists()
+    assert len(await _blob_rows(factory)) == 1
+
+
+async def test_cleanup_queries_index_for_expired_and_unreferenced(tmp_path, monkeypatch):
+    factory = await _index(tmp_path, monkeypatch)
+    store = LocalImageStore(str(tmp_path / "stored_images"))
+    fresh = await store.save(_png(tmp_path / "a.png", color=(1, 1, 1)), "kakao_da")
+    stale = await store.save(_png(tmp_path / "b.png", color=(2, 2, 2)), "kakao_da")
+    orphan = await store.save(_png(tmp_path / "c.png", color=(3, 3, 3)), "kakao_da")
+
+    old = datetime.utcnow() - timedelta(days=100)
+    async with factory() as session:
+        await session.execute(update(ImageBlob).where(
+            ImageBlob.content_hash == image_blobs.blob_digest(stale)).values(last_referenced_at=old))
+        await session.execute(update(ImageBlob).where(
+            ImageBlob.content_hash == image_blobs.blob_digest(orphan)).values(
+                ref_count=0, last_referenced_at=datetime.utcnow() - timedelta(hours=30)))
+        await session.commit()
+
+    assert await store.cleanup(older_than_days=90) == 2
+    assert Path(fresh).exists()
+    assert not Path(stale).exists() and not Path(thumbnail_path(stale, 320)).exists()
+    assert not Path(orphan).exists()
+    assert [row.content_hash for row in await _blob_rows(factory)] == [image_blobs.blob_digest(fresh)]
+
+
+async def test_migrate_legacy_tree_dedups_in_place_and_rewrites_paths(tmp_path, monkeypatch):
+    factory = await _index(tmp_path, monkeypatch)
+    base = tmp_path / "stored_images"
+    legacy = []
+    for i, day in enumerate(["20260101", "20260102", "20260103"]):
+        d = base / "naver_da" / day / "creative"
+        d.mkdir(parents=True)
+        f = d / f"ad_{i}.webp"
+        f.write_bytes(b"RIFF0000WEBPsame-creative")
+        (d / f"ad_{i}.t320.webp").write_bytes(b"thumb")
+        legacy.append(f"stored_images/naver_da/{day}/creative/ad_{i}.webp")
+    unique = base / "naver_da" / "20260103" / "screenshot" / "page.webp"
+    unique.parent.mkdir(parents=True)
+    unique.write_bytes(b"RIFF0000WEBPpage")
+    untouched = base / "instagram" / "20260103" / "thumbnail" / "x.webp"
+    untouched.parent.mkdir(parents=True)
+    untouched.write_bytes(b"ig")
+
+    async with factory() as session:
+        await session.execute(insert(Industry), [{"id": 1, "name": "뷰티"}])
+        await session.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "선크림"}])
+        await session.execute(insert(Persona), [
+            {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+        ])
+        await session.execute(insert(AdSnapshot), [{
+            "id": 1, "keyword_id": 1, "persona_id": 1, "device": "pc", "channel": "naver_da",
+            "captured_at": datetime.utcnow(), "screenshot_path": str(unique),
+        }])
+        await session.execute(insert(AdDetail), [
+            {"snapshot_id": 1, "creative_image_path": legacy[0]},
+            {"snapshot_id": 1, "creative_image_path": legacy[1].replace("/", "\\") + "#0,0,10,10"},
+            {"snapshot_id": 1, "creative_image_path": legacy[2]},
+        ])
+        await session.commit()
+
+    report = await image_blobs.migrate_legacy_tree(base)
+
+    assert report["files"] == {"legacy_files": 4, "duplicates": 2, "duplicate_bytes": 2 * (25 + 5)}
+    assert report["db_rows_updated"] == 4
+    assert report["before"]["files"] == 8 and report["after"]["files"] == 4
+    assert report["index"] == {"blobs": 2, "indexed": 2, "unreferenced": 0, "dropped_rows": 0}
+    assert untouched.exists() and not (base / "naver_da").exists()
+
+    async with factory() as session:
+        paths = (await session.execute(select(AdDetail.creative_image_path).order_by(AdDetail.id))).scalars().all()
+    digest = image_blobs.content_hash(b"RIFF0000WEBPsame-creative")
+    key = image_blobs.blob_key(digest)
+    assert paths == [f"stored_images/{key}", f"stored_images/{key}#0,0,10,10", f"stored_images/{key}"]
+    assert (base / key).exists() and Path(thumbnail_path(str(base / key), 320)).exists()
+    rows = {row.content_hash: row.ref_count for row in await _blob_rows(factory)}
+    assert rows == {digest: 3, image_blobs.content_hash(b"RIFF0000WEBPpage"): 1}
+
+    # 재실행 — 변경 없이 참조 수만 재확인
+    again = await image_blobs.migrate_legacy_tree(base)
+    assert again["files"]["legacy_files"] == 0 and again["db_rows_updated"] == 0
+    assert os.path.exists(base / key)
+
+
+async def test_migration_failing_in_db_phase_leaves_files_and_reruns(tmp_path, monkeypatch):
+    factory = await _index(tmp_path, monkeypatch)
+    base = tmp_path / "stored_images"
+    d = base / "kakao_da" / "20260101" / "creative"
+    d.mkdir(parents=True)
+    for i in range(2):
+        (d / f"ad_{i}.webp").write_bytes(b"RIFF0000WEBPdup")
+    async with factory() as session:
+        await session.execute(insert(AdSnapshot), [{
+            "id": 1, "keyword_id": 1, "persona_id": 1, "device": "pc", "channel": "kakao_da",
+            "captured_at": datetime.utcnow(), "screenshot_path": str(d / "ad_1.webp"),
+        }])
+        await session.commit()
+
+    real_rewrite = image_blobs._rewrite_db_paths
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("db locked")
+
+    monkeypatch.setattr(image_blobs, "_rewrite_db_paths", broken)
+    try:
+        await image_blobs.migrate_legacy_tree(base)
+    except RuntimeError:
+        pass
+    # DB 단계 실패 → 파일은 그대로 (이동/중복 삭제 전)
+    assert sorted(p.name for p in d.iterdir()) == ["ad_0.webp", "ad_1.webp"]
+
+    monkeypatch.setattr(image_blobs, "_rewrite_db_paths", real_rewrite)
+    report = await image_blobs.migrate_legacy_tree(base)
+    assert report["files"]["legacy_files"] == 2 and report["db_rows_updated"] == 1
+    async with factory() as session:
+        path = (await session.execute(select(AdSnapshot.screenshot_path))).scalar_one()
+    assert "/blobs/" in Path(path).as_posix() and Path(path).exists()
+
+
+async def test_failed_index_write_is_retried_on_next_save(tmp_path, monkeypatch):
+    factory = await _index(tmp_path, monkeypatch)
+    monkeypatch.setattr(image_store, "_pending_refs", {})
+    store = LocalImageStore(str(tmp_path / "stored_images"))
+    real_reference = image_blobs.reference_blob
+
+    async def flaky(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(image_blobs, "reference_blob", flaky)
+    first = await store.save(_png(tmp_path / "a.png"), "naver_da")
+    await store.save(_png(tmp_path / "b.png"), "naver_da")
+    assert await _blob_rows(factory) == [] and image_store._pending_refs[image_blobs.blob_digest(first)][2] == 2
+
+    monkeypatch.setattr(image_blobs, "reference_blob", real_reference)
+    other = await store.save(_png(tmp_path / "c.png", color=(0, 90, 200)), "naver_da")
+    rows = {row.content_hash: row.ref_count for row in await _blob_rows(factory)}
+    assert rows == {image_blobs.blob_digest(first): 2, image_blobs.blob_digest(other): 1}
+    assert image_store._pending_refs == {}
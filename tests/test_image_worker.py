@@ -0,0 +1,60 @@
+from io import BytesIO
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from api.routers import ads
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import Base
+from processor import image_blobs, image_store
+from processor.image_store import LocalImageStore, thumbnail_path
+from processor.image_worker import ImageWorker
+
+
+def _png(path: Path, size=(1280, 2400)) -> Path:
+    Image.new("RGB", size, (200, 30, 30)).save(path, format="PNG")
+    return path
+
+
+async def test_process_pool_converts_with_thumbnail_tiers(tmp_path):
+    worker = ImageWorker(workers=1, queue_max=2)
+    try:
+        converted = await worker.convert(str(_png(tmp_path / "shot.png")))
+    finally:
+        worker.shutdown()
+
+    assert (converted.width, converted.height) == (1280, 2400)
+    assert sorted(converted.thumbs) == [64, 320]
+    with Image.open(BytesIO(converted.thumbs[320])) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (320, 600)
+    assert {"wait", "decode", "encode", "thumbs", "total"} <= set(converted.timings_ms)
+    assert worker.metrics()["converted"] == 1
+
+
+async def test_local_store_writes_thumbnails_and_gallery_picks_tier(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'blobs.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(image_blobs, "async_session", async_sessionmaker(engine, class_=AsyncSession))
+    monkeypatch.setattr(image_store, "get_image_worker", lambda: ImageWorker(workers=0))
+    store = LocalImageStore(str(tmp_path / "stored_images"))
+
+    stored = await store.save(str(_png(tmp_path / "banner.png", (640, 200))), "naver_da", "creative")
+
+    assert stored.endswith(".webp")
+    assert Path(thumbnail_path(stored, 320)).exists()
+    assert Path(thumbnail_path(stored, 64)).exists()
+
+    assert ads._thumbnail_for(stored, 100) == thumbnail_path(stored, 320)
+    assert ads._thumbnail_for(stored, 64) == thumbnail_path(stored, 64)
+    assert ads._thumbnail_for(stored, 0) is None
+    assert ads._thumbnail_for(stored, 1024) is None  # 최대 티어보다 크면 원본 사용
+    assert ads._thumbnail_for(stored + "#0,0,10,10", 64) is None
+
+    assert await store.delete(stored)
+    assert not Path(thumbnail_path(stored, 64)).exists()
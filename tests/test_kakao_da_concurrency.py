@@ -0,0 +1,93 @@
+import asyncio
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler.kakao_da import KakaoDACrawler
+
+
+class _Response:
+    status = 200
+    headers = {"content-type": "application/json"}
+
+    def __init__(self, code: str, n: int):
+        self.url = f"https://display.ad.daum.net/sdk/native?slot={code}{n}"
+        self._code = code
+        self._n = n
+
+    async def json(self):
+        return {"status": "OK", "ads": [{
+            "title": f"{self._code} 광고 {self._n}",
+            "profileName": f"광고주{self._code}",
+            "landingUrl": f"https://{self._code.lower()}.example.co.kr/{self._n}",
+        }]}
+
+
+class _Page:
+    """goto마다 자기 페르소나의 SDK 응답을 핸들러로 흘려보내는 가짜 페이지."""
+
+    url = "https://m.daum.net/"
+
+    def __init__(self, code: str):
+        self.code = code
+        self.handlers: dict[str, list] = {}
+        self.visits = 0
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    async def goto(self, url, wait_until=None):
+        self.visits += 1
+        for handler in self.handlers.get("response", []):
+            await handler(_Response(self.code, self.visits))
+            await asyncio.sleep(0)  # 다른 키워드와 교차 실행
+
+    async def wait_for_timeout(self, ms):
+        await asyncio.sleep(0)
+
+    async def evaluate(self, script):
+        await asyncio.sleep(0)
+
+    async def close(self):
+        pass
+
+
+class _Context:
+    def __init__(self, code: str):
+        self.code = code
+
+    async def new_page(self):
+        return _Page(self.code)
+
+    async def close(self):
+        pass
+
+
+async def test_concurrent_keywords_keep_their_own_sdk_captures(monkeypatch):
+    monkeypatch.setenv("KAKAO_MEDIA_URLS", "https://www.daum.net/,https://news.daum.net/")
+    crawler = KakaoDACrawler()
+    crawler.landing_resolve_limit = 0
+
+    async def create_context(persona, device):
+        return _Context(persona.code)
+
+    async def nothing(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(crawler, "_create_context", create_context)
+    monkeypatch.setattr(crawler, "_inter_page_cooldown", nothing)
+    monkeypatch.setattr(crawler, "_capture_kakao_ad_elements", nothing)
+    monkeypatch.setattr(crawler, "_parse_da_candidates", nothing)
+
+    device = SimpleNamespace(is_mobile=False, device_type="pc")
+    first, second = await asyncio.gather(
+        crawler.crawl_keyword("선크림", SimpleNamespace(code="A"), device),
+        crawler.crawl_keyword("대출", SimpleNamespace(code="B"), device),
+    )
+
+    assert first["keyword"] == "선크림" and second["keyword"] == "대출"
+    assert {ad["advertiser_name"] for ad in first["ads"]} == {"광고주A"}
+    assert {ad["advertiser_name"] for ad in second["ads"]} == {"광고주B"}
+    assert len(first["ads"]) == len(second["ads"]) == 2
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler.base_crawler import BaseCrawler
+from crawler.config import CrawlerSettings
+from crawler.rate_limiter import TokenBucket
+
+
+class _SleepyCrawler(BaseCrawler):
+    channel = "naver_search"
+    rate_domain = "test.concurrency"
+
+    def __init__(self, **settings):
+        super().__init__()
+        self.settings = CrawlerSettings(max_retries=1, domain_rate_per_minute=60_000, **settings)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def crawl_keyword(self, keyword, persona, device):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            # 앞 키워드일수록 오래 걸림 → 완료 순서와 결과 순서가 달라짐
+            await asyncio.sleep(0.05 / (int(keyword[2:]) + 1))
+            if keyword == "kw3":
+                raise RuntimeError("blocked")
+            return {"keyword": keyword, "channel": self.channel, "captured_at": datetime.utcnow(), "ads": [{}]}
+        finally:
+            self.in_flight -= 1
+
+
+async def test_concurrent_mode_is_bounded_and_keeps_keyword_order():
+    crawler = _SleepyCrawler(keyword_concurrency=1, keyword_concurrency_channels="naver_search:3,kakao_da:2")
+    keywords = [f"kw{i}" for i in range(8)]
+
+    results = await crawler.crawl_keywords(keywords, persona_code="M30")
+
+    assert crawler.peak == 3
+    assert [r["keyword"] for r in results] == keywords
+    assert results[3]["error"] == "blocked" and results[3]["ads"] == []
+    assert all("error" not in r for i, r in enumerate(results) if i != 3)
+
+
+async def test_sequential_default_and_class_cap():
+    crawler = _SleepyCrawler()
+    await crawler.crawl_keywords(["kw0", "kw1", "kw2"])
+    assert crawler.peak == 1
+
+    capped = _SleepyCrawler(keyword_concurrency=4)
+    capped.max_keyword_concurrency = 1
+    assert capped._keyword_concurrency() == 1
+
+
+def test_token_bucket_reserves_spaced_slots():
+    bucket = TokenBucket(rate_per_sec=2, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.45 < waits[2] <= 0.5
+    assert 0.95 < waits[3] <= 1.0
+
+
+async def test_on_result_streams_each_keyword_without_keeping_results():
+    crawler = _SleepyCrawler(keyword_concurrency=3)
+    streamed: list[str] = []
+
+    async def sink(result):
+        streamed.append(result["keyword"])
+
+    returned = await crawler.crawl_keywords([f"kw{i}" for i in range(5)], on_result=sink)
+
+    assert returned == []
+    assert sorted(streamed) == [f"kw{i}" for i in range(5)]
+    assert streamed[0] != "kw0"  # 완료 순서대로 전달
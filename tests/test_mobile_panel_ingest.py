@@ -0,0 +1,163 @@
+import gzip
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api import mobile_ingest
+from api.deps import get_current_user
+from api.mobile_ingest import ExposureWriter, IngestBodyError, decode_exposures
+from api.routers import mobile_panel
+from database import get_db
+from database.models import Advertiser, Base, MobilePanelDevice, MobilePanelExposure, PanelObservation, User
+
+
+async def _app(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'panel.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all([Advertiser(name="삼성전자"), Advertiser(name="쿠팡")])
+        session.add_all([
+            MobilePanelDevice(device_id=f"dev{i}", device_type="real" if i == 0 else "ai",
+                              os_type="android", device_model="SM-S918N", region="서울")
+            for i in range(3)
+        ])
+        await session.commit()
+    writer = ExposureWriter(session_factory=factory, batch_size=100)
+    monkeypatch.setattr(mobile_panel, "exposure_writer", writer)
+
+    async def _db():
+        async with factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(mobile_panel.router)
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="t@test", role="admin")
+    return app, engine, factory, writer
+
+
+def _exposure(device_id: str, i: int) -> dict:
+    return {
+        "device_id": device_id,
+        "app_name": "YouTube" if i % 2 else "Instagram",
+        "advertiser_name": ["삼성전자", "쿠팡", "미등록광고주"][i % 3],
+        "ad_text": f"광고 {i}",
+        "duration_ms": 1500,
+    }
+
+
+async def test_batch_resolves_advertisers_once_and_bulk_inserts(tmp_path, monkeypatch):
+    app, engine, factory, _ = await _app(tmp_path, monkeypatch)
+    statements: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    body = {"device_id": "dev0", "exposures": [_exposure("other", i) for i in range(60)]}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/mobile-panel/exposures/batch", json=body)
+        assert resp.json() == {"status": "ok", "saved": 60, "total": 60}
+        missing = await client.post("/api/mobile-panel/exposures/batch", json={"device_id": "nope", "exposures": []})
+        assert missing.status_code == 404
+
+    advertiser_selects = [s for s in statements if "FROM advertisers" in s]
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert len(advertiser_selects) == 1
+    assert len(inserts) == 2
+
+    async with factory() as session:
+        rows = (await session.execute(select(MobilePanelExposure))).scalars().all()
+        assert {r.device_id for r in rows} == {"dev0"}
+        assert all(r.observed_at is not None and r.was_clicked is False for r in rows)
+        by_name = {r.advertiser_name_raw: r.advertiser_id for r in rows}
+        assert by_name["삼성전자"] and by_name["쿠팡"] and by_name["미등록광고주"] is None
+        obs = (await session.execute(select(PanelObservation))).scalars().all()
+        assert len(obs) == 60 and {o.channel for o in obs} == {"youtube_surf", "meta"}
+        assert all(o.is_verified and o.device == "android_SM-S918N" for o in obs)
+        device = (await session.execute(select(MobilePanelDevice).where(MobilePanelDevice.device_id == "dev0"))).scalar_one()
+        assert device.last_seen is not None
+
+
+async def test_empty_batch_still_touches_last_seen(tmp_path, monkeypatch):
+    app, _, factory, _ = await _app(tmp_path, monkeypatch)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/mobile-panel/exposures/batch", json={"device_id": "dev1", "exposures": []})
+        assert resp.json() == {"status": "ok", "saved": 0, "total": 0}
+
+    async with factory() as session:
+        device = (await session.execute(select(MobilePanelDevice).where(MobilePanelDevice.device_id == "dev1"))).scalar_one()
+        assert device.last_seen is not None
+        assert (await session.execute(select(func.count()).select_from(MobilePanelExposure))).scalar() == 0
+
+
+async def test_ingest_gzip_ndjson_async_ack_queues_for_writer(tmp_path, monkeypatch):
+    app, _, factory, writer = await _app(tmp_path, monkeypatch)
+    lines = [_exposure(f"dev{i % 3}", i) for i in range(90)] + [_exposure("ghost", 0)]
+    payload = gzip.compress("\n".join(json.dumps(line, ensure_ascii=False) for line in lines).encode())
+    headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/mobile-panel/exposures/ingest?ack=async", content=payload, headers=headers)
+        assert resp.status_code == 202
+        assert resp.json() == {"status": "queued", "queued": 90, "total": 91, "unknown_devices": ["ghost"]}
+        await writer.drain()
+
+        sync = await client.post("/api/mobile-panel/exposures/ingest", json=[_exposure("dev1", 1)])
+        assert sync.json()["saved"] == 1
+        bad = await client.post("/api/mobile-panel/exposures/ingest", content=b'{"device_id": "dev1"}\n',
+                                headers={"Content-Type": "application/x-ndjson"})
+        assert bad.status_code == 422
+
+    assert writer.stats()["written"] == 90 and writer.pending == 0
+    async with factory() as session:
+        counts = dict((await session.execute(
+            select(MobilePanelExposure.device_id, func.count()).group_by(MobilePanelExposure.device_id)
+        )).all())
+        assert counts == {"dev0": 30, "dev1": 31, "dev2": 30}
+        assert (await session.execute(select(func.count(PanelObservation.id)))).scalar_one() == 91
+    await writer.stop()
+
+
+async def test_writer_rejects_when_queue_full_and_body_limits(monkeypatch):
+    writer = ExposureWriter(max_pending=10)
+    items = decode_exposures(json.dumps([_exposure("dev0", i) for i in range(11)]).encode(), None, "application/json")
+    assert not writer.submit(items, {}, source="test")
+    assert writer.stats()["rejected"] == 11
+
+    monkeypatch.setattr(mobile_ingest, "MAX_BODY_BYTES", 1024)
+    with pytest.raises(IngestBodyError) as exc:
+        decode_exposures(gzip.compress(b" " * 4096), "gzip", "application/x-ndjson")
+    assert exc.value.status_code == 413
+
+
+async def test_ingest_rejects_oversized_body_before_reading_it(tmp_path, monkeypatch):
+    app, _, factory, _ = await _app(tmp_path, monkeypatch)
+    monkeypatch.setattr(mobile_ingest, "MAX_BODY_BYTES", 1024)
+    line = (json.dumps(_exposure("dev0", 0), ensure_ascii=False) + "\n").encode()
+    headers = {"Content-Type": "application/x-ndjson"}
+    sent: list[int] = []
+
+    async def chunks():
+        for i in range(1000):  # 길이 미지정(청크 전송) ~100KB
+            sent.append(i)
+            yield line
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        declared = await client.post("/api/mobile-panel/exposures/ingest", content=line * 1000, headers=headers)
+        assert declared.status_code == 413
+        streamed = await client.post("/api/mobile-panel/exposures/ingest", content=chunks(), headers=headers)
+        assert streamed.status_code == 413
+        assert len(sent) < 20  # 상한을 넘은 시점에 수신 중단
+        ok = await client.post("/api/mobile-panel/exposures/ingest", content=line * 3, headers=headers)
+        assert ok.json()["saved"] == 3
+
+    async with factory() as session:
+        assert (await session.execute(select(func.count(MobilePanelExposure.id)))).scalar_one() == 3
@@ -0,0 +1,69 @@
+from pathlib import Path
+import random
+import sys
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.creative_hasher import compute_perceptual_hash, hamming_distance
+from processor.phash_index import PerceptualHashIndex
+
+
+def _banner(seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, size=(12, 30, 3), dtype=np.uint8)
+    return Image.fromarray(base).resize((600, 240), Image.BILINEAR)
+
+
+def test_reencoded_banner_stays_close(tmp_path):
+    img = _banner(1)
+    png = tmp_path / "a.png"
+    webp = tmp_path / "a.webp"
+    small = tmp_path / "a_small.jpg"
+    img.save(png)
+    img.save(webp, format="WebP", quality=60)
+    img.resize((300, 120)).save(small, quality=70)
+
+    for method in ("phash", "dhash"):
+        h_png = compute_perceptual_hash(str(png), method=method)
+        assert len(h_png) == 16
+        assert hamming_distance(h_png, compute_perceptual_hash(str(webp), method=method)) <= 4
+        assert hamming_distance(h_png, compute_perceptual_hash(str(small), method=method)) <= 4
+
+
+def test_different_banners_are_far(tmp_path):
+    a, b = tmp_path / "a.png", tmp_path / "b.png"
+    _banner(1).save(a)
+    _banner(2).save(b)
+    assert hamming_distance(compute_perceptual_hash(str(a)), compute_perceptual_hash(str(b))) > 10
+
+
+def test_missing_file_returns_none():
+    assert compute_perceptual_hash(None) is None
+    assert compute_perceptual_hash("/nonexistent/x.png") is None
+
+
+def test_index_matches_brute_force():
+    rng = random.Random(3)
+    hashes = [rng.getrandbits(64) for _ in range(3000)]
+    index = PerceptualHashIndex()
+    for ad_id, h in enumerate(hashes):
+        index.add("google_gdn", h, ad_id)
+    index.add("kakao_da", hashes[0], 99999)
+
+    for k in (0, 3, 6):
+        for q_id in range(0, 3000, 300):
+            query = hashes[q_id]
+            for bit in rng.sample(range(64), k):
+                query ^= 1 << bit
+            expected = sorted(
+                i for i, h in enumerate(hashes) if (h ^ query).bit_count() <= k
+            )
+            got = sorted(ad_id for ad_id, _ in index.query("google_gdn", query, max_distance=k))
+            assert got == expected
+            assert q_id in got
+
+    assert index.query("naver_search", hashes[0]) == []
+    assert index.nearest("kakao_da", f"{hashes[0]:016x}") == 99999
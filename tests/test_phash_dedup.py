@@ -0,0 +1,129 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import AdDetail, Base, Industry, Keyword, Persona
+from processor import pipeline
+from processor.pipeline import save_crawl_results, save_crawl_results_bulk
+
+
+def _banner(seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, size=(12, 30, 3), dtype=np.uint8)
+    return Image.fromarray(base).resize((600, 240), Image.BILINEAR)
+
+
+async def _factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'phash.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        industry = Industry(name="기타")
+        session.add(industry)
+        await session.flush()
+        session.add_all([
+            Keyword(industry_id=industry.id, keyword="선크림"),
+            Persona(code="M30", age_group="30", gender="M", login_type="none"),
+        ])
+        await session.commit()
+    return engine, factory
+
+
+def _result(ads: list[dict], hour: int) -> dict:
+    return {
+        "keyword": "선크림", "persona_code": "M30", "device": "pc", "channel": "google_gdn",
+        "captured_at": datetime(2026, 5, 1, hour), "ads": ads,
+    }
+
+
+def _ad(image: Path, n: int, advertiser: str = "선크림광고주") -> dict:
+    # 문구/URL이 모두 달라 creative_hash·text_key로는 매칭되지 않는 소재
+    return {
+        "advertiser_name": advertiser, "ad_text": f"여름 자외선 차단 {n}",
+        "url": f"https://shop{n}.example.co.kr/", "creative_image_path": str(image),
+    }
+
+
+@pytest.mark.parametrize("save", [save_crawl_results, save_crawl_results_bulk])
+async def test_reencoded_creative_merges_into_existing_ad(tmp_path, monkeypatch, save):
+    png, webp, jpg, other = tmp_path / "a.png", tmp_path / "a.webp", tmp_path / "a.jpg", tmp_path / "b.png"
+    _banner(1).save(png)
+    _banner(1).save(webp, format="WebP", quality=60)
+    _banner(1).resize((300, 120)).save(jpg, quality=70)
+    _banner(2).save(other)
+
+    threads: list[str] = []
+    original = pipeline.compute_perceptual_hash
+
+    def record(path):
+        threads.append(threading.current_thread().name)
+        return original(path)
+
+    monkeypatch.setattr(pipeline, "compute_perceptual_hash", record)
+    monkeypatch.setattr("processor.phash_index.MAX_DISTANCE", 3)
+    engine, factory = await _factory(tmp_path)
+
+    async with factory() as session:
+        # 한 배치 안의 재인코딩본 + 다른 배너
+        await save(session, [_result([_ad(png, 1), _ad(webp, 2), _ad(other, 3)], hour=1)])
+    async with factory() as session:
+        # 다음 배치의 재인코딩본은 DB 행(공용 인덱스)과 매칭
+        await save(session, [_result([_ad(jpg, 4)], hour=2)])
+
+    async with factory() as session:
+        rows = (await session.execute(select(AdDetail).order_by(AdDetail.id))).scalars().all()
+    assert [r.creative_image_path for r in rows] == [str(png), str(other)]
+    assert [r.seen_count for r in rows] == [3, 1]
+    assert rows[0].last_seen_at == datetime(2026, 5, 1, 2)
+    assert threads and threading.main_thread().name not in threads
+    await engine.dispose()
+
+
+async def test_phash_fallback_can_be_disabled(tmp_path, monkeypatch):
+    png, webp, jpg = tmp_path / "a.png", tmp_path / "a.webp", tmp_path / "a.jpg"
+    _banner(1).save(png)
+    _banner(1).save(webp, format="WebP", quality=60)
+    _banner(1).resize((300, 120)).save(jpg, quality=70)
+    monkeypatch.setattr("processor.phash_index.MAX_DISTANCE", -1)
+    engine, factory = await _factory(tmp_path)
+
+    async with factory() as session:
+        stats = await save_crawl_results_bulk(session, [_result([_ad(png, 1), _ad(webp, 2)], hour=1)])
+    async with factory() as session:
+        await save_crawl_results(session, [_result([_ad(jpg, 3)], hour=2)])
+
+    async with factory() as session:
+        rows = (await session.execute(select(AdDetail))).scalars().all()
+    assert stats["inserted"] == 2 and len(rows) == 3
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("save", [save_crawl_results, save_crawl_results_bulk])
+async def test_shared_template_creative_stays_separate_by_default(tmp_path, save):
+    # 다른 광고주가 거의 같은 템플릿 배너를 쓰는 경우 — 기본 설정에서는 합치지 않는다
+    png, webp = tmp_path / "a.png", tmp_path / "a.webp"
+    _banner(1).save(png)
+    _banner(1).save(webp, format="WebP", quality=60)
+    engine, factory = await _factory(tmp_path)
+
+    async with factory() as session:
+        await save(session, [_result([_ad(png, 1, "광고주A")], hour=1)])
+    async with factory() as session:
+        await save(session, [_result([_ad(webp, 2, "광고주B")], hour=2)])
+
+    async with factory() as session:
+        rows = (await session.execute(select(AdDetail).order_by(AdDetail.id))).scalars().all()
+    assert [r.creative_image_path for r in rows] == [str(png), str(webp)]
+    assert [r.seen_count for r in rows] == [1, 1]
+    await engine.dispose()
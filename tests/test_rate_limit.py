@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+import sys
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.main import RateLimitMiddleware
+from api.rate_limit import MemoryBackend, RateLimiter, RedisBackend, SQLiteBackend
+
+
+class _Clock:
+    def __init__(self, now: float = 1_760_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _pattern(backend, clock: _Clock, key: str = "1.2.3.4:login") -> list[bool]:
+    """한도 10/60초: 버스트 10 → 거부 → 6초(간격 1개) 후 1개 회복."""
+    limiter = RateLimiter(backend, clock=clock)
+    allowed = [(await limiter.hit(key, 10, 60)).allowed for _ in range(11)]
+    denied = await limiter.hit(key, 10, 60)
+    assert not denied.allowed and 5.9 < denied.retry_after <= 6.0
+    assert denied.retry_after_header == "6"
+    clock.now += 6
+    allowed += [(await limiter.hit(key, 10, 60)).allowed for _ in range(2)]
+    return allowed
+
+
+async def test_memory_and_shared_sqlite_backends_agree(tmp_path):
+    expected = [True] * 10 + [False, True, False]
+    assert await _pattern(MemoryBackend(), _Clock()) == expected
+
+    # 두 워커가 같은 파일을 공유 → 한쪽에서 소진한 한도가 다른 쪽에도 적용
+    path = str(tmp_path / "rl.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    clock = _Clock()
+    assert await _pattern(first, clock) == expected
+    assert not (await RateLimiter(second, clock=clock).hit("1.2.3.4:login", 10, 60)).allowed
+    assert (await RateLimiter(second, clock=clock).hit("5.6.7.8:login", 10, 60)).allowed
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.filterwarnings("error::DeprecationWarning")
+def test_sqlite_backend_binds_named_parameters(tmp_path):
+    # 3.12+는 번호 placeholder + tuple에 DeprecationWarning, 3.14는 ProgrammingError.
+    # RateLimiter.hit는 예외 시 fail-open이므로 hit_sync를 직접 호출해 확인
+    backend = SQLiteBackend(str(tmp_path / "rl.db"))
+    now = 1_760_000_000.0
+    decisions = [backend.hit_sync("1.2.3.4:login", now, 2, 60) for _ in range(3)]
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert 29.9 < decisions[-1].retry_after <= 30.0
+    backend._conn.close()  # 이 스레드에서 연 연결 — close()는 전용 스레드에서 닫음
+    backend._executor.shutdown(wait=False)
+
+
+async def test_memory_sweep_drops_idle_keys_and_backend_errors_fail_open():
+    backend = MemoryBackend(sweep_interval=0)
+    clock = _Clock()
+    limiter = RateLimiter(backend, clock=clock)
+    for i in range(100):
+        await limiter.hit(f"10.0.0.{i}:api", 120, 60)
+    assert len(backend) == 100
+    clock.now += 1
+    await limiter.hit("10.0.0.1:api", 120, 60)
+    assert len(backend) == 1
+
+    class _Broken:
+        name = "broken"
+
+        async def hit(self, *args):
+            raise ConnectionError("down")
+
+    broken = RateLimiter(_Broken())
+    assert (await broken.hit("k", 1, 60)).allowed
+    assert broken.stats["errors"] == 1
+
+
+async def test_middleware_returns_429_with_retry_after():
+    app = FastAPI()
+
+    @app.post("/api/auth/login")
+    async def login():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(MemoryBackend()))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        codes = [(await client.post("/api/auth/login")).status_code for _ in range(11)]
+        assert codes == [200] * 10 + [429]
+        resp = await client.post("/api/auth/login")
+        assert resp.headers["Retry-After"] == "6"
+        assert [(await client.get("/health")).status_code for _ in range(20)] == [200] * 20
+
+
+@pytest.mark.skipif(not os.getenv("RATE_LIMIT_TEST_REDIS_URL"), reason="RATE_LIMIT_TEST_REDIS_URL not set")
+async def test_redis_backend_matches_gcra():
+    backend = RedisBackend(os.environ["RATE_LIMIT_TEST_REDIS_URL"], prefix=f"test:{uuid.uuid4().hex}:")
+    try:
+        assert await _pattern(backend, _Clock()) == [True] * 10 + [False, True, False]
+    finally:
+        await backend.close()
@@ -0,0 +1,128 @@
+import asyncio
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.event_bus import EventBus
+from api import response_cache as response_cache_module
+from api.response_cache import ResponseCache, make_cache_key, plan_tier
+
+
+def _counter():
+    calls = {"n": 0}
+
+    async def compute():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return [{"value": calls["n"]}]
+
+    return calls, compute
+
+
+def test_cache_key_normalizes_params_and_tier():
+    assert make_cache_key("r", {"b": 1, "a": None, "c": "x"}, "lite") == make_cache_key("r", {"c": "x", "b": 1}, "lite")
+    assert make_cache_key("r", {"b": 1}, "lite") != make_cache_key("r", {"b": 1}, "full")
+    assert plan_tier(SimpleNamespace(role="admin", plan="lite")) == "admin"
+    assert plan_tier(SimpleNamespace(role="user", plan=None)) == "lite"
+
+
+async def test_hit_after_miss_and_concurrent_misses_coalesce():
+    cache = ResponseCache(ttl_seconds=60)
+    calls, compute = _counter()
+
+    results = await asyncio.gather(*(cache.get_or_compute("r", {"days": 30}, "lite", compute) for _ in range(5)))
+    assert calls["n"] == 1
+    assert all(r == [{"value": 1}] for r in results)
+    assert await cache.get_or_compute("r", {"days": 30}, "lite", compute) == [{"value": 1}]
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+
+
+async def test_invalidation_and_lru_eviction():
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    calls, compute = _counter()
+    for days in (1, 2, 3):
+        await cache.get_or_compute("r", {"days": days}, "lite", compute)
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate("test")
+    assert await cache.get_or_compute("r", {"days": 3}, "lite", compute) == [{"value": 4}]
+
+
+async def test_event_bus_invalidates(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(response_cache_module, "event_bus", bus)
+    cache = ResponseCache(ttl_seconds=60)
+    calls, compute = _counter()
+    await cache.get_or_compute("r", {}, "lite", compute)
+
+    cache.start_invalidator()
+    await asyncio.sleep(0)
+    await bus.publish("heartbeat")
+    await bus.publish("campaign_rebuilt", {"campaigns_total": 1})
+    await asyncio.sleep(0.01)
+    await cache.stop_invalidator()
+
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+async def test_disk_tier_shared_between_instances(tmp_path):
+    calls, compute = _counter()
+    await ResponseCache(ttl_seconds=60, disk_dir=tmp_path).get_or_compute("r", {}, "full", compute)
+
+    other = ResponseCache(ttl_seconds=60, disk_dir=tmp_path)
+    assert await other.get_or_compute("r", {}, "full", compute) == [{"value": 1}]
+    assert other.stats()["disk_hits"] == 1
+    other.invalidate()
+    await other.drain_disk_sweeps()
+    assert list(tmp_path.glob("*.json")) == []
+
+
+async def test_disk_sweep_runs_off_loop_and_stale_files_are_ignored(tmp_path, monkeypatch):
+    import threading
+
+    calls, compute = _counter()
+    cache = ResponseCache(ttl_seconds=60, disk_dir=tmp_path)
+    await cache.get_or_compute("r", {}, "full", compute)
+
+    sweep_threads: list[str] = []
+    release = threading.Event()
+    original = cache._sweep_disk
+
+    def slow_sweep(cutoff):
+        sweep_threads.append(threading.current_thread().name)
+        release.wait(5)
+        original(cutoff)
+
+    monkeypatch.setattr(cache, "_sweep_disk", slow_sweep)
+    cache.invalidate("test")
+    await asyncio.sleep(0.01)
+    # 삭제가 끝나기 전에도 무효화 이전 파일은 읽지 않음
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert await cache.get_or_compute("r", {}, "full", compute) == [{"value": 2}]
+
+    release.set()
+    await cache.drain_disk_sweeps()
+    assert sweep_threads and sweep_threads[0] != threading.main_thread().name
+    # 무효화 이후 기록된 새 엔트리는 유지
+    fresh = ResponseCache(ttl_seconds=60, disk_dir=tmp_path)
+    assert await fresh.get_or_compute("r", {}, "full", compute) == [{"value": 2}]
+
+
+async def test_errors_are_not_cached():
+    cache = ResponseCache(ttl_seconds=60)
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    for _ in range(2):
+        try:
+            await cache.get_or_compute("r", {}, "lite", boom)
+        except RuntimeError:
+            pass
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 0
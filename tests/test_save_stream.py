@@ -0,0 +1,64 @@
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.save_stream import ResultWriter
+
+
+def _result(i: int, error: str | None = None) -> dict:
+    r = {"keyword": f"kw{i}", "ads": [{}] * (i % 3)}
+    if error:
+        r["error"] = error
+    return r
+
+
+async def test_writer_batches_by_size_and_time_and_skips_errors():
+    batches: list[list[str]] = []
+
+    async def save(batch):
+        batches.append([r["keyword"] for r in batch])
+        return len(batch)
+
+    async with ResultWriter(save, batch_size=3, flush_sec=0.05) as writer:
+        for i in range(4):
+            await writer.put(_result(i))
+        await writer.put(_result(9, error="timeout"))
+        await asyncio.sleep(0.1)  # 4번째 결과는 시간 기준으로 flush
+        assert batches == [["kw0", "kw1", "kw2"], ["kw3"]]
+        await writer.put(_result(5))
+
+    assert batches[-1] == ["kw5"]  # 종료 시 잔여분 적재
+    assert writer.stats["keywords"] == 6
+    assert writer.stats["errors"] == 1
+    assert writer.stats["saved"] == 5
+    assert writer.stats["ads"] == sum(i % 3 for i in (0, 1, 2, 3, 9, 5))
+
+
+async def test_writer_backpressure_and_partial_progress_on_failure():
+    release = asyncio.Event()
+    saved: list[str] = []
+
+    async def save(batch):
+        await release.wait()
+        if batch[0]["keyword"] == "kw1":
+            raise RuntimeError("db locked")
+        saved.extend(r["keyword"] for r in batch)
+        return len(batch)
+
+    async with ResultWriter(save, batch_size=1, flush_sec=10, queue_size=1) as writer:
+        await writer.put(_result(0))
+        await asyncio.sleep(0)  # writer가 kw0을 꺼내 적재 대기
+        await writer.put(_result(1))
+        blocked = asyncio.create_task(writer.put(_result(2)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()  # 큐가 가득 → 생산자 대기
+        release.set()
+        await blocked
+
+    # 실패한 배치만 유실, 앞뒤 배치는 커밋 유지
+    assert saved == ["kw0", "kw2"]
+    assert writer.stats["failed_batches"] == 1
+    assert writer.stats["lost_keywords"] == 1
+    assert writer.stats["backpressure_waits"] >= 1
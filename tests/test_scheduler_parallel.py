@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scheduler import scheduler as scheduler_module
+from scheduler.scheduler import AdScopeScheduler
+
+
+def _fake_crawler(channel: str, delay: float, fail: bool = False, stream_before_fail: int = 0):
+    class _Crawler:
+        keyword_dependent = True
+        attempts = 0
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def crawl_keywords(self, keywords, persona_code, device_type, on_result):
+            await asyncio.sleep(delay)
+            type(self).attempts += 1
+            if fail:
+                for kw in keywords[:stream_before_fail]:
+                    await on_result({"keyword": kw, "channel": channel, "captured_at": datetime.utcnow(), "ads": [{}]})
+                raise RuntimeError(f"{channel} down")
+            for kw in keywords:
+                await on_result({"keyword": kw, "channel": channel, "captured_at": datetime.utcnow(), "ads": [{}, {}]})
+            return []
+
+    return _Crawler
+
+
+async def test_channels_run_concurrently_and_save_as_they_finish(monkeypatch):
+    crawlers = {
+        "naver_search": _fake_crawler("naver_search", 0.05),
+        "youtube_ads": _fake_crawler("youtube_ads", 0.3),
+        "kakao_da": _fake_crawler("kakao_da", 0.1, fail=True),
+    }
+    monkeypatch.setattr(scheduler_module, "SUPPORTED_CRAWLER_MAP", crawlers)
+    monkeypatch.setenv("CRAWL_RETRY_MAX", "0")
+    monkeypatch.setenv("CRAWL_CHANNEL_CONCURRENCY", "3")
+    monkeypatch.setenv("CRAWL_SAVE_BATCH_SIZE", "2")
+
+    t0 = time.monotonic()
+    saves: list[tuple[str, float]] = []
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    async def _save(session, results):
+        saves.append((results[0]["channel"], time.monotonic() - t0))
+        return 0
+
+    monkeypatch.setattr(scheduler_module, "async_session", _session)
+    monkeypatch.setattr(scheduler_module, "save_crawl_results", _save)
+
+    sched = AdScopeScheduler()
+    sched.crawl_channels = list(crawlers)
+    sched.channel_min_intervals = {}
+    sched._keywords = ["k1", "k2"]
+    sched._resolve_keywords = lambda: ["k1", "k2"]
+
+    stats = await sched._run_crawl_job("M30", "pc", "test")
+    elapsed = time.monotonic() - t0
+
+    # 가장 느린 채널(0.3s) 수준 — 순차였다면 0.45s 이상
+    assert elapsed < 0.4
+    # 먼저 끝난 채널부터 즉시 적재, 실패 채널의 에러 결과는 집계만
+    assert [channel for channel, _ in saves] == ["naver_search", "youtube_ads"]
+    assert saves[0][1] < 0.2
+    assert stats["total_ads"] == 8
+    assert stats["errors"] == 2
+    assert sched._channel_fail_count == {"naver_search": 0, "youtube_ads": 0, "kakao_da": 1}
+
+
+async def test_channel_is_not_retried_after_streaming_results(monkeypatch):
+    crawler = _fake_crawler("naver_search", 0, fail=True, stream_before_fail=1)
+    monkeypatch.setattr(scheduler_module, "SUPPORTED_CRAWLER_MAP", {"naver_search": crawler})
+    monkeypatch.setenv("CRAWL_RETRY_MAX", "2")
+    sleeps: list[float] = []
+
+    async def _sleep(seconds):
+        if seconds:  # 재시도 백오프만 기록 (가짜 크롤러의 sleep(0) 제외)
+            sleeps.append(seconds)
+
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", _sleep)
+
+    sched = AdScopeScheduler()
+    sched.channel_min_intervals = {}
+    results: list[dict] = []
+
+    async def _on_result(result: dict):
+        results.append(result)
+
+    await sched._run_channel("naver_search", ["k1", "k2"], "M30", "pc", _on_result)
+
+    # k1은 1회만 적재, 실패한 k2는 에러 결과로만 집계 — 재시도/백오프 없음
+    assert crawler.attempts == 1
+    assert sleeps == []
+    assert [(r["keyword"], "error" in r) for r in results] == [("k1", False), ("k2", True)]
+    assert sched._channel_fail_count["naver_search"] == 1
+
+
+async def test_competitor_refresh_after_rebuild_is_throttled(monkeypatch):
+    monkeypatch.setenv("ENABLE_COMPETITOR_PRECOMPUTE", "true")
+    monkeypatch.setenv("COMPETITOR_PRECOMPUTE_MIN_INTERVAL_MINUTES", "60")
+    calls: list[int] = []
+
+    async def _precompute(days: int = 30, top_n: int = 50):
+        calls.append(days)
+        return {"days": days}
+
+    monkeypatch.setattr("processor.competitor_mapper.precompute_competitor_affinities", _precompute)
+    sched = AdScopeScheduler()
+    assert sched.enable_competitor_precompute
+
+    await sched._refresh_competitor_affinities()
+    await sched._refresh_competitor_affinities()  # 최소 간격 안 → 생략
+    assert calls == [30]
+
+    sched._competitor_refreshed_at -= 3601
+    await sched._refresh_competitor_affinities()
+    assert calls == [30, 30]
+
+
+def test_competitor_precompute_is_opt_in(monkeypatch):
+    monkeypatch.delenv("ENABLE_COMPETITOR_PRECOMPUTE", raising=False)
+    assert not AdScopeScheduler().enable_competitor_precompute
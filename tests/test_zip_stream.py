@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+import io
+from pathlib import Path
+import sys
+import zipfile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.routers import download
+from api.zip_stream import stream_zip
+from database.models import AdDetail, AdSnapshot, Advertiser, Base, Industry, Keyword, Persona
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+async def _body(response) -> list[bytes]:
+    return [chunk async for chunk in response.body_iterator]
+
+
+async def test_stream_zip_stores_images_and_skips_unreadable(tmp_path):
+    webp = tmp_path / "a.webp"
+    webp.write_bytes(b"RIFF" + bytes(range(256)) * 40)
+    txt = tmp_path / "note.txt"
+    txt.write_text("광고 " * 500, encoding="utf-8")
+
+    chunks = [c async for c in stream_zip([(webp, "x/a.webp"), (tmp_path / "missing.png", "x/m.png"), (txt, "n.txt")])]
+    assert len(chunks) == 3  # 파일 2개 + 중앙 디렉터리
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.namelist() == ["x/a.webp", "n.txt"]
+        assert zf.getinfo("x/a.webp").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("n.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("x/a.webp") == webp.read_bytes()
+        assert zf.testzip() is None
+
+
+async def test_advertiser_creatives_streamed_then_served_from_cache(tmp_path, monkeypatch):
+    store = tmp_path / "stored_images"
+    store.mkdir()
+    monkeypatch.setattr(download, "IMAGE_STORE_DIR", store)
+    monkeypatch.setattr(download, "CACHE_DIR", tmp_path)
+    for i in range(1, 4):
+        (store / f"{i}.webp").write_bytes(bytes([i]) * 1000)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'zip.db').as_posix()}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        await db.execute(insert(Industry), [{"id": 1, "name": "뷰티"}])
+        await db.execute(insert(Keyword), [{"id": 1, "industry_id": 1, "keyword": "선크림"}])
+        await db.execute(insert(Persona), [
+            {"id": 1, "code": "M20", "age_group": "20대", "gender": "male", "login_type": "none"},
+        ])
+        await db.execute(insert(Advertiser), [{"id": 1, "name": "광고주", "aliases": []}])
+        await db.execute(insert(AdSnapshot), [{
+            "id": 1, "keyword_id": 1, "persona_id": 1, "channel": "naver_da", "device": "pc",
+            "captured_at": NOW - timedelta(hours=1),
+        }])
+        await db.execute(insert(AdDetail), [
+            {"id": i, "snapshot_id": 1, "advertiser_id": 1, "creative_image_path": path}
+            for i, path in ((1, "1.webp"), (2, "2.webp"), (3, "3.webp"), (4, "gone.webp"))
+        ])
+        await db.commit()
+
+        async def _download():
+            return await download.download_advertiser_creatives(
+                advertiser_id=1, date_from=NOW - timedelta(days=1), date_to=NOW, user=None, db=db,
+            )
+
+        # 중간에 끊긴 전송은 캐시를 남기지 않음
+        first = await _download()
+        await first.body_iterator.__anext__()
+        await first.body_iterator.aclose()
+        assert list(tmp_path.glob("creatives_*")) == []
+
+        streamed = await _download()
+        assert isinstance(streamed, StreamingResponse)
+        body = b"".join(await _body(streamed))
+        day = download._kst_date_str(NOW - timedelta(hours=1)).replace("-", "")
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            assert sorted(zf.namelist()) == [f"naver_da/{day}_{i}.webp" for i in (1, 2, 3)]
+
+        cached = await _download()
+        assert isinstance(cached, FileResponse)
+        assert Path(cached.path).read_bytes() == body
+
+        # 새 소재가 생기면 (max ad id 변경) 캐시 키가 달라짐
+        await db.execute(insert(AdDetail), [
+            {"id": 5, "snapshot_id": 1, "advertiser_id": 1, "creative_image_path": "1.webp"},
+        ])
+        await db.commit()
+        assert isinstance(await _download(), StreamingResponse)
+    await engine.dispose()